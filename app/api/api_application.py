@@ -1,20 +1,45 @@
+import logging
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional
 
 from fastapi import APIRouter, FastAPI
 
 from app.settings import ApiSettings
 
 from .common.error_handlers import add_error_handlers
+from .common.responses import FastJSONResponse, TimedJSONResponse
 from .common.routers.health_check_routers import add_health_check_router
 from .middlewares.configure_middlewares import configure_middlewares
 
+if TYPE_CHECKING:
+    from app.services import GeminiService
+
+
+logger = logging.getLogger(__name__)
+
+
+def _start_pdf_watcher(app: FastAPI, interval_seconds: float) -> Optional["GeminiService"]:
+    """Inicia a recarga automática dos PDFs do chat; falhas do Gemini não impedem a subida da API."""
+    container = getattr(app, "container", None)
+    if container is None or not interval_seconds:
+        return None
+    try:
+        gemini_service = container.gemini_service()
+    except Exception:
+        logger.warning("Serviço do Gemini indisponível; recarga dos PDFs desativada", exc_info=True)
+        return None
+    gemini_service.start_watching(interval_seconds)
+    return gemini_service
+
 
 def create_app(settings: ApiSettings, router: APIRouter) -> FastAPI:
     @asynccontextmanager
     async def _lifespan(_app: FastAPI):
+        gemini_service = _start_pdf_watcher(_app, settings.gemini_pdf_watch_interval_seconds)
         yield
 
-        ...
+        if gemini_service is not None:
+            await gemini_service.stop_watching()
 
     app = FastAPI(
         lifespan=_lifespan,
@@ -22,12 +47,18 @@ def create_app(settings: ApiSettings, router: APIRouter) -> FastAPI:
         openapi_url=settings.openapi_path,
         version=settings.version,
         docs_url="/api/docs",
+        default_response_class=FastJSONResponse if settings.fast_json_response else TimedJSONResponse,
     )
     app.openapi_version = "3.0.2"
 
     configure_middlewares(app, settings)
 
-    add_error_handlers(app)
+    add_error_handlers(
+        app,
+        max_body_bytes=settings.error_log_max_body_bytes,
+        samples_per_window=settings.error_log_samples_per_window,
+        sample_window_seconds=settings.error_log_sample_window_seconds,
+    )
 
     app.include_router(router)
     add_health_check_router(app, prefix=settings.health_check_base_path)
@@ -2,6 +2,7 @@
 'Camada' de segurança para a API
 """
 
+import logging
 from typing import TYPE_CHECKING, Annotated
 
 from dependency_injector.wiring import Provide, inject
@@ -11,6 +12,7 @@ from pydantic import BaseModel
 
 from app.api.common.injector import get_seller_id_from_path
 from app.common.exceptions import ForbiddenException, UnauthorizedException
+from app.common.server_timing import timed
 from app.integrations.auth.keycloak_adapter import InvalidTokenException, OAuthException, TokenExpiredException
 from app.models.base import UserModel
 
@@ -18,6 +20,7 @@ if TYPE_CHECKING:
     from app.container import Container
     from app.integrations.auth.keycloak_adapter import KeycloakAdapter
 
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
@@ -54,8 +57,50 @@ async def get_current_user_info(
     if token is None:
         raise UnauthorizedException(message="Não autenticado. É necessário fornecer um token de acesso válido.")
 
+    return await _authenticate(request, token, openid_adapter)
+
+
+@inject
+async def get_optional_user_info(
+        request: Request,
+        token: Annotated[str | None, Depends(oauth2_scheme)],
+        openid_adapter: "KeycloakAdapter" = Depends(Provide["keycloak_adapter"]),
+) -> UserAuthInfo | None:
+    """
+    Como `get_current_user_info`, para rotas que também aceitam acesso anônimo: sem token retorna None.
+    Um token enviado continua sendo validado.
+    """
+    if token is None:
+        return None
+
+    return await _authenticate(request, token, openid_adapter)
+
+
+@inject
+async def get_user_info_or_anonymous(
+        request: Request,
+        token: Annotated[str | None, Depends(oauth2_scheme)],
+        openid_adapter: "KeycloakAdapter" = Depends(Provide["keycloak_adapter"]),
+) -> UserAuthInfo | None:
+    """
+    Como `get_optional_user_info`, para rotas públicas que só usam o usuário como informação adicional
+    (ex.: limite de requisições): um token inválido, expirado ou que não pôde ser validado (Keycloak
+    indisponível) é tratado como acesso anônimo, em vez de 401.
+    """
+    if token is None:
+        return None
+
+    try:
+        return await _authenticate(request, token, openid_adapter)
+    except UnauthorizedException as e:
+        logger.debug("Token ignorado em rota pública; requisição tratada como anônima: %s", e.message)
+        return None
+
+
+async def _authenticate(request: Request, token: str, openid_adapter: "KeycloakAdapter") -> UserAuthInfo:
     try:
-        info_token = await openid_adapter.validate_token(token)
+        with timed("auth"):
+            info_token = await openid_adapter.validate_token(token)
     except TokenExpiredException as e:
         raise UnauthorizedException(message="Seu token de acesso expirou.") from e
     except InvalidTokenException as e:
@@ -88,27 +133,23 @@ def require_seller_permission(seller_id: str, auth_info: UserAuthInfo = Depends(
     return auth_info
 
 
+def is_admin_user(auth_info: UserAuthInfo) -> bool:
+    """Indica se o usuário autenticado possui a role de administrador do realm."""
+    token_payload = auth_info.info_token
+
+    resource_access = token_payload.get("resource_access", {})
+    if "realm-admin" in resource_access.get("realm-management", {}).get("roles", []):
+        return True
+
+    return "realm-admin" in token_payload.get("realm_access", {}).get("roles", [])
+
+
 def require_admin_user(auth_info: UserAuthInfo = Depends(get_current_user_info)):
     """
     Dependência que verifica se o usuário autenticado possui a role de administrador
     do realm. Lança uma exceção ForbiddenException caso contrário.
     """
-    token_payload = auth_info.info_token
-    is_admin = False
-
-    resource_access = token_payload.get("resource_access", {})
-    if "realm-management" in resource_access:
-        realm_management_roles = resource_access["realm-management"].get("roles", [])
-        if "realm-admin" in realm_management_roles:
-            is_admin = True
-
-    if not is_admin:
-        realm_access = token_payload.get("realm_access", {})
-        realm_roles = realm_access.get("roles", [])
-        if "realm-admin" in realm_roles:
-            is_admin = True
-
-    if not is_admin:
+    if not is_admin_user(auth_info):
         raise ForbiddenException(message="Esta ação requer privilégios de administrador.")
 
     return auth_info
@@ -122,7 +163,8 @@ async def do_auth(
     openid_adapter: "KeycloakAdapter" = Depends(Provide["keycloak_adapter"]),
 ) -> None:
     try:
-        info_token = await openid_adapter.validate_token(token)
+        with timed("auth"):
+            info_token = await openid_adapter.validate_token(token)
     except TokenExpiredException as exception:
         raise UnauthorizedException(message="Seu token de acesso expirou.") from exception
     except InvalidTokenException as exception:
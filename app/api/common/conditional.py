@@ -0,0 +1,40 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+HEADER_ETAG = "ETag"
+HEADER_CACHE_CONTROL = "Cache-Control"
+
+
+def strong_etag(*parts: str) -> str:
+    """Gera um ETag forte (entre aspas) a partir das partes que identificam a versão do recurso."""
+    digest = hashlib.blake2b(":".join(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Avalia o header `If-None-Match` contra `etag` com a comparação fraca da RFC 9110:
+    aceita `*`, listas separadas por vírgula e o prefixo `W/`.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers[HEADER_ETAG] = etag
+    if cache_control:
+        response.headers[HEADER_CACHE_CONTROL] = cache_control
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """Resposta `304 Not Modified` sem corpo, repetindo os headers de cache da resposta 200."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
@@ -4,36 +4,77 @@ from pydantic import ValidationError
 
 from app.common.error_codes import ErrorCodes
 from app.common.exceptions import ApplicationException
+from app.common.log_pipeline import LogSampler, QueueLogSink
 
 from .schemas.response import ErrorDetail, get_error_response
 
 import logging
-import traceback
 import json
+from typing import Any
 
 VALID_LOCATIONS = {"query", "path", "body", "header"}
 
+REDACTED = "***"
+SENSITIVE_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie", "x-api-key"})
+# Campos do corpo cujo nome contém um destes termos são ofuscados no log
+SENSITIVE_BODY_TERMS = ("password", "senha", "token", "secret", "api_key")
+MAX_REDACTION_DEPTH = 5
+
+DEFAULT_MAX_BODY_BYTES = 2048
+DEFAULT_SAMPLES_PER_WINDOW = 20
+DEFAULT_SAMPLE_WINDOW_SECONDS = 60.0
+
 logger = logging.getLogger(__name__)
 
+# Os logs de erro são gravados por um thread dedicado, fora do event loop
+log_sink = QueueLogSink(__name__)
+
 
-async def _get_request_details(request: Request) -> dict:
+def _redact_body(value: Any, depth: int = 0) -> Any:
+    if depth >= MAX_REDACTION_DEPTH:
+        return REDACTED if isinstance(value, (dict, list)) else value
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if any(term in str(key).lower() for term in SENSITIVE_BODY_TERMS)
+            else _redact_body(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_body(item, depth + 1) for item in value]
+    return value
+
+
+async def _get_request_details(request: Request, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES) -> dict:
     """
     Helper para extrair informações úteis da requisição para os logs.
+    Headers e campos sensíveis são ofuscados, e o corpo só é lido quando o `Content-Length`
+    informado cabe em `max_body_bytes`, para que o custo não dependa do tamanho da requisição.
     """
     body = None
-    try:
-        body_bytes = await request.body()
-        if body_bytes:
-            body = json.loads(body_bytes)
-    except json.JSONDecodeError:
-        body = {"error": "Corpo da requisição não é um JSON válido."}
-    except Exception:
-        body = {"error": "Não foi possível ler o corpo da requisição."}
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            size = int(content_length)
+        except ValueError:
+            size = -1
+        if size < 0 or size > max_body_bytes:
+            body = {"error": f"Corpo da requisição omitido ({content_length} bytes, limite de {max_body_bytes})."}
+        else:
+            try:
+                body_bytes = await request.body()
+                if body_bytes:
+                    body = _redact_body(json.loads(body_bytes[:max_body_bytes]))
+            except json.JSONDecodeError:
+                body = {"error": "Corpo da requisição não é um JSON válido."}
+            except Exception:
+                body = {"error": "Não foi possível ler o corpo da requisição."}
 
     return {
         "method": request.method,
         "url": str(request.url),
-        "headers": dict(request.headers),
+        "headers": {
+            name: REDACTED if name in SENSITIVE_HEADERS else value for name, value in request.headers.items()
+        },
         "body": body
     }
 
@@ -66,20 +107,39 @@ def extract_error_detail_body(error):
     )
 
 
-def add_error_handlers(app: FastAPI):
+def add_error_handlers(
+    app: FastAPI,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    samples_per_window: int = DEFAULT_SAMPLES_PER_WINDOW,
+    sample_window_seconds: float = DEFAULT_SAMPLE_WINDOW_SECONDS,
+):
+    """
+    Registra os handlers de erro da API.
+
+    Os logs de erro são amostrados por slug: até `samples_per_window` registros a cada
+    `sample_window_seconds`; os descartados não leem a requisição e são contabilizados em `suppressed`
+    no próximo registro da mesma slug.
+    """
+    sampler = LogSampler(samples_per_window, sample_window_seconds)
+    log_sink.start()
+
     @app.exception_handler(ApplicationException)
     async def http_exception_handler(request: Request, exc: ApplicationException):
         """
         Captura nossas exceções de negócio (NotFound, Forbidden, etc.)
         e as formata usando a propriedade 'error_response' da exceção.
         """
-        logger.warning(
-            f"Falha de negócio controlada: {exc.slug}",
-            extra={
-                "error_message": exc.message,
-                "request_info": await _get_request_details(request)
-            }
-        )
+        suppressed = sampler.acquire(exc.slug)
+        if suppressed is not None:
+            logger.warning(
+                "Falha de negócio controlada: %s",
+                exc.slug,
+                extra={
+                    "error_message": exc.message,
+                    "suppressed": suppressed,
+                    "request_info": await _get_request_details(request, max_body_bytes)
+                }
+            )
         return JSONResponse(
             status_code=exc.status_code,
             content=exc.error_response.model_dump(exclude_none=True),
@@ -92,11 +152,13 @@ def add_error_handlers(app: FastAPI):
         Captura qualquer exceção não tratada (erros 500),
         registra um log crítico e retorna uma mensagem de erro genérica.
         """
-        logger.error(
-            "Erro inesperado não tratado na aplicação!",
-            exc_info=True,
-            extra={"request_info": await _get_request_details(request)}
-        )
+        suppressed = sampler.acquire(f"unhandled:{type(exc).__name__}")
+        if suppressed is not None:
+            logger.error(
+                "Erro inesperado não tratado na aplicação!",
+                exc_info=exc,
+                extra={"suppressed": suppressed, "request_info": await _get_request_details(request, max_body_bytes)}
+            )
 
         error_response = get_error_response(ErrorCodes.SERVER_ERROR.value)
         return JSONResponse(
@@ -106,13 +168,16 @@ def add_error_handlers(app: FastAPI):
 
     @app.exception_handler(ValidationError)
     async def request_pydantic_validation_error_handler(request: Request, exc: ValidationError) -> JSONResponse:
-        logger.warning(
-            "Falha na validação dos dados de entrada (Pydantic).",
-            extra={
-                "errors": exc.errors(),
-                "request_info": await _get_request_details(request)
-            }
-        )
+        suppressed = sampler.acquire("validation_error")
+        if suppressed is not None:
+            logger.warning(
+                "Falha na validação dos dados de entrada (Pydantic).",
+                extra={
+                    "errors": exc.errors(),
+                    "suppressed": suppressed,
+                    "request_info": await _get_request_details(request, max_body_bytes)
+                }
+            )
 
         errors = exc.errors()
         details = [extract_error_detail(error) for error in errors]
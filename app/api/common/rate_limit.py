@@ -0,0 +1,187 @@
+import ipaddress
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends, Request
+
+from app.api.common.auth_handler import UserAuthInfo, get_current_user_info, get_user_info_or_anonymous
+from app.common.exceptions import TooManyRequestsException
+from app.common.server_timing import timed
+from app.settings.api import RateLimitQuota
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Controle de admissão por token bucket no Redis, por sujeito (usuário ou cliente) e rota.
+
+    Quando o bucket tem folga, o Redis concede `local_lease` fichas extras, que ficam reservadas
+    nesta instância por `lease_ttl_seconds` e são consumidas sem nova consulta. Clientes bem abaixo
+    do limite pagam uma ida ao Redis a cada `local_lease + 1` requisições, sem que a contagem deixe
+    de ser exata: as fichas já foram descontadas do bucket.
+
+    :param redis_adapter: Adapter do Redis onde ficam os buckets.
+    :param quotas: Rota (`MÉTODO /caminho`) -> cota. Rotas ausentes não são limitadas.
+    :param enabled: Com False (ou None), nenhuma requisição é limitada.
+    :param local_lease: Fichas extras reservadas por consulta ao Redis.
+    :param lease_ttl_seconds: Validade das fichas reservadas; as não usadas são perdidas.
+    :param key_prefix: Prefixo das chaves no Redis.
+    :param max_local_entries: Quantidade máxima de reservas mantidas em memória.
+    :param limit_anonymous: Limita também requisições sem token, pelo IP do cliente.
+    :param trusted_proxies: IPs ou redes (CIDR) dos proxies cujo `X-Forwarded-For` é considerado
+        para obter o IP do cliente.
+    """
+
+    def __init__(
+        self,
+        redis_adapter: "RedisAsyncioAdapter",
+        quotas: Optional[dict[str, Any]] = None,
+        enabled: Optional[bool] = True,
+        local_lease: Optional[int] = 0,
+        lease_ttl_seconds: Optional[float] = 1,
+        key_prefix: str = "rate_limit:",
+        max_local_entries: int = 10_000,
+        limit_anonymous: Optional[bool] = False,
+        trusted_proxies: Optional[list[str]] = None,
+    ):
+        self.redis_adapter = redis_adapter
+        self.quotas = {route: RateLimitQuota.model_validate(quota) for route, quota in (quotas or {}).items()}
+        self.enabled = bool(enabled) and bool(self.quotas)
+        self.local_lease = local_lease or 0
+        self.lease_ttl_seconds = lease_ttl_seconds or 1
+        self.key_prefix = key_prefix
+        self.max_local_entries = max_local_entries
+        self.limit_anonymous = bool(limit_anonymous)
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies or []]
+        # chave do bucket -> (fichas reservadas restantes, instante de expiração)
+        self._leases: dict[str, tuple[int, float]] = {}
+
+    def _is_trusted_proxy(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    def client_ip(self, request: Request) -> str:
+        """
+        IP do cliente. Se a conexão vier de um proxy confiável, usa o `X-Forwarded-For`: o último
+        endereço que não é de um proxy confiável, já que os anteriores podem ter sido enviados pelo cliente.
+        """
+        client_host = request.client.host if request.client else "unknown"
+        if not self._is_trusted_proxy(client_host):
+            return client_host
+        forwarded = [
+            address.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for address in header.split(",")
+            if address.strip()
+        ]
+        for address in reversed(forwarded):
+            if not self._is_trusted_proxy(address):
+                return address
+        return forwarded[0] if forwarded else client_host
+
+    def _consume_lease(self, key: str, now: float) -> bool:
+        lease = self._leases.get(key)
+        if lease is None:
+            return False
+        tokens, expires_at = lease
+        if expires_at <= now:
+            del self._leases[key]
+            return False
+        if tokens > 1:
+            self._leases[key] = (tokens - 1, expires_at)
+        else:
+            del self._leases[key]
+        return True
+
+    def _store_lease(self, key: str, tokens: int, now: float) -> None:
+        if len(self._leases) >= self.max_local_entries:
+            self._leases = {k: lease for k, lease in self._leases.items() if lease[1] > now}
+            if len(self._leases) >= self.max_local_entries:
+                self._leases.clear()
+        self._leases[key] = (tokens, now + self.lease_ttl_seconds)
+
+    async def acquire(self, subject: str, route: str) -> Optional[float]:
+        """
+        Consome uma ficha do bucket de `subject` na `route`.
+
+        :return: None quando a requisição é admitida; caso contrário, segundos até haver ficha disponível.
+        """
+        if not self.enabled:
+            return None
+        quota = self.quotas.get(route)
+        if quota is None:
+            return None
+
+        key = f"{self.key_prefix}{route}:{subject}"
+        now = time.monotonic()
+        if self._consume_lease(key, now):
+            return None
+
+        try:
+            with timed("rate_limit"):
+                granted, retry_after_ms = await self.redis_adapter.token_bucket(
+                    key,
+                    capacity=quota.capacity,
+                    refill_per_second=quota.refill_per_second,
+                    lease=min(self.local_lease, quota.capacity - 1),
+                )
+        except Exception:
+            # Indisponibilidade do Redis não deve derrubar a API: a requisição segue sem limite
+            logger.warning(
+                "Falha ao consultar o limite de requisições da rota %s; requisição admitida", route, exc_info=True
+            )
+            return None
+
+        if not granted:
+            return retry_after_ms / 1000
+        if granted > 1:
+            self._store_lease(key, granted - 1, now)
+        return None
+
+
+def _route_key(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', request.url.path)}"
+
+
+async def _admit(rate_limiter: RateLimiter, subject: str, request: Request) -> None:
+    retry_after = await rate_limiter.acquire(subject, _route_key(request))
+    if retry_after is not None:
+        raise TooManyRequestsException(retry_after)
+
+
+@inject
+async def rate_limit_user(
+    request: Request,
+    auth_info: UserAuthInfo = Depends(get_current_user_info),
+    rate_limiter: RateLimiter = Depends(Provide["rate_limiter"]),
+) -> None:
+    """Dependência que limita as requisições do usuário autenticado (`sub` do token) na rota."""
+    await _admit(rate_limiter, f"sub:{auth_info.user.name}", request)
+
+
+@inject
+async def rate_limit_client(
+    request: Request,
+    auth_info: Optional[UserAuthInfo] = Depends(get_user_info_or_anonymous),
+    rate_limiter: RateLimiter = Depends(Provide["rate_limiter"]),
+) -> None:
+    """
+    Dependência para rotas que aceitam acesso anônimo: com token válido, limita pelo `sub` do usuário;
+    sem token (ou com token inválido), pelo IP do cliente, apenas se `limit_anonymous` estiver
+    habilitado. Atrás de um proxy não configurado em `trusted_proxies`, todos os clientes anônimos
+    compartilhariam o IP do proxy.
+    """
+    if auth_info is not None:
+        await _admit(rate_limiter, f"sub:{auth_info.user.name}", request)
+    elif rate_limiter.limit_anonymous:
+        await _admit(rate_limiter, f"ip:{rate_limiter.client_ip(request)}", request)
@@ -0,0 +1,62 @@
+from functools import lru_cache
+from typing import Any, TypeVar
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.common.server_timing import timed
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse que registra o tempo de serialização na etapa `serialization` do Server-Timing."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialization"):
+            return super().render(content)
+
+
+class FastJSONResponse(TimedJSONResponse):
+    """
+    Serializa com orjson. Para o conteúdo já convertido pelo FastAPI (str, números, listas e dicts)
+    a saída é idêntica à do JSONResponse: UTF-8 sem escapes e sem espaços entre os separadores.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialization"):
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+@lru_cache(maxsize=None)
+def _field_names(model_type: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(model_type.model_fields)
+
+
+def construct_model(model_type: type[M], source: Any) -> M:
+    """
+    Copia os campos de `model_type` a partir dos atributos de `source` sem validação (`model_construct`).
+    Use apenas com objetos já validados, como as entidades lidas pelos repositórios.
+    """
+    return model_type.model_construct(**{name: getattr(source, name) for name in _field_names(model_type)})
+
+
+def typed_json_response(response_type: Any, content: Any, status_code: int = 200, validate: bool = True) -> Response:
+    """
+    Serializa `content` como `response_type` direto para bytes, em uma única passada no pydantic-core,
+    evitando o caminho validação -> jsonable_encoder -> json.dumps do FastAPI.
+    Modelos são lidos por atributo e gravados com os aliases, como faz o `response_model` das rotas.
+    Com `validate=False`, `content` já deve estar no formato de `response_type` (ver `construct_model`).
+    """
+    adapter = _type_adapter(response_type)
+    with timed("serialization"):
+        if validate:
+            content = adapter.validate_python(content, from_attributes=True)
+        body = adapter.dump_json(content, by_alias=True)
+    return Response(content=body, status_code=status_code, media_type="application/json")
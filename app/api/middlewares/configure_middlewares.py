@@ -3,7 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
+from app.api.common.conditional import HEADER_ETAG
 from app.api.common.trace import get_trace_id
+from app.api.middlewares.request_logging import HEADER_SERVER_TIMING
 
 from ...settings import ApiSettings
 
@@ -17,7 +19,7 @@ def configure_middlewares(app: FastAPI, settings: ApiSettings) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=[HEADER_X_REQUEST_ID],
+        expose_headers=[HEADER_X_REQUEST_ID, HEADER_SERVER_TIMING, HEADER_ETAG],
     )
     app.add_middleware(
         CorrelationIdMiddleware,
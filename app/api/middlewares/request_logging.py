@@ -0,0 +1,80 @@
+import logging
+import time
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.server_timing import format_server_timing, start_timings
+
+logger = logging.getLogger(__name__)
+
+HEADER_SERVER_TIMING = "Server-Timing"
+OBFUSCATED_VALUE = "***"
+
+
+class RequestLoggingMiddleware:
+    """
+    Middleware ASGI puro que registra uma linha de log por requisição e devolve o header `Server-Timing`.
+
+    As etapas do `Server-Timing` (auth, mongo, keycloak, serialization...) são acumuladas em uma
+    contextvar iniciada aqui; o tempo total da requisição é sempre incluído como `total`.
+
+    :param ignored_urls: Caminhos que não emitem log de acesso (ex.: health check).
+    :param headers_to_log: Headers da requisição incluídos no log.
+    :param headers_to_obfuscate: Headers de `headers_to_log` registrados com o valor ofuscado.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        ignored_urls: Optional[Iterable[str]] = None,
+        headers_to_log: Optional[Iterable[str]] = None,
+        headers_to_obfuscate: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        self.ignored_urls = frozenset(ignored_urls or ())
+        self.headers_to_log = frozenset(header.lower() for header in headers_to_log or ())
+        self.headers_to_obfuscate = frozenset(header.lower() for header in headers_to_obfuscate or ())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = start_timings()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message).append(HEADER_SERVER_TIMING, format_server_timing(timings, total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            path = scope["path"]
+            if path not in self.ignored_urls and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s %s - Status: %s - Duração: %.2fms%s",
+                    scope["method"],
+                    path.replace("\n", "").replace("\r", ""),
+                    status_code,
+                    (time.perf_counter() - start) * 1000,
+                    self._format_headers(scope),
+                )
+
+    def _format_headers(self, scope: Scope) -> str:
+        if not self.headers_to_log:
+            return ""
+        headers = Headers(scope=scope)
+        logged = {
+            name: OBFUSCATED_VALUE if name in self.headers_to_obfuscate else headers[name]
+            for name in sorted(self.headers_to_log)
+            if name in headers
+        }
+        return f" - Headers: {logged}" if logged else ""
@@ -1,8 +1,12 @@
+import json
 import logging
+from typing import AsyncIterator, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.responses import StreamingResponse
 
+from app.api.common.auth_handler import UserAuthInfo, get_optional_user_info
 from app.api.v1.schemas.gemini_schema import ChatRequest, ChatResponse
 from app.common.datetime import utcnow
 from app.services import GeminiService
@@ -11,16 +15,50 @@ router = APIRouter(tags=["Gemini"])
 
 logger = logging.getLogger(__name__)
 
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def get_chat_session_id(
+    auth_info: Optional[UserAuthInfo] = Depends(get_optional_user_info),
+    x_session_id: Optional[str] = Header(default=None, max_length=64),
+) -> Optional[str]:
+    """
+    Sessão do histórico do chat: o `sub` do token, separado por conversa quando o cliente envia
+    `X-Session-ID`. Sem token não há sessão e cada mensagem é respondida sem histórico.
+    """
+    if auth_info is None:
+        return None
+    if x_session_id:
+        return f"{auth_info.user.name}:{x_session_id}"
+    return auth_info.user.name
+
+
+async def _sse_stream(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Converte os trechos da resposta em eventos SSE: `message` por trecho e `done` (ou `error`) ao final."""
+    try:
+        async for chunk in chunks:
+            yield _sse_event("message", {"text": chunk})
+    except Exception as e:
+        logger.error("Erro ao transmitir chat: %s", e)
+        yield _sse_event("error", {"detail": "Erro ao processar chat"})
+        return
+    yield _sse_event("done", {"timestamp": utcnow().isoformat()})
+
 
 @router.post("/chat", response_model=ChatResponse)
 @inject
 async def chat(
     request: ChatRequest,
+    session_id: Optional[str] = Depends(get_chat_session_id),
     gemini_service: GeminiService = Depends(Provide["gemini_service"])
 ):
     """Endpoint principal para chat com o Gemini."""
     try:
-        response_text = gemini_service.chat(request.text)
+        response_text = await gemini_service.achat(request.text, session_id)
         return ChatResponse(
             response=response_text,
             timestamp=utcnow()
@@ -28,7 +66,38 @@ async def chat(
     except Exception as e:
         logger.error(f"Erro ao processar chat: {e}")
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail=f"Erro ao processar chat: {str(e)}"
         )
 
+
+@router.post(
+    "/chat/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+@inject
+async def chat_stream(
+    request: ChatRequest,
+    session_id: Optional[str] = Depends(get_chat_session_id),
+    gemini_service: GeminiService = Depends(Provide["gemini_service"])
+):
+    """
+    Chat com o Gemini via Server-Sent Events: cada trecho da resposta é enviado como evento `message`
+    assim que gerado, seguido de `done` (ou `error`, se a geração falhar no meio).
+    """
+    return StreamingResponse(
+        _sse_stream(gemini_service.astream_response(request.text, session_id)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.delete("/chat/history", status_code=status.HTTP_204_NO_CONTENT)
+@inject
+async def reset_chat_history(
+    session_id: Optional[str] = Depends(get_chat_session_id),
+    gemini_service: GeminiService = Depends(Provide["gemini_service"])
+):
+    """Descarta o histórico da sessão do chat, iniciando uma nova conversa."""
+    await gemini_service.areset_memory(session_id)
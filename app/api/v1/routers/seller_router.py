@@ -1,44 +1,135 @@
-from typing import TYPE_CHECKING, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Annotated, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
-from app.api.common.auth_handler import get_current_user_info, require_seller_permission, UserAuthInfo
+from app.api.common.auth_handler import (
+    get_current_user_info,
+    is_admin_user,
+    require_seller_permission,
+    UserAuthInfo,
+)
+from app.api.common.conditional import etag_matches, not_modified_response, set_cache_headers, strong_etag
+from app.api.common.rate_limit import rate_limit_client, rate_limit_user
+from app.api.common.responses import construct_model, typed_json_response
 from app.api.common.schemas import ListResponse, Paginator, get_request_pagination
+from app.common.exceptions import ForbiddenException
+from app.models.enums import SellerStatus
 from app.models.seller_model import Seller
+from app.models.seller_query_model import SellerQuery
+from app.settings import api_settings
 from app.models.seller_patch_model import SellerPatch
 
-from ..schemas.seller_schema import SellerCreate, SellerReplace, SellerResponse, SellerUpdate
+from ..schemas.seller_schema import (
+    SellerCreate,
+    SellerLookupRequest,
+    SellerLookupResponse,
+    SellerReplace,
+    SellerResponse,
+    SellerSearchResponse,
+    SellerStatsResponse,
+    SellerUpdate,
+)
 
 
 if TYPE_CHECKING:
     from app.container import Container
+    from app.integrations.kv_db.generation_cache import GenerationCache
     from app.services import SellerService
 
 
 router = APIRouter(tags=["Sellers"])
 
 SELLER_NOT_FOUND_OR_ACCESS_DENIED = "Seller não encontrado ou acesso não permitido"
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 20
+
+INCLUDE_ARCHIVED_DESCRIPTION = (
+    "Inclui sellers inativos e arquivados no banco frio (consultado só se não achar no quente). "
+    "Administradores podem consultar sellers excluídos, que já não constam no atributo do usuário"
+)
+IF_NONE_MATCH_DESCRIPTION = "ETag de uma leitura anterior; se o seller não mudou, a resposta é 304 sem corpo"
+
+
+def _can_read_seller(seller_id: str, user_info: "UserAuthInfo", include_archived: bool) -> bool:
+    """
+    O usuário precisa ter o seller no atributo `sellers`. Ao excluir, o seller sai do atributo do dono;
+    por isso, com `include_archived`, administradores também podem ler.
+    """
+    return seller_id in user_info.sellers or (include_archived and is_admin_user(user_info))
 
 
-async def _find_seller_by_id_with_access_check(seller_id: str, user_info: "UserAuthInfo", seller_service) -> "Seller":
+def _seller_etag(seller_id: str, version: Optional[datetime]) -> Optional[str]:
+    """ETag forte a partir do seller_id e da data da última alteração. Sem data não há como versionar."""
+    if version is None:
+        return None
+    return strong_etag(seller_id, version.isoformat())
+
+
+def _with_cache_headers(seller: Seller, response: Response) -> Seller:
+    # created_at só é confiável quando veio do banco; o default do modelo é o instante da leitura
+    version = seller.updated_at or (seller.created_at if "created_at" in seller.model_fields_set else None)
+    etag = _seller_etag(seller.seller_id, version)
+    if etag:
+        set_cache_headers(response, etag, api_settings.seller_cache_control)
+    return seller
+
+
+async def _not_modified(
+    if_none_match: Optional[str],
+    seller_service,
+    seller_id: Optional[str] = None,
+    cnpj: Optional[str] = None,
+    user_info: Optional["UserAuthInfo"] = None,
+    include_archived: bool = False,
+) -> Optional[Response]:
+    """
+    Avalia `If-None-Match` com a versão do seller (projeção de poucos campos), antes de carregar o documento.
+    Retorna a resposta 304 ou None; qualquer divergência segue para a leitura completa, que produz
+    a resposta adequada.
+    """
+    if not if_none_match:
+        return None
+    version = await seller_service.find_version(seller_id=seller_id, cnpj=cnpj)
+    if not version:
+        return None
+    # A busca por seller_id sem include_archived retorna apenas sellers ativos
+    if seller_id and not include_archived and version.get("status") != SellerStatus.ACTIVE.value:
+        return None
+    if user_info is not None and not _can_read_seller(version["seller_id"], user_info, include_archived):
+        return None
+    if cnpj and version.get("cnpj") != cnpj:
+        return None
+
+    etag = _seller_etag(version["seller_id"], version.get("updated_at") or version.get("created_at"))
+    if etag is None or not etag_matches(if_none_match, etag):
+        return None
+    return not_modified_response(etag, api_settings.seller_cache_control)
+
+
+async def _find_seller_by_id_with_access_check(
+    seller_id: str, user_info: "UserAuthInfo", seller_service, include_archived: bool = False
+) -> "Seller":
     """Busca seller por ID com validação de acesso"""
-    if seller_id not in user_info.sellers:
+    if not _can_read_seller(seller_id, user_info, include_archived):
         raise HTTPException(status_code=404, detail=SELLER_NOT_FOUND_OR_ACCESS_DENIED)
 
-    seller = await seller_service.find_by_id(seller_id)
+    seller = await seller_service.find_by_id(seller_id, include_archived=include_archived)
     if not seller:
         raise HTTPException(status_code=404, detail="Seller não encontrado")
     return seller
 
 
-async def _find_seller_by_cnpj_with_access_check(cnpj: str, user_info: "UserAuthInfo", seller_service) -> "Seller":
+async def _find_seller_by_cnpj_with_access_check(
+    cnpj: str, user_info: "UserAuthInfo", seller_service, include_archived: bool = False
+) -> "Seller":
     """Busca seller por CNPJ com validação de acesso"""
-    seller = await seller_service.find_by_cnpj(cnpj)
+    seller = await seller_service.find_by_cnpj(cnpj, include_archived=include_archived)
     if not seller:
         raise HTTPException(status_code=404, detail="Seller não encontrado")
 
-    if seller.seller_id not in user_info.sellers:
+    if not _can_read_seller(seller.seller_id, user_info, include_archived):
         raise HTTPException(status_code=404, detail=SELLER_NOT_FOUND_OR_ACCESS_DENIED)
 
     return seller
@@ -51,17 +142,37 @@ async def _find_seller_by_cnpj_with_access_check(cnpj: str, user_info: "UserAuth
     description="Listar todos os Sellers",
     status_code=status.HTTP_200_OK,
     summary="Listar todos os Sellers",
+    dependencies=[Depends(rate_limit_client)],
 )
 @inject
 async def get(
+    filters: Annotated[SellerQuery, Query()],
     paginator: Paginator = Depends(get_request_pagination),
     seller_service: "SellerService" = Depends(Provide["seller_service"]),
+    seller_list_cache: "GenerationCache" = Depends(Provide["seller_list_cache"]),
 ):
     """
-    Retorna todos os sellers cadastrados no sistema
+    Retorna os sellers cadastrados no sistema, opcionalmente filtrados.
+    Sem filtro de status, apenas sellers ativos são retornados.
+    As páginas serializadas ficam no Redis até a próxima escrita de seller (ou o fim do TTL).
     """
-    results = await seller_service.find(paginator=paginator, filters={})
-    return paginator.paginate(results=results)
+    query_filters = filters.model_dump(mode="json", exclude_none=True)
+    cache_key = seller_list_cache.make_key(paginator.model_dump(), query_filters)
+    generation, cached_page = await seller_list_cache.get(cache_key)
+    if cached_page is not None:
+        return Response(content=cached_page, media_type="application/json")
+
+    results = await seller_service.find(paginator=paginator, filters=filters.to_query_dict())
+    page = paginator.paginate(results=results, filters=query_filters)
+    if api_settings.fast_json_response or generation is not None:
+        # Os sellers já foram validados na leitura; a página é apenas serializada
+        page = ListResponse[SellerResponse].model_construct(
+            meta=page.meta, results=[construct_model(SellerResponse, seller) for seller in page.results]
+        )
+        response = typed_json_response(ListResponse[SellerResponse], page, validate=False)
+        await seller_list_cache.set(generation, cache_key, response.body)
+        return response
+    return page
 
 
 @router.get(
@@ -74,8 +185,11 @@ async def get(
 )
 @inject
 async def get_by_id_or_cnpj(
+    response: Response,
     seller_id: Optional[str] = Query(None),
     cnpj: Optional[str] = Query(None),
+    include_archived: bool = Query(False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
     seller_service: "SellerService" = Depends(Provide["seller_service"]),
     auth_info: UserAuthInfo = Depends(get_current_user_info),
 ):
@@ -84,26 +198,75 @@ async def get_by_id_or_cnpj(
     Se ambos os parâmetros forem fornecidos, busca um seller que tenha exatamente esse seller_id E esse cnpj.
     Pelo menos um dos parâmetros deve ser fornecido.
     Validação de acesso é feita para o seller_id encontrado.
+    Com `If-None-Match` igual ao ETag atual, retorna 304 sem carregar o seller.
     """
     if not seller_id and not cnpj:
         raise HTTPException(status_code=400, detail="seller_id ou cnpj deve ser fornecido")
 
+    not_modified = await _not_modified(if_none_match, seller_service, seller_id, cnpj, auth_info, include_archived)
+    if not_modified:
+        return not_modified
+
     try:
         if seller_id and cnpj:
-            seller = await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service)
+            seller = await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service, include_archived)
             if seller.cnpj != cnpj:
                 raise HTTPException(status_code=404, detail="Seller não encontrado com os critérios fornecidos")
-            return seller
         elif seller_id:
-            return await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service)
+            seller = await _find_seller_by_id_with_access_check(seller_id, auth_info, seller_service, include_archived)
         else:
-            return await _find_seller_by_cnpj_with_access_check(cnpj, auth_info, seller_service)
+            seller = await _find_seller_by_cnpj_with_access_check(cnpj, auth_info, seller_service, include_archived)
+        return _with_cache_headers(seller, response)
     except Exception as e:
         if "não tem permissão" in str(e) or "acesso não permitido" in str(e):
             raise HTTPException(status_code=404, detail=SELLER_NOT_FOUND_OR_ACCESS_DENIED)
         raise
 
 
+@router.get(
+    "/search",
+    response_model=SellerSearchResponse,
+    name="Autocompletar Sellers por nome",
+    description="Busca por prefixo no nome fantasia e na razão social, sem diferenciar acentos ou maiúsculas.",
+    status_code=status.HTTP_200_OK,
+    summary="Autocompletar Sellers por nome",
+)
+@inject
+async def search(
+    q: str = Query(
+        ...,
+        min_length=api_settings.filter_config.min_length,
+        max_length=api_settings.filter_config.max_length,
+        description="Início do nome fantasia ou da razão social",
+    ),
+    limit: int = Query(default=SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, alias="_limit"),
+    seller_service: "SellerService" = Depends(Provide["seller_service"]),
+):
+    """
+    Retorna até `_limit` sellers ativos cujo nome começa com `q`, priorizando o nome fantasia.
+    """
+    return {"results": await seller_service.search(q, limit=limit)}
+
+
+@router.get(
+    "/stats",
+    response_model=SellerStatsResponse,
+    name="Estatísticas de Sellers",
+    description="Contagem de sellers por status, categoria de produto, estado do RG e tipo de conta. Requer auth.",
+    status_code=status.HTTP_200_OK,
+    summary="Estatísticas de Sellers",
+    dependencies=[Depends(get_current_user_info)],
+)
+@inject
+async def stats(
+    seller_service: "SellerService" = Depends(Provide["seller_service"]),
+):
+    """
+    Retorna as contagens materializadas em `seller_stats`, sem varrer a coleção de sellers.
+    """
+    return await seller_service.get_stats()
+
+
 @router.get(
     "/{seller_id}",
     response_model=SellerResponse,
@@ -111,18 +274,33 @@ async def get_by_id_or_cnpj(
     description="Buscar um Seller pelo seu 'seller_id'. Requer autorização.",
     status_code=status.HTTP_200_OK,
     summary="Buscar Seller por ID",
-    dependencies=[Depends(require_seller_permission)],
 )
 @inject
 async def get_by_id(
     seller_id: str,
+    response: Response,
+    include_archived: bool = Query(False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
     seller_service: "SellerService" = Depends(Provide["seller_service"]),
+    auth_info: UserAuthInfo = Depends(get_current_user_info),
 ):
     """
     Retorna os dados de um seller específico.
-    O usuário autenticado precisa ter permissão para o seller_id informado.
+    O usuário autenticado precisa ter permissão para o seller_id informado; com `include_archived`,
+    administradores também podem ler.
+    Com `If-None-Match` igual ao ETag atual, retorna 304 sem carregar o seller.
     """
-    return await seller_service.find_by_id(seller_id)
+    if not _can_read_seller(seller_id, auth_info, include_archived):
+        raise ForbiddenException(message="Você não tem permissão para acessar este seller.")
+
+    not_modified = await _not_modified(if_none_match, seller_service, seller_id, include_archived=include_archived)
+    if not_modified:
+        return not_modified
+
+    seller = await seller_service.find_by_id(seller_id, include_archived=include_archived)
+    if seller:
+        return _with_cache_headers(seller, response)
+    return seller
 
 
 @router.post(
@@ -132,6 +310,7 @@ async def get_by_id(
     description="Cria um novo Seller associado ao usuário autenticado.",
     status_code=status.HTTP_201_CREATED,
     summary="Criar um novo Seller",
+    dependencies=[Depends(rate_limit_user)],
 )
 @inject
 async def create(
@@ -146,6 +325,33 @@ async def create(
     return await seller_service.create(seller_model, auth_info)
 
 
+@router.post(
+    "/lookup",
+    response_model=SellerLookupResponse,
+    name="Buscar Sellers em lote",
+    description="Busca vários Sellers por 'seller_id' e/ou 'cnpj' em uma única requisição. Requer autorização.",
+    status_code=status.HTTP_200_OK,
+    summary="Buscar Sellers em lote",
+)
+@inject
+async def lookup(
+    lookup_request: SellerLookupRequest,
+    seller_service: "SellerService" = Depends(Provide["seller_service"]),
+    auth_info: UserAuthInfo = Depends(get_current_user_info),
+):
+    """
+    Busca em lote por seller_id e/ou cnpj. Apenas sellers aos quais o usuário tem acesso são retornados;
+    chaves inexistentes ou sem permissão são listadas em `not_found`.
+    """
+    allowed_ids = [seller_id for seller_id in lookup_request.seller_ids if seller_id in auth_info.sellers]
+    sellers = await seller_service.find_many(seller_ids=allowed_ids, cnpjs=lookup_request.cnpjs)
+    results = [seller for seller in sellers if seller.seller_id in auth_info.sellers]
+
+    found_keys = {seller.seller_id for seller in results} | {seller.cnpj for seller in results}
+    requested_keys = dict.fromkeys([*lookup_request.seller_ids, *lookup_request.cnpjs])
+    return {"results": results, "not_found": [key for key in requested_keys if key not in found_keys]}
+
+
 @router.patch(
     "/{seller_id}",
     response_model=SellerResponse,
@@ -1,10 +1,11 @@
 import re
-from typing import Optional, List
-from datetime import date
-from pydantic import Field, field_validator, EmailStr
+from typing import Dict, Optional, List
+from datetime import date, datetime
+from pydantic import Field, field_validator, model_validator, EmailStr
 from app.models.enums import SellerStatus
 
 from app.api.common.schemas import SchemaType
+from app.settings import api_settings
 from app.models.enums import BrazilianState, AccountType, ProductCategory
 from app.messages import (
     DESC_CNPJ,
@@ -12,6 +13,7 @@ from app.messages import (
     DESC_SELLER_ID,
     MSG_CNPJ_FORMATO,
     MSG_CNPJ_FORMATO_REPLACE,
+    MSG_LOOKUP_SEM_CHAVES,
     MSG_NOME_FANTASIA_CURTO,
     MSG_SELLER_ID_FORMATO,
     MSG_SELLER_ID_OBRIGATORIO,
@@ -309,3 +311,48 @@ class SellerReplace(SchemaType):
 class SellerResponse(SellerBase):
     status: SellerStatus = Field(description="Status atual do seller")
 
+
+class SellerLookupRequest(SchemaType):
+    seller_ids: List[str] = Field(
+        default_factory=list, max_length=api_settings.pagination.max_limit, description="Lista de seller_id"
+    )
+    cnpjs: List[str] = Field(
+        default_factory=list, max_length=api_settings.pagination.max_limit, description="Lista de CNPJ"
+    )
+
+    @model_validator(mode="after")
+    def validar_chaves(self):
+        if not self.seller_ids and not self.cnpjs:
+            raise ValueError(MSG_LOOKUP_SEM_CHAVES)
+        return self
+
+
+class SellerLookupResponse(SchemaType):
+    results: List[SellerResponse] = Field(..., description="Sellers encontrados")
+    not_found: List[str] = Field(..., description="seller_id/cnpj não encontrados ou sem permissão de acesso")
+
+
+class SellerSearchItem(SchemaType):
+    seller_id: str = Field(..., description=DESC_SELLER_ID)
+    trade_name: str = Field(..., description=DESC_NOME_FANTASIA)
+    company_name: str = Field(..., description=DESC_COMPANY_NAME)
+
+
+class SellerSearchResponse(SchemaType):
+    results: List[SellerSearchItem] = Field(
+        ..., description="Sellers cujo nome fantasia ou razão social começa com o termo"
+    )
+
+
+class SellerStatsResponse(SchemaType):
+    total: int = Field(..., description="Quantidade total de sellers")
+    by_status: Dict[str, int] = Field(default_factory=dict, description="Quantidade de sellers por status")
+    by_product_categories: Dict[str, int] = Field(
+        default_factory=dict, description="Quantidade de sellers por categoria de produto"
+    )
+    by_legal_rep_rg_state: Dict[str, int] = Field(
+        default_factory=dict, description="Quantidade de sellers por estado emissor do RG do representante"
+    )
+    by_account_type: Dict[str, int] = Field(default_factory=dict, description="Quantidade de sellers por tipo de conta")
+    updated_at: Optional[datetime] = Field(None, description="Data e hora da última atualização dos contadores")
+    reconciled_at: Optional[datetime] = Field(None, description="Data e hora da última reconciliação completa")
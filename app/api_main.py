@@ -1,10 +1,10 @@
 import os
 import sys
 import logging
-import time
 import dotenv
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from app.api.middlewares.request_logging import RequestLoggingMiddleware
+from app.common.log_pipeline import LogBudgetFilter, QueueLogSink, SamplingFilter
 from app.container import Container
 from app.settings import api_settings
 from pclogging import LoggingBuilder
@@ -29,18 +29,12 @@ if hasattr(LoggingBuilder, '_log_level'):
 else:
     logger.setLevel(logging.INFO)
 
-
-async def log_requests_middleware(request: Request, call_next):
-    start_time = time.time()
-    safe_path = request.url.path.replace('\n', '').replace('\r', '')
-    logger.info(f"Requisição recebida: {request.method} {safe_path}")
-    response = await call_next(request)
-    process_time = (time.time() - start_time) * 1000
-    formatted_process_time = f"{process_time:.2f}ms"
-    logger.info(
-        f"Requisição finalizada: {request.method} {safe_path} - Status: {response.status_code} - Duração: {formatted_process_time}"
-    )
-    return response
+# Os handlers do logger raiz passam a ser atendidos por um thread dedicado, fora do event loop
+log_sink = QueueLogSink(
+    max_queue_size=api_settings.log_queue_size,
+    filters=[SamplingFilter(api_settings.log_sampling), LogBudgetFilter(api_settings.log_budget_per_second)],
+)
+log_sink.start()
 
 
 def init() -> FastAPI:
@@ -51,8 +45,15 @@ def init() -> FastAPI:
     container.config.from_pydantic(api_settings)
     app_api = create_app(api_settings, api_routes)
     app_api.container = container  # type: ignore[attr-defined]
-    app_api.add_middleware(BaseHTTPMiddleware, dispatch=log_requests_middleware)
+    app_api.add_middleware(
+        RequestLoggingMiddleware,
+        ignored_urls=api_settings.access_log_ignored_urls,
+        headers_to_log=api_settings.access_log_headers_to_log,
+        headers_to_obfuscate=api_settings.access_log_headers_to_obfuscate,
+    )
     container.wire(modules=[
+        "app.api.common.auth_handler",
+        "app.api.common.rate_limit",
         "app.api.common.routers.health_check_routers",
         "app.api.v1.routers.seller_router",
         "app.api.v1.routers.user_router",
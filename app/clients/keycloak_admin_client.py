@@ -2,6 +2,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from app.common.exceptions.bad_request_exception import BadRequestException
+from app.common.server_timing import timed_async
 from app.settings.app import settings
 import logging
 from typing import List
@@ -41,6 +42,7 @@ class KeycloakAdminClient:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                     detail="Falha ao autenticar com o Keycloak.")
 
+    @timed_async("keycloak")
     async def create_user(
             self, username: str, email: str, password: str, first_name: str | None, last_name: str | None,
             sellers: list[str]
@@ -77,6 +79,7 @@ class KeycloakAdminClient:
                 logger.error(f"Erro ao criar usuário no Keycloak: {e.response.text}")
                 raise HTTPException(status_code=e.response.status_code, detail=f"Erro no Keycloak: {e.response.text}")
 
+    @timed_async("keycloak")
     async def get_user(self, user_id: str) -> dict | None:
         logger.debug(f"Buscando usuário por ID: {user_id}")
         admin_token = await self._get_admin_token()
@@ -89,6 +92,7 @@ class KeycloakAdminClient:
             response.raise_for_status()
             return response.json()
 
+    @timed_async("keycloak")
     async def get_users(self) -> list[dict]:
         logger.debug("Listando todos os usuários.")
         admin_token = await self._get_admin_token()
@@ -99,6 +103,7 @@ class KeycloakAdminClient:
             response.raise_for_status()
             return response.json()
 
+    @timed_async("keycloak")
     async def update_user_attributes(self, user_id: str, attributes: dict):
         logger.info(f"Atualizando atributos para o usuário ID: {user_id}")
         admin_token = await self._get_admin_token()
@@ -127,6 +132,7 @@ class KeycloakAdminClient:
                 )
                 raise
 
+    @timed_async("keycloak")
     async def delete_user(self, user_id: str) -> bool:
         logger.info(f"Deletando usuário ID: {user_id}")
         admin_token = await self._get_admin_token()
@@ -139,6 +145,7 @@ class KeycloakAdminClient:
             response.raise_for_status()
             return True
 
+    @timed_async("keycloak")
     async def update_user(self, user_id: str, data_to_update: dict):
         """
         Atualiza dados específicos de um usuário (lógica de PATCH).
@@ -172,6 +179,7 @@ class KeycloakAdminClient:
                     raise BadRequestException(message=f"Erro ao atualizar no Keycloak: {error_detail}")
                 raise e
 
+    @timed_async("keycloak")
     async def reset_user_password(self, user_id: str, password: str):
         """
         Define uma nova senha para o usuário.
@@ -248,6 +256,7 @@ class KeycloakAdminClient:
         else:
             logger.warning(f"O seller '{seller_to_remove}' não foi encontrado nos atributos do usuário '{user_id}'.")
 
+    @timed_async("keycloak")
     async def _update_user_representation(self, user_id: str, user_data: dict):
         """
         Método privado que realiza o PUT com a representação completa do usuário.
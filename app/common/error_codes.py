@@ -22,6 +22,7 @@ class ErrorCodes(Enum):
     NOT_FOUND = ErrorInfo("NOT_FOUND", "Not found", HTTPStatus.NOT_FOUND)
     CONFLICT = ErrorInfo("CONFLICT", "Conflict", HTTPStatus.CONFLICT)
     UNPROCESSABLE_ENTITY = ErrorInfo("UNPROCESSABLE_ENTITY", "Unprocessable Entity", HTTPStatus.UNPROCESSABLE_ENTITY)
+    TOO_MANY_REQUESTS = ErrorInfo("TOO_MANY_REQUESTS", "Too Many Requests", HTTPStatus.TOO_MANY_REQUESTS)
     SERVER_ERROR = ErrorInfo("INTERNAL_SERVER_ERROR", "Internal Server Error", HTTPStatus.INTERNAL_SERVER_ERROR)
 
     # ============================================================
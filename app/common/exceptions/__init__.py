@@ -2,6 +2,7 @@ from .application_exception import ApplicationException
 from .bad_request_exception import BadRequestException
 from .forbidden_exception import ForbiddenException
 from .not_found_exception import NotFoundException
+from .too_many_requests_exception import TooManyRequestsException
 from .unauthorized_exception import UnauthorizedException
 
 __all__ = [
@@ -10,4 +11,5 @@ __all__ = [
     "ForbiddenException",
     "UnauthorizedException",
     "NotFoundException",
+    "TooManyRequestsException",
 ]
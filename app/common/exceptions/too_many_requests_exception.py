@@ -0,0 +1,22 @@
+import math
+from typing import TYPE_CHECKING
+
+from app.common.error_codes import ErrorCodes
+
+from . import ApplicationException
+
+if TYPE_CHECKING:
+    from app.api.common.schemas.response import ErrorDetail
+
+
+class TooManyRequestsException(ApplicationException):
+    def __init__(
+        self,
+        retry_after_seconds: float,
+        message: str | None = None,
+        details: list["ErrorDetail"] | None = None,
+    ):
+        self.retry_after_seconds = max(1, math.ceil(retry_after_seconds))
+        message = message or f"Limite de requisições excedido. Tente novamente em {self.retry_after_seconds}s."
+        super().__init__(error_info=ErrorCodes.TOO_MANY_REQUESTS.value, message=message, details=details)
+        self.headers = {"Retry-After": str(self.retry_after_seconds)}
@@ -0,0 +1,223 @@
+import atexit
+import copy
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Hashable, Optional, Sequence
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler que deixa para o listener a formatação do handler e do traceback. Só `msg % args`
+    é resolvido no thread de origem, para que args mutáveis (dicts, models) sejam registrados como
+    estavam no momento da chamada. Com a fila cheia, o registro é descartado e contado em `dropped`,
+    sem bloquear quem está logando.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _NamedQueueHandler(LazyQueueHandler):
+    """
+    Handler de um logger nomeado: se o logger raiz também estiver atrás de uma fila, o registro vai
+    direto para ela (uma única passagem por fila, qualquer que seja a ordem em que os sinks iniciaram).
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        root_handler = _root_queue_handler()
+        if root_handler is None:
+            super().enqueue(record)
+        else:
+            root_handler.handle(record)
+
+
+class _RootForwarder(logging.Handler):
+    """Entrega os registros retirados da fila aos handlers atuais do logger raiz."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class QueueLogSink:
+    """
+    Desvia os registros para uma fila consumida por um thread dedicado; quem loga paga apenas o
+    `put_nowait`. Sem `logger_name`, os handlers do logger raiz passam a ser atendidos pelo listener.
+    Com um logger nomeado, os registros dele são repassados aos handlers do raiz; enquanto o raiz
+    estiver atrás de uma fila, cada registro é entregue direto a ela.
+
+    :param logger_name: Logger desviado para a fila; None para o logger raiz.
+    :param max_queue_size: Tamanho máximo da fila; acima dele os registros são descartados.
+    :param filters: Filtros aplicados antes de enfileirar, ainda no thread de origem.
+    """
+
+    def __init__(
+        self,
+        logger_name: Optional[str] = None,
+        max_queue_size: int = 10_000,
+        filters: Sequence[logging.Filter] = (),
+    ):
+        self.logger = logging.getLogger(logger_name)
+        self.is_root = self.logger is logging.getLogger()
+        handler_class = LazyQueueHandler if self.is_root else _NamedQueueHandler
+        self.handler = handler_class(queue.Queue(max_queue_size))
+        for log_filter in filters:
+            self.handler.addFilter(log_filter)
+        self._listener: Optional[QueueListener] = None
+        self._target_handlers: list[logging.Handler] = []
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._listener is not None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            if self.is_root:
+                self._target_handlers = list(self.logger.handlers)
+                for handler in self._target_handlers:
+                    self.logger.removeHandler(handler)
+                self._listener = QueueListener(self.handler.queue, *self._target_handlers, respect_handler_level=True)
+            else:
+                self._listener = QueueListener(self.handler.queue, _RootForwarder())
+                self.logger.propagate = False
+            self._listener.start()
+            self.logger.addHandler(self.handler)
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Remove o desvio e aguarda o listener esvaziar a fila."""
+        with self._lock:
+            if self._listener is None:
+                return
+            self.logger.removeHandler(self.handler)
+            self._listener.stop()
+            self._listener = None
+            if self.is_root:
+                for handler in self._target_handlers:
+                    self.logger.addHandler(handler)
+                self._target_handlers = []
+            else:
+                self.logger.propagate = True
+
+
+def _root_queue_handler() -> Optional[LazyQueueHandler]:
+    return next((handler for handler in logging.getLogger().handlers if isinstance(handler, LazyQueueHandler)), None)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Mantém 1 a cada N registros abaixo de WARNING dos loggers configurados; WARNING e acima sempre passam.
+
+    :param every: Prefixo do nome do logger -> N. O prefixo mais específico prevalece.
+    """
+
+    def __init__(self, every: dict[str, int]):
+        super().__init__()
+        self.every = dict(sorted(every.items(), key=lambda item: len(item[0]), reverse=True))
+        self._rate_by_logger: dict[str, int] = {}
+        self._counters: dict[str, int] = {}
+
+    def _rate(self, name: str) -> int:
+        rate = self._rate_by_logger.get(name)
+        if rate is None:
+            rate = next(
+                (every for prefix, every in self.every.items() if name == prefix or name.startswith(f"{prefix}.")), 1
+            )
+            self._rate_by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.every:
+            return True
+        rate = self._rate(record.name)
+        if rate <= 1:
+            return True
+        count = self._counters.get(record.name, 0)
+        self._counters[record.name] = count + 1
+        return count % rate == 0
+
+
+class LogBudgetFilter(logging.Filter):
+    """
+    Limita os registros abaixo de WARNING a `max_per_second` (token bucket com rajada de um segundo).
+    A quantidade descartada é informada no atributo `suppressed` do próximo registro aceito.
+
+    :param max_per_second: Registros por segundo. Com 0 não há limite.
+    """
+
+    def __init__(self, max_per_second: float):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._tokens = max_per_second
+        self._updated_at = time.monotonic()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.max_per_second <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.max_per_second, self._tokens + (now - self._updated_at) * self.max_per_second)
+        self._updated_at = now
+        if self._tokens < 1:
+            self.suppressed += 1
+            return False
+        self._tokens -= 1
+        if self.suppressed:
+            record.suppressed = self.suppressed
+            self.suppressed = 0
+        return True
+
+
+class LogSampler:
+    """
+    Limita a quantidade de registros por chave em janelas fixas de tempo.
+
+    :param max_per_window: Registros permitidos por chave em cada janela. Com 0 não há limite.
+    :param window_seconds: Duração da janela em segundos.
+    """
+
+    def __init__(self, max_per_window: int, window_seconds: float):
+        self.max_per_window = max_per_window
+        self.window_seconds = window_seconds
+        # chave -> (início da janela, registros permitidos na janela, registros descartados desde o último permitido)
+        self._windows: dict[Hashable, tuple[float, int, int]] = {}
+
+    def acquire(self, key: Hashable) -> Optional[int]:
+        """
+        Retorna None quando o registro deve ser descartado. Caso contrário, retorna quantos registros
+        da chave foram descartados desde o último permitido, para que sejam informados no próximo log.
+        """
+        if self.max_per_window <= 0:
+            return 0
+        now = time.monotonic()
+        window_start, allowed, suppressed = self._windows.get(key, (now, 0, 0))
+        if now - window_start >= self.window_seconds:
+            window_start, allowed = now, 0
+        if allowed >= self.max_per_window:
+            self._windows[key] = (window_start, allowed, suppressed + 1)
+            return None
+        self._windows[key] = (window_start, allowed + 1, 0)
+        return suppressed
+
+
+__all__ = ["LazyQueueHandler", "LogBudgetFilter", "LogSampler", "QueueLogSink", "SamplingFilter"]
@@ -0,0 +1,77 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Awaitable, Callable, Iterator, Optional, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Duração acumulada (ms) por etapa da requisição atual. None fora de uma requisição HTTP.
+_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("_server_timings", default=None)
+
+
+def start_timings() -> dict[str, float]:
+    """Inicia a coleta de tempos para a requisição corrente e retorna o dicionário compartilhado."""
+    timings: dict[str, float] = {}
+    _timings.set(timings)
+    return timings
+
+
+def get_timings() -> Optional[dict[str, float]]:
+    return _timings.get()
+
+
+def record_timing(stage: str, duration_ms: float) -> None:
+    """Soma `duration_ms` à etapa. Sem requisição em andamento, não faz nada."""
+    timings = _timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + duration_ms
+
+
+def merge_timings(timings: dict[str, float]) -> None:
+    """Soma as etapas de `timings` às da requisição corrente."""
+    for stage, duration in timings.items():
+        record_timing(stage, duration)
+
+
+def isolated_timings(timings: dict[str, float]) -> Context:
+    """
+    Cópia do contexto atual em que os tempos são somados a `timings`, e não à requisição corrente.
+    Usada por tasks compartilhadas entre requisições: cada uma soma `timings` com `merge_timings`
+    ao receber o resultado, em vez de tudo ir para a requisição que criou a task.
+    """
+    context = copy_context()
+    context.run(_timings.set, timings)
+    return context
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, (time.perf_counter() - start) * 1000)
+
+
+def timed_async(stage: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Decorator que registra a duração de uma função assíncrona na etapa `stage`."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with timed(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def format_server_timing(timings: dict[str, float], total_ms: Optional[float] = None) -> str:
+    """Formata as etapas no padrão do header `Server-Timing` (ex.: `mongo;dur=3.2, total;dur=10.5`)."""
+    metrics = [f"{stage};dur={duration:.1f}" for stage, duration in timings.items()]
+    if total_ms is not None:
+        metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
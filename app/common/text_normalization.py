@@ -0,0 +1,27 @@
+import re
+import unicodedata
+
+_NON_ALNUM_PATTERN = re.compile(r"[^0-9a-z]+")
+
+MAX_SEARCH_TOKENS = 10
+
+
+def normalize_text(value: str | None) -> str:
+    """
+    Normaliza texto para busca: remove acentos, converte para minúsculas e
+    substitui qualquer sequência de caracteres não alfanuméricos por um espaço.
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return _NON_ALNUM_PATTERN.sub(" ", folded).strip()
+
+
+def build_search_keys(value: str | None) -> list[str]:
+    """
+    Gera as chaves de busca por prefixo de um texto: o texto normalizado completo e
+    cada sufixo a partir do início de uma palavra ("loja do joao" -> ["loja do joao", "do joao", "joao"]).
+    """
+    words = normalize_text(value).split()[:MAX_SEARCH_TOKENS]
+    return [" ".join(words[index:]) for index in range(len(words))]
@@ -1,10 +1,14 @@
 from dependency_injector import containers, providers
 
+from app.api.common.rate_limit import RateLimiter
 from app.clients.keycloak_admin_client import KeycloakAdminClient
+from app.integrations.archive.segment_archive import SegmentArchive
 from app.integrations.auth.keycloak_adapter import KeycloakAdapter
+from app.integrations.kv_db.chat_history_store import ChatHistoryStore
+from app.integrations.kv_db.generation_cache import SELLER_LIST_NAMESPACE, GenerationCache
 from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
 from app.integrations.database.mongo_client import MongoClient
-from app.repositories import SellerRepository
+from app.repositories import SellerRepository, SellerStatsRepository
 from app.services import HealthCheckService, SellerService, UserService, GeminiService, WebhookService
 from app.settings.app import AppSettings
 from app.settings.app import settings as settings_instance
@@ -20,10 +24,33 @@ class Container(containers.DeclarativeContainer):
         mongo_url=config.app_db_url_mongo,
     )
 
+    cold_mongo_client = providers.Singleton(
+        MongoClient.from_optional_url,
+        mongo_url=config.MONGO_COLD_URL,
+        maxPoolSize=config.mongo_cold_max_pool_size,
+    )
+
+    seller_segment_archive = providers.Singleton(
+        SegmentArchive.from_optional_path,
+        path=config.cold_archive_segments_path,
+    )
+
     seller_repository = providers.Singleton(
         SellerRepository,
         client=mongo_client,
         db_name=config.MONGO_DB,
+        batch_window_ms=config.seller_lookup_batch_window_ms,
+        max_batch_size=config.seller_lookup_max_batch_size,
+        cold_client=cold_mongo_client,
+        cold_db_name=config.MONGO_COLD_DB,
+        negative_cache_ttl_seconds=config.seller_archived_negative_cache_ttl_seconds,
+        segment_archive=seller_segment_archive,
+    )
+
+    seller_stats_repository = providers.Singleton(
+        SellerStatsRepository,
+        client=mongo_client,
+        db_name=config.MONGO_DB,
     )
 
     redis_adapter = providers.Singleton(
@@ -31,6 +58,25 @@ class Container(containers.DeclarativeContainer):
         redis_url=config.REDIS_URL,
     )
 
+    rate_limiter = providers.Singleton(
+        RateLimiter,
+        redis_adapter=redis_adapter,
+        quotas=config.rate_limit_quotas,
+        enabled=config.rate_limit_enabled,
+        local_lease=config.rate_limit_local_lease,
+        lease_ttl_seconds=config.rate_limit_lease_ttl_seconds,
+        limit_anonymous=config.rate_limit_anonymous,
+        trusted_proxies=config.rate_limit_trusted_proxies,
+    )
+
+    seller_list_cache = providers.Singleton(
+        GenerationCache,
+        redis_adapter=redis_adapter,
+        namespace=SELLER_LIST_NAMESPACE,
+        ttl_seconds=config.seller_list_cache_ttl_seconds,
+        enabled=config.seller_list_cache_enabled,
+    )
+
     keycloak_admin_client = providers.Singleton(
         KeycloakAdminClient,
     )
@@ -49,6 +95,10 @@ class Container(containers.DeclarativeContainer):
         SellerService,
         repository=seller_repository,
         keycloak_client=keycloak_admin_client,
+        reject_unindexed_sort=config.seller_query_reject_unindexed_sort,
+        stats_repository=seller_stats_repository,
+        stats_reconcile_interval_seconds=config.seller_stats_reconcile_interval_seconds,
+        list_cache=seller_list_cache,
     )
 
     user_service = providers.Singleton(
@@ -56,10 +106,39 @@ class Container(containers.DeclarativeContainer):
         keycloak_client=keycloak_admin_client,
     )
 
+    chat_history_store = providers.Singleton(
+        ChatHistoryStore,
+        redis_adapter=redis_adapter,
+        ttl_seconds=config.gemini_history_ttl_seconds,
+        max_turns=config.gemini_history_max_turns,
+    )
+
+    gemini_answer_cache = providers.Singleton(
+        GenerationCache,
+        redis_adapter=redis_adapter,
+        namespace="gemini_answer",
+        ttl_seconds=config.gemini_answer_cache_ttl_seconds,
+        enabled=config.gemini_answer_cache_enabled,
+    )
+
     gemini_service = providers.Singleton(
         GeminiService,
         api_key=config.API_KEY_GEMINI,
         pdfs_folder_path="pdfs",
+        max_concurrency=config.gemini_max_concurrency,
+        retrieval_top_k=config.gemini_retrieval_top_k,
+        chunk_words=config.gemini_chunk_words,
+        hybrid_weight=config.gemini_hybrid_weight,
+        index_path=config.gemini_index_path,
+        history_store=chat_history_store,
+        answer_cache=gemini_answer_cache,
+        pdf_workers=config.gemini_pdf_workers,
+        pdf_cache_dir=config.gemini_pdf_cache_dir,
+        chat_backend=config.gemini_chat_backend,
+        fake_llm_config=config.gemini_fake_llm,
+        prompt_max_tokens=config.gemini_prompt_max_tokens,
+        prompt_context_share=config.gemini_prompt_context_share,
+        prompt_message_max_tokens=config.gemini_prompt_message_max_tokens,
     )
 
     webhook_service = providers.Singleton(
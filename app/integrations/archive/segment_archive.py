@@ -0,0 +1,283 @@
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import bson
+import zstandard
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# Cabeçalho do índice: magic, versão e quantidade de entradas
+INDEX_HEADER = struct.Struct("<4sHI")
+INDEX_MAGIC = b"PCSX"
+INDEX_VERSION = 1
+# Entrada do índice: offset e tamanho da chave no heap, offset e tamanho do bloco, posição do documento no bloco
+INDEX_ENTRY = struct.Struct("<IHQII")
+DOC_SIZE = struct.Struct("<i")
+
+# Mesmas opções do MongoClient, para que os documentos lidos sejam equivalentes aos do banco frio
+CODEC_OPTIONS: CodecOptions = CodecOptions(uuid_representation=UuidRepresentation.STANDARD, tz_aware=True)
+
+# A cada FENCE_INTERVAL entradas do índice, uma chave é mantida em memória para encurtar a busca binária no mmap
+FENCE_INTERVAL = 16
+
+# Campo indexado -> prefixo da chave no índice (um único índice ordenado por segmento)
+INDEXED_FIELDS = {"seller_id": b"i:", "cnpj": b"c:"}
+
+# Acima desta quantidade de segmentos, `compact` os une em um só
+DEFAULT_MAX_SEGMENTS = 16
+# Sufixo do segmento resultante da compactação: ordena logo após o segmento mais novo que ele substitui
+COMPACTED_SUFFIX = "-c"
+
+
+class _Segment:
+    """Segmento aberto para leitura: blocos zstd e índice ordenado, ambos via mmap."""
+
+    def __init__(self, data_path: Path, index_path: Path):
+        self.name = data_path.stem
+        self._data_file = open(data_path, "rb")
+        self._index_file = open(index_path, "rb")
+        self.data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.count = INDEX_HEADER.unpack_from(self.index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"Índice inválido no segmento {self.name}")
+        self._heap_start = INDEX_HEADER.size + self.count * INDEX_ENTRY.size
+        self._fences = [self._key(position) for position in range(0, self.count, FENCE_INTERVAL)]
+        self.max_key = self._key(self.count - 1) if self.count else b""
+
+    def _entry(self, position: int) -> tuple[int, int, int, int, int]:
+        return INDEX_ENTRY.unpack_from(self.index, INDEX_HEADER.size + position * INDEX_ENTRY.size)
+
+    def _key(self, position: int) -> bytes:
+        key_offset, key_length, *_ = self._entry(position)
+        start = self._heap_start + key_offset
+        return self.index[start : start + key_length]
+
+    def find(self, key: bytes) -> Optional[dict]:
+        if not self.count or not self._fences[0] <= key <= self.max_key:
+            return None
+        # As chaves em memória delimitam um trecho de até FENCE_INTERVAL entradas para a busca no mmap
+        low = (bisect.bisect_right(self._fences, key) - 1) * FENCE_INTERVAL
+        high = min(low + FENCE_INTERVAL, self.count)
+        position = bisect.bisect_left(range(low, high), key, key=self._key) + low
+        if position == high or self._key(position) != key:
+            return None
+
+        _, _, block_offset, block_length, doc_position = self._entry(position)
+        block = zstandard.ZstdDecompressor().decompress(self.data[block_offset : block_offset + block_length])
+        # Cada documento BSON começa com seu tamanho (int32); pula os anteriores sem decodificá-los
+        start = 0
+        for _ in range(doc_position):
+            start += DOC_SIZE.unpack_from(block, start)[0]
+        return bson.decode(block[start : start + DOC_SIZE.unpack_from(block, start)[0]], codec_options=CODEC_OPTIONS)
+
+    def iter_docs(self) -> Iterator[dict]:
+        """Percorre os documentos bloco a bloco, descompactando cada bloco uma única vez."""
+        blocks = sorted({self._entry(position)[2:4] for position in range(self.count)})
+        decompressor = zstandard.ZstdDecompressor()
+        for block_offset, block_length in blocks:
+            block = decompressor.decompress(self.data[block_offset : block_offset + block_length])
+            start = 0
+            while start < len(block):
+                size = DOC_SIZE.unpack_from(block, start)[0]
+                yield bson.decode(block[start : start + size], codec_options=CODEC_OPTIONS)
+                start += size
+
+    def close(self) -> None:
+        self.data.close()
+        self.index.close()
+        self._data_file.close()
+        self._index_file.close()
+
+
+class SegmentArchive:
+    """
+    Arquivo de longo prazo de sellers em segmentos imutáveis, compactados com zstd.
+
+    Cada chamada a `write_segment` cria um par de arquivos: `<nome>.seg` com os documentos em BSON
+    agrupados em blocos zstd, e `<nome>.idx` com as chaves `seller_id`/`cnpj` ordenadas. As leituras
+    usam mmap e busca binária no índice, descompactando apenas o bloco do documento encontrado.
+    Segmentos mais novos têm precedência, então rearquivar um seller substitui a versão anterior.
+
+    Como cada lote arquivado vira um segmento, `compact` une os segmentos em um só quando passam de
+    `max_segments`, mantendo a versão mais nova de cada seller; sem isso, cada segmento manteria dois
+    arquivos e dois mmaps abertos e toda busca sem resultado percorreria todos eles. As leituras
+    fecham os segmentos cujos arquivos foram removidos pela compactação.
+
+    :param path: Diretório dos segmentos.
+    :param docs_per_block: Documentos por bloco zstd; blocos maiores compactam melhor e leem mais bytes por busca.
+    :param compression_level: Nível de compactação do zstd.
+    """
+
+    def __init__(self, path: str | Path, docs_per_block: int = 32, compression_level: int = 10):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.docs_per_block = docs_per_block
+        self.compression_level = compression_level
+        self._segments: list[_Segment] = []
+        self._loaded_names: set[str] = set()
+        self._directory_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_optional_path(cls, path: Optional[str], **options) -> Optional["SegmentArchive"]:
+        """Cria o arquivo somente quando o diretório estiver configurado."""
+        if not path:
+            return None
+        return cls(path, **options)
+
+    def write_segment(self, docs: Sequence[dict]) -> Optional[Path]:
+        """Grava os documentos em um novo segmento e retorna o caminho do arquivo de dados."""
+        if not docs:
+            return None
+        return self._write(f"segment-{time.time_ns():020d}", docs)
+
+    def _blocks(self, docs: Iterable[dict], entries: list[tuple[bytes, int, int, int]]) -> Iterator[bytes]:
+        """Blocos zstd dos documentos, na ordem recebida; as entradas do índice são acumuladas em `entries`."""
+        compressor = zstandard.ZstdCompressor(level=self.compression_level)
+        offset = 0
+        chunk: list[dict] = []
+        iterator = iter(docs)
+        while True:
+            doc = next(iterator, None)
+            if doc is not None:
+                chunk.append(doc)
+                if len(chunk) < self.docs_per_block:
+                    continue
+            if not chunk:
+                return
+            block = compressor.compress(b"".join(bson.encode(doc, codec_options=CODEC_OPTIONS) for doc in chunk))
+            for doc_position, chunk_doc in enumerate(chunk):
+                for field, prefix in INDEXED_FIELDS.items():
+                    if chunk_doc.get(field):
+                        entries.append((prefix + str(chunk_doc[field]).encode(), offset, len(block), doc_position))
+            yield block
+            offset += len(block)
+            chunk = []
+
+    def _write(self, name: str, docs: Iterable[dict]) -> Path:
+        data_path = self.path / f"{name}{SEGMENT_SUFFIX}"
+        index_path = self.path / f"{name}{INDEX_SUFFIX}"
+        entries: list[tuple[bytes, int, int, int]] = []
+        # O índice é publicado por último: segmentos sem índice são ignorados pelas leituras
+        self._write_atomic(data_path, self._blocks(docs, entries))
+        self._write_atomic(index_path, [self._build_index(entries)])
+        documents = len({(block_offset, doc_position) for _, block_offset, _, doc_position in entries})
+        logger.info("Segmento %s gravado com %d sellers (%d bytes)", name, documents, data_path.stat().st_size)
+        return data_path
+
+    def compact(self, max_segments: int = DEFAULT_MAX_SEGMENTS) -> Optional[Path]:
+        """
+        Une todos os segmentos em um só quando passam de `max_segments`, mantendo a versão mais nova
+        de cada seller, e remove os segmentos unidos. O novo segmento é publicado antes da remoção,
+        então uma interrupção no meio deixa apenas segmentos duplicados, sem perda de dados.
+        Deve ser executado por um único processo por vez (o arquivador).
+        """
+        segments = self._refresh()
+        if len(segments) <= max_segments:
+            return None
+
+        def newest_versions() -> Iterator[dict]:
+            seen: set[str] = set()
+            for segment in segments:
+                for doc in segment.iter_docs():
+                    seller_id = doc.get("seller_id")
+                    if seller_id is not None:
+                        if seller_id in seen:
+                            continue
+                        seen.add(seller_id)
+                    yield doc
+
+        data_path = self._write(segments[0].name + COMPACTED_SUFFIX, newest_versions())
+        for segment in segments:
+            (self.path / f"{segment.name}{INDEX_SUFFIX}").unlink(missing_ok=True)
+            (self.path / f"{segment.name}{SEGMENT_SUFFIX}").unlink(missing_ok=True)
+        logger.info("%d segmentos compactados em %s", len(segments), data_path.stem)
+        return data_path
+
+    @staticmethod
+    def _build_index(entries: list[tuple[bytes, int, int, int]]) -> bytes:
+        entries.sort(key=lambda entry: entry[0])
+        header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(entries))
+        packed_entries = bytearray()
+        heap = bytearray()
+        for key, block_offset, block_length, doc_position in entries:
+            packed_entries += INDEX_ENTRY.pack(len(heap), len(key), block_offset, block_length, doc_position)
+            heap += key
+        return header + bytes(packed_entries) + bytes(heap)
+
+    @staticmethod
+    def _write_atomic(path: Path, chunks: Iterable[bytes]) -> None:
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def _refresh(self) -> list[_Segment]:
+        # Novos segmentos alteram o mtime do diretório; sem mudança, evita listar os arquivos
+        directory_mtime = self.path.stat().st_mtime_ns
+        if directory_mtime == self._directory_mtime:
+            return self._segments
+        with self._lock:
+            index_names = {index_path.stem for index_path in self.path.glob(f"*{INDEX_SUFFIX}")}
+            # Segmentos removidos pela compactação deixam de ser lidos e têm os arquivos fechados
+            removed = [segment for segment in self._segments if segment.name not in index_names]
+            segments = [segment for segment in self._segments if segment.name in index_names]
+            for name in sorted(index_names - self._loaded_names):
+                data_path = self.path / f"{name}{SEGMENT_SUFFIX}"
+                if not data_path.exists():
+                    continue
+                segments.append(_Segment(data_path, self.path / f"{name}{INDEX_SUFFIX}"))
+                self._loaded_names.add(name)
+            segments.sort(key=lambda segment: segment.name, reverse=True)
+            # Publica uma nova lista para que leituras concorrentes nunca vejam uma lista parcial
+            self._segments = segments
+            self._directory_mtime = directory_mtime
+            for segment in removed:
+                self._loaded_names.discard(segment.name)
+                segment.close()
+            return segments
+
+    def find(self, field: str, value: str) -> Optional[dict]:
+        """Busca um seller por `seller_id` ou `cnpj`, do segmento mais novo para o mais antigo."""
+        key = INDEXED_FIELDS[field] + value.encode()
+        try:
+            return self._find(self._refresh(), key)
+        except ValueError:
+            # Um segmento foi fechado durante a busca (compactação); a lista atualizada já tem o substituto
+            return self._find(self._refresh(), key)
+
+    @staticmethod
+    def _find(segments: list[_Segment], key: bytes) -> Optional[dict]:
+        for segment in segments:
+            doc = segment.find(key)
+            if doc is not None:
+                return doc
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+            self._loaded_names.clear()
+            self._directory_mtime = None
+
+
+__all__ = ["SegmentArchive"]
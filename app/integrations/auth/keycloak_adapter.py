@@ -53,7 +53,7 @@ class KeycloakAdapter:
                 algorithms=[unverified_header.get("alg")],
                 options={"verify_aud": False},
             )
-            logger.info(f"Token validado com sucesso para o usuário sub: {info_token.get('sub')}")
+            logger.debug("Token validado com sucesso para o usuário sub: %s", info_token.get("sub"))
             return info_token
         except jwt.ExpiredSignatureError as e:
             raise TokenExpiredException("Token expirou") from e
@@ -1,4 +1,5 @@
 import asyncio
+from typing import Optional
 
 from bson.binary import UuidRepresentation
 from bson.codec_options import CodecOptions, TypeCodec, TypeRegistry
@@ -27,11 +28,21 @@ class MongoDB:
 
 
 class MongoClient:
-    def __init__(self, mongo_url: MongoDsn):
+    def __init__(self, mongo_url: MongoDsn, **client_options):
+        """
+        :param client_options: Opções repassadas ao driver, por exemplo `maxPoolSize`.
+        """
         self.mongo_url = mongo_url
-        self.motor_client: AgnosticClient = AsyncIOMotorClient(str(mongo_url))
+        self.motor_client: AgnosticClient = AsyncIOMotorClient(str(mongo_url), **client_options)
         self.motor_client.get_io_loop = asyncio.get_event_loop
 
+    @classmethod
+    def from_optional_url(cls, mongo_url: Optional[MongoDsn], **client_options) -> Optional["MongoClient"]:
+        """Cria o cliente somente quando a URL estiver configurada."""
+        if not mongo_url:
+            return None
+        return cls(mongo_url, **client_options)
+
     def close(self):
         self.motor_client.close()
 
@@ -0,0 +1,211 @@
+"""Pool de sessões SMTP autenticadas, reaproveitadas entre envios."""
+
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 8
+DEFAULT_MAX_IDLE_SECONDS = 60.0
+DEFAULT_NOOP_AFTER_SECONDS = 5.0
+DEFAULT_MAX_MESSAGES_PER_SESSION = 100
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+# Falhas de conexão: a sessão é descartada e o envio é repetido em uma sessão nova. As exceções do
+# smtplib também herdam de OSError, então as recusas definitivas (`is_refusal`) são tratadas antes
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, OSError)
+
+
+def is_refusal(error: BaseException) -> bool:
+    """
+    Recusa definitiva (5xx) do remetente, dos destinatários ou dos dados: o smtplib já fez o RSET, a
+    sessão continua válida e reenviar não mudaria a resposta. Respostas 4xx não são recusas: com 421
+    o servidor encerra a sessão (ex.: limite de mensagens por conexão), e as demais são temporárias.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        return error.smtp_code >= 500
+    return False
+
+
+@dataclass
+class SmtpSession:
+    smtp: smtplib.SMTP
+    last_used: float = field(default_factory=time.monotonic)
+    sent: int = 0
+
+
+class SmtpSessionPool:
+    """
+    Mantém até `max_size` conexões SMTP abertas e autenticadas (STARTTLS e login feitos uma vez por
+    conexão) e as reaproveita em vários `sendmail`. É thread-safe: cada thread usa uma sessão por
+    vez e espera quando todas estão em uso.
+
+    Antes de reaproveitar uma sessão parada há mais de `noop_after_seconds`, o pool envia um `NOOP`;
+    se a resposta não for 250, ou se a sessão ficou parada mais que `max_idle_seconds` (o servidor
+    costuma derrubar conexões ociosas), ela é fechada e outra é aberta. Uma sessão é renovada após
+    `max_messages_per_session` envios, já que muitos servidores limitam as mensagens por conexão.
+    Se o envio em uma sessão reaproveitada falhar por queda da conexão ou resposta 4xx (ex.: 421,
+    limite de mensagens por conexão), ele é repetido uma vez em uma sessão nova.
+
+    :param host: Servidor SMTP.
+    :param port: Porta do servidor.
+    :param username: Usuário do login; sem usuário, o login não é feito.
+    :param password: Senha do login.
+    :param starttls: Executa STARTTLS ao abrir a conexão.
+    :param timeout: Timeout das operações de rede, em segundos.
+    :param smtp_factory: Cria a conexão a partir de host, porta e timeout (padrão: `smtplib.SMTP`).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: Union[int, str, None],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        max_size: Optional[int] = None,
+        max_idle_seconds: Optional[float] = None,
+        noop_after_seconds: Optional[float] = None,
+        max_messages_per_session: Optional[int] = None,
+        timeout: Optional[float] = None,
+        smtp_factory: Optional[Callable[..., smtplib.SMTP]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.max_size = max_size or DEFAULT_MAX_SIZE
+        self.max_idle_seconds = DEFAULT_MAX_IDLE_SECONDS if max_idle_seconds is None else max_idle_seconds
+        self.noop_after_seconds = DEFAULT_NOOP_AFTER_SECONDS if noop_after_seconds is None else noop_after_seconds
+        self.max_messages_per_session = max_messages_per_session or DEFAULT_MAX_MESSAGES_PER_SESSION
+        self.timeout = timeout or DEFAULT_TIMEOUT_SECONDS
+        self.smtp_factory = smtp_factory or smtplib.SMTP
+        self._idle: deque[SmtpSession] = deque()
+        self._lock = threading.Lock()
+        self._available = threading.BoundedSemaphore(self.max_size)
+        self._closed = False
+        self.stats = {"connections": 0, "reused": 0, "noops": 0, "discarded": 0, "retries": 0, "sent": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _connect(self) -> SmtpSession:
+        smtp = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except BaseException:
+            self._close_quietly(smtp)
+            raise
+        self._count("connections")
+        return SmtpSession(smtp)
+
+    @staticmethod
+    def _close_quietly(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    def _discard(self, session: SmtpSession) -> None:
+        self._count("discarded")
+        self._close_quietly(session.smtp)
+
+    def _is_usable(self, session: SmtpSession) -> bool:
+        idle = time.monotonic() - session.last_used
+        if idle > self.max_idle_seconds:
+            return False
+        if idle <= self.noop_after_seconds:
+            return True
+        self._count("noops")
+        try:
+            code, _ = session.smtp.noop()
+        except CONNECTION_ERRORS + (smtplib.SMTPException,):
+            return False
+        return code == 250
+
+    def _checkout(self, fresh: bool) -> tuple[SmtpSession, bool]:
+        """Sessão pronta para uso e se ela foi reaproveitada; com `fresh`, sempre abre uma conexão nova."""
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle and not fresh else None
+            if session is None:
+                return self._connect(), False
+            if self._is_usable(session):
+                self._count("reused")
+                return session, True
+            logger.info("Sessão SMTP ociosa ou sem resposta ao NOOP; reconectando")
+            self._discard(session)
+
+    def _checkin(self, session: SmtpSession) -> None:
+        session.last_used = time.monotonic()
+        with self._lock:
+            if not self._closed and session.sent < self.max_messages_per_session:
+                self._idle.append(session)
+                return
+        self._discard(session)
+
+    @contextmanager
+    def _session(self, fresh: bool = False) -> Iterator[tuple[SmtpSession, bool]]:
+        """
+        Sessão exclusiva durante o bloco e se ela foi reaproveitada. Ela volta para o pool ao final,
+        inclusive após recusas definitivas do servidor (`is_refusal`); em qualquer outra exceção,
+        inclusive respostas 4xx, é descartada.
+        """
+        if self._closed:
+            raise RuntimeError("Pool de sessões SMTP fechado")
+        with self._available:
+            session, reused = self._checkout(fresh)
+            try:
+                yield session, reused
+            except BaseException as e:
+                if is_refusal(e):
+                    self._checkin(session)
+                else:
+                    self._discard(session)
+                raise
+            self._checkin(session)
+
+    def sendmail(self, from_addr: str, to_addrs: Union[str, Sequence[str]], msg: Union[str, bytes]) -> dict:
+        """Envia a mensagem por uma sessão do pool; retorna os destinatários recusados, como `SMTP.sendmail`."""
+        reused = False
+        try:
+            with self._session() as (session, reused):
+                refused = self._send(session, from_addr, to_addrs, msg)
+        except CONNECTION_ERRORS as e:
+            if is_refusal(e) or not reused:
+                raise
+            # A conexão reaproveitada caiu ou foi encerrada pelo servidor (421); tenta de novo em uma conexão nova
+            self._count("retries")
+            with self._session(fresh=True) as (session, _):
+                refused = self._send(session, from_addr, to_addrs, msg)
+        return refused
+
+    def _send(self, session: SmtpSession, from_addr: str, to_addrs, msg) -> dict:
+        refused = session.smtp.sendmail(from_addr, to_addrs, msg)
+        session.sent += 1
+        self._count("sent")
+        return refused
+
+    def close(self) -> None:
+        """Encerra as sessões ociosas; as que estiverem em uso são encerradas ao serem devolvidas."""
+        with self._lock:
+            self._closed = True
+            sessions, self._idle = list(self._idle), deque()
+        for session in sessions:
+            self._close_quietly(session.smtp)
@@ -0,0 +1,68 @@
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import orjson
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryStore:
+    """
+    Histórico de conversa por sessão no Redis, compartilhado entre workers e pods.
+
+    Cada sessão é uma lista em que cada item é um turno (`[pergunta, resposta]` em JSON compacto).
+    A gravação acrescenta o turno, descarta os mais antigos além de `max_turns` e renova o TTL em
+    uma única transação, então sessões abandonadas somem sozinhas.
+
+    Falhas do Redis não interrompem o chat: a leitura devolve um histórico vazio e a gravação é ignorada.
+
+    :param redis_adapter: Adapter do Redis.
+    :param ttl_seconds: Tempo sem mensagens após o qual a sessão é descartada.
+    :param max_turns: Quantidade de turnos (pergunta e resposta) mantidos por sessão.
+    :param key_prefix: Prefixo das chaves no Redis.
+    """
+
+    def __init__(
+        self,
+        redis_adapter: "RedisAsyncioAdapter",
+        ttl_seconds: Optional[int] = 1800,
+        max_turns: Optional[int] = 5,
+        key_prefix: str = "chat_history:",
+    ):
+        self.redis_adapter = redis_adapter
+        self.ttl_seconds = ttl_seconds or 1800
+        self.max_turns = max_turns or 5
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    async def load(self, session_id: str) -> list[tuple[str, str]]:
+        """Turnos `(pergunta, resposta)` da sessão, do mais antigo ao mais recente."""
+        try:
+            entries = await self.redis_adapter.get_list(self._key(session_id))
+        except Exception:
+            logger.warning("Falha ao ler o histórico do chat; seguindo sem histórico", exc_info=True)
+            return []
+        turns = []
+        for entry in entries:
+            try:
+                question, answer = orjson.loads(entry)
+            except (orjson.JSONDecodeError, TypeError, ValueError):
+                continue
+            turns.append((question, answer))
+        return turns
+
+    async def append(self, session_id: str, question: str, answer: str) -> None:
+        try:
+            await self.redis_adapter.push_capped(
+                self._key(session_id), orjson.dumps([question, answer]), self.max_turns, self.ttl_seconds
+            )
+        except Exception:
+            logger.warning("Falha ao gravar o histórico do chat", exc_info=True)
+
+    async def clear(self, session_id: str) -> None:
+        await self.redis_adapter.delete(self._key(session_id))
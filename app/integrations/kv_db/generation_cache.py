@@ -0,0 +1,85 @@
+import hashlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+
+logger = logging.getLogger(__name__)
+
+# Namespace das páginas da listagem de sellers, invalidado pela API e pelo arquivador
+SELLER_LIST_NAMESPACE = "seller_list"
+
+
+class GenerationCache:
+    """
+    Cache de respostas serializadas no Redis, invalidado por um contador de geração.
+
+    Cada entrada é gravada sob a geração lida antes da consulta ao banco; `invalidate` apenas
+    incrementa o contador (`INCR`), tornando todas as entradas anteriores inalcançáveis sem
+    precisar enumerá-las. As entradas antigas expiram pelo TTL. Uma escrita concorrente com a
+    consulta incrementa a geração, então o resultado possivelmente desatualizado fica gravado
+    sob uma geração que não é mais lida.
+
+    Falhas do Redis não interrompem a requisição: a leitura vira miss e a gravação é ignorada.
+
+    :param redis_adapter: Adapter do Redis.
+    :param namespace: Prefixo das chaves (contador e entradas).
+    :param ttl_seconds: Validade das entradas; limita também o tempo de uma entrada servida após uma
+        escrita feita fora da API (ex.: worker), que não incrementa a geração.
+    :param enabled: Com False (ou None), o cache não é consultado nem gravado.
+    """
+
+    def __init__(
+        self,
+        redis_adapter: "RedisAsyncioAdapter",
+        namespace: str,
+        ttl_seconds: Optional[int] = 60,
+        enabled: Optional[bool] = True,
+    ):
+        self.redis_adapter = redis_adapter
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds or 60
+        self.enabled = bool(enabled)
+        self.generation_key = f"{namespace}:generation"
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Resume as partes que identificam a resposta (parâmetros, filtros...) em uma chave estável."""
+        raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def _entry_key(self, generation: int, key: str) -> str:
+        return f"{self.namespace}:{generation}:{key}"
+
+    async def get(self, key: str) -> tuple[Optional[int], Optional[bytes]]:
+        """
+        Retorna a geração atual e a entrada gravada nela, se houver. A geração deve ser repassada a
+        `set` para gravar o resultado calculado em caso de miss; None indica cache indisponível.
+        """
+        if not self.enabled:
+            return None, None
+        try:
+            generation = int(await self.redis_adapter.get_str(self.generation_key) or 0)
+            return generation, await self.redis_adapter.get_bytes(self._entry_key(generation, key))
+        except Exception:
+            logger.warning("Falha ao ler o cache %s; consultando a origem", self.namespace, exc_info=True)
+            return None, None
+
+    async def set(self, generation: Optional[int], key: str, value: bytes) -> None:
+        if not self.enabled or generation is None:
+            return
+        try:
+            await self.redis_adapter.set_bytes(self._entry_key(generation, key), value, self.ttl_seconds)
+        except Exception:
+            logger.warning("Falha ao gravar o cache %s", self.namespace, exc_info=True)
+
+    async def invalidate(self) -> None:
+        """Avança a geração, descartando de uma vez todas as entradas do namespace."""
+        if not self.enabled:
+            return
+        try:
+            await self.redis_adapter.incr(self.generation_key)
+        except Exception:
+            logger.warning("Falha ao invalidar o cache %s", self.namespace, exc_info=True)
@@ -4,12 +4,41 @@ from contextlib import asynccontextmanager
 from pydantic import RedisDsn
 from redis.asyncio import Redis
 
+# Token bucket atômico. ARGV: capacidade, fichas repostas por segundo, custo e fichas extras reservadas
+# quando há folga. Retorna {fichas concedidas, ms até haver `custo` fichas (0 quando concedido)}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2]) / 1000
+local cost = tonumber(ARGV[3])
+local lease = tonumber(ARGV[4])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_per_ms)
+local granted = 0
+local retry_after = 0
+if tokens >= cost + lease then
+    granted = cost + lease
+elseif tokens >= cost then
+    granted = cost
+else
+    retry_after = math.ceil((cost - tokens) / refill_per_ms)
+end
+tokens = tokens - granted
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / refill_per_ms))
+return {granted, retry_after}
+"""
+
 
 class RedisAsyncioAdapter:
 
     def __init__(self, redis_url: RedisDsn):
         self.redis_url = str(redis_url)
         self.redis_client = Redis.from_url(self.redis_url)
+        self._token_bucket_script = None
 
     async def aclose(self):
         await self.redis_client.aclose()
@@ -51,9 +80,46 @@ class RedisAsyncioAdapter:
             v = json.dumps(v)
         await self.set_str(key, v, expires_in_seconds)
 
+    async def get_bytes(self, key: str) -> bytes | None:
+        return await self.redis_client.get(key)
+
+    async def set_bytes(self, key: str, v: bytes, expires_in_seconds: int | None = None):
+        await self.redis_client.set(key, v, expires_in_seconds)
+
+    async def incr(self, key: str) -> int:
+        return await self.redis_client.incr(key)
+
     async def delete(self, key: str):
         await self.redis_client.delete(key)
 
+    async def get_list(self, key: str) -> list[bytes]:
+        return await self.redis_client.lrange(key, 0, -1)
+
+    async def push_capped(self, key: str, v: bytes, max_length: int, expires_in_seconds: int | None = None):
+        """Acrescenta `v` ao fim da lista `key`, mantendo só os `max_length` últimos itens, e renova o TTL."""
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, v)
+            pipe.ltrim(key, -max_length, -1)
+            if expires_in_seconds:
+                pipe.expire(key, expires_in_seconds)
+            await pipe.execute()
+
+    async def token_bucket(
+        self, key: str, capacity: int, refill_per_second: float, cost: int = 1, lease: int = 0
+    ) -> tuple[int, int]:
+        """
+        Consome `cost` fichas do token bucket `key` em uma única operação atômica (script Lua).
+        Se sobrarem ao menos `cost + lease` fichas, as `lease` extras também são concedidas.
+
+        :return: Fichas concedidas (0 quando negado) e milissegundos até haver `cost` fichas.
+        """
+        if self._token_bucket_script is None:
+            self._token_bucket_script = self.redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+        granted, retry_after_ms = await self._token_bucket_script(
+            keys=[key], args=[capacity, refill_per_second, cost, lease]
+        )
+        return int(granted), int(retry_after_ms)
+
     @asynccontextmanager
     async def locks(
         self,
@@ -0,0 +1,91 @@
+"""Modelo de chat local e determinístico, usado no lugar do Gemini em testes de carga e desenvolvimento offline."""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+VOCABULARY = (
+    "o seller deve informar cadastro dados CNPJ conta bancária documentos regras prazo análise "
+    "aprovação status ativo inativo contato representante legal endereço categoria produtos"
+).split()
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Responde sem rede, com latência configurável: `first_token_latency_ms` até o primeiro token e
+    `token_latency_ms` entre os demais. A resposta tem `answer_tokens` palavras e depende apenas da
+    última mensagem, então a mesma pergunta sempre produz a mesma resposta.
+    """
+
+    first_token_latency_ms: float = 0.0
+    token_latency_ms: float = 0.0
+    answer_tokens: int = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def response_seconds(self) -> float:
+        """Tempo total que o modelo leva para produzir uma resposta completa."""
+        return (self.first_token_latency_ms + self.token_latency_ms * max(self.answer_tokens - 1, 0)) / 1000
+
+    def _tokens(self, messages: list[BaseMessage]) -> list[str]:
+        question = str(messages[-1].content) if messages else ""
+        seed = hashlib.blake2b(question.encode(), digest_size=8).digest()
+        words = [VOCABULARY[(seed[i % len(seed)] + i) % len(VOCABULARY)] for i in range(self.answer_tokens)]
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def _delays(self, count: int) -> Iterator[float]:
+        for i in range(count):
+            yield (self.first_token_latency_ms if i == 0 else self.token_latency_ms) / 1000
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.response_seconds)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._tokens(messages))))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.response_seconds)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._tokens(messages))))])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        tokens = self._tokens(messages)
+        for token, delay in zip(tokens, self._delays(len(tokens))):
+            time.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        tokens = self._tokens(messages)
+        for token, delay in zip(tokens, self._delays(len(tokens))):
+            await asyncio.sleep(delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
@@ -0,0 +1,161 @@
+"""Orçamento de tokens do prompt: limita contexto e histórico para que o tamanho do prompt seja previsível."""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = " […]"
+DEFAULT_MAX_TOKENS = 6000
+DEFAULT_CONTEXT_SHARE = 0.6
+DEFAULT_MESSAGE_MAX_TOKENS = 500
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa de tokens sem tokenizador (~4 caracteres por token em português)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto no último espaço que cabe em `max_tokens`, indicando o corte."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK)
+    if limit <= 0:
+        return ""
+    cut = text.rfind(" ", 0, limit + 1)
+    return text[: cut if cut > 0 else limit].rstrip() + TRUNCATION_MARK
+
+
+@dataclass
+class PromptUsage:
+    """Tokens estimados de cada parte do prompt montado e o que foi cortado para caber no orçamento."""
+
+    budget: int
+    system: int
+    question: int
+    context: int
+    history: int
+    dropped_turns: int = 0
+    truncated_messages: int = 0
+    context_truncated: bool = False
+
+    @property
+    def total(self) -> int:
+        return self.system + self.question + self.context + self.history
+
+    @property
+    def compacted(self) -> bool:
+        return bool(self.dropped_turns or self.truncated_messages or self.context_truncated)
+
+
+class PromptBudget:
+    """
+    Ajusta contexto e histórico a um orçamento de tokens de entrada. Instrução do sistema e pergunta
+    entram sempre; o contexto dos documentos fica com até `context_share` do restante (o corte
+    remove o fim, onde estão os trechos menos relevantes) e o histórico com o que sobrar. Cada
+    mensagem do histórico é limitada a `message_max_tokens` e os turnos mais antigos que não
+    couberem são descartados inteiros, do mais antigo ao mais recente.
+
+    O uso acumulado fica em `stats`, para acompanhamento do tamanho dos prompts.
+
+    :param max_tokens: Tokens de entrada por prompt.
+    :param context_share: Fração (0 a 1) do orçamento livre reservada ao contexto dos documentos.
+    :param message_max_tokens: Tokens por mensagem do histórico.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        context_share: Optional[float] = None,
+        message_max_tokens: Optional[int] = None,
+    ):
+        self.max_tokens = max_tokens or DEFAULT_MAX_TOKENS
+        self.context_share = DEFAULT_CONTEXT_SHARE if context_share is None else context_share
+        self.message_max_tokens = message_max_tokens or DEFAULT_MESSAGE_MAX_TOKENS
+        self.stats = {
+            "prompts": 0,
+            "compacted_prompts": 0,
+            "dropped_turns": 0,
+            "truncated_messages": 0,
+            "truncated_contexts": 0,
+            "total_tokens": 0,
+            "max_tokens": 0,
+        }
+
+    @staticmethod
+    def _turns(history: Sequence[BaseMessage]) -> list[list[BaseMessage]]:
+        """Agrupa o histórico em turnos (pergunta e resposta), do mais antigo ao mais recente."""
+        start = len(history) % 2
+        turns = [list(history[:start])] if start else []
+        turns.extend(list(history[i : i + 2]) for i in range(start, len(history), 2))
+        return turns
+
+    def _fit_history(self, history: Sequence[BaseMessage], budget: int, usage: PromptUsage) -> list[BaseMessage]:
+        kept: list[list[BaseMessage]] = []
+        turns = self._turns(history)
+        for turn in reversed(turns):
+            messages = []
+            truncated_messages = 0
+            for message in turn:
+                content = message.content if isinstance(message.content, str) else str(message.content)
+                truncated = truncate_to_tokens(content, self.message_max_tokens)
+                if truncated != content:
+                    truncated_messages += 1
+                    message = message.model_copy(update={"content": truncated})
+                messages.append(message)
+            tokens = sum(estimate_tokens(message.content) for message in messages)
+            if tokens > budget:
+                break
+            budget -= tokens
+            usage.history += tokens
+            usage.truncated_messages += truncated_messages
+            kept.append(messages)
+        usage.dropped_turns = len(turns) - len(kept)
+        return [message for turn in reversed(kept) for message in turn]
+
+    def fit(
+        self, system: str, question: str, context: str, history: Sequence[BaseMessage]
+    ) -> tuple[str, list[BaseMessage], PromptUsage]:
+        """Retorna o contexto e o histórico ajustados ao orçamento, com o uso estimado de cada parte."""
+        usage = PromptUsage(
+            budget=self.max_tokens,
+            system=estimate_tokens(system),
+            question=estimate_tokens(question),
+            context=0,
+            history=0,
+        )
+        available = max(self.max_tokens - usage.system - usage.question, 0)
+
+        fitted_context = truncate_to_tokens(context, int(available * self.context_share))
+        usage.context_truncated = fitted_context != context
+        usage.context = estimate_tokens(fitted_context)
+
+        fitted_history = self._fit_history(history, available - usage.context, usage)
+        self._record(usage)
+        return fitted_context, fitted_history, usage
+
+    def _record(self, usage: PromptUsage) -> None:
+        stats = self.stats
+        stats["prompts"] += 1
+        stats["total_tokens"] += usage.total
+        stats["max_tokens"] = max(stats["max_tokens"], usage.total)
+        if usage.compacted:
+            stats["compacted_prompts"] += 1
+            stats["dropped_turns"] += usage.dropped_turns
+            stats["truncated_messages"] += usage.truncated_messages
+            stats["truncated_contexts"] += int(usage.context_truncated)
+            logger.info(
+                "Prompt compactado para %d/%d tokens (turnos descartados: %d, mensagens cortadas: %d, "
+                "contexto cortado: %s)",
+                usage.total,
+                usage.budget,
+                usage.dropped_turns,
+                usage.truncated_messages,
+                "sim" if usage.context_truncated else "não",
+            )
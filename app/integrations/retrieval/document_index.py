@@ -0,0 +1,216 @@
+"""Índice BM25 local (NumPy) para recuperar os trechos dos documentos mais relevantes para uma pergunta."""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from app.common.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_CHUNK_WORDS = 180
+DEFAULT_CHUNK_OVERLAP = 30
+EMBEDDING_DIMS = 256
+
+# Palavras muito frequentes em português que não ajudam a distinguir os trechos
+STOPWORDS = frozenset(
+    "a ao aos as com como da das de do dos e ela ele em entre esta este eu isso mais mas na nas no nos "
+    "o os ou para pela pelas pelo pelos por qual quando que se sem ser seu sua sao tem um uma".split()
+)
+
+
+@dataclass(frozen=True)
+class Chunk:
+    source: str
+    text: str
+
+
+def tokenize(text: str) -> list[str]:
+    """Termos indexados: texto sem acentos e em minúsculas, sem stopwords e termos de uma letra."""
+    return [term for term in normalize_text(text).split() if len(term) > 1 and term not in STOPWORDS]
+
+
+def chunk_text(
+    text: str, source: str, max_words: int = DEFAULT_CHUNK_WORDS, overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> list[Chunk]:
+    """Divide o texto em janelas de até `max_words` palavras, com `overlap` palavras repetidas entre vizinhas."""
+    words = text.split()
+    step = max(1, max_words - overlap)
+    return [
+        Chunk(source=source, text=" ".join(words[start : start + max_words]))
+        for start in range(0, max(len(words) - overlap, 1), step)
+        if words[start : start + max_words]
+    ]
+
+
+def hashed_embedding(text: str, dims: int = EMBEDDING_DIMS) -> np.ndarray:
+    """
+    Vetor normalizado dos trigramas de caracteres do texto, com feature hashing (crc32 e sinal pelo bit alto).
+    Aproxima grafias parecidas (plurais, flexões) que o BM25 trata como termos distintos.
+    """
+    normalized = f" {normalize_text(text)} "
+    if len(normalized) < 3:
+        return np.zeros(dims, dtype=np.float32)
+    hashes = np.fromiter(
+        (zlib.crc32(normalized[i : i + 3].encode()) for i in range(len(normalized) - 2)), dtype=np.uint32
+    )
+    signs = np.where(hashes >> 31, 1.0, -1.0).astype(np.float32)
+    vector = np.bincount(hashes % dims, weights=signs, minlength=dims).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class DocumentIndex:
+    """
+    Índice BM25 imutável sobre os trechos dos documentos, opcionalmente híbrido com embeddings por hashing.
+
+    As postings ficam agrupadas por termo (offsets, chunk, peso) com o peso BM25 já calculado, de modo que
+    a busca soma fatias de arrays NumPy, uma por termo da pergunta. O índice pode ser gravado em disco e
+    recarregado enquanto a `fingerprint` (conteúdo e parâmetros de construção) for a mesma.
+    """
+
+    def __init__(
+        self,
+        chunks: Sequence[Chunk],
+        vocabulary: dict[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        embeddings: Optional[np.ndarray] = None,
+        fingerprint: str = "",
+    ):
+        self.chunks = list(chunks)
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.embeddings = embeddings
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @staticmethod
+    def make_fingerprint(content: str, *params: object) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([INDEX_VERSION, *params]).encode())
+        digest.update(content.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(
+        cls,
+        chunks: Sequence[Chunk],
+        k1: float = 1.5,
+        b: float = 0.75,
+        with_embeddings: bool = False,
+        fingerprint: str = "",
+    ) -> "DocumentIndex":
+        vocabulary: dict[str, int] = {}
+        term_ids: list[int] = []
+        chunk_ids: list[int] = []
+        lengths = np.zeros(len(chunks), dtype=np.float32)
+        for chunk_id, chunk in enumerate(chunks):
+            terms = tokenize(chunk.text)
+            lengths[chunk_id] = len(terms)
+            term_ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+            chunk_ids.extend([chunk_id] * len(terms))
+
+        # Pares (termo, chunk) únicos, ordenados por termo: a frequência de cada par é o tf
+        n_chunks = max(len(chunks), 1)
+        pairs, tf = np.unique(
+            np.asarray(term_ids, dtype=np.int64) * n_chunks + np.asarray(chunk_ids, dtype=np.int64),
+            return_counts=True,
+        )
+        terms, doc_ids = np.divmod(pairs, n_chunks)
+        df = np.bincount(terms, minlength=len(vocabulary))
+        idf = np.log1p((len(chunks) - df + 0.5) / (df + 0.5))
+        avg_length = float(lengths.mean()) if len(chunks) and lengths.mean() > 0 else 1.0
+        norm = k1 * (1 - b + b * lengths[doc_ids] / avg_length)
+        weights = (idf[terms] * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+        offsets = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+        embeddings = None
+        if with_embeddings and chunks:
+            embeddings = np.stack([hashed_embedding(chunk.text) for chunk in chunks])
+        return cls(chunks, vocabulary, offsets, doc_ids.astype(np.int32), weights, embeddings, fingerprint)
+
+    def search(self, query: str, top_k: int = 4, embedding_weight: float = 0.0) -> list[tuple[Chunk, float]]:
+        """
+        Retorna até `top_k` trechos com pontuação positiva, do mais ao menos relevante. Com `embedding_weight`
+        e embeddings no índice, a pontuação BM25 (normalizada pelo máximo) é combinada à similaridade de cosseno.
+        """
+        if not self.chunks or top_k <= 0:
+            return []
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                # Cada chunk aparece no máximo uma vez nas postings do termo, então a soma indexada é segura
+                scores[self.doc_ids[start:end]] += self.weights[start:end]
+
+        if embedding_weight > 0 and self.embeddings is not None:
+            best = scores.max()
+            lexical = scores / best if best > 0 else scores
+            semantic = np.clip(self.embeddings @ hashed_embedding(query), 0, None)
+            scores = (1 - embedding_weight) * lexical + embedding_weight * semantic
+
+        top_k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.chunks[i], float(scores[i])) for i in ranked if scores[i] > 0]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Grava o índice em um único `.npz`, substituindo o arquivo anterior de forma atômica."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "vocabulary": sorted(self.vocabulary, key=self.vocabulary.__getitem__),
+            "chunks": [[chunk.source, chunk.text] for chunk in self.chunks],
+        }
+        arrays = {
+            "offsets": self.offsets,
+            "doc_ids": self.doc_ids,
+            "weights": self.weights,
+            "meta": np.frombuffer(json.dumps(meta, ensure_ascii=False).encode(), dtype=np.uint8),
+        }
+        if self.embeddings is not None:
+            arrays["embeddings"] = self.embeddings
+        temporary = path.with_name(f"{path.name}.tmp")
+        with open(temporary, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], fingerprint: str) -> Optional["DocumentIndex"]:
+        """Carrega o índice gravado; retorna None se não existir, estiver corrompido ou for de outro conteúdo."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data["meta"].tobytes().decode())
+                if meta.get("version") != INDEX_VERSION or meta.get("fingerprint") != fingerprint:
+                    return None
+                return cls(
+                    chunks=[Chunk(source, text) for source, text in meta["chunks"]],
+                    vocabulary={term: term_id for term_id, term in enumerate(meta["vocabulary"])},
+                    offsets=data["offsets"],
+                    doc_ids=data["doc_ids"],
+                    weights=data["weights"],
+                    embeddings=data["embeddings"] if "embeddings" in data.files else None,
+                    fingerprint=fingerprint,
+                )
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Índice de documentos em %s inválido; será reconstruído", path, exc_info=True)
+            return None
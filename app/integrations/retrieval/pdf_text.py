@@ -0,0 +1,159 @@
+"""Extração do texto dos PDFs em processos paralelos, com cache em disco pelo conteúdo de cada arquivo."""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+MANIFEST_NAME = "manifest.json"
+
+
+def extract_pdf_text(path: str) -> str:
+    """Texto de todas as páginas do PDF, na ordem. Executado nos processos de extração."""
+    with fitz.open(path) as doc:
+        return "".join(page.get_text() for page in doc)
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def folder_signature(folder: Union[str, Path]) -> tuple[tuple[str, int, int], ...]:
+    """(nome, mtime_ns, tamanho) de cada PDF da pasta; muda quando um arquivo é criado, alterado ou removido."""
+    signature = []
+    for path in Path(folder).glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+
+class PdfTextExtractor:
+    """
+    Extrai o texto dos PDFs de uma pasta reaproveitando o resultado das execuções anteriores.
+
+    O texto de cada arquivo é gravado em `cache_dir` com o hash do conteúdo como nome. Um manifesto
+    guarda o hash de cada arquivo junto do mtime e do tamanho, então arquivos não alterados nem
+    chegam a ser lidos. Apenas os arquivos novos ou alterados são extraídos, em paralelo em até
+    `max_workers` processos (ou no próprio processo, quando há um único arquivo a extrair).
+
+    :param cache_dir: Pasta do cache; com None, todos os arquivos são extraídos a cada carga.
+    :param max_workers: Processos de extração; com 1, a extração é sequencial no próprio processo.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_workers: Optional[int] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+
+    def _read_manifest(self) -> dict[str, list]:
+        if self.cache_dir is None:
+            return {}
+        try:
+            return json.loads((self.cache_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning("Manifesto do cache de PDFs em %s inválido; será recriado", self.cache_dir)
+            return {}
+
+    def _write_atomic(self, path: Path, content: str) -> None:
+        temporary = path.with_name(f"{path.name}.tmp")
+        temporary.write_text(content, encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _store(self, manifest: dict[str, list], texts: dict[str, str]) -> None:
+        """Grava os textos extraídos e o manifesto, e remove os textos que nenhum arquivo usa mais."""
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for digest, text in texts.items():
+                self._write_atomic(self.cache_dir / f"{digest}.txt", text)
+            self._write_atomic(self.cache_dir / MANIFEST_NAME, json.dumps(manifest))
+            in_use = {f"{entry[2]}.txt" for entry in manifest.values()}
+            for cached in self.cache_dir.glob("*.txt"):
+                if cached.name not in in_use:
+                    cached.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache de PDFs em %s: %s", self.cache_dir, e)
+
+    def _cached_text(self, digest: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        try:
+            return (self.cache_dir / f"{digest}.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _extract_many(self, paths: list[Path]) -> dict[Path, Optional[str]]:
+        """Extrai os arquivos, em paralelo quando há mais de um; None para os que falharem."""
+        if len(paths) > 1 and self.max_workers > 1:
+            try:
+                workers = min(self.max_workers, len(paths))
+                # spawn: o processo da API tem threads (event loop, logs), o que torna o fork inseguro
+                with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    futures = {path: pool.submit(extract_pdf_text, str(path)) for path in paths}
+                    return {path: self._result(path, future.result) for path, future in futures.items()}
+            except Exception:
+                logger.warning("Falha no pool de extração de PDFs; extraindo sequencialmente", exc_info=True)
+        return {path: self._result(path, partial(extract_pdf_text, str(path))) for path in paths}
+
+    @staticmethod
+    def _result(path: Path, extract: Callable[[], str]) -> Optional[str]:
+        try:
+            return extract()
+        except Exception as e:
+            logger.error("Erro ao processar PDF %s: %s", path.name, e)
+            return None
+
+    def load_folder(self, folder: Union[str, Path]) -> dict[str, str]:
+        """Nome do arquivo -> texto, para cada PDF da pasta que pôde ser lido, em ordem alfabética."""
+        manifest = self._read_manifest()
+        new_manifest: dict[str, list] = {}
+        texts: dict[str, str] = {}
+        pending: dict[Path, list] = {}
+        for path in sorted(Path(folder).glob("*.pdf")):
+            try:
+                stat = path.stat()
+                entry = manifest.get(path.name)
+                if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                    entry = [stat.st_mtime_ns, stat.st_size, file_digest(path)]
+            except OSError as e:
+                logger.error("Erro ao processar PDF %s: %s", path.name, e)
+                continue
+            text = self._cached_text(entry[2])
+            if text is None:
+                pending[path] = entry
+            else:
+                texts[path.name] = text
+                new_manifest[path.name] = entry
+
+        extracted: dict[str, str] = {}
+        for path, text in self._extract_many(list(pending)).items():
+            if text is None:
+                continue
+            entry = pending[path]
+            texts[path.name] = extracted[entry[2]] = text
+            new_manifest[path.name] = entry
+
+        if extracted or new_manifest != manifest:
+            self._store(new_manifest, extracted)
+        extracted_files = sum(1 for path in pending if path.name in new_manifest)
+        logger.info("PDFs carregados: %d do cache, %d extraídos.", len(texts) - extracted_files, extracted_files)
+        return dict(sorted(texts.items()))
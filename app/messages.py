@@ -24,6 +24,8 @@ MSG_SELLER_ID_JA_CADASTRADO = "O seller_id informado já está cadastrado. Escol
 MSG_NOME_FANTASIA_JA_CADASTRADO = "O nome_fantasia informado já está cadastrado. Escolha outro."
 MSG_SELLER_NAO_ENCONTRADO = "Seller com ID '{entity_id}' não encontrado."
 MSG_SELLER_CNPJ_NAO_ENCONTRADO = "Nenhum Seller com CNPJ '{cnpj}' encontrado."
+MSG_ORDENACAO_SEM_INDICE = "A ordenação '{sort}' não é suportada com os filtros informados."
+MSG_LOOKUP_SEM_CHAVES = "Informe ao menos um seller_id ou cnpj para a busca em lote."
 
 # Mensagens de sucesso
 MSG_SELLER_CRIADO = "Seller criado com sucesso."
@@ -1,6 +1,7 @@
 from .base import AuditModel, PersistableEntity, UuidModel, UuidType
 from .query_model import QueryModel
 from .seller_model import Seller
+from .seller_query_model import SellerQuery
 from .gemini_model import ChatMessage
 
 __all__ = [
@@ -9,6 +10,7 @@ __all__ = [
     "UuidModel", 
     "UuidType", 
     "Seller", 
+    "SellerQuery",
     "QueryModel",
     "ChatMessage"
 ]
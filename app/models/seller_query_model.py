@@ -0,0 +1,29 @@
+import re
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from .enums import BrazilianState, ProductCategory, SellerStatus
+from .query_model import QueryModel
+
+
+class SellerQuery(QueryModel):
+    """
+    Filtros aceitos na listagem de sellers.
+
+    `cnpj` é tratado como prefixo (regex ancorada), o que permite o uso do índice.
+    """
+
+    status: Optional[SellerStatus] = Field(None, description="Status do seller")
+    product_categories: Optional[ProductCategory] = Field(None, description="Categoria de produto atendida")
+    legal_rep_rg_state: Optional[BrazilianState] = Field(None, description="Estado emissor do RG do representante")
+    created_at__ge: Optional[datetime] = Field(None, description="Criados a partir de (inclusive)")
+    created_at__le: Optional[datetime] = Field(None, description="Criados até (inclusive)")
+    cnpj: Optional[str] = Field(None, min_length=1, max_length=14, pattern=r"^\d+$", description="Prefixo do CNPJ")
+
+    def to_query_dict(self):
+        query_dict = super().to_query_dict()
+        if (cnpj_prefix := query_dict.pop("cnpj", None)) is not None:
+            query_dict["cnpj"] = cnpj_prefix if len(cnpj_prefix) == 14 else {"$regex": f"^{re.escape(cnpj_prefix)}"}
+        return query_dict
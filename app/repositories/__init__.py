@@ -1,4 +1,5 @@
 from .base import AsyncCrudRepository
 from .seller_repository import SellerRepository
+from .seller_stats_repository import SellerStatsRepository
 
-__all__ = ["SellerRepository", "AsyncCrudRepository"]
+__all__ = ["SellerRepository", "SellerStatsRepository", "AsyncCrudRepository"]
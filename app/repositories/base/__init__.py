@@ -1,4 +1,16 @@
 from .async_crud_repository import AsyncCrudRepository
+from .data_loader import DataLoader
 from .memory_repository import AsyncMemoryRepository
+from .negative_cache import NegativeCache
+from .query_planner import QueryPlan, QueryPlanner
+from .single_flight import SingleFlight
 
-__all__ = ["AsyncMemoryRepository", "AsyncCrudRepository"]
+__all__ = [
+    "AsyncMemoryRepository",
+    "AsyncCrudRepository",
+    "DataLoader",
+    "NegativeCache",
+    "QueryPlan",
+    "QueryPlanner",
+    "SingleFlight",
+]
@@ -0,0 +1,102 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from app.common.server_timing import isolated_timings, merge_timings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchLoadFn = Callable[[list[K]], Awaitable[dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Agrupa chamadas `load` emitidas no mesmo tick do event loop (ou dentro de uma
+    janela curta) em uma única chamada da função de carga em lote.
+
+    Chamadas para uma chave cujo lote já foi despachado e ainda não terminou aguardam
+    o mesmo resultado (single-flight), em vez de abrir um novo lote.
+
+    Não há cache entre lotes: terminada a consulta, a chave é consultada novamente no próximo
+    lote, então a instância pode ser compartilhada entre requisições sem servir dados antigos.
+
+    Os tempos do `Server-Timing` registrados pelo lote são somados a cada requisição que aguardou
+    por ele, e não só à que o disparou.
+
+    :param batch_load_fn: Função assíncrona que recebe a lista de chaves e retorna um dict chave -> valor.
+    :param max_batch_size: Quantidade máxima de chaves por lote; ao atingir o limite o lote é despachado.
+    :param batch_window_ms: Janela de espera em milissegundos. Com 0 o lote é despachado no próximo tick.
+    """
+
+    def __init__(self, batch_load_fn: BatchLoadFn, max_batch_size: int = 100, batch_window_ms: float = 0):
+        self._batch_load_fn = batch_load_fn
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000
+        # Cada chave aponta para o future do lote e para os tempos registrados por ele
+        self._pending: dict[K, tuple[asyncio.Future, dict[str, float]]] = {}
+        self._pending_timings: dict[str, float] = {}
+        self._inflight: dict[K, tuple[asyncio.Future, dict[str, float]]] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        # O event loop guarda só referências fracas às tasks; sem esta, um lote pode ser coletado no meio
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        entry = self._inflight.get(key) or self._pending.get(key)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            entry = self._pending[key] = (loop.create_future(), self._pending_timings)
+
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self.batch_window > 0:
+                    self._handle = loop.call_later(self.batch_window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+
+        future, timings = entry
+        try:
+            # O cancelamento de quem espera não pode cancelar o resultado compartilhado com as demais chamadas
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                merge_timings(timings)
+
+    async def load_many(self, keys: Iterable[K]) -> list[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        batch, self._pending = self._pending, {}
+        timings, self._pending_timings = self._pending_timings, {}
+        if batch:
+            self._inflight.update(batch)
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch), context=isolated_timings(timings))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: dict[K, tuple[asyncio.Future, dict[str, float]]]) -> None:
+        try:
+            results = await self._batch_load_fn(list(batch))
+        except Exception as exc:
+            for key, entry in batch.items():
+                self._finish(key, entry)
+                future = entry[0]
+                if not future.done():
+                    future.set_exception(exc)
+                    # Evita o aviso de exceção não recuperada quando todos os interessados foram cancelados
+                    future.add_done_callback(lambda done: done.exception())
+            return
+
+        for key, entry in batch.items():
+            self._finish(key, entry)
+            future = entry[0]
+            if not future.done():
+                future.set_result(results.get(key))
+
+    def _finish(self, key: K, entry: tuple[asyncio.Future, dict[str, float]]) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
@@ -6,6 +6,7 @@ from enum import Enum
 from pydantic import BaseModel
 
 from app.common.datetime import utcnow
+from app.common.server_timing import timed_async
 from app.integrations.database.mongo_client import MongoClient
 from app.models.query_model import QueryModel
 
@@ -49,6 +50,14 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
         self.collection = database[collection_name]
         self.model_class = model_class
 
+    def _prepare_document(self, document: dict) -> dict:
+        """
+        Ponto de extensão para campos derivados mantidos na escrita (create, update e patch).
+        Recebe o documento (ou os campos alterados) já convertido para o MongoDB.
+        """
+        return document
+
+    @timed_async("mongo")
     async def create(self, entity: T) -> T:
         now = utcnow()
         entity_dict = entity.model_dump(by_alias=True)
@@ -60,17 +69,19 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
         entity_dict.setdefault("audit_updated_at", now)
         
         # Converte tipos não serializáveis pelo MongoDB
-        entity_dict = convert_for_mongo(entity_dict)
+        entity_dict = self._prepare_document(convert_for_mongo(entity_dict))
         
         await self.collection.insert_one(entity_dict)
         return self.model_class(**entity_dict)
 
+    @timed_async("mongo")
     async def find_by_id(self, seller_id: Any) -> Optional[T]:
         result = await self.collection.find_one({"seller_id": str(seller_id)})
         if result:
             return self.model_class(**result)
         return None
 
+    @timed_async("mongo")
     async def find(self, filters: dict, limit: int = 10, offset: int = 0, sort: Optional[dict] = None) -> List[T]:
         cursor = self.collection.find(filters)
         if sort:
@@ -81,10 +92,11 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
             results.append(self.model_class(**doc))
         return results
 
+    @timed_async("mongo")
     async def update(self, seller_id: str, entity: Any) -> Optional[T]:
         # PUT: substitui todos os campos (menos _id)
         entity_dict = entity.model_dump(by_alias=True, exclude={"identity"})
-        entity_dict = convert_for_mongo(entity_dict)
+        entity_dict = self._prepare_document(convert_for_mongo(entity_dict))
         result = await self.collection.find_one_and_update(
             {"seller_id": str(seller_id)}, {"$set": entity_dict}, return_document=True
         )
@@ -92,13 +104,15 @@ class AsyncMemoryRepository(AsyncCrudRepository[T], Generic[T]):
             return self.model_class(**result)
         return None
 
+    @timed_async("mongo")
     async def delete_by_id(self, seller_id: str) -> bool:
         result = await self.collection.delete_one({"seller_id": str(seller_id)})
         return result.deleted_count > 0
 
+    @timed_async("mongo")
     async def patch(self, seller_id: str, update_fields: dict) -> Optional[T]:
         # PATCH: atualiza só os campos enviados
-        update_fields = convert_for_mongo(update_fields)
+        update_fields = self._prepare_document(convert_for_mongo(update_fields))
         result = await self.collection.find_one_and_update(
             {"seller_id": str(seller_id)}, {"$set": update_fields}, return_document=True
         )
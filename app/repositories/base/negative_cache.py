@@ -0,0 +1,42 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class NegativeCache(Generic[K]):
+    """
+    Memoriza por pouco tempo chaves confirmadamente inexistentes, evitando repetir consultas caras.
+
+    :param ttl_seconds: Tempo em segundos que uma ausência permanece válida. Com 0 o cache fica desativado.
+    :param max_size: Quantidade máxima de chaves; ao exceder, as mais antigas são descartadas.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_size: int = 10_000):
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self._expires_at: OrderedDict[K, float] = OrderedDict()
+
+    def __contains__(self, key: K) -> bool:
+        expires_at = self._expires_at.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._expires_at[key]
+            return False
+        return True
+
+    def add(self, key: K) -> None:
+        if self.ttl <= 0:
+            return
+        self._expires_at[key] = time.monotonic() + self.ttl
+        self._expires_at.move_to_end(key)
+        while len(self._expires_at) > self.max_size:
+            self._expires_at.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        self._expires_at.pop(key, None)
+
+    def clear(self) -> None:
+        self._expires_at.clear()
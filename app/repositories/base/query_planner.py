@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+IndexKey = tuple[str, int]
+IndexSpec = tuple[IndexKey, ...]
+
+_EQUALITY_OPERATORS = {"$eq"}
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """
+    Resultado da análise de uma consulta contra os índices conhecidos.
+
+    :param index: Índice que melhor atende a consulta (None quando nenhum índice é utilizável).
+    :param sort_indexed: A ordenação pode ser atendida pelo índice, sem SORT em memória.
+    :param unindexed_filters: Campos filtrados que não restringem a varredura do índice escolhido.
+    """
+
+    index: Optional[IndexSpec]
+    sort_indexed: bool
+    unindexed_filters: frozenset[str]
+
+    @property
+    def is_collection_scan(self) -> bool:
+        return self.index is None
+
+
+def _is_equality(value) -> bool:
+    return not isinstance(value, dict) or set(value) <= _EQUALITY_OPERATORS
+
+
+class QueryPlanner:
+    """
+    Planejador simplificado que segue a regra ESR (Equality, Sort, Range) do MongoDB
+    para decidir se um filtro e uma ordenação podem ser atendidos por algum índice.
+    """
+
+    def __init__(self, indexes: Sequence[Sequence[IndexKey]]):
+        self.indexes: tuple[IndexSpec, ...] = tuple(tuple(index) for index in indexes)
+
+    def plan(self, filters: dict, sort: Optional[dict[str, int]] = None) -> QueryPlan:
+        equality = {field for field, value in filters.items() if _is_equality(value)}
+        ranges = set(filters) - equality
+        # Campos filtrados por igualdade são constantes no resultado e não afetam a ordenação
+        sort_keys = [(field, order) for field, order in (sort or {}).items() if field not in equality]
+
+        best: Optional[tuple[tuple[bool, int], IndexSpec, frozenset[str]]] = None
+        for index in self.indexes:
+            prefix = 0
+            while prefix < len(index) and index[prefix][0] in equality:
+                prefix += 1
+
+            sort_indexed = self._supports_sort(index[prefix:], sort_keys)
+            bounded = {field for field, _ in index[:prefix]} | {field for field, _ in index if field in ranges}
+            if not bounded and not (sort_keys and sort_indexed):
+                continue
+
+            score = (sort_indexed, len(bounded))
+            if best is None or score > best[0]:
+                best = (score, index, frozenset(filters) - bounded)
+
+        if best is None:
+            return QueryPlan(index=None, sort_indexed=not sort_keys, unindexed_filters=frozenset(filters))
+
+        (sort_indexed, _), index, unindexed = best
+        return QueryPlan(index=index, sort_indexed=sort_indexed or not sort_keys, unindexed_filters=unindexed)
+
+    @staticmethod
+    def _supports_sort(index_suffix: Sequence[IndexKey], sort_keys: list[IndexKey]) -> bool:
+        if not sort_keys:
+            return True
+        if len(index_suffix) < len(sort_keys):
+            return False
+
+        directions = set()
+        for (index_field, index_order), (sort_field, sort_order) in zip(index_suffix, sort_keys):
+            if index_field != sort_field:
+                return False
+            directions.add(index_order == sort_order)
+        # Índices podem ser percorridos em ordem inversa, desde que todas as chaves invertam juntas
+        return len(directions) == 1
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Callable, Coroutine, Generic, Hashable, TypeVar
+
+from app.common.server_timing import isolated_timings, merge_timings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Compartilha uma única execução entre chamadas concorrentes com a mesma chave: enquanto a
+    primeira está em andamento, as demais aguardam o mesmo resultado (ou a mesma exceção).
+    Nada é guardado depois que a execução termina. Os tempos do `Server-Timing` registrados pela
+    execução são somados a cada chamada que a aguardou.
+    """
+
+    def __init__(self):
+        self._inflight: dict[K, tuple[asyncio.Future, dict[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: K, fn: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        entry = self._inflight.get(key)
+        if entry is None:
+            timings: dict[str, float] = {}
+            task = asyncio.get_running_loop().create_task(fn(), context=isolated_timings(timings))
+            entry = self._inflight[key] = (task, timings)
+            task.add_done_callback(lambda done: self._finish(key, done))
+        future, timings = entry
+        try:
+            # O cancelamento de quem espera não pode cancelar a execução compartilhada com as demais chamadas
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                merge_timings(timings)
+
+    def _finish(self, key: K, future: asyncio.Future) -> None:
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Evita o aviso de exceção não recuperada quando todos os interessados foram cancelados
+            future.exception()
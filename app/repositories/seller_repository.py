@@ -1,18 +1,184 @@
-from typing import Optional
+import asyncio
+import re
+from typing import Any, Iterable, Optional
 
+from app.common.server_timing import timed_async
+from app.common.text_normalization import build_search_keys, normalize_text
+from app.integrations.archive.segment_archive import SegmentArchive
 from app.integrations.database.mongo_client import MongoClient
 
 from ..models import Seller
-from .base import AsyncMemoryRepository
+from ..models.enums import SellerStatus
+from .base import AsyncMemoryRepository, DataLoader, NegativeCache, QueryPlan, QueryPlanner, SingleFlight
+
+ASC = 1
+DESC = -1
 
 
 class SellerRepository(AsyncMemoryRepository[Seller]):
 
     COLLECTION_NAME = "sellers"
 
-    def __init__(self, client: "MongoClient", db_name: str):
+    # Espelha os índices criados pelas migrations em `migrations/`
+    INDEXES = (
+        (("seller_id", ASC),),
+        (("trade_name", ASC),),
+        (("cnpj", ASC),),
+        (("status", ASC), ("created_at", DESC)),
+        (("status", ASC), ("product_categories", ASC), ("created_at", DESC)),
+        (("status", ASC), ("legal_rep_rg_state", ASC), ("created_at", DESC)),
+        (("status", ASC), ("cnpj", ASC)),
+        (("status", ASC), ("trade_name", ASC)),
+        (("status", ASC), ("trade_name_search", ASC)),
+        (("status", ASC), ("company_name_search", ASC)),
+    )
+
+    # Campo de origem -> campo derivado com as chaves normalizadas para busca por prefixo
+    SEARCH_FIELDS = {"trade_name": "trade_name_search", "company_name": "company_name_search"}
+    SEARCH_PROJECTION = {"_id": 0, "seller_id": 1, "trade_name": 1, "company_name": 1}
+    # Campos suficientes para calcular o ETag e validar o acesso sem carregar o documento inteiro
+    VERSION_PROJECTION = {"_id": 0, "seller_id": 1, "cnpj": 1, "status": 1, "created_at": 1, "updated_at": 1}
+
+    query_planner = QueryPlanner(INDEXES)
+
+    def __init__(
+        self,
+        client: "MongoClient",
+        db_name: str,
+        batch_window_ms: float = 0,
+        max_batch_size: int = 100,
+        cold_client: Optional["MongoClient"] = None,
+        cold_db_name: Optional[str] = None,
+        negative_cache_ttl_seconds: float = 30,
+        segment_archive: Optional[SegmentArchive] = None,
+    ):
         super().__init__(client=client, db_name=db_name, collection_name=self.COLLECTION_NAME, model_class=Seller)
+        # Banco frio com os sellers arquivados; consultado apenas em leituras com `include_archived`
+        self.cold_collection = (
+            cold_client.get_database(cold_db_name)[self.COLLECTION_NAME] if cold_client and cold_db_name else None
+        )
+        self.segment_archive = segment_archive
+        self._archived_misses: NegativeCache[tuple[str, str]] = NegativeCache(ttl_seconds=negative_cache_ttl_seconds)
+        self._id_loader: DataLoader[str, dict] = DataLoader(
+            self._load_by_ids, max_batch_size=max_batch_size, batch_window_ms=batch_window_ms
+        )
+        self._cnpj_loader: DataLoader[str, dict] = DataLoader(
+            self._load_by_cnpjs, max_batch_size=max_batch_size, batch_window_ms=batch_window_ms
+        )
+        # Consultas pontuais idênticas e simultâneas (versão e banco frio) compartilham a mesma ida ao banco
+        self._single_flight: SingleFlight[tuple[str, str, str], Optional[dict]] = SingleFlight()
+
+    def plan(self, filters: dict, sort: Optional[dict] = None) -> QueryPlan:
+        """Avalia se o filtro e a ordenação são atendidos pelos índices da coleção."""
+        return self.query_planner.plan(filters, sort)
+
+    def _prepare_document(self, document: dict) -> dict:
+        for source_field, search_field in self.SEARCH_FIELDS.items():
+            if source_field in document:
+                document[search_field] = build_search_keys(document[source_field])
+        return document
+
+    @timed_async("mongo")
+    async def search(self, text: str, limit: int = 10, status: SellerStatus = SellerStatus.ACTIVE) -> list[dict]:
+        """
+        Busca por prefixo (sem acentos e sem diferenciar maiúsculas) em trade_name e company_name.
+        Retorna apenas os campos de `SEARCH_PROJECTION`, com os resultados de trade_name primeiro.
+        """
+        prefix = normalize_text(text)
+        if not prefix:
+            return []
+
+        condition = {"$regex": f"^{re.escape(prefix)}"}
+        batches = await asyncio.gather(
+            *(
+                self.collection.find({"status": status, search_field: condition}, self.SEARCH_PROJECTION)
+                .limit(limit)
+                .to_list(length=limit)
+                for search_field in self.SEARCH_FIELDS.values()
+            )
+        )
+
+        matches: dict[str, tuple[tuple[int, str], dict]] = {}
+        for field_rank, (source_field, docs) in enumerate(zip(self.SEARCH_FIELDS, batches)):
+            for doc in docs:
+                normalized = normalize_text(doc.get(source_field))
+                # Prefixo do nome completo vale mais que prefixo de uma palavra no meio do nome
+                rank = (field_rank * 2 + (0 if normalized.startswith(prefix) else 1), normalized)
+                current = matches.get(doc["seller_id"])
+                if current is None or rank < current[0]:
+                    matches[doc["seller_id"]] = (rank, doc)
+
+        return [doc for _, doc in sorted(matches.values(), key=lambda match: match[0])][:limit]
+
+    @timed_async("mongo")
+    async def _load_by_field(self, field: str, values: list[str]) -> dict[str, dict]:
+        """Carrega um lote de documentos por `field`, usando `$in` quando há mais de uma chave."""
+        if len(values) == 1:
+            doc = await self.collection.find_one({field: values[0]})
+            return {values[0]: doc} if doc else {}
+
+        docs: dict[str, dict] = {}
+        async for doc in self.collection.find({field: {"$in": values}}):
+            docs.setdefault(doc[field], doc)
+        return docs
 
+    async def _load_by_ids(self, seller_ids: list[str]) -> dict[str, dict]:
+        return await self._load_by_field("seller_id", seller_ids)
+
+    async def _load_by_cnpjs(self, cnpjs: list[str]) -> dict[str, dict]:
+        return await self._load_by_field("cnpj", cnpjs)
+
+    async def _find_archived(self, field: str, value: str) -> Optional[dict]:
+        """
+        Consulta o arquivo de segmentos e o banco frio, memorizando por alguns segundos as chaves
+        que também não existem lá.
+        """
+        if (field, value) in self._archived_misses:
+            return None
+        return await self._single_flight.do(("archived", field, value), lambda: self._load_archived(field, value))
+
+    @timed_async("mongo")
+    async def _load_archived(self, field: str, value: str) -> Optional[dict]:
+        doc = None
+        if self.segment_archive is not None:
+            doc = await asyncio.to_thread(self.segment_archive.find, field, value)
+        if doc is None and self.cold_collection is not None:
+            doc = await self.cold_collection.find_one({field: value})
+        if doc is None:
+            self._archived_misses.add((field, value))
+        return doc
+
+    async def find_version(self, field: str, value: str) -> Optional[dict]:
+        """
+        Retorna apenas os campos de `VERSION_PROJECTION` do seller no banco quente. Chamadas
+        simultâneas para a mesma chave compartilham a consulta; cada uma recebe a sua cópia.
+        """
+        version = await self._single_flight.do(("version", field, value), lambda: self._load_version(field, value))
+        return dict(version) if version else version
+
+    @timed_async("mongo")
+    async def _load_version(self, field: str, value: str) -> Optional[dict]:
+        return await self.collection.find_one({field: value}, self.VERSION_PROJECTION)
+
+    async def find_by_id(self, seller_id: Any, include_archived: bool = False) -> Optional[Seller]:
+        """
+        Busca seller por seller_id. Chamadas concorrentes, inclusive as que chegam com a consulta da
+        mesma chave em andamento, são atendidas por uma única consulta; cada uma recebe o seu modelo.
+        Com `include_archived`, o banco frio é consultado apenas quando o seller não está no banco quente.
+        """
+        doc = await self._id_loader.load(str(seller_id))
+        if not doc and include_archived:
+            doc = await self._find_archived("seller_id", str(seller_id))
+        if doc:
+            return self.model_class(**doc)
+        return None
+
+    async def find_many_by_ids(self, seller_ids: Iterable[str]) -> list[Seller]:
+        """Busca vários sellers por seller_id em uma única consulta. Ids inexistentes são ignorados."""
+        docs = await self._id_loader.load_many(dict.fromkeys(str(seller_id) for seller_id in seller_ids))
+        return [self.model_class(**doc) for doc in docs if doc]
+
+    @timed_async("mongo")
     async def find_by_nome_fantasia(self, nome_fantasia: str) -> Optional[Seller]:
         """Método legado - mantido para compatibilidade"""
         result = await self.collection.find_one({"nome_fantasia": nome_fantasia})
@@ -20,6 +186,7 @@ class SellerRepository(AsyncMemoryRepository[Seller]):
             return self.model_class(**result)
         return None
 
+    @timed_async("mongo")
     async def find_by_trade_name(self, trade_name: str) -> Optional[Seller]:
         """Busca seller por trade_name (nome fantasia)"""
         result = await self.collection.find_one({"trade_name": trade_name})
@@ -27,11 +194,23 @@ class SellerRepository(AsyncMemoryRepository[Seller]):
             return self.model_class(**result)
         return None
 
-    async def find_by_cnpj(self, cnpj: str) -> Optional[Seller]:
-        result = await self.collection.find_one({"cnpj": cnpj})
-        if result:
-            return self.model_class(**result)
+    async def find_by_cnpj(self, cnpj: str, include_archived: bool = False) -> Optional[Seller]:
+        """
+        Busca seller por CNPJ. Chamadas concorrentes, inclusive as que chegam com a consulta da
+        mesma chave em andamento, são atendidas por uma única consulta; cada uma recebe o seu modelo.
+        Com `include_archived`, o banco frio é consultado apenas quando o seller não está no banco quente.
+        """
+        doc = await self._cnpj_loader.load(cnpj)
+        if not doc and include_archived:
+            doc = await self._find_archived("cnpj", cnpj)
+        if doc:
+            return self.model_class(**doc)
         return None
 
+    async def find_many_by_cnpjs(self, cnpjs: Iterable[str]) -> list[Seller]:
+        """Busca vários sellers por CNPJ em uma única consulta. CNPJs inexistentes são ignorados."""
+        docs = await self._cnpj_loader.load_many(dict.fromkeys(cnpjs))
+        return [self.model_class(**doc) for doc in docs if doc]
+
 
 __all__ = ["SellerRepository"]
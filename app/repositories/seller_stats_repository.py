@@ -0,0 +1,100 @@
+from collections import Counter
+from typing import Optional
+
+from app.common.datetime import utcnow
+from app.common.server_timing import timed_async
+from app.integrations.database.mongo_client import MongoClient
+
+from ..models import Seller
+
+STATS_DOCUMENT_ID = "sellers"
+
+
+class SellerStatsRepository:
+    """
+    Mantém o documento materializado `seller_stats` com a contagem de sellers por faceta.
+
+    Os contadores são atualizados incrementalmente (`$inc`) a cada escrita e recalculados
+    periodicamente com uma agregação `$facet` sobre a coleção de sellers para corrigir desvios.
+    """
+
+    COLLECTION_NAME = "seller_stats"
+    SELLERS_COLLECTION_NAME = "sellers"
+
+    # Campo do seller -> contador no documento de estatísticas
+    FACETS = {
+        "status": "by_status",
+        "product_categories": "by_product_categories",
+        "legal_rep_rg_state": "by_legal_rep_rg_state",
+        "account_type": "by_account_type",
+    }
+    MULTIVALUED_FACETS = {"product_categories"}
+
+    def __init__(self, client: MongoClient, db_name: str):
+        database = client.get_database(db_name)
+        self.collection = database[self.COLLECTION_NAME]
+        self.sellers_collection = database[self.SELLERS_COLLECTION_NAME]
+
+    @classmethod
+    def _facet_values(cls, seller: Optional[Seller]) -> Counter:
+        counts: Counter = Counter()
+        if seller is None:
+            return counts
+        counts["total"] += 1
+        for field, counter_name in cls.FACETS.items():
+            value = getattr(seller, field)
+            values = value if field in cls.MULTIVALUED_FACETS else [value]
+            for item in set(values):
+                counts[f"{counter_name}.{getattr(item, 'value', item)}"] += 1
+        return counts
+
+    @timed_async("mongo")
+    async def apply_change(self, before: Optional[Seller], after: Optional[Seller]) -> None:
+        """
+        Aplica a diferença entre o estado anterior e o novo de um seller.
+        Use `before=None` para criação e `after=None` para remoção física.
+        """
+        delta = self._facet_values(after)
+        delta.subtract(self._facet_values(before))
+        increments = {counter: amount for counter, amount in delta.items() if amount}
+        if not increments:
+            return
+        await self.collection.update_one(
+            {"_id": STATS_DOCUMENT_ID},
+            {"$inc": increments, "$set": {"updated_at": utcnow()}},
+            upsert=True,
+        )
+
+    @timed_async("mongo")
+    async def get(self) -> Optional[dict]:
+        return await self.collection.find_one({"_id": STATS_DOCUMENT_ID})
+
+    @timed_async("mongo")
+    async def reconcile(self) -> dict:
+        """Recalcula todas as facetas a partir da coleção de sellers e substitui o documento."""
+        pipeline_facets: dict[str, list] = {"total": [{"$count": "count"}]}
+        for field, counter_name in self.FACETS.items():
+            stages: list[dict] = [{"$unwind": f"${field}"}] if field in self.MULTIVALUED_FACETS else []
+            stages.append({"$group": {"_id": f"${field}", "count": {"$sum": 1}}})
+            pipeline_facets[counter_name] = stages
+
+        result = await self.sellers_collection.aggregate([{"$facet": pipeline_facets}]).to_list(length=1)
+        facets = result[0] if result else {}
+
+        now = utcnow()
+        stats: dict = {
+            "_id": STATS_DOCUMENT_ID,
+            "total": facets["total"][0]["count"] if facets.get("total") else 0,
+            "updated_at": now,
+            "reconciled_at": now,
+        }
+        for counter_name in self.FACETS.values():
+            stats[counter_name] = {
+                str(group["_id"]): group["count"] for group in facets.get(counter_name, []) if group["_id"] is not None
+            }
+
+        await self.collection.replace_one({"_id": STATS_DOCUMENT_ID}, stats, upsert=True)
+        return stats
+
+
+__all__ = ["SellerStatsRepository"]
@@ -1,18 +1,41 @@
-import smtplib
 import os
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from app.integrations.email.smtp_session_pool import SmtpSessionPool
+
+
+def _env_number(name: str, convert):
+    value = os.getenv(name)
+    return convert(value) if value else None
 
 
 class EmailService:
-    def __init__(self):
+    def __init__(self, smtp_pool: Optional[SmtpSessionPool] = None):
         self.logger = logging.getLogger(__name__)
         self.server = os.getenv("SMTP_SERVER")
         self.port = os.getenv("SMTP_PORT")
         self.sender_email = os.getenv("SENDER_EMAIL")
         self.password = os.getenv("SENDER_PASSWORD")
+        # Conexões autenticadas reaproveitadas entre os envios (STARTTLS e login uma vez por conexão)
+        self.smtp_pool = smtp_pool or SmtpSessionPool(
+            self.server,
+            self.port,
+            username=self.sender_email,
+            password=self.password,
+            starttls=os.getenv("SMTP_STARTTLS", "true").lower() != "false",
+            max_size=_env_number("SMTP_POOL_SIZE", int),
+            max_idle_seconds=_env_number("SMTP_POOL_MAX_IDLE_SECONDS", float),
+            timeout=_env_number("SMTP_TIMEOUT", float),
+        )
+
+    def close(self):
+        """
+        Encerra as conexões SMTP abertas
+        """
+        self.smtp_pool.close()
 
     def send_welcome_email(self, seller_data: Dict):
         """
@@ -43,10 +66,7 @@ class EmailService:
             message.attach(MIMEText(body, 'html'))
 
             # Enviar email
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.password)
-                server.sendmail(self.sender_email, contact_email, message.as_string())
+            self.smtp_pool.sendmail(self.sender_email, contact_email, message.as_string())
 
             self.logger.info(f"Email de boas-vindas enviado com sucesso para {contact_email}")
             return True
@@ -1,23 +1,116 @@
+import asyncio
+import contextlib
+import hashlib
 import logging
 import os
+import re
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
-import fitz  # PyMuPDF
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from app.common.text_normalization import normalize_text
+from app.integrations.kv_db.generation_cache import GenerationCache
+from app.integrations.llm.fake_chat_model import FakeChatModel
+from app.integrations.llm.prompt_budget import PromptBudget
+from app.integrations.retrieval.document_index import Chunk, DocumentIndex, chunk_text
+from app.integrations.retrieval.pdf_text import PdfTextExtractor, folder_signature
+from app.services.text_cleaner_service import TextCleanerService
+
+if TYPE_CHECKING:
+    from app.integrations.kv_db.chat_history_store import ChatHistoryStore
+
 logger = logging.getLogger(__name__)
 
+CHAT_BACKEND_GEMINI = "gemini"
+CHAT_BACKEND_FAKE = "fake"
+GEMINI_MODEL = "gemini-1.5-flash"
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RETRIEVAL_TOP_K = 4
+DEFAULT_CHUNK_WORDS = 180
+DOCUMENT_HEADER = "\n\n--- Conteúdo do arquivo {name} ---\n\n"
+DOCUMENT_HEADER_PATTERN = re.compile(r"\n\n--- Conteúdo do arquivo (.+?) ---\n\n")
+MSG_SEM_CONTEXTO = "Nenhum trecho dos documentos é relevante para esta pergunta."
+MSG_SEM_RESPOSTA = "Desculpe, não consegui gerar uma resposta."
+MSG_ERRO_CHAT = "Desculpe, ocorreu um erro ao processar sua mensagem."
+SYSTEM_PROMPT = """Você é um assistente amigável chamado falaSeller, especialista em informações
+        do Seller.
+        Você possui acesso EXCLUSIVO às seguintes informações vindas de documentos PDF e APENAS esses PDFs:
+
+        ####
+        {context}
+        ####
+
+        Utilize AS INFORMAÇÕES FORNECIDAS ACIMA para basear as suas respostas.  NÃO invente informações ou
+        use conhecimento externo.
+        Se a resposta não estiver explicitamente nos documentos, diga que você não sabe.
+
+        Sempre que houver $ na sua saída, substita por S.!"""
+
 
 class GeminiService:
     """Serviço principal para chat com IA Gemini - mantém funcionalidade original."""
     
-    def __init__(self, api_key: str, pdfs_folder_path: str = "pdfs"):
+    def __init__(
+        self,
+        api_key: str,
+        pdfs_folder_path: str = "pdfs",
+        max_concurrency: Optional[int] = None,
+        retrieval_top_k: Optional[int] = None,
+        chunk_words: Optional[int] = None,
+        hybrid_weight: Optional[float] = None,
+        index_path: Optional[str] = None,
+        history_store: Optional["ChatHistoryStore"] = None,
+        answer_cache: Optional[GenerationCache] = None,
+        pdf_workers: Optional[int] = None,
+        pdf_cache_dir: Optional[str] = None,
+        chat_backend: Optional[str] = None,
+        fake_llm_config: Optional[dict] = None,
+        prompt_max_tokens: Optional[int] = None,
+        prompt_context_share: Optional[float] = None,
+        prompt_message_max_tokens: Optional[int] = None,
+    ):
+        """
+        :param retrieval_top_k: Trechos dos PDFs incluídos em cada prompt. Com 0, o conteúdo completo é enviado.
+        :param chunk_words: Tamanho (em palavras) dos trechos indexados.
+        :param hybrid_weight: Peso (0 a 1) dos embeddings por hashing na pontuação; com 0, apenas BM25.
+        :param index_path: Arquivo onde o índice é gravado e reaproveitado enquanto os PDFs não mudarem.
+        :param history_store: Histórico por sessão no Redis, usado pelos métodos assíncronos. Sem ele, esses
+            métodos usam a memória local do processo, compartilhada por todas as conversas.
+        :param answer_cache: Cache das respostas a perguntas sem histórico, usado pelos métodos assíncronos.
+        :param pdf_workers: Processos usados para extrair o texto dos PDFs novos ou alterados.
+        :param pdf_cache_dir: Pasta onde o texto extraído de cada PDF é reaproveitado entre reinícios.
+        :param chat_backend: "gemini" (padrão) ou "fake", um modelo local sem rede para testes de carga.
+        :param fake_llm_config: Parâmetros do `FakeChatModel` (latências e tamanho da resposta).
+        :param prompt_max_tokens: Orçamento de tokens de entrada de cada prompt (instrução, contexto e histórico).
+        :param prompt_context_share: Fração do orçamento reservada ao contexto dos PDFs.
+        :param prompt_message_max_tokens: Tokens de cada mensagem do histórico enviada ao modelo.
+        """
         self.api_key = api_key
+        self.chat_backend = chat_backend or CHAT_BACKEND_GEMINI
+        self.fake_llm_config = fake_llm_config or {}
         self.pdfs_folder_path = pdfs_folder_path
+        # Limita as chamadas simultâneas ao LLM nos caminhos assíncronos; as demais aguardam a vez
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self._llm_slots = asyncio.Semaphore(self.max_concurrency)
+        self.retrieval_top_k = DEFAULT_RETRIEVAL_TOP_K if retrieval_top_k is None else retrieval_top_k
+        self.chunk_words = chunk_words or DEFAULT_CHUNK_WORDS
+        self.hybrid_weight = hybrid_weight or 0.0
+        self.index_path = index_path
+        self.history_store = history_store
+        self.answer_cache = answer_cache
+        self.pdf_extractor = PdfTextExtractor(pdf_cache_dir, pdf_workers)
+        self.prompt_budget = PromptBudget(prompt_max_tokens, prompt_context_share, prompt_message_max_tokens)
+        self.text_cleaner = TextCleanerService()
+        self.index: Optional[DocumentIndex] = None
         self.pdf_content: Optional[str] = None
+        self.documents_hash = ""
+        self._folder_signature: tuple = ()
+        self._document_chunks: dict[tuple[str, str], list[Chunk]] = {}
+        self._watch_task: Optional[asyncio.Task] = None
         self.memory = ConversationBufferWindowMemory(
             k=5, return_messages=True, memory_key="chat_history", output_key="output"
         )
@@ -26,110 +119,302 @@ class GeminiService:
 
     def _initialize(self):
         """Inicializa o serviço carregando PDFs e criando a chain."""
+        self._folder_signature = folder_signature(self.pdfs_folder_path)
         self.pdf_content = self._load_pdfs_from_folder()
         if not self.pdf_content:
             raise ValueError("Não foi possível carregar os documentos PDF.")
+        self.documents_hash = self._hash_documents(self.pdf_content)
+        self.index = self._build_index(self.pdf_content)
         self.chain = self._create_chain()
 
+    @staticmethod
+    def _hash_documents(content: str) -> str:
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
     def _load_pdfs_from_folder(self) -> str:
         """Carrega todos os PDFs de uma pasta e retorna o conteúdo como texto."""
         try:
             pasta = Path(self.pdfs_folder_path)
             if not pasta.exists():
-                logger.warning(f"Pasta {self.pdfs_folder_path} não encontrada.")
+                logger.warning("Pasta %s não encontrada.", self.pdfs_folder_path)
                 return ""
-            
-            conteudo_total = ""
-            pdf_files = list(pasta.glob("*.pdf"))
-            
-            if not pdf_files:
-                logger.warning(f"Nenhum arquivo PDF encontrado na pasta {self.pdfs_folder_path}.")
+
+            documentos = self.pdf_extractor.load_folder(pasta)
+            if not documentos:
+                logger.warning("Nenhum arquivo PDF encontrado na pasta %s.", self.pdfs_folder_path)
                 return ""
-            
-            for pdf_file in pdf_files:
-                try:
-                    doc = fitz.open(str(pdf_file))
-                    texto_pdf = ""
-                    
-                    for page_num in range(len(doc)):
-                        page = doc.load_page(page_num)
-                        texto_pdf += page.get_text()
-                    
-                    doc.close()
-                    conteudo_total += f"\n\n--- Conteúdo do arquivo {pdf_file.name} ---\n\n{texto_pdf}"
-                    logger.info(f"PDF {pdf_file.name} carregado com sucesso.")
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao processar PDF {pdf_file.name}: {e}")
-                    continue
-            
-            return conteudo_total
-        
+
+            return "".join(DOCUMENT_HEADER.format(name=name) + texto for name, texto in documentos.items())
+
         except Exception as e:
-            logger.error(f"Erro ao carregar PDFs da pasta {self.pdfs_folder_path}: {e}")
+            logger.error("Erro ao carregar PDFs da pasta %s: %s", self.pdfs_folder_path, e)
             return ""
 
-    def _create_chain(self):
-        """Cria a cadeia Langchain para o Gemini."""
-        # Escapar chaves do conteúdo PDF para evitar conflitos com template
-        escaped_pdf_content = self.pdf_content.replace("{", "{{").replace("}", "}}")
+    def reload_documents(self) -> bool:
+        """
+        Recarrega os PDFs da pasta e reconstrói o índice, reaproveitando o texto e os trechos dos
+        arquivos não alterados. Perguntas em andamento seguem com os documentos anteriores.
 
-        system_message = f"""Você é um assistente amigável chamado falaSeller, especialista em informações
-        do Seller.
-        Você possui acesso EXCLUSIVO às seguintes informações vindas de documentos PDF e APENAS esses PDFs:
+        :return: True se o conteúdo dos documentos mudou.
+        """
+        self._folder_signature = folder_signature(self.pdfs_folder_path)
+        content = self._load_pdfs_from_folder()
+        if not content:
+            logger.warning("Nenhum PDF carregado de %s; mantendo os documentos anteriores.", self.pdfs_folder_path)
+            return False
+        documents_hash = self._hash_documents(content)
+        if documents_hash == self.documents_hash:
+            return False
+        index = self._build_index(content)
+        self.index, self.pdf_content, self.documents_hash = index, content, documents_hash
+        logger.info("Documentos de %s recarregados.", self.pdfs_folder_path)
+        return True
 
-        ####
-        {escaped_pdf_content}
-        ####
+    async def _watch_documents(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                signature = await asyncio.to_thread(folder_signature, self.pdfs_folder_path)
+                if signature != self._folder_signature:
+                    await asyncio.to_thread(self.reload_documents)
+            except Exception:
+                logger.warning("Falha ao recarregar os PDFs de %s", self.pdfs_folder_path, exc_info=True)
 
-        Utilize AS INFORMAÇÕES FORNECIDAS ACIMA para basear as suas respostas.  NÃO invente informações ou
-        use conhecimento externo.
-        Se a resposta não estiver explicitamente nos documentos, diga que você não sabe.
+    def start_watching(self, interval_seconds: float) -> None:
+        """Verifica a pasta dos PDFs a cada `interval_seconds` e recarrega os documentos quando ela muda."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_documents(interval_seconds))
 
-        Sempre que houver $ na sua saída, substita por S.!"""
+    async def stop_watching(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._watch_task
+        self._watch_task = None
+
+    @staticmethod
+    def _split_documents(content: str) -> list[tuple[str, str]]:
+        """Separa o conteúdo carregado de volta em (nome do arquivo, texto), pelos cabeçalhos de cada PDF."""
+        parts = DOCUMENT_HEADER_PATTERN.split(content)
+        documents = list(zip(parts[1::2], parts[2::2]))
+        if parts[0].strip():
+            documents.insert(0, ("documentos", parts[0]))
+        return documents
+
+    def _build_index(self, content: str) -> Optional[DocumentIndex]:
+        """
+        Indexa os trechos dos PDFs para a recuperação por pergunta. O índice gravado em `index_path`
+        é reaproveitado enquanto o conteúdo e os parâmetros forem os mesmos. Os trechos de cada PDF são
+        guardados para que, ao recarregar, apenas os arquivos alterados sejam divididos de novo.
+        """
+        if self.retrieval_top_k <= 0:
+            return None
+        with_embeddings = self.hybrid_weight > 0
+        fingerprint = DocumentIndex.make_fingerprint(content, self.chunk_words, with_embeddings)
+        if self.index_path:
+            index = DocumentIndex.load(self.index_path, fingerprint)
+            if index is not None:
+                logger.info("Índice dos documentos carregado de %s (%d trechos).", self.index_path, len(index))
+                return index
+
+        document_chunks = {
+            (source, text): self._document_chunks.get((source, text))
+            or chunk_text(text, source, max_words=self.chunk_words, overlap=self.chunk_words // 6)
+            for source, text in self._split_documents(content)
+        }
+        self._document_chunks = document_chunks
+        chunks = [chunk for document in document_chunks.values() for chunk in document]
+        index = DocumentIndex.build(chunks, with_embeddings=with_embeddings, fingerprint=fingerprint)
+        logger.info("Índice dos documentos construído com %d trechos.", len(index))
+        if self.index_path:
+            try:
+                index.save(self.index_path)
+            except OSError as e:
+                logger.warning("Não foi possível gravar o índice dos documentos em %s: %s", self.index_path, e)
+        return index
+
+    def _retrieve_context(self, question: str) -> str:
+        """Trechos dos PDFs mais relevantes para a pergunta; sem índice, o conteúdo completo."""
+        if self.index is None:
+            return self.pdf_content or ""
+        results = self.index.search(question, top_k=self.retrieval_top_k, embedding_weight=self.hybrid_weight)
+        if not results:
+            return MSG_SEM_CONTEXTO
+        return "\n\n".join(f"--- Trecho de {chunk.source} ---\n{chunk.text}" for chunk, _ in results)
+
+    def _create_llm(self):
+        if self.chat_backend == CHAT_BACKEND_FAKE:
+            logger.warning("Chat usando o modelo simulado (%s); as respostas não vêm do Gemini.", self.fake_llm_config)
+            return FakeChatModel(**self.fake_llm_config)
+        if self.chat_backend != CHAT_BACKEND_GEMINI:
+            raise ValueError(f"Backend de chat desconhecido: {self.chat_backend}")
+        return ChatGoogleGenerativeAI(model=GEMINI_MODEL, google_api_key=self.api_key)
+
+    def _model_identity(self) -> tuple:
+        """Backend e modelo que geram as respostas; para o modelo simulado, os parâmetros dele."""
+        if self.chat_backend == CHAT_BACKEND_FAKE:
+            return self.chat_backend, self.fake_llm_config
+        return self.chat_backend, GEMINI_MODEL
 
+    def _create_chain(self):
+        """Cria a cadeia Langchain para o Gemini. O contexto dos PDFs é preenchido a cada pergunta."""
         template = ChatPromptTemplate.from_messages(
             [
-                ("system", system_message),
+                ("system", SYSTEM_PROMPT),
                 ("placeholder", "{chat_history}"),
                 ("user", "{input}"),
             ]
         )
         try:
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash", google_api_key=self.api_key
-            )
-            chain = template | llm
+            chain = template | self._create_llm()
             return chain
         except Exception as e:
             raise RuntimeError(f"Erro ao carregar o modelo de chat Gemini: {e}") from e
 
+    def _chain_input(self, user_message: str, chat_history: Optional[list[BaseMessage]] = None) -> dict:
+        """Entradas do prompt, com contexto e histórico ajustados ao orçamento de tokens."""
+        context, history, _ = self.prompt_budget.fit(
+            SYSTEM_PROMPT,
+            user_message,
+            self._retrieve_context(user_message),
+            self.memory.buffer_as_messages if chat_history is None else chat_history,
+        )
+        return {"input": user_message, "context": context, "chat_history": history}
+
+    async def _load_history(self, session_id: Optional[str]) -> Optional[list[BaseMessage]]:
+        """
+        Histórico da sessão guardado no Redis. None indica que a memória local deve ser usada (sem
+        `history_store`); sem `session_id`, a conversa não tem histórico.
+        """
+        if self.history_store is None:
+            return None
+        if not session_id:
+            return []
+        turns = await self.history_store.load(session_id)
+        return [message for question, answer in turns for message in (HumanMessage(question), AIMessage(answer))]
+
+    def _answer_cache_key(self, user_message: str, chat_history: Optional[list[BaseMessage]]) -> Optional[str]:
+        """
+        Chave da resposta no cache: a pergunta sem formatação, acentos e caixa, junto do backend e modelo
+        de chat, do hash dos PDFs carregados (PDFs novos geram chaves novas) e dos parâmetros que mudam o
+        contexto enviado ao modelo (respostas do modelo simulado nunca são servidas no lugar do Gemini).
+        None quando a resposta não deve vir do cache, como nas continuações de uma conversa.
+        """
+        if self.answer_cache is None:
+            return None
+        if self.memory.buffer_as_messages if chat_history is None else chat_history:
+            return None
+        question = normalize_text(self.text_cleaner.clean_text(user_message))
+        if not question:
+            return None
+        return GenerationCache.make_key(
+            question, self._model_identity(), self.documents_hash, self.retrieval_top_k, self.hybrid_weight
+        )
+
+    async def _cached_answer(self, cache_key: Optional[str]) -> tuple[Optional[int], Optional[str]]:
+        if cache_key is None:
+            return None, None
+        generation, value = await self.answer_cache.get(cache_key)
+        return generation, value.decode() if value is not None else None
+
+    async def _cache_answer(self, generation: Optional[int], cache_key: Optional[str], answer: Any) -> None:
+        if cache_key is not None and answer and isinstance(answer, str):
+            await self.answer_cache.set(generation, cache_key, answer.encode())
+
+    async def _aremember(self, session_id: Optional[str], user_message: str, answer: Optional[str]) -> str:
+        """Como `_remember`, gravando o turno no histórico da sessão quando há `history_store`."""
+        if self.history_store is None:
+            return self._remember(user_message, answer)
+        if not answer:
+            return MSG_SEM_RESPOSTA
+        if session_id:
+            await self.history_store.append(session_id, user_message, answer)
+        return answer
+
+    def _remember(self, user_message: str, answer: Optional[str]) -> str:
+        """Registra a troca no histórico e retorna a resposta final (ou o aviso de resposta vazia)."""
+        self.memory.chat_memory.add_user_message(user_message)
+        if not answer:
+            return MSG_SEM_RESPOSTA
+        self.memory.chat_memory.add_ai_message(answer)
+        return answer
+
+    @staticmethod
+    def _chunk_text(content: Any) -> str:
+        """Texto de um chunk do modelo; o conteúdo pode vir como string ou como lista de partes."""
+        if isinstance(content, str):
+            return content
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content or ())
+
     def generate_response(self, user_message: str) -> str:
-        """Gera uma resposta usando o modelo Gemini."""
+        """Gera uma resposta usando o modelo Gemini. Bloqueia o thread até o fim da chamada ao modelo."""
         try:
-            response = self.chain.invoke(
-                {"input": user_message, "chat_history": self.memory.buffer_as_messages}
-            )
-            
-            # Atualiza o histórico com a mensagem do usuário
-            self.memory.chat_memory.add_user_message(user_message)
-            
-            # Verifica se a resposta tem conteúdo
-            if not response.content:
-                return "Desculpe, não consegui gerar uma resposta."
-            
-            # Atualiza o histórico com a mensagem da IA
-            self.memory.chat_memory.add_ai_message(response.content)
-            
-            return response.content
+            response = self.chain.invoke(self._chain_input(user_message))
+            return self._remember(user_message, response.content)
         except Exception as e:
             logger.error(f"Erro ao gerar resposta com Gemini: {e}")
-            return "Desculpe, ocorreu um erro ao processar sua mensagem."
-    
+            return MSG_ERRO_CHAT
+
+    async def agenerate_response(self, user_message: str, session_id: Optional[str] = None) -> str:
+        """
+        Versão assíncrona de `generate_response`, limitada a `max_concurrency` chamadas simultâneas.
+        O histórico de `session_id` é carregado antes da chamada ao modelo e atualizado depois dela.
+        Perguntas sem histórico já respondidas com os mesmos PDFs vêm do `answer_cache`, sem chamar o modelo.
+        """
+        try:
+            chat_history = await self._load_history(session_id)
+            cache_key = self._answer_cache_key(user_message, chat_history)
+            generation, answer = await self._cached_answer(cache_key)
+            if answer is None:
+                async with self._llm_slots:
+                    response = await self.chain.ainvoke(self._chain_input(user_message, chat_history))
+                answer = response.content
+                await self._cache_answer(generation, cache_key, answer)
+            return await self._aremember(session_id, user_message, answer)
+        except Exception as e:
+            logger.error("Erro ao gerar resposta com Gemini: %s", e)
+            return MSG_ERRO_CHAT
+
+    async def astream_response(self, user_message: str, session_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Repassa os trechos da resposta à medida que o modelo os gera. O histórico é atualizado ao final;
+        falhas são propagadas para quem consome o stream, que já pode ter recebido parte da resposta.
+        """
+        chunks: list[str] = []
+        chat_history = await self._load_history(session_id)
+        cache_key = self._answer_cache_key(user_message, chat_history)
+        generation, answer = await self._cached_answer(cache_key)
+        if answer is not None:
+            yield answer
+            await self._aremember(session_id, user_message, answer)
+            return
+        async with self._llm_slots:
+            async for chunk in self.chain.astream(self._chain_input(user_message, chat_history)):
+                text = self._chunk_text(chunk.content)
+                if text:
+                    chunks.append(text)
+                    yield text
+        if not chunks:
+            yield MSG_SEM_RESPOSTA
+        answer = "".join(chunks)
+        await self._cache_answer(generation, cache_key, answer)
+        await self._aremember(session_id, user_message, answer)
+
     def chat(self, message: str) -> str:
         """Método para compatibilidade com o router."""
         return self.generate_response(message)
+
+    async def achat(self, message: str, session_id: Optional[str] = None) -> str:
+        return await self.agenerate_response(message, session_id)
     
     def reset_memory(self):
         """Reseta a memória do chat."""
         self.memory.chat_memory.clear()
+
+    async def areset_memory(self, session_id: Optional[str] = None):
+        """Reseta o histórico da sessão (ou a memória local, sem `history_store`)."""
+        if self.history_store is None:
+            self.reset_memory()
+        elif session_id:
+            await self.history_store.clear(session_id)
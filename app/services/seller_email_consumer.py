@@ -1,7 +1,13 @@
 import pika
 import json
 import os
+import sys
+import signal
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from app.services.email_service import EmailService
 
 logger = logging.getLogger(__name__)
@@ -12,8 +18,29 @@ if not logger.hasHandlers():
     logger.addHandler(handler)
     logger.setLevel(logging.INFO)
 
+DEFAULT_WORKERS = 8
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 30
+
 
 class SellerEmailConsumer:
+    """
+    Consome as mensagens de sellers criados e envia o email de boas-vindas.
+
+    A conexão com o RabbitMQ fica na thread principal, que só recebe as mensagens e responde aos
+    heartbeats; o envio dos emails roda em um pool de `EMAIL_CONSUMER_WORKERS` threads, e os
+    ack/nack voltam para a thread da conexão via `add_callback_threadsafe` (o canal do pika não é
+    thread-safe). O `prefetch_count` (`EMAIL_CONSUMER_PREFETCH`, padrão: o dobro de workers)
+    limita as mensagens entregues e ainda não confirmadas.
+
+    Ao parar (CTRL+C ou SIGTERM), o consumo é cancelado e as mensagens já recebidas têm até
+    `EMAIL_CONSUMER_DRAIN_TIMEOUT` segundos para serem processadas. Passado esse prazo, as que
+    ainda aguardam um worker são descartadas sem envio e voltam para a fila; um envio já iniciado
+    não pode ser interrompido sem risco de email duplicado, então a conexão só é fechada depois que
+    ele termina e é confirmado (cada operação SMTP é limitada por `SMTP_TIMEOUT`). O prazo dado pelo
+    orquestrador entre o SIGTERM e o SIGKILL deve cobrir `EMAIL_CONSUMER_DRAIN_TIMEOUT` mais um
+    envio completo.
+    """
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.__host = os.getenv("RABBITMQ_HOST")
@@ -21,7 +48,18 @@ class SellerEmailConsumer:
         self.__username = os.getenv("RABBITMQ_USERNAME")
         self.__password = os.getenv("RABBITMQ_PASSWORD")
         self.__queue = os.getenv("RABBITMQ_QUEUE")
+        self.__workers = int(os.getenv("EMAIL_CONSUMER_WORKERS") or DEFAULT_WORKERS)
+        self.__prefetch_count = int(os.getenv("EMAIL_CONSUMER_PREFETCH") or self.__workers * 2)
+        self.__drain_timeout = float(os.getenv("EMAIL_CONSUMER_DRAIN_TIMEOUT") or DEFAULT_DRAIN_TIMEOUT_SECONDS)
         self.email_service = EmailService()
+        self.__connection = None
+        self.__channel = None
+        self.__executor = None
+        self.__in_flight = set()
+        self.__in_flight_lock = threading.Lock()
+        # Após a drenagem a conexão é fechada; ack/nack que chegarem depois (conexão perdida) são ignorados
+        self.__closing = False
+        self.__connection_lock = threading.Lock()
 
     def __create_channel(self):
         connection_parameters = pika.ConnectionParameters(
@@ -42,15 +80,63 @@ class SellerEmailConsumer:
             durable=True
         )
         
+        # Limitar mensagens entregues e ainda não confirmadas
+        channel.basic_qos(prefetch_count=self.__prefetch_count)
+
         # Configurar consumer
         channel.basic_consume(
             queue=self.__queue,
             auto_ack=False,  # Mudado para False para controle manual
-            on_message_callback=self.__process_seller_message
+            on_message_callback=self.__dispatch_message
         )
 
         return connection, channel
 
+    def __dispatch_message(self, ch, method, properties, body):
+        """
+        Entrega a mensagem ao pool de workers, sem bloquear a thread da conexão
+        """
+        future = self.__executor.submit(self.__process_seller_message, ch, method, properties, body)
+        with self.__in_flight_lock:
+            self.__in_flight.add(future)
+        future.add_done_callback(self.__discard_in_flight)
+
+    def __discard_in_flight(self, future: Future):
+        with self.__in_flight_lock:
+            self.__in_flight.discard(future)
+
+    def __in_flight_count(self):
+        with self.__in_flight_lock:
+            return len(self.__in_flight)
+
+    def __run_on_connection(self, callback):
+        """
+        Executa a operação no canal pela thread da conexão quando chamada de um worker
+        """
+        with self.__connection_lock:
+            if self.__closing:
+                self.logger.warning(
+                    "Envio terminou após o fechamento da conexão; a mensagem voltará para a fila"
+                )
+                return
+            if self.__connection is None:
+                callback()
+            else:
+                self.__connection.add_callback_threadsafe(callback)
+
+    def __close_connection(self, connection):
+        with self.__connection_lock:
+            self.__closing = True
+            self.__connection = self.__channel = None
+        if connection is not None and connection.is_open:
+            connection.close()
+
+    def __ack(self, ch, delivery_tag):
+        self.__run_on_connection(partial(ch.basic_ack, delivery_tag=delivery_tag))
+
+    def __nack(self, ch, delivery_tag):
+        self.__run_on_connection(partial(ch.basic_nack, delivery_tag=delivery_tag, requeue=True))
+
     def __process_seller_message(self, ch, method, properties, body):
         """
         Processa mensagem recebida do RabbitMQ e envia email de boas-vindas
@@ -65,7 +151,7 @@ class SellerEmailConsumer:
             # Verificar se é uma mensagem de seller válida
             if not self.__is_valid_seller_message(seller_data):
                 self.logger.warning("Mensagem recebida não contém dados válidos de seller")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                self.__ack(ch, method.delivery_tag)
                 return
 
             # Enviar email de boas-vindas
@@ -76,19 +162,19 @@ class SellerEmailConsumer:
             if success:
                 self.logger.info(f"Email enviado com sucesso para {seller_data.get('contact_email', 'N/A')}")
                 # Confirmar processamento da mensagem
-                ch.basic_ack(delivery_tag=method.delivery_tag)
+                self.__ack(ch, method.delivery_tag)
             else:
                 self.logger.error("Falha ao enviar email. Rejeitando mensagem.")
                 # Rejeitar mensagem (volta para a fila)
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                self.__nack(ch, method.delivery_tag)
 
         except json.JSONDecodeError as e:
             self.logger.error(f"Erro ao decodificar JSON: {str(e)}")
-            ch.basic_ack(delivery_tag=method.delivery_tag)  # Descartar mensagem inválida
+            self.__ack(ch, method.delivery_tag)  # Descartar mensagem inválida
             
         except Exception as e:
             self.logger.error(f"Erro inesperado ao processar mensagem: {str(e)}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            self.__nack(ch, method.delivery_tag)
 
     def __is_valid_seller_message(self, data):
         """
@@ -105,21 +191,64 @@ class SellerEmailConsumer:
             self.logger.info("Iniciando consumer de email para sellers...")
             self.logger.info(f"Conectando em {self.__host}:{self.__port}")
             self.logger.info(f"Fila: {self.__queue}")
-            
+            self.logger.info(f"Workers: {self.__workers}, prefetch: {self.__prefetch_count}")
+
+            self.__closing = False
+            self.__executor = ThreadPoolExecutor(self.__workers, thread_name_prefix="seller-email")
             connection, channel = self.__create_channel()
-            
+            self.__connection, self.__channel = connection, channel
+
             self.logger.info("Aguardando mensagens. Para sair, pressione CTRL+C")
-            channel.start_consuming()
-            
-        except KeyboardInterrupt:
-            self.logger.info("Interrompido pelo usuário")
-            channel.stop_consuming()
-            connection.close()
-            
+            try:
+                channel.start_consuming()
+            except KeyboardInterrupt:
+                self.logger.info("Interrompido pelo usuário")
+                channel.stop_consuming()
+
+            self.__drain(connection)
+            self.__close_connection(connection)
+
         except Exception as e:
             self.logger.error(f"Erro ao iniciar consumer: {str(e)}")
             raise
 
+        finally:
+            self.__close_connection(self.__connection)
+            # O pool SMTP só é fechado quando nenhum worker o usa mais
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=True, cancel_futures=True)
+            self.email_service.close()
+
+    def stop(self):
+        """
+        Solicita a parada do consumo; pode ser chamado de outra thread ou de um signal handler
+        """
+        if self.__connection is not None and self.__channel is not None:
+            self.__connection.add_callback_threadsafe(self.__channel.stop_consuming)
+
+    def __drain(self, connection):
+        """
+        Aguarda as mensagens recebidas, processando os ack/nack enviados pelos workers. Após o prazo,
+        descarta as que ainda não começaram e espera apenas os envios já iniciados
+        """
+        pending = self.__in_flight_count()
+        if pending:
+            self.logger.info(f"Aguardando {pending} envio(s) em andamento...")
+        deadline = time.monotonic() + self.__drain_timeout
+        while self.__in_flight_count() and time.monotonic() < deadline:
+            connection.process_data_events(time_limit=0.1)
+
+        if self.__in_flight_count():
+            # Cancela as mensagens que aguardam um worker; elas voltam para a fila sem envio
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            pending = self.__in_flight_count()
+            if pending:
+                self.logger.warning(f"Prazo de drenagem esgotado; aguardando {pending} envio(s) já iniciado(s)")
+            while self.__in_flight_count():
+                connection.process_data_events(time_limit=0.1)
+        # Executa os ack/nack agendados pelos últimos envios
+        connection.process_data_events(time_limit=0)
+
 
 def main():
     """
@@ -139,6 +268,7 @@ def main():
 
     # Iniciar consumer
     consumer = SellerEmailConsumer()
+    signal.signal(signal.SIGTERM, lambda signum, frame: consumer.stop())
     consumer.start_consuming()
 
 
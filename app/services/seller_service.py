@@ -1,4 +1,7 @@
+import asyncio
 import os
+from datetime import timedelta
+from typing import Optional
 
 import logging
 
@@ -9,8 +12,10 @@ from app.api.common.auth_handler import UserAuthInfo
 from app.clients.keycloak_admin_client import KeycloakAdminClient
 from app.common.datetime import utcnow
 from app.common.exceptions import BadRequestException, NotFoundException
+from app.integrations.kv_db.generation_cache import GenerationCache
 from app.messages import (
     MSG_NOME_FANTASIA_JA_CADASTRADO,
+    MSG_ORDENACAO_SEM_INDICE,
     MSG_SELLER_CNPJ_NAO_ENCONTRADO,
     MSG_SELLER_ID_JA_CADASTRADO,
     MSG_SELLER_NAO_ENCONTRADO,
@@ -18,6 +23,7 @@ from app.messages import (
 from app.models.seller_model import Seller
 from app.models.seller_patch_model import SellerPatch
 from app.repositories.seller_repository import SellerRepository
+from app.repositories.seller_stats_repository import SellerStatsRepository
 from app.services.publisher import publish_seller_message
 from app.services.webhook_service import WebhookService
 from ..api.v1.schemas.seller_schema import SellerResponse
@@ -34,22 +40,35 @@ logger = logging.getLogger(__name__)
 
 
 class SellerService(CrudService[Seller, str]):
-    def __init__(self, repository: SellerRepository, keycloak_client: KeycloakAdminClient):
+    def __init__(
+        self,
+        repository: SellerRepository,
+        keycloak_client: KeycloakAdminClient,
+        reject_unindexed_sort: bool = False,
+        stats_repository: Optional[SellerStatsRepository] = None,
+        stats_reconcile_interval_seconds: int = 3600,
+        list_cache: Optional[GenerationCache] = None,
+    ):
         super().__init__(repository)
         self.repository: SellerRepository = repository
         self.keycloak_client: KeycloakAdminClient = keycloak_client
+        self.reject_unindexed_sort = reject_unindexed_sort
+        self.stats_repository = stats_repository
+        self.stats_reconcile_interval = timedelta(seconds=stats_reconcile_interval_seconds)
+        self._stats_reconcile_task: Optional[asyncio.Task] = None
+        self.list_cache = list_cache
         self.webhook_service = WebhookService()
 
     async def create(self, data: Seller, auth_info: UserAuthInfo) -> Seller:
-        logger.info(f"Iniciando processo de criação para o seller_id: {data.seller_id}")
+        logger.info("Iniciando processo de criação para o seller_id: %s", data.seller_id)
         # Verifica se seller_id já existe
         if await self.repository.find_by_id(data.seller_id):
-            logger.warning(f"Tentativa de criar seller com ID duplicado: {data.seller_id}")
+            logger.warning("Tentativa de criar seller com ID duplicado: %s", data.seller_id)
             raise BadRequestException(message=MSG_SELLER_ID_JA_CADASTRADO)
 
         # Verifica se trade_name já existe
         if await self.repository.find_by_trade_name(data.trade_name):
-            logger.warning(f"Tentativa de criar seller com trade_name duplicado: {data.seller_id}")
+            logger.warning("Tentativa de criar seller com trade_name duplicado: %s", data.seller_id)
             raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
 
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
@@ -87,24 +106,28 @@ class SellerService(CrudService[Seller, str]):
         )
 
         user_keycloak_id = auth_info.user.name
-        logger.debug(f"Tentando associar o novo seller '{data.seller_id}' ao usuário '{user_keycloak_id}' no Keycloak.")
+        logger.debug(
+            "Tentando associar o novo seller '%s' ao usuário '%s' no Keycloak.", data.seller_id, user_keycloak_id
+        )
         await self.keycloak_client.add_seller_to_user(
             user_id=user_keycloak_id,
             seller_to_add=data.seller_id
         )
         logger.info("Associação no Keycloak bem-sucedida.")
 
-        logger.debug(f"Salvando o seller '{data.seller_id}' no repositório.")
+        logger.debug("Salvando o seller '%s' no repositório.", data.seller_id)
         created_seller = await self.repository.create(seller_to_create)
-        logger.info(f"Seller '{data.seller_id}' e associação de usuário criados com sucesso.")
+        logger.info("Seller '%s' e associação de usuário criados com sucesso.", data.seller_id)
+        await self._invalidate_list_cache()
+        await self._update_stats(None, created_seller)
 
         try:
             seller_dict = created_seller.model_dump()
-            logger.debug(f"Dados do seller para publicação: {seller_dict}")
+            logger.debug("Dados do seller para publicação: %s", seller_dict)
             publish_seller_message(seller_dict)
-            logger.info(f"Mensagem do seller '{data.seller_id}' publicada com sucesso no RabbitMQ.")
+            logger.info("Mensagem do seller '%s' publicada com sucesso no RabbitMQ.", data.seller_id)
         except Exception as e:
-            logger.error(f"Falha ao publicar mensagem do seller '{data.seller_id}' no RabbitMQ: {str(e)}")
+            logger.error("Falha ao publicar mensagem do seller '%s' no RabbitMQ: %s", data.seller_id, e)
             # Não falha a operação principal, apenas loga o erro
 
         # Enviar notificação webhook
@@ -114,7 +137,7 @@ class SellerService(CrudService[Seller, str]):
                 changes={"operation": "created", "seller_id": data.seller_id}
             )
         except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller criado '{data.seller_id}': {str(e)}")
+            logger.error("Falha ao enviar notificação webhook para seller criado '%s': %s", data.seller_id, e)
 
         return created_seller
 
@@ -126,8 +149,19 @@ class SellerService(CrudService[Seller, str]):
         if 'status' not in filters:
             filters['status'] = SellerStatus.ACTIVE
 
+        sort = paginator.get_sort_order()
+        plan = self.repository.plan(filters, sort)
+        if not plan.sort_indexed:
+            if self.reject_unindexed_sort:
+                raise BadRequestException(message=MSG_ORDENACAO_SEM_INDICE.format(sort=paginator.sort))
+            logger.warning("Ordenação sem índice na listagem de sellers: sort=%s filtros=%s", sort, list(filters))
+        if plan.is_collection_scan:
+            logger.warning("Listagem de sellers sem índice utilizável: filtros=%s", list(filters))
+        elif plan.unindexed_filters:
+            logger.debug("Filtros não cobertos pelo índice %s: %s", plan.index, sorted(plan.unindexed_filters))
+
         return await self.repository.find(
-            filters=filters, limit=paginator.limit, offset=paginator.offset, sort=paginator.get_sort_order()
+            filters=filters, limit=paginator.limit, offset=paginator.offset, sort=sort
         )
 
     async def delete_by_id(self, entity_id: str, auth_info: UserAuthInfo) -> Seller:
@@ -135,7 +169,7 @@ class SellerService(CrudService[Seller, str]):
         Realiza um 'soft delete' alterando o status do seller para 'Inativo'.
         """
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando exclusão lógica para o seller_id: {entity_id}")
+        logger.info("Usuário '%s' iniciando exclusão lógica para o seller_id: %s", user_identifier, entity_id)
 
         current_seller = await self.repository.find_by_id(entity_id)
         if not current_seller or current_seller.status == SellerStatus.INACTIVE:
@@ -150,7 +184,9 @@ class SellerService(CrudService[Seller, str]):
         }
 
         updated_seller = await self.repository.patch(entity_id, update_data)
-        logger.info(f"Seller '{entity_id}' marcado como 'Inativo' com sucesso pelo usuário '{user_identifier}'.")
+        logger.info("Seller '%s' marcado como 'Inativo' com sucesso pelo usuário '%s'.", entity_id, user_identifier)
+        await self._invalidate_list_cache()
+        await self._update_stats(current_seller, updated_seller)
 
         try:
             await self.webhook_service.send_update_message(
@@ -158,7 +194,7 @@ class SellerService(CrudService[Seller, str]):
                 changes={"operation": "deleted", "seller_id": entity_id}
             )
         except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller excluído '{entity_id}': {str(e)}")
+            logger.error("Falha ao enviar notificação webhook para seller excluído '%s': %s", entity_id, e)
 
         try:
             user_keycloak_id = auth_info.user.name  # 'name' é o 'sub' (ID do usuário)
@@ -169,38 +205,105 @@ class SellerService(CrudService[Seller, str]):
         except Exception:
             # Se a atualização do Keycloak falhar, o seller já foi inativado.
             logger.error(
-                f"ALERTA: O seller '{entity_id}' foi inativado no banco, mas a remoção "
-                f"do atributo no Keycloak para o usuário '{user_identifier}' FALHOU. "
+                "ALERTA: O seller '%s' foi inativado no banco, mas a remoção "
+                "do atributo no Keycloak para o usuário '%s' FALHOU. "
                 "O acesso pode precisar ser revogado manualmente.",
+                entity_id,
+                user_identifier,
                 exc_info=True
             )
 
         return updated_seller
 
-    async def find_by_cnpj(self, cnpj: str) -> Seller:
-        seller = await self.repository.find_by_cnpj(cnpj)
+    async def find_many(self, seller_ids: list[str], cnpjs: list[str]) -> list[Seller]:
+        """
+        Busca em lote por seller_id e/ou CNPJ, retornando apenas sellers ativos e sem duplicatas.
+        """
+        by_ids, by_cnpjs = await asyncio.gather(
+            self.repository.find_many_by_ids(seller_ids),
+            self.repository.find_many_by_cnpjs(cnpjs),
+        )
+        sellers: dict[str, Seller] = {}
+        for seller in [*by_ids, *by_cnpjs]:
+            if seller.status == SellerStatus.ACTIVE:
+                sellers.setdefault(seller.seller_id, seller)
+        return list(sellers.values())
+
+    async def search(self, text: str, limit: int) -> list[dict]:
+        """
+        Busca por prefixo em trade_name/company_name para autocompletar, apenas entre sellers ativos.
+        """
+        return await self.repository.search(text, limit=limit)
+
+    async def _invalidate_list_cache(self) -> None:
+        """Avança a geração do cache das páginas de listagem após qualquer escrita de seller."""
+        if self.list_cache is not None:
+            await self.list_cache.invalidate()
+
+    async def _update_stats(self, before: Optional[Seller], after: Optional[Seller]) -> None:
+        """Atualiza os contadores de facetas; falhas não interrompem a operação principal."""
+        if self.stats_repository is None:
+            return
+        try:
+            await self.stats_repository.apply_change(before, after)
+        except Exception:
+            logger.error("Falha ao atualizar as estatísticas de sellers.", exc_info=True)
+
+    async def get_stats(self) -> dict:
+        """
+        Retorna as estatísticas materializadas. Se o documento não existir, é calculado na hora;
+        se a última reconciliação estiver mais antiga que o intervalo configurado, ela é refeita em segundo plano.
+        """
+        stats = await self.stats_repository.get()
+        if stats is None:
+            return await self.stats_repository.reconcile()
+
+        reconciled_at = stats.get("reconciled_at")
+        is_stale = reconciled_at is None or utcnow() - reconciled_at > self.stats_reconcile_interval
+        if is_stale and (self._stats_reconcile_task is None or self._stats_reconcile_task.done()):
+            self._stats_reconcile_task = asyncio.create_task(self._reconcile_stats())
+        return stats
+
+    async def _reconcile_stats(self) -> None:
+        try:
+            await self.stats_repository.reconcile()
+            logger.info("Estatísticas de sellers reconciliadas.")
+        except Exception:
+            logger.error("Falha ao reconciliar as estatísticas de sellers.", exc_info=True)
+
+    async def find_version(self, seller_id: Optional[str] = None, cnpj: Optional[str] = None) -> Optional[dict]:
+        """
+        Retorna seller_id, cnpj, status e datas do seller, sem carregar o documento completo.
+        Usado para avaliar requisições condicionais (ETag) antes da leitura.
+        """
+        if seller_id:
+            return await self.repository.find_version("seller_id", seller_id)
+        return await self.repository.find_version("cnpj", cnpj)
+
+    async def find_by_cnpj(self, cnpj: str, include_archived: bool = False) -> Seller:
+        seller = await self.repository.find_by_cnpj(cnpj, include_archived=include_archived)
         if not seller:
             raise NotFoundException(message=MSG_SELLER_CNPJ_NAO_ENCONTRADO.format(cnpj=cnpj))
         return seller
 
     async def update(self, entity_id: str, data: SellerPatch, auth_info: UserAuthInfo) -> Seller:
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando atualização (PATCH) para o seller_id: {entity_id}")
+        logger.info("Usuário '%s' iniciando atualização (PATCH) para o seller_id: %s", user_identifier, entity_id)
         current = await self.repository.find_by_id(entity_id)
         if not current:
-            logger.warning(f"Usuário '{user_identifier}' tentou atualizar um seller inexistente: {entity_id}")
+            logger.warning("Usuário '%s' tentou atualizar um seller inexistente: %s", user_identifier, entity_id)
             raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
 
         update_data = data.model_dump(exclude_unset=True)
 
         if not update_data:
-            logger.info(f"Nenhum campo para atualizar no seller_id: {entity_id}. Nenhuma ação realizada.")
+            logger.info("Nenhum campo para atualizar no seller_id: %s. Nenhuma ação realizada.", entity_id)
             return current
 
         if "trade_name" in update_data:
             existing = await self.repository.find_by_trade_name(update_data["trade_name"])
             if existing and existing.seller_id != entity_id:
-                logger.warning(f"Tentativa de atualizar seller '{entity_id}' com trade_name que já está em uso.")
+                logger.warning("Tentativa de atualizar seller '%s' com trade_name que já está em uso.", entity_id)
                 raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
 
         now = utcnow()
@@ -210,7 +313,9 @@ class SellerService(CrudService[Seller, str]):
         update_data["audit_updated_at"] = now
 
         updated_seller = await self.repository.patch(entity_id, update_data)
-        logger.info(f"Seller '{entity_id}' atualizado com sucesso pelo usuário '{user_identifier}'.")
+        logger.info("Seller '%s' atualizado com sucesso pelo usuário '%s'.", entity_id, user_identifier)
+        await self._invalidate_list_cache()
+        await self._update_stats(current, updated_seller)
 
         # Enviar notificação webhook
         try:
@@ -220,30 +325,31 @@ class SellerService(CrudService[Seller, str]):
                 changes={"operation": "updated", "seller_id": entity_id, "fields_changed": changes_made}
             )
         except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller atualizado '{entity_id}': {str(e)}")
+            logger.error("Falha ao enviar notificação webhook para seller atualizado '%s': %s", entity_id, e)
             # Não falha a operação principal, apenas loga o erro
 
         return updated_seller
 
     async def replace(self, entity_id: str, data: Seller, auth_info: UserAuthInfo) -> Seller:
         user_identifier = f"{auth_info.user.server}:{auth_info.user.name}"
-        logger.info(f"Usuário '{user_identifier}' iniciando substituição (PUT) para o seller_id: {entity_id}")
+        logger.info("Usuário '%s' iniciando substituição (PUT) para o seller_id: %s", user_identifier, entity_id)
         existing = await self.repository.find_by_id(entity_id)
         if not existing:
-            logger.warning(f"Usuário '{user_identifier}' tentou substituir um seller inexistente: {entity_id}")
+            logger.warning("Usuário '%s' tentou substituir um seller inexistente: %s", user_identifier, entity_id)
             raise NotFoundException(message=MSG_SELLER_NAO_ENCONTRADO.format(entity_id=entity_id))
 
         if await self.repository.find_by_trade_name(data.trade_name):
             if data.trade_name != existing.trade_name:
                 logger.warning(
-                    f"Conflito de nome fantasia ao tentar substituir o seller '{entity_id}'. "
-                    f"O nome '{data.trade_name}' já está em uso."
+                    "Conflito de nome fantasia ao tentar substituir o seller '%s'. O nome '%s' já está em uso.",
+                    entity_id,
+                    data.trade_name,
                 )
                 raise BadRequestException(message=MSG_NOME_FANTASIA_JA_CADASTRADO)
 
         now = utcnow()
 
-        logger.debug(f"Montando objeto de substituição para o seller '{entity_id}'.")
+        logger.debug("Montando objeto de substituição para o seller '%s'.", entity_id)
         updated_seller = Seller(
             seller_id=entity_id,
             company_name=data.company_name,
@@ -276,7 +382,9 @@ class SellerService(CrudService[Seller, str]):
 
         result = await self.repository.update(entity_id, updated_seller)
 
-        logger.info(f"Seller '{entity_id}' substituído com sucesso pelo usuário '{user_identifier}'.")
+        logger.info("Seller '%s' substituído com sucesso pelo usuário '%s'.", entity_id, user_identifier)
+        await self._invalidate_list_cache()
+        await self._update_stats(existing, result)
 
         # Enviar notificação webhook
         try:
@@ -285,13 +393,17 @@ class SellerService(CrudService[Seller, str]):
                 changes={"operation": "replaced", "seller_id": entity_id}
             )
         except Exception as e:
-            logger.error(f"Falha ao enviar notificação webhook para seller substituído '{entity_id}': {str(e)}")
+            logger.error("Falha ao enviar notificação webhook para seller substituído '%s': %s", entity_id, e)
             # Não falha a operação principal, apenas loga o erro
 
         return result
 
-    async def find_by_id(self, seller_id: str) -> Seller | None:
-        seller = await self.repository.find_by_id(seller_id)
-        if not seller or seller.status != "Ativo":
+    async def find_by_id(self, seller_id: str, include_archived: bool = False) -> Seller | None:
+        """
+        Retorna o seller ativo. Com `include_archived`, sellers inativos e arquivados no banco frio
+        também são retornados.
+        """
+        seller = await self.repository.find_by_id(seller_id, include_archived=include_archived)
+        if not seller or (not include_archived and seller.status != "Ativo"):
             return None
         return seller
@@ -1,10 +1,44 @@
 import re
-from typing import List
+from typing import AsyncIterable, AsyncIterator, Optional
+
+# Tags HTML, códigos ANSI, negrito, itálico e links em uma única alternação, na ordem de prioridade.
+# Usada só na limpeza incremental: sobre o texto inteiro, as passadas separadas de `clean_text` são mais rápidas
+_CLEAN_PATTERN = re.compile(
+    r"<[^>]*>"
+    r"|\x1b\[[0-9;]*m"
+    r"|\*\*([^*]+)\*\*"
+    r"|\*([^*]+)\*"
+    r"|\[([^\]]*)\]\([^\)]*\)"
+)
+_OPENER_PATTERN = re.compile(r"[<\x1b*\[]")
+# Prefixos de cada construção ainda sem o fechamento: podem virar uma construção completa com mais texto
+_INCOMPLETE_PATTERNS = {
+    "<": re.compile(r"<[^>]*"),
+    "\x1b": re.compile(r"\x1b(\[[0-9;]*)?"),
+    "*": re.compile(r"\*\*?[^*]*\*?"),
+    "[": re.compile(r"\[[^\]]*(\](\([^\)]*)?)?"),
+}
+DEFAULT_MAX_PENDING = 256
+
+
+def _replace(match: re.Match) -> str:
+    if match.lastindex is None:
+        return ""
+    inner = match.group(match.lastindex)
+    # O conteúdo de negrito, itálico ou link pode ter HTML e formatação, removidos antes nas passadas separadas
+    if _OPENER_PATTERN.search(inner):
+        return _CLEAN_PATTERN.sub(_replace, inner)
+    return inner
+
+
+def clean(texto: str) -> str:
+    """Limpeza em uma passada; igual a `clean_text` exceto em sequências ambíguas de asteriscos (ex.: `***a***`)."""
+    return _CLEAN_PATTERN.sub(_replace, texto)
 
 
 class TextCleanerService:
     """Serviço para limpeza e formatação de texto."""
-    
+
     def __init__(self):
         self._html_pattern = re.compile(r"<[^>]*>")
         self._ansi_pattern = re.compile(r"\x1b\[[0-9;]*m")
@@ -13,21 +47,90 @@ class TextCleanerService:
             (re.compile(r"\*([^*]+)\*"), r"\1"),      # Italic
             (re.compile(r"\[([^\]]*)\]\([^\)]*\)"), r"\1"),  # Links
         ]
-    
+
     def remove_html(self, texto: str) -> str:
         """Remove tags HTML e códigos ANSI do texto."""
         texto = re.sub(self._html_pattern, "", texto)
         texto = re.sub(self._ansi_pattern, "", texto)
         return texto
-    
+
     def remove_markdown(self, texto: str) -> str:
         """Remove formatação markdown do texto."""
         for pattern, replacement in self._markdown_patterns:
             texto = re.sub(pattern, replacement, texto)
         return texto
-    
+
     def clean_text(self, texto: str) -> str:
         """Remove tanto HTML quanto Markdown do texto."""
         texto = self.remove_html(texto)
         texto = self.remove_markdown(texto)
         return texto
+
+    def stream(self, max_pending: int = DEFAULT_MAX_PENDING) -> "StreamingTextCleaner":
+        """Limpador incremental, para texto que chega em partes (ex.: resposta do modelo via SSE)."""
+        return StreamingTextCleaner(max_pending)
+
+    async def aclean_stream(self, chunks: AsyncIterable[str]) -> AsyncIterator[str]:
+        """Repassa os trechos já limpos; o que fica retido entre trechos é enviado ao final."""
+        cleaner = self.stream()
+        async for chunk in chunks:
+            cleaned = cleaner.feed(chunk)
+            if cleaned:
+                yield cleaned
+        rest = cleaner.flush()
+        if rest:
+            yield rest
+
+
+class StreamingTextCleaner:
+    """
+    Limpeza incremental com o mesmo resultado de `clean` sobre o texto completo (e de `clean_text`,
+    salvo em sequências ambíguas de asteriscos). Cada `feed` devolve o texto limpo até a primeira
+    construção que ainda pode mudar com os próximos trechos (tag sem `>`, asterisco sem par, link
+    sem `)`...), que fica retida. Se o trecho retido passar de `max_pending` caracteres, é liberado
+    como está, para não segurar a resposta indefinidamente.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending = ""
+
+    @staticmethod
+    def _hold_position(texto: str) -> Optional[int]:
+        """Início da primeira construção incompleta fora das construções já completas; None se não houver."""
+        position = 0
+        matches = _CLEAN_PATTERN.finditer(texto)
+        match = next(matches, None)
+        while True:
+            opener = _OPENER_PATTERN.search(texto, position, match.start() if match else len(texto))
+            if opener is not None:
+                start = opener.start()
+                if _INCOMPLETE_PATTERNS[opener.group()].fullmatch(texto, start):
+                    return start
+                position = start + 1
+                continue
+            if match is None:
+                return None
+            # Construção completa terminando no fim do texto pode ser o início de outra (ex.: `*a*` de `**a**`)
+            if match.end() == len(texto) and _INCOMPLETE_PATTERNS[texto[match.start()]].fullmatch(
+                texto, match.start()
+            ):
+                return match.start()
+            position = match.end()
+            match = next(matches, None)
+
+    def feed(self, chunk: str) -> str:
+        texto = self._pending + chunk
+        hold = self._hold_position(texto)
+        if hold is None or len(texto) - hold > self.max_pending:
+            self._pending = ""
+            return clean(texto)
+        self._pending = texto[hold:]
+        return clean(texto[:hold])
+
+    def flush(self) -> str:
+        texto, self._pending = self._pending, ""
+        return clean(texto)
+
+
+__all__ = ["StreamingTextCleaner", "TextCleanerService"]
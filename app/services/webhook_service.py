@@ -25,7 +25,7 @@ class WebhookService:
         Returns:
             bool: True se a mensagem foi enviada com sucesso, False caso contrário
         """
-        logger.warning(f"🚀 WEBHOOK: Iniciando envio - {message}")
+        logger.debug("🚀 WEBHOOK: Iniciando envio - %s", message)
         
         try:
             # Formato bonito e organizado para Slack
@@ -60,8 +60,8 @@ class WebhookService:
                 ]
             }
             
-            logger.warning(f"🔗 WEBHOOK: URL = {self.webhook_url}")
-            logger.warning(f"📦 WEBHOOK: Payload = {slack_payload}")
+            logger.debug("🔗 WEBHOOK: URL = %s", self.webhook_url)
+            logger.debug("📦 WEBHOOK: Payload = %s", slack_payload)
             
             async with httpx.AsyncClient(timeout=self.timeout) as client:
                 response = await client.post(
@@ -70,23 +70,23 @@ class WebhookService:
                     headers={"Content-Type": JSON}
                 )
                 
-                logger.warning(f"📈 WEBHOOK: Status = {response.status_code}")
-                logger.warning(f"📄 WEBHOOK: Resposta = {response.text}")
+                logger.debug("📈 WEBHOOK: Status = %s", response.status_code)
+                logger.debug("📄 WEBHOOK: Resposta = %s", response.text)
                 
                 response.raise_for_status()
-                logger.warning("✅ WEBHOOK: Mensagem enviada com sucesso!")
+                logger.info("✅ WEBHOOK: Mensagem enviada com sucesso: %s", message)
                 return True
                 
         except httpx.TimeoutException:
             logger.error("❌ WEBHOOK: Timeout ao enviar mensagem")
             return False
         except httpx.HTTPStatusError as e:
-            logger.error(f"❌ WEBHOOK: Erro HTTP {e.response.status_code}")
-            logger.error(f"❌ WEBHOOK: Resposta do servidor: {e.response.text}")
+            logger.error("❌ WEBHOOK: Erro HTTP %s", e.response.status_code)
+            logger.error("❌ WEBHOOK: Resposta do servidor: %s", e.response.text)
             return False
         except Exception as e:
-            logger.error(f"❌ WEBHOOK: Erro inesperado: {str(e)}")
-            logger.error(f"❌ WEBHOOK: URL: {self.webhook_url}")
+            logger.error("❌ WEBHOOK: Erro inesperado: %s", e)
+            logger.error("❌ WEBHOOK: URL: %s", self.webhook_url)
             return False
 
     def _format_changes(self, changes: Dict[str, Any]) -> str:
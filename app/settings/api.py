@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 from .app import AppSettings
@@ -19,6 +21,17 @@ class PaginationConfig(BaseModel):
     )
 
 
+class RateLimitQuota(BaseModel):
+    capacity: int = Field(..., ge=1, description="Rajada máxima de requisições")
+    refill_per_second: float = Field(..., gt=0, description="Requisições repostas por segundo")
+
+
+class FakeLlmConfig(BaseModel):
+    first_token_latency_ms: float = Field(default=800, ge=0, description="Latência até o primeiro token")
+    token_latency_ms: float = Field(default=20, ge=0, description="Latência entre os tokens seguintes")
+    answer_tokens: int = Field(default=60, ge=1, description="Quantidade de tokens de cada resposta")
+
+
 class ApiSettings(AppSettings):
     server_port: int = Field(default=8000, title="Porta da aplicação")
 
@@ -49,10 +62,153 @@ class ApiSettings(AppSettings):
         title="Headers que devem ser ofuscados no log de requisições",
     )
 
+    log_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        description="Registros de log em espera para o thread de escrita; acima disso são descartados",
+    )
+
+    log_budget_per_second: float = Field(
+        default=5_000, ge=0, description="Máximo de logs abaixo de WARNING por segundo no processo. 0 = sem limite"
+    )
+
+    log_sampling: dict[str, int] = Field(
+        default_factory=dict,
+        description="Prefixo do logger -> N: mantém 1 a cada N logs abaixo de WARNING (ex.: {\"app.services\": 10})",
+    )
+
+    error_log_max_body_bytes: int = Field(
+        default=2048, ge=0, description="Tamanho máximo (bytes) do corpo da requisição incluído nos logs de erro"
+    )
+
+    error_log_samples_per_window: int = Field(
+        default=20, ge=0, description="Logs de erro por slug a cada janela de amostragem. 0 = sem limite"
+    )
+
+    error_log_sample_window_seconds: float = Field(
+        default=60, gt=0, description="Duração (s) da janela de amostragem dos logs de erro"
+    )
+
+    rate_limit_enabled: bool = Field(default=True, description="Habilita o limite de requisições por usuário e rota")
+
+    rate_limit_quotas: dict[str, RateLimitQuota] = Field(
+        default_factory=lambda: {
+            "GET /seller/v1/sellers": RateLimitQuota(capacity=60, refill_per_second=20),
+            "POST /seller/v1/sellers": RateLimitQuota(capacity=10, refill_per_second=1),
+        },
+        description="Rota (`MÉTODO /caminho`) -> cota do token bucket. Rotas ausentes não são limitadas",
+    )
+
+    rate_limit_local_lease: int = Field(
+        default=4,
+        ge=0,
+        description="Fichas extras reservadas no Redis quando há folga, consumidas localmente sem nova consulta",
+    )
+
+    rate_limit_lease_ttl_seconds: float = Field(
+        default=1, gt=0, description="Validade (s) das fichas reservadas localmente"
+    )
+
+    rate_limit_anonymous: bool = Field(
+        default=False, description="Limita também as requisições sem token, por IP do cliente"
+    )
+
+    rate_limit_trusted_proxies: list[str] = Field(
+        default_factory=list,
+        description="IPs ou redes (CIDR) dos proxies confiáveis, cujo X-Forwarded-For informa o IP do cliente",
+    )
+
+    seller_list_cache_enabled: bool = Field(
+        default=True, description="Guarda no Redis as páginas serializadas da listagem de sellers"
+    )
+
+    seller_list_cache_ttl_seconds: int = Field(
+        default=60, gt=0, description="Validade (s) das páginas da listagem de sellers guardadas no Redis"
+    )
+
+    gemini_max_concurrency: int = Field(
+        default=4, ge=1, description="Chamadas simultâneas ao Gemini; as excedentes aguardam na fila"
+    )
+
+    gemini_retrieval_top_k: int = Field(
+        default=4, ge=0, description="Trechos dos PDFs enviados em cada prompt; com 0, o conteúdo completo é enviado"
+    )
+
+    gemini_chunk_words: int = Field(default=180, ge=20, description="Tamanho (em palavras) dos trechos indexados")
+
+    gemini_hybrid_weight: float = Field(
+        default=0.0, ge=0, le=1, description="Peso dos embeddings por hashing na recuperação (0 = apenas BM25)"
+    )
+
+    gemini_index_path: Optional[str] = Field(
+        default=".cache/gemini/document_index.npz",
+        description="Arquivo do índice dos PDFs, reaproveitado entre reinícios enquanto os PDFs não mudarem",
+    )
+
+    gemini_pdf_workers: int = Field(
+        default=4, ge=1, description="Processos usados para extrair o texto dos PDFs novos ou alterados"
+    )
+
+    gemini_pdf_cache_dir: Optional[str] = Field(
+        default=".cache/gemini/pdf_text",
+        description="Pasta onde o texto extraído de cada PDF é reaproveitado enquanto o arquivo não mudar",
+    )
+
+    gemini_pdf_watch_interval_seconds: float = Field(
+        default=5.0, ge=0, description="Intervalo (s) de verificação da pasta dos PDFs para recarga; 0 desativa"
+    )
+
+    gemini_chat_backend: Literal["gemini", "fake"] = Field(
+        default="gemini",
+        description="Modelo do chat: Gemini ou um modelo local simulado, sem rede, para testes de carga",
+    )
+
+    gemini_fake_llm: FakeLlmConfig = Field(
+        default=FakeLlmConfig(), description="Latências e tamanho das respostas do modelo simulado"
+    )
+
+    gemini_prompt_max_tokens: int = Field(
+        default=6000, ge=500, description="Orçamento de tokens de entrada por prompt (instrução, contexto e histórico)"
+    )
+
+    gemini_prompt_context_share: float = Field(
+        default=0.6, ge=0, le=1, description="Fração do orçamento do prompt reservada ao contexto dos PDFs"
+    )
+
+    gemini_prompt_message_max_tokens: int = Field(
+        default=500, ge=20, description="Tokens de cada mensagem do histórico enviada ao modelo"
+    )
+
+    gemini_history_ttl_seconds: int = Field(
+        default=1800, gt=0, description="Tempo (s) sem mensagens após o qual o histórico de uma sessão do chat expira"
+    )
+
+    gemini_history_max_turns: int = Field(
+        default=5, ge=1, description="Turnos (pergunta e resposta) do histórico do chat mantidos por sessão"
+    )
+
+    gemini_answer_cache_enabled: bool = Field(
+        default=True, description="Guarda no Redis as respostas do chat a perguntas feitas sem histórico"
+    )
+
+    gemini_answer_cache_ttl_seconds: int = Field(
+        default=86400, gt=0, description="Validade (s) das respostas do chat guardadas no Redis"
+    )
+
     pagination: PaginationConfig = Field(default=PaginationConfig(), description="Configurações de paginação")
 
     filter_config: FilterConfig = Field(default=FilterConfig(), description="Configurações de filtros")
 
+    fast_json_response: bool = Field(
+        default=True,
+        description="Serializa as respostas com orjson e a listagem de sellers direto para bytes via pydantic-core",
+    )
+
+    seller_cache_control: str = Field(
+        default="private, no-cache",
+        description="Cache-Control das leituras de um seller; `no-cache` faz o cliente revalidar com o ETag",
+    )
+
     enable_seller_resources: bool = Field(default=True, description="Habilita Recursos de APIs do contexto de Seller")
 
     enable_channel_resources: bool = Field(default=True, description="Habilita Recursos de APIs do contexto de Canal")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import Field, MongoDsn, RedisDsn
 from pydantic_settings import SettingsConfigDict
 
@@ -13,6 +15,15 @@ class AppSettings(BaseSettings):
     disk_usage_max: int = Field(default=80, title="Limite máximo de 80% de uso de disco")
     app_db_url_mongo: MongoDsn = Field(..., title="URI para o MongoDB")
     MONGO_DB: str = Field(..., title="Nome do banco de dados padrão")
+    MONGO_COLD_URL: Optional[MongoDsn] = Field(default=None, title="URI para o MongoDB frio (sellers inativos)")
+    MONGO_COLD_DB: str = Field(default="bd01_cold", title="Nome do banco de dados frio")
+    cold_archive_segments_path: Optional[str] = Field(
+        default=None,
+        description="Diretório de segmentos zstd usado como arquivo frio no lugar do MongoDB frio",
+    )
+    mongo_cold_max_pool_size: int = Field(
+        default=5, ge=1, description="Tamanho máximo do pool de conexões com o banco frio (leituras raras)"
+    )
 
     KEYCLOAK_URL: str = Field(..., description="URL base do Keycloak")
     KEYCLOAK_REALM_NAME: str = Field(..., description="Nome do Realm no Keycloak")
@@ -35,5 +46,28 @@ class AppSettings(BaseSettings):
 
     REDIS_URL: RedisDsn = Field(..., title="URI para o Redis")
 
+    seller_lookup_batch_window_ms: float = Field(
+        default=0,
+        ge=0,
+        description="Janela (ms) para agrupar buscas de sellers por id/cnpj em uma única consulta. 0 = mesmo tick",
+    )
+    seller_lookup_max_batch_size: int = Field(
+        default=100, ge=1, description="Quantidade máxima de chaves por consulta agrupada de sellers"
+    )
+    seller_archived_negative_cache_ttl_seconds: float = Field(
+        default=30,
+        ge=0,
+        description="Tempo (s) que uma busca sem resultado no banco frio é memorizada. 0 = desativado",
+    )
+    seller_stats_reconcile_interval_seconds: int = Field(
+        default=3600,
+        ge=1,
+        description="Intervalo (s) para reconciliar as estatísticas de sellers com uma agregação completa",
+    )
+    seller_query_reject_unindexed_sort: bool = Field(
+        default=False,
+        description="Rejeita (400) listagens cuja ordenação não é atendida por índice. Por padrão, apenas registra aviso",
+    )
+
 
 settings = AppSettings()
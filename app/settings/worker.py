@@ -9,5 +9,16 @@ class WorkerSettings(AppSettings):
         title="Workers que devem ser inicializados",
     )
 
+    cold_archiver_batch_size: int = Field(
+        default=500, ge=1, description="Quantidade de sellers inativos movidos para o banco frio por lote"
+    )
+    cold_archiver_concurrency: int = Field(default=2, ge=1, description="Quantidade de lotes arquivados em paralelo")
+    cold_archiver_max_docs_per_second: float = Field(
+        default=0, ge=0, description="Limite de sellers arquivados por segundo. 0 = sem limite"
+    )
+    cold_archiver_max_segments: int = Field(
+        default=16, ge=1, description="Segmentos do arquivo frio acima dos quais o arquivador os compacta em um só"
+    )
+
 
 worker_settings = WorkerSettings()
@@ -1,3 +1,4 @@
+from . import cold_archiver  # noqa: F401  registra o worker no worker_factory
 from .worker_factory import WorkerDefinition, WorkerFactory, WorkerInfo
 
 __all__ = ["WorkerDefinition", "WorkerFactory", "WorkerInfo"]
@@ -0,0 +1,284 @@
+"""Worker que move sellers inativos do banco quente para o banco frio."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from app.common.datetime import utcnow
+from app.integrations.archive.segment_archive import DEFAULT_MAX_SEGMENTS, SegmentArchive
+from app.integrations.database.mongo_client import MongoClient
+from app.integrations.kv_db.generation_cache import SELLER_LIST_NAMESPACE, GenerationCache
+from app.integrations.kv_db.redis_asyncio_adapter import RedisAsyncioAdapter
+from app.models.enums import SellerStatus
+from app.repositories import SellerStatsRepository
+
+from .worker_factory import WorkerDefinition, WorkerInfo, worker_factory
+
+logger = logging.getLogger(__name__)
+
+COLD_ARCHIVER_WORKER = "cold_archiver"
+COLLECTION_NAME = "sellers"
+CHECKPOINT_COLLECTION_NAME = "archiver_checkpoints"
+CHECKPOINT_ID = "sellers_inactive"
+
+
+@dataclass
+class ArchiveResult:
+    archived: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class RateLimiter:
+    """Espaça as aquisições para não ultrapassar `rate` unidades por segundo. Com 0 não limita."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_slot = 0.0
+
+    async def acquire(self, amount: int = 1) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_slot)
+        self._next_slot = start + amount / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class ColdArchiver:
+    """
+    Move sellers inativos em lotes ordenados por `_id`, sem carregar a coleção inteira em memória.
+
+    Cada lote é gravado no banco frio com `bulk_write` não ordenado (upsert idempotente), ou em um novo
+    segmento de `segment_archive` quando informado, e somente os `_id`s confirmados são removidos do
+    banco quente. Ao concluir os lotes em sequência, o último `_id`
+    é salvo como checkpoint para que uma execução interrompida continue de onde parou.
+
+    :param batch_size: Quantidade de documentos por lote.
+    :param concurrency: Quantidade máxima de lotes em processamento simultâneo.
+    :param max_docs_per_second: Limite de documentos arquivados por segundo (0 = sem limite).
+    :param stats_repository: Quando informado, as estatísticas de sellers são reconciliadas ao final.
+    :param segment_archive: Destino alternativo ao banco frio: segmentos compactados em disco.
+    :param list_cache: Cache das páginas da listagem de sellers, invalidado a cada lote arquivado.
+    :param max_segments: Com `segment_archive`, os segmentos são compactados em um só ao final da
+        execução quando passam desta quantidade.
+    """
+
+    def __init__(
+        self,
+        hot_client: MongoClient,
+        cold_client: Optional[MongoClient],
+        hot_db_name: str,
+        cold_db_name: Optional[str],
+        batch_size: int = 500,
+        concurrency: int = 2,
+        max_docs_per_second: float = 0,
+        stats_repository: Optional[SellerStatsRepository] = None,
+        segment_archive: Optional[SegmentArchive] = None,
+        list_cache: Optional[GenerationCache] = None,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+    ):
+        if cold_client is None and segment_archive is None:
+            raise ValueError("Informe o banco frio ou o arquivo de segmentos como destino")
+        hot_db = hot_client.get_database(hot_db_name)
+        self.hot_collection = hot_db[COLLECTION_NAME]
+        self.checkpoint_collection = hot_db[CHECKPOINT_COLLECTION_NAME]
+        self.cold_collection = cold_client.get_database(cold_db_name)[COLLECTION_NAME] if cold_client else None
+        self.segment_archive = segment_archive
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(max_docs_per_second)
+        self.stats_repository = stats_repository
+        self.list_cache = list_cache
+        self.max_segments = max_segments
+
+    async def load_checkpoint(self) -> Optional[Any]:
+        checkpoint = await self.checkpoint_collection.find_one({"_id": CHECKPOINT_ID})
+        return checkpoint.get("last_id") if checkpoint else None
+
+    async def save_checkpoint(self, last_id: Any) -> None:
+        # $max mantém o checkpoint monotônico mesmo com lotes concluídos fora de ordem
+        await self.checkpoint_collection.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$max": {"last_id": last_id}, "$set": {"updated_at": utcnow()}},
+            upsert=True,
+        )
+
+    async def clear_checkpoint(self) -> None:
+        await self.checkpoint_collection.delete_one({"_id": CHECKPOINT_ID})
+
+    async def _write_cold(self, docs: list[dict]) -> set[int]:
+        """Grava o lote no destino frio e retorna as posições dos documentos que falharam."""
+        if self.segment_archive is not None:
+            # O segmento é gravado de forma atômica: ou todo o lote é confirmado ou a exceção interrompe o lote
+            await asyncio.to_thread(self.segment_archive.write_segment, docs)
+            return set()
+
+        operations = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs]
+        try:
+            await self.cold_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+            logger.error(f"Falha ao gravar {len(failed_indexes)} de {len(docs)} sellers no banco frio")
+            return failed_indexes
+        return set()
+
+    async def archive_batch(self, docs: list[dict]) -> list[Any]:
+        """Grava o lote no destino frio e remove do quente os documentos confirmados. Retorna os `_id`s removidos."""
+        failed_indexes = await self._write_cold(docs)
+        confirmed = [doc["_id"] for index, doc in enumerate(docs) if index not in failed_indexes]
+        if confirmed:
+            # O filtro por status evita remover um seller reativado enquanto o lote era processado
+            await self.hot_collection.delete_many({"_id": {"$in": confirmed}, "status": SellerStatus.INACTIVE.value})
+            # Páginas de sellers inativos em cache ainda listariam os arquivados até o fim do TTL
+            if self.list_cache is not None:
+                await self.list_cache.invalidate()
+        return confirmed
+
+    async def run(self) -> ArchiveResult:
+        result = ArchiveResult()
+        last_id = await self.load_checkpoint()
+        query: dict = {"status": SellerStatus.INACTIVE.value}
+        if last_id is not None:
+            logger.info(f"Retomando arquivamento a partir do checkpoint {last_id}")
+            query["_id"] = {"$gt": last_id}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # Sinalizado pelo primeiro lote com falha: nenhum outro lote é despachado para o destino com problema
+        failed = asyncio.Event()
+        # Lotes despachados (sequência -> último _id) e quais já terminaram sem falhas
+        batch_last_ids: dict[int, Any] = {}
+        completed: set[int] = set()
+        next_to_checkpoint = 0
+        tasks: list[asyncio.Task] = []
+
+        async def process(sequence: int, docs: list[dict]) -> None:
+            nonlocal next_to_checkpoint
+            try:
+                confirmed = await self.archive_batch(docs)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                semaphore.release()
+
+            result.archived += len(confirmed)
+            result.failed += len(docs) - len(confirmed)
+            if len(confirmed) != len(docs):
+                return
+
+            completed.add(sequence)
+            advanced = None
+            while next_to_checkpoint in completed:
+                advanced = batch_last_ids[next_to_checkpoint]
+                next_to_checkpoint += 1
+            if advanced is not None:
+                await self.save_checkpoint(advanced)
+
+        async def dispatch(docs: list[dict]) -> bool:
+            await self.rate_limiter.acquire(len(docs))
+            await semaphore.acquire()
+            if failed.is_set():
+                semaphore.release()
+                return False
+            sequence = result.batches
+            batch_last_ids[sequence] = docs[-1]["_id"]
+            result.batches += 1
+            tasks.append(asyncio.create_task(process(sequence, docs)))
+            return True
+
+        try:
+            batch: list[dict] = []
+            async for doc in self.hot_collection.find(query).sort("_id", 1).batch_size(self.batch_size):
+                if failed.is_set():
+                    break
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    if not await dispatch(batch):
+                        break
+                    batch = []
+            else:
+                if batch:
+                    await dispatch(batch)
+            # Propaga a falha do lote, se houver, e interrompe os demais
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Uma falha (ou cancelamento) interrompe os lotes restantes antes de propagar o erro
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if result.failed == 0:
+            # Novos inativos podem ter `_id` menor que o checkpoint; a próxima execução recomeça do início
+            await self.clear_checkpoint()
+
+        if result.archived and self.segment_archive is not None:
+            try:
+                await asyncio.to_thread(self.segment_archive.compact, self.max_segments)
+            except Exception as e:
+                logger.error(f"Erro ao compactar os segmentos do arquivo frio: {e}")
+
+        if result.archived and self.stats_repository is not None:
+            try:
+                await self.stats_repository.reconcile()
+            except Exception as e:
+                logger.error(f"Erro ao reconciliar estatísticas após o arquivamento: {e}")
+
+        logger.info(
+            f"Arquivamento concluído: {result.archived} sellers movidos, "
+            f"{result.failed} com falha, {result.batches} lotes"
+        )
+        return result
+
+
+async def run_cold_archiver() -> ArchiveResult:
+    """Executa o arquivamento com as configurações de `WorkerSettings`."""
+    from app.settings import worker_settings
+
+    segment_archive = SegmentArchive.from_optional_path(worker_settings.cold_archive_segments_path)
+    if segment_archive is None and worker_settings.MONGO_COLD_URL is None:
+        raise ValueError("MONGO_COLD_URL ou COLD_ARCHIVE_SEGMENTS_PATH não configurada")
+
+    hot_client = MongoClient(worker_settings.app_db_url_mongo)
+    cold_client = None if segment_archive else MongoClient(worker_settings.MONGO_COLD_URL)
+    redis_adapter = RedisAsyncioAdapter(worker_settings.REDIS_URL)
+    try:
+        archiver = ColdArchiver(
+            hot_client=hot_client,
+            cold_client=cold_client,
+            hot_db_name=worker_settings.MONGO_DB,
+            cold_db_name=worker_settings.MONGO_COLD_DB,
+            batch_size=worker_settings.cold_archiver_batch_size,
+            concurrency=worker_settings.cold_archiver_concurrency,
+            max_docs_per_second=worker_settings.cold_archiver_max_docs_per_second,
+            stats_repository=SellerStatsRepository(hot_client, worker_settings.MONGO_DB),
+            segment_archive=segment_archive,
+            list_cache=GenerationCache(redis_adapter, namespace=SELLER_LIST_NAMESPACE),
+            max_segments=worker_settings.cold_archiver_max_segments,
+        )
+        return await archiver.run()
+    finally:
+        await redis_adapter.aclose()
+        hot_client.close()
+        if cold_client:
+            cold_client.close()
+        if segment_archive:
+            segment_archive.close()
+
+
+worker_factory.register(
+    COLD_ARCHIVER_WORKER,
+    WorkerDefinition(
+        WorkerInfo(COLD_ARCHIVER_WORKER, "Move sellers inativos do banco quente para o banco frio"),
+        run=run_cold_archiver,
+    ),
+)
+
+__all__ = ["ArchiveResult", "ColdArchiver", "RateLimiter", "run_cold_archiver", "COLD_ARCHIVER_WORKER"]
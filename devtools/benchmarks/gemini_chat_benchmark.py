@@ -0,0 +1,152 @@
+"""
+Benchmark do chat com o modelo simulado (sem rede): dispara requisições concorrentes em
+/seller/v1/gemini/chat (ou /chat/stream) pela pilha real da API (middlewares, rota, injeção,
+recuperação nos PDFs, prompt e memória) e mede o overhead do nosso código em torno do modelo,
+o atraso do event loop e a vazão.
+
+O overhead é a latência observada menos o tempo configurado do modelo simulado. O cliente roda no
+mesmo event loop da API, então o atraso do loop inclui também o custo do cliente HTTP. O transporte
+ASGI do httpx entrega a resposta inteira de uma vez, então no modo `--stream` só o tempo total é medido.
+
+Uso: python devtools/benchmarks/gemini_chat_benchmark.py --requests 500 --concurrency 50 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from dependency_injector import providers
+
+sys.path.append(os.getcwd())
+
+from app.api.api_application import create_app  # noqa: E402
+from app.api.router import routes  # noqa: E402
+from app.container import Container  # noqa: E402
+from app.services import GeminiService  # noqa: E402
+from app.settings import api_settings  # noqa: E402
+
+QUESTIONS = [
+    "Quais documentos são necessários para cadastrar um seller?",
+    "Quanto tempo leva a análise do cadastro?",
+    "Como alterar os dados bancários do seller?",
+    "O que acontece quando um seller fica inativo?",
+    "Quem pode ser o representante legal?",
+]
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summary(label: str, values: list[float]) -> str:
+    return (
+        f"{label:<22} p50={percentile(values, 50) * 1000:8.2f}ms p95={percentile(values, 95) * 1000:8.2f}ms "
+        f"p99={percentile(values, 99) * 1000:8.2f}ms max={max(values, default=0) * 1000:8.2f}ms"
+    )
+
+
+def build_app(service: GeminiService):
+    settings = api_settings.model_copy(update={"gemini_pdf_watch_interval_seconds": 0})
+    container = Container()
+    container.gemini_service.override(providers.Object(service))
+    # Requisições anônimas não validam token; o adapter só precisa existir para a injeção
+    container.keycloak_adapter.override(providers.Object(None))
+    container.wire(modules=["app.api.v1.routers.gemini_router"])
+    app = create_app(settings, routes)
+    app.container = container
+    return app
+
+
+async def monitor_loop_lag(interval: float, lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def run(args: argparse.Namespace) -> None:
+    service = GeminiService(
+        "offline",
+        pdfs_folder_path=args.pdfs,
+        max_concurrency=args.max_concurrency or args.concurrency,
+        chat_backend="fake",
+        fake_llm_config={
+            "first_token_latency_ms": args.latency_ms,
+            "token_latency_ms": args.token_latency_ms,
+            "answer_tokens": args.tokens,
+        },
+    )
+    model_seconds = service.chain.last.response_seconds
+    app = build_app(service)
+    path = "/seller/v1/gemini/chat/stream" if args.stream else "/seller/v1/gemini/chat"
+
+    latencies: list[float] = []
+    lags: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        while not queue.empty():
+            i = queue.get_nowait()
+            body = {"text": QUESTIONS[i % len(QUESTIONS)]}
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response.status_code != 200:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(args.lag_interval_ms / 1000, lags, stop))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    print(
+        f"{args.requests} requisições em {path}, concorrência {args.concurrency}, "
+        f"modelo simulado de {model_seconds * 1000:.0f}ms ({args.tokens} tokens)"
+    )
+    print(summary("latência", latencies))
+    print(summary("overhead", [latency - model_seconds for latency in latencies]))
+    print(summary("atraso do event loop", lags))
+    print(f"{'vazão':<22} {len(latencies) / elapsed:.1f} req/s, {errors} erros")
+    if model_seconds:
+        ceiling = min(args.concurrency, service.max_concurrency) / model_seconds
+        print(f"{'teto (só o modelo)':<22} {ceiling:.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--max-concurrency", type=int, default=0, help="Chamadas simultâneas ao modelo (padrão: --concurrency)"
+    )
+    parser.add_argument("--latency-ms", type=float, default=200, help="Latência até o primeiro token")
+    parser.add_argument("--token-latency-ms", type=float, default=0, help="Latência entre os tokens seguintes")
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--stream", action="store_true", help="Usa o endpoint SSE /chat/stream")
+    parser.add_argument("--pdfs", default="pdfs")
+    parser.add_argument("--lag-interval-ms", type=float, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
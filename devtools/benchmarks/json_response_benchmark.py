@@ -0,0 +1,113 @@
+"""
+Benchmark da serialização da listagem de sellers: caminho padrão do FastAPI (response_model +
+jsonable_encoder + JSONResponse) contra `typed_json_response`, com e sem revalidação dos sellers.
+
+Uso: python devtools/benchmarks/json_response_benchmark.py --sizes 10 50 100 --rounds 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.dependencies.utils import ModelField
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+sys.path.append(os.getcwd())
+
+from app.api.common.responses import construct_model, typed_json_response  # noqa: E402
+from app.api.common.schemas import ListResponse, Paginator  # noqa: E402
+from app.api.v1.schemas.seller_schema import SellerResponse  # noqa: E402
+from app.models.enums import AccountType, BrazilianState, ProductCategory, SellerStatus  # noqa: E402
+from app.models.seller_model import Seller  # noqa: E402
+
+
+def make_seller(i: int) -> Seller:
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    return Seller(
+        seller_id=f"seller{i:07d}",
+        status=SellerStatus.ACTIVE,
+        company_name=f"Empresa Exemplo {i} Comércio LTDA",
+        trade_name=f"Loja Exemplo {i}",
+        cnpj=f"{i:014d}",
+        state_municipal_registration=f"{i:012d}",
+        commercial_address=f"Rua das Flores, {i % 2000}, Centro, São Paulo - SP",
+        contact_phone=f"11{i % 100000000:09d}",
+        contact_email=f"contato{i}@exemplo.com.br",
+        legal_rep_full_name=f"Representante Legal {i}",
+        legal_rep_cpf=f"{i:011d}",
+        legal_rep_rg_number=f"{i:09d}",
+        legal_rep_rg_state=BrazilianState.SP,
+        legal_rep_birth_date=date(1985, 5, 20),
+        legal_rep_phone=f"11{(i * 7) % 100000000:09d}",
+        legal_rep_email=f"representante{i}@exemplo.com.br",
+        bank_name="banco exemplo",
+        agency_account=f"{i % 9999:04d}/{i:08d}-{i % 10}",
+        account_type=AccountType.CURRENT,
+        account_holder_name=f"Empresa Exemplo {i}",
+        product_categories=[ProductCategory.COMPUTING],
+        business_description="Comércio varejista de produtos diversos com entrega para todo o Brasil.",
+        created_at=created_at,
+        updated_at=created_at + timedelta(days=30),
+        created_by="system",
+    )
+
+
+def make_page(size: int):
+    paginator = Paginator(request_path="/seller/v1/sellers", limit=size, offset=0)
+    return paginator.paginate(results=[make_seller(i) for i in range(size)], filters={"status": "Ativo"})
+
+
+def trusted_body(page) -> bytes:
+    # Mesmo caminho da rota GET /sellers com `fast_json_response`
+    trusted = ListResponse[SellerResponse].model_construct(
+        meta=page.meta, results=[construct_model(SellerResponse, seller) for seller in page.results]
+    )
+    return typed_json_response(ListResponse[SellerResponse], trusted, validate=False).body
+
+
+async def legacy_body(field: ModelField, page) -> bytes:
+    content = await serialize_response(field=field, response_content=page, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def measure(rounds: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    response_type = ListResponse[SellerResponse]
+    field = create_model_field(name="response", type_=response_type, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    for size in args.sizes:
+        page = make_page(size)
+        legacy = loop.run_until_complete(legacy_body(field, page))
+        validated = typed_json_response(response_type, page).body
+        assert validated == legacy == trusted_body(page), "Saída diferente do caminho padrão do FastAPI"
+
+        legacy_seconds = measure(args.rounds, lambda: loop.run_until_complete(legacy_body(field, page)))
+        validated_seconds = measure(args.rounds, lambda: typed_json_response(response_type, page))
+        trusted_seconds = measure(args.rounds, lambda: trusted_body(page))
+        print(
+            f"{size:>4} sellers ({len(legacy) / 1024:.1f} KiB): FastAPI={legacy_seconds * 1e6:.0f}µs "
+            f"validando={validated_seconds * 1e6:.0f}µs sem revalidar={trusted_seconds * 1e6:.0f}µs "
+            f"({legacy_seconds / trusted_seconds:.1f}x)"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
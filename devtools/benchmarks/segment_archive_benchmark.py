@@ -0,0 +1,122 @@
+"""
+Benchmark do arquivo de segmentos zstd: bytes por seller e latência de busca pontual.
+
+Uso: python devtools/benchmarks/segment_archive_benchmark.py --sellers 50000 --batch-size 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import bson
+from bson import ObjectId
+
+sys.path.append(os.getcwd())
+
+from app.integrations.archive.segment_archive import SegmentArchive  # noqa: E402
+
+CATEGORIES = ["eletronicos", "moda", "casa", "games", "livros", "esporte", "beleza", "brinquedos"]
+STATES = ["SP", "RJ", "MG", "RS", "PR", "BA", "SC", "PE"]
+
+
+def make_seller(i: int) -> dict:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    return {
+        "_id": ObjectId(),
+        "seller_id": f"seller{i:07d}",
+        "company_name": f"Empresa Exemplo {i} Comércio LTDA",
+        "trade_name": f"Loja Exemplo {i}",
+        "cnpj": f"{i:014d}",
+        "state_municipal_registration": f"{i:012d}",
+        "commercial_address": f"Rua das Flores, {i % 2000}, Centro, São Paulo - SP",
+        "contact_phone": f"11{i % 100000000:09d}",
+        "contact_email": f"contato{i}@exemplo.com.br",
+        "legal_rep_full_name": f"Representante Legal {i}",
+        "legal_rep_cpf": f"{i:011d}",
+        "legal_rep_rg_number": f"{i:09d}",
+        "legal_rep_rg_state": STATES[i % len(STATES)],
+        "legal_rep_birth_date": "1985-05-20",
+        "legal_rep_phone": f"11{(i * 7) % 100000000:09d}",
+        "legal_rep_email": f"representante{i}@exemplo.com.br",
+        "bank_name": "Banco Exemplo",
+        "agency_account": f"{i % 9999:04d}/{i:08d}-{i % 10}",
+        "account_type": "Corrente",
+        "account_holder_name": f"Empresa Exemplo {i}",
+        "product_categories": random.sample(CATEGORIES, k=2),
+        "business_description": "Comércio varejista de produtos diversos com entrega para todo o Brasil.",
+        "status": "Inativo",
+        "created_at": created_at,
+        "updated_at": created_at + timedelta(days=30),
+        "created_by": "system",
+        "updated_by": "system",
+    }
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sellers", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=500, help="Sellers por segmento (lote do arquivador)")
+    parser.add_argument("--docs-per-block", type=int, default=32)
+    parser.add_argument("--level", type=int, default=10, help="Nível de compactação zstd")
+    parser.add_argument("--lookups", type=int, default=5_000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    docs = [make_seller(i) for i in range(args.sellers)]
+    raw_bytes = sum(len(bson.encode(doc)) for doc in docs)
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = SegmentArchive(directory, docs_per_block=args.docs_per_block, compression_level=args.level)
+
+        start = time.perf_counter()
+        for offset in range(0, len(docs), args.batch_size):
+            archive.write_segment(docs[offset:offset + args.batch_size])
+        write_seconds = time.perf_counter() - start
+
+        data_bytes = sum(path.stat().st_size for path in Path(directory).glob("*.seg"))
+        index_bytes = sum(path.stat().st_size for path in Path(directory).glob("*.idx"))
+
+        archive.find("seller_id", docs[0]["seller_id"])  # abre os segmentos fora da medição
+        hits, misses = [], []
+        for _ in range(args.lookups):
+            seller_id = random.choice(docs)["seller_id"]
+            start = time.perf_counter()
+            assert archive.find("seller_id", seller_id) is not None
+            hits.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            assert archive.find("cnpj", "inexistente") is None
+            misses.append(time.perf_counter() - start)
+        archive.close()
+
+    segments = -(-args.sellers // args.batch_size)
+    print(
+        f"Sellers: {args.sellers} em {segments} segmentos "
+        f"({args.docs_per_block} docs/bloco, zstd nível {args.level})"
+    )
+    print(f"BSON sem compactação: {raw_bytes / args.sellers:.0f} bytes/seller")
+    print(
+        f"Segmentos: {data_bytes / args.sellers:.0f} bytes/seller de dados + "
+        f"{index_bytes / args.sellers:.0f} de índice ({raw_bytes / (data_bytes + index_bytes):.1f}x menor)"
+    )
+    print(f"Escrita: {args.sellers / write_seconds:.0f} sellers/s")
+    for label, samples in (("Busca com acerto", hits), ("Busca sem acerto", misses)):
+        print(
+            f"{label}: p50={statistics.median(samples) * 1e6:.0f}µs "
+            f"p99={percentile(samples, 0.99) * 1e6:.0f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark do envio de emails com e sem o pool de sessões SMTP, contra o servidor SMTP local com
+latências simuladas: sem pool, cada email abre uma conexão, faz o login e encerra a conexão (como o
+`EmailService` fazia); com o pool, as conexões autenticadas são reaproveitadas.
+
+Uso: python devtools/benchmarks/smtp_pool_benchmark.py --emails 200 --threads 8 --connect-ms 80 --auth-ms 40
+"""
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.getcwd())
+
+from app.integrations.email.smtp_session_pool import SmtpSessionPool  # noqa: E402
+from tests.helpers.local_smtp_server import LocalSmtpServer  # noqa: E402
+
+SENDER = "noreply@marketplace.com"
+PASSWORD = "benchmark"
+
+
+def message(index: int) -> str:
+    return f"Subject: Bem-vindo(a) {index}\r\nContent-Type: text/html\r\n\r\n<p>Ola, seller {index}!</p>\r\n"
+
+
+def send_without_pool(server: LocalSmtpServer, index: int) -> None:
+    with smtplib.SMTP(server.host, server.port) as smtp:
+        smtp.login(SENDER, PASSWORD)
+        smtp.sendmail(SENDER, f"seller{index}@teste.com", message(index))
+
+
+def run(label: str, server: LocalSmtpServer, emails: int, threads: int, send) -> None:
+    connections = server.stats["connections"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(send, range(emails)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<10} {elapsed:8.2f}s {emails / elapsed:9.1f} emails/s "
+        f"{server.stats['connections'] - connections:6d} conexões"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="Envios simultâneos (workers do consumer)")
+    parser.add_argument("--connect-ms", type=float, default=80, help="Latência da conexão e do TLS")
+    parser.add_argument("--auth-ms", type=float, default=40, help="Latência do login")
+    parser.add_argument("--command-ms", type=float, default=2, help="Latência de cada comando SMTP")
+    args = parser.parse_args()
+
+    with LocalSmtpServer(
+        connect_latency_ms=args.connect_ms, auth_latency_ms=args.auth_ms, command_latency_ms=args.command_ms
+    ) as server:
+        print(
+            f"{args.emails} emails, {args.threads} threads, conexão {args.connect_ms:.0f}ms, "
+            f"login {args.auth_ms:.0f}ms, comando {args.command_ms:.0f}ms"
+        )
+        run("sem pool", server, args.emails, args.threads, lambda index: send_without_pool(server, index))
+
+        pool = SmtpSessionPool(
+            server.host, server.port, username=SENDER, password=PASSWORD, starttls=False, max_size=args.threads
+        )
+        run("com pool", server, args.emails, args.threads, lambda index: pool.sendmail(
+            SENDER, f"seller{index}@teste.com", message(index)
+        ))
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
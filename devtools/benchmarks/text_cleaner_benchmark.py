@@ -0,0 +1,89 @@
+"""
+Benchmark da limpeza de texto em respostas grandes do modelo: compara as passadas separadas
+de `clean_text` (HTML, ANSI, negrito, itálico e links, uma regex por vez), a passada única de
+`clean` e a limpeza incremental em trechos do tamanho de tokens, usada no streaming SSE. Confere
+também que as três produzem o mesmo texto (o texto gerado não tem sequências ambíguas de `*`).
+
+Uso: python devtools/benchmarks/text_cleaner_benchmark.py --size-kb 512 --chunk-chars 8 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.services.text_cleaner_service import TextCleanerService, clean  # noqa: E402
+
+WORDS = [
+    "seller", "cadastro", "documentos", "prazo", "análise", "contrato", "banco", "conta", "endereço",
+    "representante", "marketplace", "pedido", "entrega", "nota", "fiscal", "de", "o", "a", "para", "com",
+]
+FRAGMENTS = [
+    "**{w}**", "*{w}*", "[{w}](https://example.com/{w})", "<b>{w}</b>", "<br/>", "\x1b[32m{w}\x1b[0m",
+    "`{w}`", "{w}:", "{w},", "\n- {w}", "\n\n## {w}\n",
+]
+
+
+def generate_text(size: int, seed: int) -> str:
+    """Resposta sintética em markdown com HTML e ANSI, com cerca de `size` caracteres."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        part = rng.choice(FRAGMENTS).format(w=word) if rng.random() < 0.2 else word
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+
+def streamed_clean(service: TextCleanerService, chunks: list[str]) -> str:
+    cleaner = service.stream()
+    return "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.flush()
+
+
+def best_of(repeat: int, function, *args) -> tuple[float, str]:
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=512, help="Tamanho do texto gerado")
+    parser.add_argument("--chunk-chars", type=int, default=8, help="Tamanho dos trechos no modo incremental")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    service = TextCleanerService()
+    text = generate_text(args.size_kb * 1024, args.seed)
+    chunks = [text[i:i + args.chunk_chars] for i in range(0, len(text), args.chunk_chars)]
+    megabytes = len(text.encode()) / (1 << 20)
+
+    results = {
+        "passadas separadas": best_of(args.repeat, service.clean_text, text),
+        "passada única": best_of(args.repeat, clean, text),
+        f"incremental ({args.chunk_chars} chars)": best_of(args.repeat, streamed_clean, service, chunks),
+    }
+
+    print(f"texto de {len(text)} caracteres ({megabytes:.2f} MiB), {len(chunks)} trechos, melhor de {args.repeat}")
+    baseline = results["passadas separadas"][0]
+    for label, (seconds, _) in results.items():
+        print(
+            f"{label:<26} {seconds * 1000:9.2f}ms {megabytes / seconds:8.1f} MiB/s "
+            f"{baseline / seconds:5.2f}x"
+        )
+    outputs = {output for _, output in results.values()}
+    print(f"{'saídas iguais':<26} {'sim' if len(outputs) == 1 else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
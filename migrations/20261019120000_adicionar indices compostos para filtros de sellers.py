@@ -0,0 +1,55 @@
+from mongodb_migrations.base import BaseMigration
+import pymongo
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        """
+        Adiciona índices compostos que atendem os filtros da listagem de sellers
+        (status + categoria/estado/cnpj) e a ordenação por created_at e trade_name.
+        """
+        sellers_collection = self.db['sellers']
+
+        print("\nCriando índice composto para 'status', 'product_categories' e 'created_at'...")
+        sellers_collection.create_index(
+            [
+                ("status", pymongo.ASCENDING),
+                ("product_categories", pymongo.ASCENDING),
+                ("created_at", pymongo.DESCENDING),
+            ]
+        )
+        print("Índice composto de categorias criado com sucesso.")
+
+        print("Criando índice composto para 'status', 'legal_rep_rg_state' e 'created_at'...")
+        sellers_collection.create_index(
+            [
+                ("status", pymongo.ASCENDING),
+                ("legal_rep_rg_state", pymongo.ASCENDING),
+                ("created_at", pymongo.DESCENDING),
+            ]
+        )
+        print("Índice composto de estado do RG criado com sucesso.")
+
+        print("Criando índice composto para 'status' e 'cnpj'...")
+        sellers_collection.create_index([("status", pymongo.ASCENDING), ("cnpj", pymongo.ASCENDING)])
+        print("Índice composto de cnpj criado com sucesso.")
+
+        print("Criando índice composto para 'status' e 'trade_name'...")
+        sellers_collection.create_index([("status", pymongo.ASCENDING), ("trade_name", pymongo.ASCENDING)])
+        print("Índice composto de trade_name criado com sucesso.")
+
+    def downgrade(self):
+        """
+        Remove os índices compostos de filtros da listagem de sellers. (Rollback)
+        """
+        sellers_collection = self.db['sellers']
+
+        for index_name in (
+            "status_1_product_categories_1_created_at_-1",
+            "status_1_legal_rep_rg_state_1_created_at_-1",
+            "status_1_cnpj_1",
+            "status_1_trade_name_1",
+        ):
+            print(f"Removendo índice '{index_name}'...")
+            sellers_collection.drop_index(index_name)
+        print("Índices compostos removidos.")
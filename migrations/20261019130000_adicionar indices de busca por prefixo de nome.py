@@ -0,0 +1,57 @@
+from mongodb_migrations.base import BaseMigration
+import pymongo
+from pymongo import UpdateOne
+
+from app.common.text_normalization import build_search_keys
+
+BATCH_SIZE = 1000
+
+
+class Migration(BaseMigration):
+    def upgrade(self):
+        """
+        Preenche os campos derivados de busca (trade_name_search e company_name_search)
+        dos sellers existentes e cria os índices usados pelo autocompletar.
+        """
+        sellers_collection = self.db['sellers']
+
+        print("\nPreenchendo chaves de busca normalizadas dos sellers existentes...")
+        operations = []
+        updated = 0
+        cursor = sellers_collection.find({}, {"_id": 1, "trade_name": 1, "company_name": 1})
+        for seller in cursor:
+            operations.append(
+                UpdateOne(
+                    {"_id": seller["_id"]},
+                    {
+                        "$set": {
+                            "trade_name_search": build_search_keys(seller.get("trade_name")),
+                            "company_name_search": build_search_keys(seller.get("company_name")),
+                        }
+                    },
+                )
+            )
+            if len(operations) >= BATCH_SIZE:
+                updated += sellers_collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += sellers_collection.bulk_write(operations, ordered=False).modified_count
+        print(f"{updated} sellers atualizados.")
+
+        print("Criando índice composto para 'status' e 'trade_name_search'...")
+        sellers_collection.create_index([("status", pymongo.ASCENDING), ("trade_name_search", pymongo.ASCENDING)])
+        print("Criando índice composto para 'status' e 'company_name_search'...")
+        sellers_collection.create_index([("status", pymongo.ASCENDING), ("company_name_search", pymongo.ASCENDING)])
+        print("Índices de busca criados com sucesso.")
+
+    def downgrade(self):
+        """
+        Remove os índices e os campos derivados de busca. (Rollback)
+        """
+        sellers_collection = self.db['sellers']
+
+        print("\nRemovendo índices de busca...")
+        sellers_collection.drop_index("status_1_trade_name_search_1")
+        sellers_collection.drop_index("status_1_company_name_search_1")
+        sellers_collection.update_many({}, {"$unset": {"trade_name_search": "", "company_name_search": ""}})
+        print("Índices e campos de busca removidos.")
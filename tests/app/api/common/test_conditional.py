@@ -0,0 +1,29 @@
+from app.api.common.conditional import etag_matches, not_modified_response, strong_etag
+
+
+def test_strong_etag_is_quoted_and_stable():
+    etag = strong_etag("seller1", "2025-01-01T00:00:00+00:00")
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == strong_etag("seller1", "2025-01-01T00:00:00+00:00")
+    assert etag != strong_etag("seller1", "2025-01-02T00:00:00+00:00")
+
+
+def test_etag_matches_uses_weak_comparison_and_lists():
+    etag = strong_etag("seller1")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"outro", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"outro"', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+
+
+def test_not_modified_response_has_no_body_and_cache_headers():
+    response = not_modified_response('"abc"', "private, no-cache")
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == '"abc"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
@@ -367,3 +367,54 @@ def test_extract_error_detail_empty_loc():
     assert result.slug == "generic"
     assert result.field == ""
     assert result.ctx == {}
+
+
+def _failing_app(**options):
+    from app.common.exceptions import UnauthorizedException
+
+    app = FastAPI()
+    add_error_handlers(app, **options)
+
+    @app.post("/falha")
+    async def falha():
+        raise UnauthorizedException()
+
+    return app
+
+
+def test_error_log_redacts_sensitive_headers_and_body_fields():
+    with patch("app.api.common.error_handlers.logger") as mock_logger:
+        client = TestClient(_failing_app())
+        client.post(
+            "/falha",
+            json={"usuario": "ana", "senha": "123", "dados": {"access_token": "abc"}},
+            headers={"Authorization": "Bearer segredo", "X-Outro": "valor"},
+        )
+
+    request_info = mock_logger.warning.call_args.kwargs["extra"]["request_info"]
+    assert request_info["headers"]["authorization"] == "***"
+    assert request_info["headers"]["x-outro"] == "valor"
+    assert request_info["body"] == {"usuario": "ana", "senha": "***", "dados": {"access_token": "***"}}
+
+
+def test_error_log_skips_bodies_above_limit():
+    with patch("app.api.common.error_handlers.logger") as mock_logger:
+        client = TestClient(_failing_app(max_body_bytes=10))
+        client.post("/falha", json={"campo": "x" * 100})
+
+    body = mock_logger.warning.call_args.kwargs["extra"]["request_info"]["body"]
+    assert "omitido" in body["error"]
+
+
+def test_error_log_is_sampled_per_slug():
+    with (
+        patch("app.api.common.error_handlers.logger") as mock_logger,
+        patch("app.api.common.error_handlers._get_request_details") as mock_details,
+    ):
+        mock_details.return_value = {}
+        client = TestClient(_failing_app(samples_per_window=2, sample_window_seconds=60))
+        responses = [client.post("/falha") for _ in range(5)]
+
+    assert all(response.status_code == 401 for response in responses)
+    assert mock_logger.warning.call_count == 2
+    assert mock_details.await_count == 2
@@ -0,0 +1,218 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dependency_injector import providers
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from app.api.common.auth_handler import UserAuthInfo, get_current_user_info
+from app.api.common.error_handlers import add_error_handlers
+from app.api.common.rate_limit import RateLimiter, rate_limit_client
+from app.integrations.auth.keycloak_adapter import InvalidTokenException
+from app.models.base import UserModel
+
+ROUTE = "POST /seller/v1/sellers"
+LIST_ROUTE = "GET /seller/v1/sellers"
+QUOTAS = {ROUTE: {"capacity": 10, "refill_per_second": 1}, LIST_ROUTE: {"capacity": 1, "refill_per_second": 1}}
+
+
+def make_limiter(token_bucket: AsyncMock, **kwargs) -> RateLimiter:
+    redis_adapter = MagicMock()
+    redis_adapter.token_bucket = token_bucket
+    return RateLimiter(redis_adapter, quotas=QUOTAS, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_acquire_consumes_local_lease_before_calling_redis():
+    token_bucket = AsyncMock(return_value=(3, 0))
+    limiter = make_limiter(token_bucket, local_lease=2)
+
+    assert [await limiter.acquire("sub:user", ROUTE) for _ in range(4)] == [None] * 4
+
+    assert token_bucket.await_count == 2
+    token_bucket.assert_awaited_with(
+        "rate_limit:POST /seller/v1/sellers:sub:user", capacity=10, refill_per_second=1.0, lease=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_acquire_returns_retry_after_when_bucket_is_empty():
+    limiter = make_limiter(AsyncMock(return_value=(0, 1500)))
+
+    assert await limiter.acquire("sub:user", ROUTE) == 1.5
+
+
+@pytest.mark.asyncio
+async def test_acquire_discards_expired_lease():
+    token_bucket = AsyncMock(return_value=(5, 0))
+    limiter = make_limiter(token_bucket, local_lease=4, lease_ttl_seconds=0.001)
+
+    await limiter.acquire("sub:user", ROUTE)
+    limiter._leases = {key: (tokens, 0) for key, (tokens, _) in limiter._leases.items()}
+    await limiter.acquire("sub:user", ROUTE)
+
+    assert token_bucket.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_ignores_routes_without_quota_and_disabled_limiter():
+    token_bucket = AsyncMock(return_value=(0, 1000))
+
+    assert await make_limiter(token_bucket).acquire("sub:user", "GET /outra") is None
+    assert await make_limiter(token_bucket, enabled=None).acquire("sub:user", ROUTE) is None
+    token_bucket.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_acquire_admits_request_when_redis_fails():
+    limiter = make_limiter(AsyncMock(side_effect=ConnectionError("redis fora do ar")))
+
+    assert await limiter.acquire("sub:user", ROUTE) is None
+
+
+@pytest.fixture
+def rate_limited_client():
+    from app.api.v1.routers import seller_router
+    from app.container import Container
+
+    seller_service = AsyncMock()
+    seller_service.create.return_value = None
+    limiter = make_limiter(AsyncMock(side_effect=[(1, 0), (0, 2500)]))
+
+    container = Container()
+    container.seller_service.override(providers.Object(seller_service))
+    container.keycloak_adapter.override(providers.Object(MagicMock()))
+    container.rate_limiter.override(providers.Object(limiter))
+    container.wire(modules=[seller_router])
+
+    app = FastAPI()
+    add_error_handlers(app)
+    app.dependency_overrides[get_current_user_info] = lambda: UserAuthInfo(
+        user=UserModel(name="user", server="server"), trace_id=None, sellers=[], info_token={}
+    )
+    app.include_router(seller_router.router, prefix="/seller/v1/sellers")
+    yield TestClient(app)
+    container.unwire()
+
+
+def test_create_returns_429_with_retry_after(rate_limited_client: TestClient):
+    payload = {"seller_id": "novo", "company_name": "Nova Empresa Ltda", "trade_name": "Novo", "cnpj": "12345678000101"}
+
+    rate_limited_client.post("/seller/v1/sellers", json=payload)
+    response = rate_limited_client.post("/seller/v1/sellers", json=payload)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert response.json()["slug"] == "TOO_MANY_REQUESTS"
+
+
+def make_request(client_host: str, forwarded_for: list[str] = ()) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded_for]
+    return Request({"type": "http", "client": (client_host, 50000), "headers": headers})
+
+
+def test_client_ip_ignores_forwarded_for_from_untrusted_peer():
+    limiter = make_limiter(AsyncMock(), trusted_proxies=["10.0.0.0/8"])
+
+    assert limiter.client_ip(make_request("203.0.113.7", ["198.51.100.1"])) == "203.0.113.7"
+
+
+def test_client_ip_uses_last_untrusted_forwarded_address():
+    limiter = make_limiter(AsyncMock(), trusted_proxies=["10.0.0.0/8"])
+    # O primeiro endereço foi enviado pelo próprio cliente; o proxy acrescentou o IP real
+    request = make_request("10.0.0.5", ["1.2.3.4, 198.51.100.1", "10.0.0.9"])
+
+    assert limiter.client_ip(request) == "198.51.100.1"
+
+
+def fake_token_bucket() -> AsyncMock:
+    """Bucket de uma ficha por chave: a segunda requisição com a mesma chave é recusada."""
+    seen: set[str] = set()
+
+    async def token_bucket(key, **kwargs):
+        if key in seen:
+            return 0, 1000
+        seen.add(key)
+        return 1, 0
+
+    return AsyncMock(side_effect=token_bucket)
+
+
+@pytest.fixture
+def make_list_client():
+    from app.api.common import auth_handler, rate_limit
+    from app.container import Container
+
+    container = Container()
+    keycloak_adapter = MagicMock()
+
+    async def validate_token(token):
+        if token == "invalido":
+            raise InvalidTokenException("assinatura inválida")
+        if token == "keycloak-fora":
+            raise ConnectionError("JWKS indisponível")
+        return {"sub": token, "iss": "server"}
+
+    keycloak_adapter.validate_token = AsyncMock(side_effect=validate_token)
+    container.keycloak_adapter.override(providers.Object(keycloak_adapter))
+    container.wire(modules=[auth_handler, rate_limit])
+
+    def make(limiter: RateLimiter) -> TestClient:
+        container.rate_limiter.override(providers.Object(limiter))
+        app = FastAPI()
+        add_error_handlers(app)
+
+        @app.get("/seller/v1/sellers", dependencies=[Depends(rate_limit_client)])
+        async def list_sellers():
+            return []
+
+        return TestClient(app)
+
+    yield make
+    container.unwire()
+
+
+def test_list_limits_each_user_behind_the_same_ip_separately(make_list_client):
+    client = make_list_client(make_limiter(fake_token_bucket()))
+
+    def list_as(sub):
+        return client.get("/seller/v1/sellers", headers={"Authorization": f"Bearer {sub}"}).status_code
+
+    assert list_as("user-a") == 200
+    assert list_as("user-b") == 200
+    assert list_as("user-a") == 429
+
+
+def test_list_does_not_limit_anonymous_clients_by_default(make_list_client):
+    token_bucket = fake_token_bucket()
+    client = make_list_client(make_limiter(token_bucket))
+
+    assert [client.get("/seller/v1/sellers").status_code for _ in range(3)] == [200] * 3
+    token_bucket.assert_not_awaited()
+
+
+def test_list_limits_anonymous_clients_by_ip_when_enabled(make_list_client):
+    client = make_list_client(make_limiter(fake_token_bucket(), limit_anonymous=True))
+
+    assert client.get("/seller/v1/sellers").status_code == 200
+    assert client.get("/seller/v1/sellers").status_code == 429
+
+
+@pytest.mark.parametrize("token", ["invalido", "keycloak-fora"])
+def test_list_treats_unvalidated_token_as_anonymous(make_list_client, token):
+    token_bucket = fake_token_bucket()
+    client = make_list_client(make_limiter(token_bucket))
+
+    response = client.get("/seller/v1/sellers", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    token_bucket.assert_not_awaited()
+
+
+def test_list_limits_unvalidated_token_by_ip_when_anonymous_enabled(make_list_client):
+    token_bucket = fake_token_bucket()
+    client = make_list_client(make_limiter(token_bucket, limit_anonymous=True))
+
+    assert client.get("/seller/v1/sellers", headers={"Authorization": "Bearer invalido"}).status_code == 200
+    assert token_bucket.await_args.args[0].endswith(":ip:testclient")
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.api.common.responses import FastJSONResponse, TimedJSONResponse, construct_model, typed_json_response
+from app.api.common.schemas import ListResponse, Paginator
+from app.api.v1.schemas.seller_schema import SellerResponse
+from tests.helpers.test_fixtures import create_full_seller
+
+
+def make_page(size: int):
+    sellers = [
+        create_full_seller(
+            seller_id=f"seller{i}",
+            trade_name=f"Lojão São João {i} <&> \"aspas\"",
+            created_at=datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            updated_at=datetime(2025, 3, 2, 8, 0, tzinfo=timezone.utc),
+        )
+        for i in range(size)
+    ]
+    paginator = Paginator(request_path="/seller/v1/sellers", limit=10, offset=0)
+    return paginator.paginate(results=sellers, filters={"status": "Ativo", "cnpj": "123"})
+
+
+def legacy_body(page) -> bytes:
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/sellers", response_model=ListResponse[SellerResponse])
+    async def sellers():
+        return page
+
+    return TestClient(app).get("/sellers").content
+
+
+@pytest.mark.parametrize("size", [0, 1, 10])
+def test_typed_json_response_matches_fastapi_output_byte_for_byte(size):
+    page = make_page(size)
+
+    response = typed_json_response(ListResponse[SellerResponse], page)
+
+    assert response.media_type == "application/json"
+    assert response.body == legacy_body(page)
+
+
+@pytest.mark.parametrize("size", [0, 1, 10])
+def test_typed_json_response_without_validation_matches_fastapi_output(size):
+    # Sellers persistidos já passaram pelos validadores de escrita (ex.: bank_name em minúsculas)
+    page = make_page(size)
+    for seller in page.results:
+        seller.bank_name = seller.bank_name.lower()
+    constructed = ListResponse[SellerResponse].model_construct(
+        meta=page.meta, results=[construct_model(SellerResponse, seller) for seller in page.results]
+    )
+
+    response = typed_json_response(ListResponse[SellerResponse], constructed, validate=False)
+
+    assert response.body == legacy_body(page)
+
+
+def test_construct_model_copies_only_declared_fields():
+    seller = create_full_seller(seller_id="seller1")
+
+    response = construct_model(SellerResponse, seller)
+
+    assert isinstance(response, SellerResponse)
+    assert response.seller_id == "seller1"
+    assert response.status == seller.status
+    assert not hasattr(response, "created_at")
+
+
+def test_fast_json_response_matches_json_response():
+    content = {"nome": "João", "itens": [1, 2.5, None, True], "texto": "linha\nnova \"aspas\"  "}
+
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+def test_fast_json_response_accepts_non_string_keys():
+    assert FastJSONResponse({1: "a"}).body == b'{"1":"a"}'
+
+
+def test_timed_json_response_is_plain_json_response():
+    assert TimedJSONResponse({"a": 1}).body == JSONResponse({"a": 1}).body
@@ -0,0 +1,67 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.common.responses import TimedJSONResponse
+from app.api.middlewares.request_logging import RequestLoggingMiddleware
+from app.common.server_timing import timed
+
+LOGGER_NAME = "app.api.middlewares.request_logging"
+
+
+def make_client(**middleware_options) -> TestClient:
+    app = FastAPI(default_response_class=TimedJSONResponse)
+
+    @app.get("/sellers")
+    async def sellers():
+        with timed("mongo"):
+            pass
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(RequestLoggingMiddleware, **middleware_options)
+    return TestClient(app)
+
+
+def test_server_timing_header_includes_stages_and_total():
+    response = make_client().get("/sellers")
+
+    server_timing = response.headers["Server-Timing"]
+    assert response.status_code == 200
+    assert "mongo;dur=" in server_timing
+    assert "serialization;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+
+def test_logs_single_line_per_request(caplog):
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        make_client().get("/sellers")
+
+    records = [record for record in caplog.records if record.name == LOGGER_NAME]
+    assert len(records) == 1
+    assert records[0].args[:3] == ("GET", "/sellers", 200)
+
+
+def test_ignored_urls_are_not_logged(caplog):
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        response = make_client(ignored_urls={"/health"}).get("/health")
+
+    assert "Server-Timing" in response.headers
+    assert not [record for record in caplog.records if record.name == LOGGER_NAME]
+
+
+def test_logs_selected_headers_with_obfuscation(caplog):
+    client = make_client(headers_to_log={"User-Agent", "Authorization"}, headers_to_obfuscate={"authorization"})
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        client.get("/sellers", headers={"Authorization": "Bearer segredo", "User-Agent": "teste", "X-Outro": "x"})
+
+    message = [record for record in caplog.records if record.name == LOGGER_NAME][0].getMessage()
+    assert "'authorization': '***'" in message
+    assert "'user-agent': 'teste'" in message
+    assert "segredo" not in message
+    assert "x-outro" not in message
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import MagicMock, Mock, AsyncMock
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from dependency_injector import containers, providers
@@ -14,7 +14,7 @@ CHAT = "/chat"
 def mock_gemini_service():
     """Mock do serviço Gemini"""
     mock = Mock()
-    mock.chat = Mock(return_value=RESPOSTA_GEMINI)
+    mock.achat = AsyncMock(return_value=RESPOSTA_GEMINI)
     return mock
 
 
@@ -28,6 +28,10 @@ def client(mock_gemini_service):
     # Container para dependency injection
     container = Container()
     container.gemini_service.override(providers.Object(mock_gemini_service))
+
+    mock_keycloak_adapter = MagicMock()
+    mock_keycloak_adapter.validate_token = AsyncMock(return_value={"sub": "user-123", "iss": "keycloak"})
+    container.keycloak_adapter.override(providers.Object(mock_keycloak_adapter))
     
     # Wire the container to the router module
     container.wire(modules=["app.api.v1.routers.gemini_router"])
@@ -40,7 +44,7 @@ def client(mock_gemini_service):
 
 def test_chat_success(client, mock_gemini_service):
     """Testa chat com sucesso."""
-    mock_gemini_service.chat.return_value = RESPOSTA_GEMINI
+    mock_gemini_service.achat.return_value = RESPOSTA_GEMINI
     
     response = client.post(CHAT, json={"text": "Olá"})
     
@@ -48,12 +52,12 @@ def test_chat_success(client, mock_gemini_service):
     data = response.json()
     assert data["response"] == RESPOSTA_GEMINI
     assert "timestamp" in data
-    mock_gemini_service.chat.assert_called_once_with("Olá")
+    mock_gemini_service.achat.assert_called_once_with("Olá", None)
 
 
 def test_chat_service_error(client, mock_gemini_service):
     """Testa erro no serviço."""
-    mock_gemini_service.chat.side_effect = Exception("Erro do serviço")
+    mock_gemini_service.achat.side_effect = Exception("Erro do serviço")
     
     response = client.post(CHAT, json={"text": "Olá"})
     
@@ -84,27 +88,27 @@ def test_chat_empty_text(client):
 def test_chat_long_text(client, mock_gemini_service):
     """Testa chat com texto longo."""
     long_text = "a" * 1000
-    mock_gemini_service.chat.return_value = "Resposta para texto longo"
+    mock_gemini_service.achat.return_value = "Resposta para texto longo"
     
     response = client.post(CHAT, json={"text": long_text})
     
     assert response.status_code == 200
     data = response.json()
     assert data["response"] == "Resposta para texto longo"
-    mock_gemini_service.chat.assert_called_once_with(long_text)
+    mock_gemini_service.achat.assert_called_once_with(long_text, None)
 
 
 def test_chat_special_characters(client, mock_gemini_service):
     """Testa chat com caracteres especiais."""
     special_text = "Olá! Como está? 😊 #hashtag @mention"
-    mock_gemini_service.chat.return_value = "Resposta especial"
+    mock_gemini_service.achat.return_value = "Resposta especial"
     
     response = client.post(CHAT, json={"text": special_text})
     
     assert response.status_code == 200
     data = response.json()
     assert data["response"] == "Resposta especial"
-    mock_gemini_service.chat.assert_called_once_with(special_text)
+    mock_gemini_service.achat.assert_called_once_with(special_text, None)
 
 
 def test_chat_response_schema_validation():
@@ -140,7 +144,7 @@ def test_chat_request_schema_validation():
 def test_chat_with_different_exception_types(client, mock_gemini_service):
     """Testa diferentes tipos de exceções."""
     # Teste com ValueError
-    mock_gemini_service.chat.side_effect = ValueError("Valor inválido")
+    mock_gemini_service.achat.side_effect = ValueError("Valor inválido")
     response = client.post(CHAT, json={"text": "teste"})
     assert response.status_code == 500
     assert "Valor inválido" in response.json()["detail"]
@@ -149,7 +153,7 @@ def test_chat_with_different_exception_types(client, mock_gemini_service):
     mock_gemini_service.reset_mock()
     
     # Teste com TypeError
-    mock_gemini_service.chat.side_effect = TypeError("Tipo inválido")
+    mock_gemini_service.achat.side_effect = TypeError("Tipo inválido")
     response = client.post(CHAT, json={"text": "teste"})
     assert response.status_code == 500
     assert "Tipo inválido" in response.json()["detail"]
@@ -157,11 +161,76 @@ def test_chat_with_different_exception_types(client, mock_gemini_service):
 
 def test_chat_none_response(client, mock_gemini_service):
     """Testa quando o serviço retorna None."""
-    mock_gemini_service.chat.return_value = None
+    mock_gemini_service.achat.return_value = None
     
     response = client.post(CHAT, json={"text": "Olá"})
     
     assert response.status_code == 200
     data = response.json()
     assert data["response"] is None
-    assert "timestamp" in data
\ No newline at end of file
+    assert "timestamp" in data
+
+
+def test_chat_stream_sends_sse_events(client, mock_gemini_service):
+    """Testa o chat via SSE: um evento por trecho e `done` ao final."""
+    async def chunks(text, session_id):
+        for chunk in ("Olá", ", tudo bem?"):
+            yield chunk
+
+    mock_gemini_service.astream_response = Mock(side_effect=chunks)
+
+    response = client.post("/chat/stream", json={"text": "Oi"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0] == 'event: message\ndata: {"text": "Olá"}'
+    assert events[1] == 'event: message\ndata: {"text": ", tudo bem?"}'
+    assert events[2].startswith("event: done")
+    mock_gemini_service.astream_response.assert_called_once_with("Oi", None)
+
+
+def test_chat_stream_reports_error_event(client, mock_gemini_service):
+    """Testa falha no meio do stream: o trecho já enviado é mantido e um evento `error` encerra."""
+    async def chunks(text, session_id):
+        yield "Parcial"
+        raise RuntimeError("Gemini indisponível")
+
+    mock_gemini_service.astream_response = Mock(side_effect=chunks)
+
+    response = client.post("/chat/stream", json={"text": "Oi"})
+
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0] == 'event: message\ndata: {"text": "Parcial"}'
+    assert events[1].startswith("event: error")
+    assert "Gemini indisponível" not in response.text
+
+
+def test_chat_uses_token_sub_as_session(client, mock_gemini_service):
+    """Testa que o histórico é separado pelo `sub` do token e, opcionalmente, pela conversa."""
+    headers = {"Authorization": "Bearer token"}
+
+    client.post(CHAT, json={"text": "Olá"}, headers=headers)
+    client.post(CHAT, json={"text": "Olá"}, headers={**headers, "X-Session-ID": "conversa-2"})
+
+    assert [c.args for c in mock_gemini_service.achat.call_args_list] == [
+        ("Olá", "user-123"),
+        ("Olá", "user-123:conversa-2"),
+    ]
+
+
+def test_chat_session_header_without_token_is_ignored(client, mock_gemini_service):
+    """Testa que sem token não há sessão, mesmo com `X-Session-ID`."""
+    client.post(CHAT, json={"text": "Olá"}, headers={"X-Session-ID": "conversa-2"})
+
+    mock_gemini_service.achat.assert_called_once_with("Olá", None)
+
+
+def test_reset_chat_history(client, mock_gemini_service):
+    """Testa o descarte do histórico da sessão."""
+    mock_gemini_service.areset_memory = AsyncMock()
+
+    response = client.delete("/chat/history", headers={"Authorization": "Bearer token"})
+
+    assert response.status_code == 204
+    mock_gemini_service.areset_memory.assert_awaited_once_with("user-123")
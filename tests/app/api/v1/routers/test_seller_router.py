@@ -1,4 +1,5 @@
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from starlette import status
@@ -47,3 +48,244 @@ def test_get_by_id_protected(client: TestClient, mock_seller_service: AsyncMock)
     
     # Estrutura está ok mesmo que falhe na autenticação ou método
     assert response.status_code in [200, 401, 403, 404, 405]
+
+
+@pytest.fixture
+def lookup_client(mock_seller_service: AsyncMock):
+    from dependency_injector import providers
+    from fastapi import FastAPI
+
+    from app.api.common.auth_handler import UserAuthInfo, get_current_user_info
+    from app.api.v1.routers import seller_router
+    from app.container import Container
+    from app.models.base import UserModel
+
+    app = FastAPI()
+    container = Container()
+    container.seller_service.override(providers.Object(mock_seller_service))
+    container.keycloak_adapter.override(providers.Object(MagicMock()))
+    container.wire(modules=[seller_router])
+    app.dependency_overrides[get_current_user_info] = lambda: UserAuthInfo(
+        user=UserModel(name="user", server="server"), trace_id=None, sellers=["seller1", "seller2"], info_token={}
+    )
+    app.include_router(seller_router.router, prefix=SELLER_BASE)
+    return TestClient(app)
+
+
+def test_lookup_returns_only_accessible_sellers(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    seller1 = create_full_seller(seller_id="seller1", cnpj="11111111111111")
+    other = create_full_seller(seller_id="other", cnpj="99999999999999")
+    mock_seller_service.find_many.return_value = [seller1, other]
+
+    response = lookup_client.post(
+        f"{SELLER_BASE}/lookup",
+        json={"seller_ids": ["seller1", "seller2", "other"], "cnpjs": ["99999999999999"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert [seller["seller_id"] for seller in body["results"]] == ["seller1"]
+    assert body["not_found"] == ["seller2", "other", "99999999999999"]
+    mock_seller_service.find_many.assert_awaited_once_with(
+        seller_ids=["seller1", "seller2"], cnpjs=["99999999999999"]
+    )
+
+
+def test_lookup_requires_at_least_one_key(lookup_client: TestClient):
+    response = lookup_client.post(f"{SELLER_BASE}/lookup", json={})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_all_sellers_forwards_filters(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    mock_seller_service.find.return_value = []
+
+    response = lookup_client.get(
+        SELLER_BASE,
+        params={
+            "status": "Inativo",
+            "legal_rep_rg_state": "SP",
+            "cnpj": "123",
+            "created_at__ge": "2025-01-01T00:00:00Z",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    filters = mock_seller_service.find.call_args.kwargs["filters"]
+    assert filters["status"] == "Inativo"
+    assert filters["legal_rep_rg_state"] == "SP"
+    assert filters["cnpj"] == {"$regex": "^123"}
+    assert "$gte" in filters["created_at"]
+    assert "status=Inativo" in response.json()["meta"]["links"]["self"]
+
+
+@pytest.fixture
+def list_cache_client(mock_seller_service: AsyncMock):
+    from dependency_injector import providers
+    from fastapi import FastAPI
+
+    from app.api.v1.routers import seller_router
+    from app.container import Container
+    from app.integrations.kv_db.generation_cache import GenerationCache
+
+    store = {}
+    redis_adapter = MagicMock()
+    redis_adapter.get_str = AsyncMock(side_effect=lambda key: store.get(key))
+    redis_adapter.get_bytes = AsyncMock(side_effect=lambda key: store.get(key))
+    redis_adapter.set_bytes = AsyncMock(side_effect=lambda key, value, ttl: store.__setitem__(key, value))
+    redis_adapter.incr = AsyncMock(side_effect=lambda key: store.__setitem__(key, str(int(store.get(key, 0)) + 1)))
+
+    app = FastAPI()
+    container = Container()
+    container.seller_service.override(providers.Object(mock_seller_service))
+    container.seller_list_cache.override(providers.Object(GenerationCache(redis_adapter, namespace="seller_list")))
+    container.wire(modules=[seller_router])
+    app.include_router(seller_router.router, prefix=SELLER_BASE)
+    return TestClient(app), container.seller_list_cache()
+
+
+def test_get_all_sellers_serves_cached_page_until_invalidated(list_cache_client, mock_seller_service: AsyncMock):
+    client, list_cache = list_cache_client
+    mock_seller_service.find.return_value = [create_full_seller(seller_id="seller1")]
+
+    first = client.get(SELLER_BASE, params={"_limit": 10, "_sort": "created_at:desc"})
+    second = client.get(SELLER_BASE, params={"_sort": "created_at:desc", "_limit": 10})
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert second.json()["results"][0]["seller_id"] == "seller1"
+    assert mock_seller_service.find.await_count == 1
+
+    client.get(SELLER_BASE, params={"_limit": 10, "_offset": 10, "_sort": "created_at:desc"})
+    assert mock_seller_service.find.await_count == 2
+
+    asyncio.run(list_cache.invalidate())
+    client.get(SELLER_BASE, params={"_limit": 10, "_sort": "created_at:desc"})
+    assert mock_seller_service.find.await_count == 3
+
+
+def test_get_all_sellers_rejects_invalid_filter(lookup_client: TestClient):
+    response = lookup_client.get(SELLER_BASE, params={"cnpj": "abc"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_search_sellers(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    mock_seller_service.search.return_value = [{"seller_id": "s1", "trade_name": "Loja", "company_name": "Loja SA"}]
+
+    response = lookup_client.get(f"{SELLER_BASE}/search", params={"q": "lo", "_limit": 5})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"results": [{"seller_id": "s1", "trade_name": "Loja", "company_name": "Loja SA"}]}
+    mock_seller_service.search.assert_awaited_once_with("lo", limit=5)
+
+
+def test_search_sellers_requires_query(lookup_client: TestClient):
+    response = lookup_client.get(f"{SELLER_BASE}/search")
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_stats(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    mock_seller_service.get_stats.return_value = {
+        "_id": "sellers",
+        "total": 2,
+        "by_status": {"Ativo": 2},
+        "by_account_type": {"PJ": 2},
+    }
+
+    response = lookup_client.get(f"{SELLER_BASE}/stats")
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["total"] == 2
+    assert body["by_status"] == {"Ativo": 2}
+    assert body["by_product_categories"] == {}
+    assert "_id" not in body
+
+
+def test_buscar_include_archived(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    mock_seller_service.find_by_id.return_value = create_full_seller(seller_id="seller1", status="Inativo")
+
+    response = lookup_client.get(f"{SELLER_BASE}/buscar", params={"seller_id": "seller1", "include_archived": True})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "Inativo"
+    mock_seller_service.find_by_id.assert_awaited_once_with("seller1", include_archived=True)
+
+
+def _versioned_seller():
+    from datetime import datetime, timezone
+
+    return create_full_seller(
+        seller_id="seller1",
+        cnpj="11111111111111",
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 2, 1, 10, 30, tzinfo=timezone.utc),
+    )
+
+
+def test_get_by_id_or_cnpj_returns_etag_and_cache_control(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    mock_seller_service.find_by_id.return_value = _versioned_seller()
+
+    response = lookup_client.get(f"{SELLER_BASE}/buscar", params={"seller_id": "seller1"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"].startswith('"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    mock_seller_service.find_version.assert_not_awaited()
+
+
+def test_get_by_id_or_cnpj_returns_304_without_loading_seller(
+    lookup_client: TestClient, mock_seller_service: AsyncMock
+):
+    seller = _versioned_seller()
+    mock_seller_service.find_by_id.return_value = seller
+    etag = lookup_client.get(f"{SELLER_BASE}/buscar", params={"seller_id": "seller1"}).headers["ETag"]
+    mock_seller_service.find_by_id.reset_mock()
+    mock_seller_service.find_version.return_value = seller.model_dump(
+        include={"seller_id", "cnpj", "status", "created_at", "updated_at"}, mode="python"
+    ) | {"status": "Ativo"}
+
+    response = lookup_client.get(
+        f"{SELLER_BASE}/buscar", params={"cnpj": "11111111111111"}, headers={"If-None-Match": f'W/{etag}, "outro"'}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    mock_seller_service.find_version.assert_awaited_once_with(seller_id=None, cnpj="11111111111111")
+    mock_seller_service.find_by_id.assert_not_awaited()
+    mock_seller_service.find_by_cnpj.assert_not_awaited()
+
+
+def test_get_by_id_or_cnpj_reads_seller_when_etag_changed(lookup_client: TestClient, mock_seller_service: AsyncMock):
+    seller = _versioned_seller()
+    mock_seller_service.find_by_id.return_value = seller
+    mock_seller_service.find_version.return_value = {
+        "seller_id": "seller1", "cnpj": seller.cnpj, "status": "Ativo", "updated_at": seller.updated_at
+    }
+
+    response = lookup_client.get(
+        f"{SELLER_BASE}/buscar", params={"seller_id": "seller1"}, headers={"If-None-Match": '"antigo"'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["seller_id"] == "seller1"
+    assert response.headers["ETag"] != '"antigo"'
+
+
+def test_get_by_id_or_cnpj_ignores_etag_of_inaccessible_seller(
+    lookup_client: TestClient, mock_seller_service: AsyncMock
+):
+    seller = _versioned_seller()
+    mock_seller_service.find_version.return_value = {
+        "seller_id": "other", "cnpj": seller.cnpj, "status": "Ativo", "updated_at": seller.updated_at
+    }
+    mock_seller_service.find_by_cnpj.return_value = create_full_seller(seller_id="other", cnpj=seller.cnpj)
+
+    response = lookup_client.get(
+        f"{SELLER_BASE}/buscar", params={"cnpj": seller.cnpj}, headers={"If-None-Match": "*"}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,179 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from dependency_injector import providers
+from fastapi import FastAPI
+from starlette import status
+from starlette.testclient import TestClient
+
+from app.api.common.error_handlers import add_error_handlers
+from app.integrations.archive.segment_archive import SegmentArchive
+from app.repositories import SellerRepository
+from app.services import SellerService
+from app.worker.cold_archiver import ColdArchiver
+from tests.helpers.test_fixtures import create_full_seller
+
+SELLER_BASE = "/seller/v1/sellers"
+SELLER_ID = "loja01"
+CNPJ = "12345678000199"
+
+
+def _matches(doc: dict, filters: dict) -> bool:
+    for field, condition in filters.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gt" in condition and not (value is not None and value > condition["$gt"]):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class InMemoryCursor:
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+
+    def sort(self, field, direction=1):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction == -1)
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    def __aiter__(self):
+        async def gen():
+            for doc in self.docs:
+                yield dict(doc)
+
+        return gen()
+
+
+class InMemoryCollection:
+    """Subconjunto da coleção do Motor usado pelo repositório de sellers e pelo arquivador."""
+
+    def __init__(self):
+        self.docs: list[dict] = []
+
+    async def insert_one(self, doc: dict):
+        self.docs.append({"_id": ObjectId(), **doc})
+
+    async def find_one(self, filters: dict, projection: dict = None):
+        doc = next((doc for doc in self.docs if _matches(doc, filters)), None)
+        if doc is None or projection is None:
+            return dict(doc) if doc else None
+        return {field: doc[field] for field, include in projection.items() if include and field in doc}
+
+    async def find_one_and_update(self, filters: dict, update: dict, return_document=False):
+        doc = next((doc for doc in self.docs if _matches(doc, filters)), None)
+        if doc is not None:
+            doc.update(update["$set"])
+        return dict(doc) if doc else None
+
+    def find(self, filters: dict, projection: dict = None):
+        return InMemoryCursor([doc for doc in self.docs if _matches(doc, filters)])
+
+    async def delete_many(self, filters: dict):
+        self.docs = [doc for doc in self.docs if not _matches(doc, filters)]
+
+    async def update_one(self, *args, **kwargs):
+        pass
+
+    async def delete_one(self, filters: dict):
+        await self.delete_many(filters)
+
+
+@pytest.fixture
+def hot_client():
+    collections: dict[str, InMemoryCollection] = {}
+    database = MagicMock()
+    database.__getitem__ = lambda self, name: collections.setdefault(name, InMemoryCollection())
+    client = MagicMock()
+    client.get_database.return_value = database
+    return client
+
+
+@pytest.fixture
+def tokens():
+    """Token -> claims validadas pelo Keycloak; o atributo `sellers` do dono muda com a exclusão."""
+    return {
+        "owner": {"sub": "owner", "iss": "server", "sellers": SELLER_ID},
+        "admin": {"sub": "admin", "iss": "server", "realm_access": {"roles": ["realm-admin"]}},
+        "other": {"sub": "other", "iss": "server", "sellers": ""},
+    }
+
+
+@pytest.fixture
+def archive_client(hot_client, tokens, tmp_path):
+    from app.api.v1.routers import seller_router
+    from app.container import Container
+
+    segment_archive = SegmentArchive(tmp_path)
+    repository = SellerRepository(hot_client, "bd01", segment_archive=segment_archive)
+    keycloak_client = AsyncMock()
+
+    async def remove_seller_from_user(user_id, seller_to_remove):
+        tokens[user_id]["sellers"] = ""
+
+    keycloak_client.remove_seller_from_user.side_effect = remove_seller_from_user
+    seller_service = SellerService(repository, keycloak_client)
+    seller_service.webhook_service = AsyncMock()
+
+    keycloak_adapter = MagicMock()
+    keycloak_adapter.validate_token = AsyncMock(side_effect=lambda token: dict(tokens[token]))
+
+    container = Container()
+    container.seller_service.override(providers.Object(seller_service))
+    container.keycloak_adapter.override(providers.Object(keycloak_adapter))
+    container.wire(modules=[seller_router])
+
+    app = FastAPI()
+    add_error_handlers(app)
+    app.include_router(seller_router.router, prefix=SELLER_BASE)
+    yield TestClient(app), repository, segment_archive
+    container.unwire()
+    segment_archive.close()
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_admin_reads_seller_deleted_and_archived(archive_client, hot_client):
+    client, repository, segment_archive = archive_client
+    await repository.create(create_full_seller(seller_id=SELLER_ID, cnpj=CNPJ))
+    assert client.get(f"{SELLER_BASE}/{SELLER_ID}", headers=_auth("owner")).status_code == status.HTTP_200_OK
+
+    response = client.delete(f"{SELLER_BASE}/{SELLER_ID}", headers=_auth("owner"))
+    assert response.status_code == status.HTTP_200_OK
+    result = await ColdArchiver(hot_client, None, "bd01", None, segment_archive=segment_archive).run()
+    assert result.archived == 1
+    assert await repository.find_by_id(SELLER_ID) is None
+
+    by_id = client.get(f"{SELLER_BASE}/{SELLER_ID}", params={"include_archived": True}, headers=_auth("admin"))
+    by_cnpj = client.get(
+        f"{SELLER_BASE}/buscar", params={"cnpj": CNPJ, "include_archived": True}, headers=_auth("admin")
+    )
+
+    assert by_id.status_code == status.HTTP_200_OK
+    assert by_id.json()["status"] == "Inativo"
+    assert by_cnpj.status_code == status.HTTP_200_OK
+    assert by_cnpj.json()["seller_id"] == SELLER_ID
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token, params",
+    [("admin", {}), ("owner", {"include_archived": True}), ("other", {"include_archived": True})],
+)
+async def test_deleted_seller_stays_hidden_without_admin_and_include_archived(archive_client, token, params):
+    client, repository, _ = archive_client
+    await repository.create(create_full_seller(seller_id=SELLER_ID, cnpj=CNPJ))
+    client.delete(f"{SELLER_BASE}/{SELLER_ID}", headers=_auth("owner"))
+
+    response = client.get(f"{SELLER_BASE}/{SELLER_ID}", params=params, headers=_auth(token))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -46,7 +46,7 @@ class TestSellerRouterHelpers:
         )
         
         assert result == mock_seller
-        mock_seller_service.find_by_id.assert_called_once_with("seller1")
+        mock_seller_service.find_by_id.assert_called_once_with("seller1", include_archived=False)
         
     @pytest.mark.asyncio
     async def test_find_seller_by_id_with_access_check_no_permission(self, mock_user_auth_info, mock_seller_service):
@@ -72,7 +72,7 @@ class TestSellerRouterHelpers:
         
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == "Seller não encontrado"
-        mock_seller_service.find_by_id.assert_called_once_with("seller1")
+        mock_seller_service.find_by_id.assert_called_once_with("seller1", include_archived=False)
         
     @pytest.mark.asyncio
     async def test_find_seller_by_cnpj_with_access_check_success(self, mock_user_auth_info, mock_seller_service):
@@ -87,7 +87,7 @@ class TestSellerRouterHelpers:
         )
         
         assert result == mock_seller
-        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234")
+        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234", include_archived=False)
         
     @pytest.mark.asyncio
     async def test_find_seller_by_cnpj_with_access_check_seller_not_found(self, mock_user_auth_info, mock_seller_service):
@@ -101,7 +101,7 @@ class TestSellerRouterHelpers:
         
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == "Seller não encontrado"
-        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234")
+        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234", include_archived=False)
         
     @pytest.mark.asyncio
     async def test_find_seller_by_cnpj_with_access_check_no_permission(self, mock_user_auth_info, mock_seller_service):
@@ -118,7 +118,7 @@ class TestSellerRouterHelpers:
         
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == SELLER_NOT_FOUND_OR_ACCESS_DENIED
-        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234")
+        mock_seller_service.find_by_cnpj.assert_called_once_with("12345678901234", include_archived=False)
 
 
 class TestSellerRouterEndpoints:
@@ -8,6 +8,8 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from app.api.v1.routers.seller_router import router as seller_router
 from app.api.common.auth_handler import UserAuthInfo
+from app.api.common.rate_limit import RateLimiter
+from app.integrations.kv_db.generation_cache import GenerationCache
 from app.models.base import UserModel
 
 
@@ -19,11 +21,24 @@ class TestSellerRouterSimple:
     """Testes simples para seller_router"""
     
     @pytest.fixture
-    def mock_app(self):
-        """Cria uma app FastAPI mockada para os testes"""
+    def mock_app(self, mock_seller_service):
+        """Cria uma app FastAPI mockada para os testes, com o container conectado ao router"""
+        from dependency_injector import providers
+
+        from app.api.v1.routers import seller_router as seller_router_module
+        from app.container import Container
+
+        container = Container()
+        container.seller_service.override(providers.Object(mock_seller_service))
+        container.seller_list_cache.override(providers.Object(GenerationCache(MagicMock(), "sellers", enabled=False)))
+        container.rate_limiter.override(providers.Object(RateLimiter(MagicMock(), enabled=False)))
+        container.keycloak_adapter.override(providers.Object(MagicMock()))
+        container.wire(modules=[seller_router_module])
+
         app = FastAPI()
         app.include_router(seller_router, prefix=SELLER)
-        return app
+        yield app
+        container.unwire()
     
     @pytest.fixture  
     def mock_user_auth_info(self):
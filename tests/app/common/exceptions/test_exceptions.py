@@ -2,6 +2,7 @@ import pytest
 
 from app.common.error_codes import ErrorCodes
 from app.common.exceptions.application_exception import ApplicationException
+from app.common.exceptions.too_many_requests_exception import TooManyRequestsException
 from app.common.exceptions.unauthorized_exception import UnauthorizedException
 
 
@@ -94,3 +95,13 @@ def test_error_codes_not_found():
     assert not_found.slug == "NOT_FOUND"
     assert not_found.message == "Not found"
     assert not_found.http_code == 404
+
+
+def test_too_many_requests_exception_sets_retry_after():
+    """Test TooManyRequestsException rounds Retry-After up to whole seconds"""
+    exception = TooManyRequestsException(retry_after_seconds=0.2)
+
+    assert exception.status_code == 429
+    assert exception.slug == "TOO_MANY_REQUESTS"
+    assert exception.headers == {"Retry-After": "1"}
+    assert "1s" in exception.message
@@ -0,0 +1,168 @@
+import logging
+import queue
+from unittest.mock import patch
+
+from app.common.log_pipeline import LazyQueueHandler, LogBudgetFilter, LogSampler, QueueLogSink, SamplingFilter
+
+
+def _record(msg="valor: %s", args=("a",), name="teste", level=logging.INFO):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_lazy_queue_handler_resolves_message_on_caller_thread():
+    handler = LazyQueueHandler(queue.Queue())
+    details = {"status": "ativo"}
+    record = _record(msg="detalhes: %s", args=(details,))
+
+    handler.handle(record)
+    details["status"] = "alterado depois"
+
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "detalhes: {'status': 'ativo'}"
+    assert queued.args is None
+    # O registro original segue intacto para os demais handlers
+    assert record.msg == "detalhes: %s"
+    assert record.args is not None
+
+
+def test_lazy_queue_handler_drops_when_queue_is_full():
+    handler = LazyQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert handler.dropped == 1
+
+
+def test_queue_log_sink_forwards_to_root_handlers():
+    received = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            received.append(record.getMessage())
+
+    collector = Collector()
+    root = logging.getLogger()
+    root.addHandler(collector)
+    sink = QueueLogSink("tests.log_pipeline.sink")
+    try:
+        sink.start()
+        sink.start()
+        logger = logging.getLogger("tests.log_pipeline.sink")
+        logger.setLevel(logging.INFO)
+        logger.info("mensagem %s", 1)
+    finally:
+        sink.stop()
+        root.removeHandler(collector)
+
+    assert received == ["mensagem 1"]
+    assert not sink.started
+    assert logging.getLogger("tests.log_pipeline.sink").propagate
+
+
+def test_root_queue_log_sink_moves_root_handlers_to_listener():
+    received = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            received.append(record.getMessage())
+
+    root = logging.getLogger()
+    original_handlers = list(root.handlers)
+    collector = Collector()
+    root.addHandler(collector)
+    sink = QueueLogSink()
+    named_sink = QueueLogSink("tests.log_pipeline.root")
+    try:
+        sink.start()
+        assert root.handlers == [sink.handler]
+        named_sink.start()
+
+        logger = logging.getLogger("tests.log_pipeline.root")
+        logger.setLevel(logging.INFO)
+        logger.info("mensagem %s", 2)
+    finally:
+        named_sink.stop()
+        sink.stop()
+        root.removeHandler(collector)
+
+    assert received == ["mensagem 2"]
+    assert named_sink.handler.queue.empty()
+    assert root.handlers == original_handlers
+
+
+def test_named_sink_started_before_root_uses_single_queue():
+    received = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            received.append(record.getMessage())
+
+    root = logging.getLogger()
+    collector = Collector()
+    root.addHandler(collector)
+    named_sink = QueueLogSink("tests.log_pipeline.order")
+    sink = QueueLogSink()
+    try:
+        named_sink.start()
+        sink.start()
+
+        logger = logging.getLogger("tests.log_pipeline.order")
+        logger.setLevel(logging.INFO)
+        with patch.object(sink.handler, "enqueue", wraps=sink.handler.enqueue) as root_enqueue:
+            logger.info("mensagem %s", 3)
+            assert root_enqueue.call_count == 1
+        assert named_sink.handler.queue.empty()
+    finally:
+        sink.stop()
+        named_sink.stop()
+        root.removeHandler(collector)
+
+    assert received == ["mensagem 3"]
+
+
+def test_sampling_filter_keeps_one_in_n_below_warning():
+    sampling = SamplingFilter({"app.services": 3, "app.services.webhook_service": 1})
+
+    kept = [sampling.filter(_record(name="app.services.seller_service")) for _ in range(6)]
+
+    assert kept == [True, False, False, True, False, False]
+    assert all(sampling.filter(_record(name="app.services.webhook_service")) for _ in range(3))
+    assert all(sampling.filter(_record(name="app.api")) for _ in range(3))
+    assert all(sampling.filter(_record(name="app.services.seller_service", level=logging.WARNING)) for _ in range(3))
+
+
+def test_log_budget_filter_drops_excess_and_reports_suppressed():
+    with patch("app.common.log_pipeline.time.monotonic", return_value=10.0):
+        budget = LogBudgetFilter(max_per_second=2)
+        kept = [budget.filter(_record()) for _ in range(4)]
+        assert budget.filter(_record(level=logging.ERROR))
+
+    assert kept == [True, True, False, False]
+
+    with patch("app.common.log_pipeline.time.monotonic", return_value=11.0):
+        record = _record()
+        assert budget.filter(record)
+
+    assert record.suppressed == 2
+
+
+def test_log_sampler_limits_per_key_and_reports_suppressed():
+    sampler = LogSampler(max_per_window=2, window_seconds=10)
+
+    with patch("app.common.log_pipeline.time.monotonic", return_value=100.0):
+        assert sampler.acquire("slug") == 0
+        assert sampler.acquire("slug") == 0
+        assert sampler.acquire("slug") is None
+        assert sampler.acquire("slug") is None
+        assert sampler.acquire("outra") == 0
+
+    with patch("app.common.log_pipeline.time.monotonic", return_value=110.0):
+        assert sampler.acquire("slug") == 2
+        assert sampler.acquire("slug") == 0
+
+
+def test_log_sampler_without_limit():
+    sampler = LogSampler(max_per_window=0, window_seconds=1)
+
+    assert all(sampler.acquire("slug") == 0 for _ in range(100))
@@ -0,0 +1,45 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from app.common.server_timing import format_server_timing, get_timings, record_timing, start_timings, timed, timed_async
+
+
+def test_record_without_request_is_noop():
+    def record_outside_request():
+        record_timing("mongo", 1.0)
+        return get_timings()
+
+    assert contextvars.Context().run(record_outside_request) is None
+
+
+@pytest.mark.asyncio
+async def test_timings_accumulate_per_stage():
+    timings = start_timings()
+
+    record_timing("mongo", 1.5)
+    record_timing("mongo", 2.0)
+    with timed("auth"):
+        pass
+
+    assert timings["mongo"] == 3.5
+    assert "auth" in timings
+
+
+@pytest.mark.asyncio
+async def test_timed_async_records_in_child_tasks():
+    timings = start_timings()
+
+    @timed_async("keycloak")
+    async def call():
+        return "ok"
+
+    assert await asyncio.create_task(call()) == "ok"
+    assert "keycloak" in timings
+
+
+def test_format_server_timing():
+    formatted = format_server_timing({"mongo": 3.21, "auth": 1}, total_ms=10)
+
+    assert formatted == "mongo;dur=3.2, auth;dur=1.0, total;dur=10.0"
@@ -0,0 +1,22 @@
+from app.common.text_normalization import MAX_SEARCH_TOKENS, build_search_keys, normalize_text
+
+
+def test_normalize_text_folds_accents_case_and_punctuation():
+    assert normalize_text("  Açaí  & Cia. LTDA ") == "acai cia ltda"
+
+
+def test_normalize_text_empty_values():
+    assert normalize_text(None) == ""
+    assert normalize_text("") == ""
+    assert normalize_text("!!!") == ""
+
+
+def test_build_search_keys_word_suffixes():
+    assert build_search_keys("Loja do João") == ["loja do joao", "do joao", "joao"]
+
+
+def test_build_search_keys_caps_number_of_words():
+    keys = build_search_keys(" ".join(f"p{index}" for index in range(MAX_SEARCH_TOKENS + 5)))
+
+    assert len(keys) == MAX_SEARCH_TOKENS
+    assert keys[-1] == f"p{MAX_SEARCH_TOKENS - 1}"
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from app.integrations.archive.segment_archive import INDEX_SUFFIX, SEGMENT_SUFFIX, SegmentArchive
+
+
+def make_doc(i: int, **overrides) -> dict:
+    doc = {
+        "_id": ObjectId(),
+        "seller_id": f"seller{i:04d}",
+        "cnpj": f"{i:014d}",
+        "trade_name": f"Loja {i}",
+        "status": "Inativo",
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }
+    doc.update(overrides)
+    return doc
+
+
+@pytest.fixture
+def archive(tmp_path):
+    segment_archive = SegmentArchive(tmp_path, docs_per_block=4)
+    yield segment_archive
+    segment_archive.close()
+
+
+def test_write_segment_creates_data_and_index_files(archive, tmp_path):
+    data_path = archive.write_segment([make_doc(i) for i in range(10)])
+
+    assert data_path.suffix == SEGMENT_SUFFIX
+    assert data_path.with_suffix(INDEX_SUFFIX).exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_find_by_seller_id_and_cnpj(archive):
+    docs = [make_doc(i) for i in range(10)]
+    archive.write_segment(docs)
+
+    found = archive.find("seller_id", "seller0007")
+    assert found["_id"] == docs[7]["_id"]
+    assert found["trade_name"] == "Loja 7"
+
+    assert archive.find("cnpj", f"{3:014d}")["seller_id"] == "seller0003"
+    assert archive.find("seller_id", "inexistente") is None
+
+
+def test_newer_segment_takes_precedence(archive):
+    archive.write_segment([make_doc(1, trade_name="Versão antiga")])
+    assert archive.find("seller_id", "seller0001")["trade_name"] == "Versão antiga"
+
+    archive.write_segment([make_doc(1, trade_name="Versão nova")])
+
+    assert archive.find("seller_id", "seller0001")["trade_name"] == "Versão nova"
+
+
+def test_segment_without_index_is_ignored(archive, tmp_path):
+    (tmp_path / f"segment-00000000000000000001{SEGMENT_SUFFIX}").write_bytes(b"incompleto")
+
+    assert archive.find("seller_id", "seller0001") is None
+
+
+def test_empty_write_is_noop(archive, tmp_path):
+    assert archive.write_segment([]) is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_from_optional_path(tmp_path):
+    assert SegmentArchive.from_optional_path(None) is None
+    assert isinstance(SegmentArchive.from_optional_path(str(tmp_path)), SegmentArchive)
+
+
+def test_datetimes_are_timezone_aware(archive):
+    archive.write_segment([make_doc(1)])
+
+    assert archive.find("seller_id", "seller0001")["created_at"] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_compact_merges_segments_keeping_newest_version(archive, tmp_path):
+    for batch in range(4):
+        archive.write_segment([make_doc(i, trade_name=f"Lote {batch}") for i in range(batch, batch + 3)])
+    assert archive.find("seller_id", "seller0002")["trade_name"] == "Lote 2"
+
+    data_path = archive.compact(max_segments=2)
+
+    assert sorted(tmp_path.glob(f"*{INDEX_SUFFIX}")) == [data_path.with_suffix(INDEX_SUFFIX)]
+    assert archive.find("seller_id", "seller0002")["trade_name"] == "Lote 2"
+    assert archive.find("cnpj", f"{5:014d}")["trade_name"] == "Lote 3"
+    assert archive.find("seller_id", "seller0000")["trade_name"] == "Lote 0"
+    assert len(archive._segments) == 1
+
+
+def test_compact_keeps_precedence_of_later_segments(archive):
+    archive.write_segment([make_doc(1, trade_name="Antiga")])
+    archive.write_segment([make_doc(2)])
+    archive.compact(max_segments=1)
+
+    archive.write_segment([make_doc(1, trade_name="Nova")])
+    archive.compact(max_segments=1)
+
+    assert archive.find("seller_id", "seller0001")["trade_name"] == "Nova"
+    assert archive.find("seller_id", "seller0002") is not None
+
+
+def test_compact_is_noop_below_max_segments(archive, tmp_path):
+    archive.write_segment([make_doc(1)])
+
+    assert archive.compact(max_segments=1) is None
+    assert len(list(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))) == 1
+
+
+def test_reader_closes_segments_removed_by_compaction(tmp_path):
+    writer = SegmentArchive(tmp_path, docs_per_block=4)
+    reader = SegmentArchive(tmp_path, docs_per_block=4)
+    writer.write_segment([make_doc(1)])
+    writer.write_segment([make_doc(2)])
+    assert reader.find("seller_id", "seller0001") is not None
+    stale = list(reader._segments)
+
+    writer.compact(max_segments=1)
+
+    assert reader.find("seller_id", "seller0002") is not None
+    assert len(reader._segments) == 1
+    assert all(segment.data.closed for segment in stale)
+    writer.close()
+    reader.close()
@@ -0,0 +1,199 @@
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.integrations.email.smtp_session_pool import SmtpSessionPool, is_refusal
+from tests.helpers.local_smtp_server import LocalSmtpServer
+
+SENDER = "noreply@marketplace.com"
+
+
+@pytest.fixture
+def smtp_server():
+    with LocalSmtpServer() as server:
+        yield server
+
+
+def make_pool(server, **kwargs):
+    kwargs.setdefault("username", SENDER)
+    kwargs.setdefault("password", "secret")
+    return SmtpSessionPool(server.host, server.port, starttls=False, **kwargs)
+
+
+def message(index):
+    return f"Subject: Bem-vindo {index}\r\n\r\nOla, seller {index}!\r\n"
+
+
+def test_reuses_authenticated_session(smtp_server):
+    pool = make_pool(smtp_server)
+
+    for index in range(5):
+        assert pool.sendmail(SENDER, f"seller{index}@teste.com", message(index)) == {}
+    pool.close()
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.stats["connections"] == 1
+    assert smtp_server.stats["logins"] == 1
+    assert pool.stats["reused"] == 4
+    assert b"Ola, seller 4!" in smtp_server.messages[-1].data
+
+
+def test_noop_before_reusing_idle_session(smtp_server):
+    pool = make_pool(smtp_server, noop_after_seconds=0)
+
+    pool.sendmail(SENDER, "a@teste.com", message(1))
+    pool.sendmail(SENDER, "b@teste.com", message(2))
+    pool.close()
+
+    assert smtp_server.stats["noops"] == 1
+    assert smtp_server.stats["connections"] == 1
+
+
+def test_reconnects_when_noop_fails(smtp_server):
+    pool = make_pool(smtp_server, noop_after_seconds=0)
+
+    pool.sendmail(SENDER, "a@teste.com", message(1))
+    smtp_server.disconnect_all()
+    pool.sendmail(SENDER, "b@teste.com", message(2))
+    pool.close()
+
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.stats["connections"] == 2
+    assert pool.stats["discarded"] == 1
+
+
+def test_retries_on_fresh_session_when_reused_connection_dropped(smtp_server):
+    # Sem NOOP: a queda só é percebida no envio, que é repetido em uma conexão nova
+    pool = make_pool(smtp_server, noop_after_seconds=60)
+
+    pool.sendmail(SENDER, "a@teste.com", message(1))
+    smtp_server.disconnect_all()
+    pool.sendmail(SENDER, "b@teste.com", message(2))
+    pool.close()
+
+    assert len(smtp_server.messages) == 2
+    assert pool.stats["retries"] == 1
+    assert smtp_server.stats["connections"] == 2
+
+
+def test_discards_session_idle_too_long(smtp_server):
+    pool = make_pool(smtp_server, max_idle_seconds=0.0001)
+
+    pool.sendmail(SENDER, "a@teste.com", message(1))
+    threading.Event().wait(0.01)
+    pool.sendmail(SENDER, "b@teste.com", message(2))
+    pool.close()
+
+    assert smtp_server.stats["connections"] == 2
+    assert smtp_server.stats["noops"] == 0
+
+
+def test_renews_session_after_max_messages(smtp_server):
+    pool = make_pool(smtp_server, max_messages_per_session=2)
+
+    for index in range(5):
+        pool.sendmail(SENDER, "a@teste.com", message(index))
+    pool.close()
+
+    assert smtp_server.stats["connections"] == 3
+
+
+def test_concurrent_sends_limited_to_max_size(smtp_server):
+    smtp_server.command_latency_ms = 5
+    pool = make_pool(smtp_server, max_size=3)
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda index: pool.sendmail(SENDER, "a@teste.com", message(index)), range(24)))
+    pool.close()
+
+    assert len(smtp_server.messages) == 24
+    assert smtp_server.stats["connections"] <= 3
+
+
+def test_refused_recipient_keeps_session():
+    smtp = MagicMock()
+    smtp.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({"x@teste.com": (550, b"no")}), {}]
+    pool = SmtpSessionPool("smtp.test.com", 587, smtp_factory=MagicMock(return_value=smtp))
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.sendmail(SENDER, "x@teste.com", "msg")
+    pool.sendmail(SENDER, "y@teste.com", "msg")
+
+    assert pool.stats["connections"] == 1
+    assert pool.stats["reused"] == 1
+
+
+def test_permanent_refusal_on_reused_session_is_not_retried():
+    smtp = MagicMock()
+    smtp.sendmail.side_effect = [{}, smtplib.SMTPDataError(552, b"message too large"), {}]
+    factory = MagicMock(return_value=smtp)
+    pool = SmtpSessionPool("smtp.test.com", 587, smtp_factory=factory)
+
+    pool.sendmail(SENDER, "a@teste.com", "msg")
+    with pytest.raises(smtplib.SMTPDataError):
+        pool.sendmail(SENDER, "b@teste.com", "msg")
+    pool.sendmail(SENDER, "c@teste.com", "msg")
+
+    factory.assert_called_once()
+    assert smtp.sendmail.call_count == 3
+    assert pool.stats["retries"] == 0
+    assert pool.stats["discarded"] == 0
+
+
+def test_service_closing_reply_on_reused_session_discards_and_retries():
+    closing = MagicMock()
+    closing.sendmail.side_effect = [{}, smtplib.SMTPDataError(421, b"too many messages on this connection")]
+    fresh = MagicMock()
+    fresh.sendmail.return_value = {}
+    factory = MagicMock(side_effect=[closing, fresh])
+    pool = SmtpSessionPool("smtp.test.com", 587, smtp_factory=factory)
+
+    pool.sendmail(SENDER, "a@teste.com", "msg")
+    pool.sendmail(SENDER, "b@teste.com", "msg")
+    pool.sendmail(SENDER, "c@teste.com", "msg")
+
+    assert factory.call_count == 2
+    assert fresh.sendmail.call_count == 2
+    assert pool.stats["retries"] == 1
+    assert pool.stats["discarded"] == 1
+
+
+@pytest.mark.parametrize(
+    "error, refusal",
+    [
+        (smtplib.SMTPDataError(552, b"too large"), True),
+        (smtplib.SMTPSenderRefused(553, b"no", SENDER), True),
+        (smtplib.SMTPRecipientsRefused({"x@teste.com": (550, b"no")}), True),
+        (smtplib.SMTPRecipientsRefused({"x@teste.com": (421, b"closing")}), False),
+        (smtplib.SMTPDataError(451, b"try again"), False),
+        (smtplib.SMTPServerDisconnected(), False),
+    ],
+)
+def test_is_refusal_only_for_permanent_replies(error, refusal):
+    assert is_refusal(error) is refusal
+
+
+def test_connect_failure_closes_connection_and_raises():
+    smtp = MagicMock()
+    smtp.login.side_effect = smtplib.SMTPAuthenticationError(535, b"invalid")
+    pool = SmtpSessionPool(
+        "smtp.test.com", 587, username=SENDER, password="x", smtp_factory=MagicMock(return_value=smtp)
+    )
+
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        pool.sendmail(SENDER, "a@teste.com", "msg")
+
+    smtp.starttls.assert_called_once()
+    smtp.quit.assert_called_once()
+    assert pool.stats["retries"] == 0
+
+
+def test_closed_pool_rejects_sends(smtp_server):
+    pool = make_pool(smtp_server)
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        pool.sendmail(SENDER, "a@teste.com", "msg")
@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.integrations.kv_db.chat_history_store import ChatHistoryStore
+
+
+@pytest.fixture
+def redis_adapter():
+    adapter = MagicMock()
+    adapter.get_list = AsyncMock(return_value=[])
+    adapter.push_capped = AsyncMock()
+    adapter.delete = AsyncMock()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_load_decodes_turns_in_order(redis_adapter):
+    redis_adapter.get_list.return_value = ['["Oi","Olá!"]'.encode(), b'["Tudo bem?","Sim."]']
+    store = ChatHistoryStore(redis_adapter)
+
+    assert await store.load("user-123") == [("Oi", "Olá!"), ("Tudo bem?", "Sim.")]
+    redis_adapter.get_list.assert_awaited_once_with("chat_history:user-123")
+
+
+@pytest.mark.asyncio
+async def test_load_skips_invalid_entries(redis_adapter):
+    redis_adapter.get_list.return_value = [b"lixo", '["Oi","Olá!"]'.encode(), b'["sem resposta"]']
+    store = ChatHistoryStore(redis_adapter)
+
+    assert await store.load("user-123") == [("Oi", "Olá!")]
+
+
+@pytest.mark.asyncio
+async def test_append_caps_window_and_renews_ttl(redis_adapter):
+    store = ChatHistoryStore(redis_adapter, ttl_seconds=600, max_turns=3)
+
+    await store.append("user-123", "Oi", "Olá!")
+
+    redis_adapter.push_capped.assert_awaited_once_with("chat_history:user-123", b'["Oi","Ol\xc3\xa1!"]', 3, 600)
+
+
+@pytest.mark.asyncio
+async def test_none_settings_use_defaults(redis_adapter):
+    store = ChatHistoryStore(redis_adapter, ttl_seconds=None, max_turns=None)
+
+    assert (store.ttl_seconds, store.max_turns) == (1800, 5)
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_does_not_break_chat(redis_adapter):
+    redis_adapter.get_list.side_effect = ConnectionError("redis fora do ar")
+    redis_adapter.push_capped.side_effect = ConnectionError("redis fora do ar")
+    store = ChatHistoryStore(redis_adapter)
+
+    assert await store.load("user-123") == []
+    await store.append("user-123", "Oi", "Olá!")
+
+
+@pytest.mark.asyncio
+async def test_clear_deletes_session(redis_adapter):
+    store = ChatHistoryStore(redis_adapter)
+
+    await store.clear("user-123")
+
+    redis_adapter.delete.assert_awaited_once_with("chat_history:user-123")
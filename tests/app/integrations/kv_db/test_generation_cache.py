@@ -0,0 +1,75 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.integrations.kv_db.generation_cache import GenerationCache
+
+
+@pytest.fixture
+def redis_adapter():
+    adapter = MagicMock()
+    adapter.get_str = AsyncMock(return_value="7")
+    adapter.get_bytes = AsyncMock(return_value=None)
+    adapter.set_bytes = AsyncMock()
+    adapter.incr = AsyncMock(return_value=8)
+    return adapter
+
+
+def test_make_key_is_stable_and_order_independent():
+    key = GenerationCache.make_key({"limit": 10, "offset": 0}, {"status": "Ativo"})
+
+    assert key == GenerationCache.make_key({"offset": 0, "limit": 10}, {"status": "Ativo"})
+    assert key != GenerationCache.make_key({"limit": 10, "offset": 10}, {"status": "Ativo"})
+
+
+@pytest.mark.asyncio
+async def test_get_reads_entry_of_current_generation(redis_adapter):
+    redis_adapter.get_bytes.return_value = b"[]"
+    cache = GenerationCache(redis_adapter, namespace="seller_list")
+
+    assert await cache.get("abc") == (7, b"[]")
+    redis_adapter.get_str.assert_awaited_once_with("seller_list:generation")
+    redis_adapter.get_bytes.assert_awaited_once_with("seller_list:7:abc")
+
+
+@pytest.mark.asyncio
+async def test_set_writes_under_given_generation_with_ttl(redis_adapter):
+    cache = GenerationCache(redis_adapter, namespace="seller_list", ttl_seconds=30)
+
+    await cache.set(7, "abc", b"[]")
+
+    redis_adapter.set_bytes.assert_awaited_once_with("seller_list:7:abc", b"[]", 30)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_increments_generation(redis_adapter):
+    cache = GenerationCache(redis_adapter, namespace="seller_list")
+
+    await cache.invalidate()
+
+    redis_adapter.incr.assert_awaited_once_with("seller_list:generation")
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_is_a_miss_and_skips_set(redis_adapter):
+    redis_adapter.get_str.side_effect = ConnectionError("redis fora do ar")
+    cache = GenerationCache(redis_adapter, namespace="seller_list")
+
+    generation, value = await cache.get("abc")
+    await cache.set(generation, "abc", b"[]")
+
+    assert (generation, value) == (None, None)
+    redis_adapter.set_bytes.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_does_not_touch_redis(redis_adapter):
+    cache = GenerationCache(redis_adapter, namespace="seller_list", enabled=None)
+
+    assert await cache.get("abc") == (None, None)
+    await cache.set(7, "abc", b"[]")
+    await cache.invalidate()
+
+    redis_adapter.get_str.assert_not_awaited()
+    redis_adapter.set_bytes.assert_not_awaited()
+    redis_adapter.incr.assert_not_awaited()
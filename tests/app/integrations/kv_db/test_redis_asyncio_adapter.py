@@ -164,3 +164,40 @@ class TestRedisAsyncioAdapter:
         await redis_adapter.delete("test_key")
         
         mock_redis.delete.assert_called_once_with("test_key")
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_registers_script_once(self, redis_adapter, mock_redis):
+        """Test token_bucket runs the Lua script with key and quota arguments."""
+        script = AsyncMock(return_value=[5, 0])
+        mock_redis.register_script = MagicMock(return_value=script)
+
+        assert await redis_adapter.token_bucket("bucket", capacity=10, refill_per_second=2, lease=4) == (5, 0)
+        await redis_adapter.token_bucket("bucket", capacity=10, refill_per_second=2)
+
+        mock_redis.register_script.assert_called_once()
+        script.assert_awaited_with(keys=["bucket"], args=[10, 2, 1, 0])
+
+    @pytest.mark.asyncio
+    async def test_get_list(self, redis_adapter, mock_redis):
+        """Test get_list reads the whole list."""
+        mock_redis.lrange.return_value = [b"a", b"b"]
+
+        assert await redis_adapter.get_list("test_key") == [b"a", b"b"]
+        mock_redis.lrange.assert_called_once_with("test_key", 0, -1)
+
+    @pytest.mark.asyncio
+    async def test_push_capped_trims_and_expires_in_one_transaction(self, redis_adapter, mock_redis):
+        """Test push_capped queues RPUSH, LTRIM and EXPIRE in a single pipeline."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+
+        await redis_adapter.push_capped("test_key", b"v", max_length=5, expires_in_seconds=60)
+
+        mock_redis.pipeline.assert_called_once_with(transaction=True)
+        pipe.rpush.assert_called_once_with("test_key", b"v")
+        pipe.ltrim.assert_called_once_with("test_key", -5, -1)
+        pipe.expire.assert_called_once_with("test_key", 60)
+        pipe.execute.assert_awaited_once()
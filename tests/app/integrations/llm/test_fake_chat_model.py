@@ -0,0 +1,39 @@
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.integrations.llm.fake_chat_model import FakeChatModel
+
+
+def test_answer_is_deterministic_per_question():
+    model = FakeChatModel(answer_tokens=12)
+
+    first = model.invoke([HumanMessage("Como cadastrar um seller?")]).content
+
+    assert first == model.invoke([HumanMessage("Como cadastrar um seller?")]).content
+    assert first != model.invoke([HumanMessage("Qual o prazo de análise?")]).content
+    assert len(first.split()) == 12
+
+
+@pytest.mark.asyncio
+async def test_astream_yields_one_chunk_per_token_with_latency():
+    model = FakeChatModel(first_token_latency_ms=30, token_latency_ms=5, answer_tokens=5)
+
+    start = time.perf_counter()
+    chunks = [chunk.content async for chunk in model.astream([HumanMessage("Oi")])]
+    elapsed = time.perf_counter() - start
+
+    assert len(chunks) == 5
+    assert "".join(chunks) == (await model.ainvoke([HumanMessage("Oi")])).content
+    assert elapsed >= model.response_seconds == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_works_behind_prompt_template():
+    chain = ChatPromptTemplate.from_messages([("system", "{context}"), ("user", "{input}")]) | FakeChatModel()
+
+    response = await chain.ainvoke({"context": "Regras", "input": "Oi"})
+
+    assert response.content
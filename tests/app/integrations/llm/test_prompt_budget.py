@@ -0,0 +1,68 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.integrations.llm.prompt_budget import PromptBudget, estimate_tokens, truncate_to_tokens
+
+
+def _history(*turns):
+    return [message for question, answer in turns for message in (HumanMessage(question), AIMessage(answer))]
+
+
+def test_truncate_to_tokens_cuts_at_word_boundary():
+    text = "palavra " * 50
+
+    truncated = truncate_to_tokens(text, 10)
+
+    assert estimate_tokens(truncated) <= 10
+    assert truncated.endswith(" […]")
+    assert truncate_to_tokens("curto", 10) == "curto"
+
+
+def test_prompt_within_budget_is_unchanged():
+    budget = PromptBudget(max_tokens=1000)
+    history = _history(("Oi", "Olá!"))
+
+    context, fitted, usage = budget.fit("Instrução", "Pergunta?", "Contexto", history)
+
+    assert (context, fitted) == ("Contexto", history)
+    assert not usage.compacted
+    assert budget.stats["prompts"] == 1
+    assert budget.stats["compacted_prompts"] == 0
+
+
+def test_context_is_capped_by_its_share():
+    budget = PromptBudget(max_tokens=200, context_share=0.5)
+
+    context, _, usage = budget.fit("", "", "trecho " * 400, [])
+
+    assert usage.context_truncated
+    assert usage.context <= 100
+    assert context.startswith("trecho trecho")
+
+
+def test_oldest_turns_are_dropped_whole_and_long_messages_truncated():
+    budget = PromptBudget(max_tokens=70, context_share=0, message_max_tokens=40)
+    history = _history(
+        ("primeira pergunta", "resposta " * 10),
+        ("segunda pergunta", "resposta longa " * 100),
+        ("terceira pergunta", "curta"),
+    )
+
+    _, fitted, usage = budget.fit("", "", "", history)
+
+    assert [message.content for message in fitted][::2] == ["segunda pergunta", "terceira pergunta"]
+    assert fitted[1].content.endswith(" […]")
+    assert isinstance(fitted[1], AIMessage)
+    assert usage.dropped_turns == 1
+    assert usage.truncated_messages == 1
+    assert usage.total <= 70
+    assert budget.stats["dropped_turns"] == 1
+
+
+def test_history_never_exceeds_remaining_budget():
+    budget = PromptBudget(max_tokens=50, context_share=0.5)
+    history = _history(*((f"pergunta {i}", "resposta " * 20) for i in range(5)))
+
+    _, fitted, usage = budget.fit("instrução " * 5, "pergunta atual", "contexto " * 40, history)
+
+    assert usage.total <= 50
+    assert len(fitted) % 2 == 0
@@ -0,0 +1,84 @@
+import numpy as np
+
+from app.integrations.retrieval.document_index import Chunk, DocumentIndex, chunk_text, hashed_embedding, tokenize
+
+CHUNKS = [
+    Chunk("regras.pdf", "O cadastro do seller exige CNPJ válido e razão social."),
+    Chunk("regras.pdf", "A autenticação usa tokens JWT emitidos pelo Keycloak."),
+    Chunk("faq.pdf", "Sellers inativos são arquivados no banco frio após noventa dias."),
+]
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert tokenize("A Autenticação do Seller é válida") == ["autenticacao", "seller", "valida"]
+
+
+def test_chunk_text_uses_overlapping_windows():
+    words = [f"p{i}" for i in range(25)]
+
+    chunks = chunk_text(" ".join(words), "doc.pdf", max_words=10, overlap=2)
+
+    assert [chunk.text.split()[0] for chunk in chunks] == ["p0", "p8", "p16"]
+    assert chunks[0].text.split()[-2:] == chunks[1].text.split()[:2]
+    assert chunks[-1].text.split()[-1] == "p24"
+    assert all(chunk.source == "doc.pdf" for chunk in chunks)
+
+
+def test_search_ranks_relevant_chunk_first():
+    index = DocumentIndex.build(CHUNKS)
+
+    results = index.search("Como funciona a autenticacao?", top_k=2)
+
+    assert [chunk for chunk, _ in results] == [CHUNKS[1]]
+
+
+def test_search_without_matching_terms_returns_nothing():
+    index = DocumentIndex.build(CHUNKS)
+
+    assert index.search("pagamento por boleto") == []
+
+
+def test_hybrid_search_matches_inflected_words():
+    index = DocumentIndex.build(CHUNKS, with_embeddings=True)
+
+    assert index.search("arquivamento inativo", top_k=1) == []
+    hybrid = index.search("arquivamento inativo", top_k=1, embedding_weight=0.5)
+
+    assert hybrid[0][0] == CHUNKS[2]
+
+
+def test_hashed_embedding_is_normalized():
+    vector = hashed_embedding("regras de cadastro")
+
+    assert vector.shape == (256,)
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "index" / "documents.npz"
+    index = DocumentIndex.build(CHUNKS, with_embeddings=True, fingerprint="v1")
+    index.save(path)
+
+    loaded = DocumentIndex.load(path, fingerprint="v1")
+
+    assert loaded.chunks == CHUNKS
+    assert loaded.search("keycloak", top_k=1) == index.search("keycloak", top_k=1)
+    assert loaded.embeddings is not None
+
+
+def test_load_rejects_other_fingerprint_and_corrupted_file(tmp_path):
+    path = tmp_path / "documents.npz"
+    DocumentIndex.build(CHUNKS, fingerprint="v1").save(path)
+
+    assert DocumentIndex.load(path, fingerprint="v2") is None
+    assert DocumentIndex.load(tmp_path / "inexistente.npz", fingerprint="v1") is None
+    path.write_bytes(b"corrompido")
+    assert DocumentIndex.load(path, fingerprint="v1") is None
+
+
+def test_fingerprint_changes_with_content_and_params():
+    base = DocumentIndex.make_fingerprint("conteúdo", 180, False)
+
+    assert base == DocumentIndex.make_fingerprint("conteúdo", 180, False)
+    assert base != DocumentIndex.make_fingerprint("conteúdo novo", 180, False)
+    assert base != DocumentIndex.make_fingerprint("conteúdo", 120, False)
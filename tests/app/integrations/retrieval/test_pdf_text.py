@@ -0,0 +1,79 @@
+import os
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from app.integrations.retrieval import pdf_text
+from app.integrations.retrieval.pdf_text import PdfTextExtractor, folder_signature
+
+
+def _write_pdf(path, *pages):
+    with fitz.open() as doc:
+        for text in pages:
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(str(path))
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    _write_pdf(folder / "b.pdf", "Segunda regra", "Terceira regra")
+    _write_pdf(folder / "a.pdf", "Primeira regra")
+    return folder
+
+
+def test_load_folder_extracts_all_pages_in_name_order(pdfs):
+    documents = PdfTextExtractor(max_workers=1).load_folder(pdfs)
+
+    assert list(documents) == ["a.pdf", "b.pdf"]
+    assert "Primeira regra" in documents["a.pdf"]
+    assert documents["b.pdf"].index("Segunda") < documents["b.pdf"].index("Terceira")
+
+
+def test_load_folder_in_process_pool(pdfs):
+    documents = PdfTextExtractor(max_workers=2).load_folder(pdfs)
+
+    assert documents == PdfTextExtractor(max_workers=1).load_folder(pdfs)
+
+
+def test_cached_text_is_reused_until_file_changes(pdfs, tmp_path):
+    extractor = PdfTextExtractor(tmp_path / "cache", max_workers=1)
+    first = extractor.load_folder(pdfs)
+
+    with (
+        patch.object(pdf_text, "extract_pdf_text", wraps=pdf_text.extract_pdf_text) as extract,
+        patch.object(pdf_text, "file_digest", wraps=pdf_text.file_digest) as digest,
+    ):
+        assert extractor.load_folder(pdfs) == first
+        extract.assert_not_called()
+        digest.assert_not_called()
+
+        _write_pdf(pdfs / "a.pdf", "Regra alterada")
+        documents = extractor.load_folder(pdfs)
+
+    assert "Regra alterada" in documents["a.pdf"]
+    extract.assert_called_once_with(str(pdfs / "a.pdf"))
+    # O texto da versão anterior de a.pdf não é mais usado e sai do cache
+    assert len(list((tmp_path / "cache").glob("*.txt"))) == 2
+
+
+def test_unreadable_file_is_skipped(pdfs, tmp_path):
+    (pdfs / "corrompido.pdf").write_bytes(b"isto nao e um pdf")
+
+    documents = PdfTextExtractor(tmp_path / "cache", max_workers=1).load_folder(pdfs)
+
+    assert list(documents) == ["a.pdf", "b.pdf"]
+
+
+def test_folder_signature_changes_with_files(pdfs):
+    signature = folder_signature(pdfs)
+    assert folder_signature(pdfs) == signature
+
+    stat = (pdfs / "a.pdf").stat()
+    os.utime(pdfs / "a.pdf", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert folder_signature(pdfs) != signature
+
+    (pdfs / "b.pdf").unlink()
+    assert [name for name, *_ in folder_signature(pdfs)] == ["a.pdf"]
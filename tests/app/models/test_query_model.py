@@ -272,3 +272,27 @@ def test_query_model_to_query_dict_no_operators():
 
     expected = {"simple_field": "value", "another_field": 42}
     assert result == expected
+
+
+def test_seller_query_to_query_dict():
+    """Test SellerQuery maps ranges and cnpj prefix"""
+    from datetime import datetime, timezone
+
+    from app.models.enums import SellerStatus
+    from app.models.seller_query_model import SellerQuery
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    query = SellerQuery(status=SellerStatus.INACTIVE, created_at__ge=start, cnpj="1234")
+
+    assert query.to_query_dict() == {
+        "status": SellerStatus.INACTIVE,
+        "created_at": {"$gte": start},
+        "cnpj": {"$regex": "^1234"},
+    }
+
+
+def test_seller_query_full_cnpj_is_equality():
+    """Test SellerQuery uses equality for a complete cnpj"""
+    from app.models.seller_query_model import SellerQuery
+
+    assert SellerQuery(cnpj="12345678000199").to_query_dict() == {"cnpj": "12345678000199"}
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from app.common.server_timing import record_timing, start_timings
+from app.repositories.base.data_loader import DataLoader
+
+
+@pytest.mark.asyncio
+class TestDataLoader:
+    async def test_coalesces_loads_in_same_tick(self):
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(keys)
+            return {key: key.upper() for key in keys}
+
+        loader = DataLoader(batch_load)
+        results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("a"))
+
+        assert results == ["A", "B", "A"]
+        assert calls == [["a", "b"]]
+
+    async def test_missing_key_resolves_to_none(self):
+        async def batch_load(keys):
+            return {}
+
+        loader = DataLoader(batch_load)
+
+        assert await loader.load("x") is None
+
+    async def test_max_batch_size_splits_batches(self):
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(keys)
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load, max_batch_size=2)
+        results = await loader.load_many(["a", "b", "c"])
+
+        assert results == ["a", "b", "c"]
+        assert calls == [["a", "b"], ["c"]]
+
+    async def test_batch_window_groups_later_calls(self):
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(keys)
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load, batch_window_ms=20)
+
+        async def delayed_load(key):
+            await asyncio.sleep(0.005)
+            return await loader.load(key)
+
+        await asyncio.gather(loader.load("a"), delayed_load("b"))
+
+        assert calls == [["a", "b"]]
+
+    async def test_exception_is_propagated_to_all_callers(self):
+        async def batch_load(keys):
+            raise RuntimeError("mongo fora do ar")
+
+        loader = DataLoader(batch_load)
+        results = await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def test_no_cache_between_batches(self):
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(keys)
+            return {key: len(calls) for key in keys}
+
+        loader = DataLoader(batch_load)
+
+        assert await loader.load("a") == 1
+        assert await loader.load("a") == 2
+
+    async def test_load_joins_batch_in_flight(self):
+        calls = []
+        release = asyncio.Event()
+
+        async def batch_load(keys):
+            calls.append(keys)
+            await release.wait()
+            return {key: key.upper() for key in keys}
+
+        loader = DataLoader(batch_load)
+        first = asyncio.create_task(loader.load("a"))
+        while not calls:
+            await asyncio.sleep(0)
+
+        late = asyncio.create_task(loader.load("a"))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(first, late) == ["A", "A"]
+        assert calls == [["a"]]
+        assert await loader.load("a") == "A"
+        assert calls == [["a"], ["a"]]
+
+    async def test_cancelled_caller_does_not_cancel_shared_load(self):
+        release = asyncio.Event()
+
+        async def batch_load(keys):
+            await release.wait()
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load)
+        cancelled = asyncio.create_task(loader.load("a"))
+        other = asyncio.create_task(loader.load("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+
+        assert await other == "a"
+
+    async def test_keeps_reference_to_running_batch(self):
+        release = asyncio.Event()
+
+        async def batch_load(keys):
+            await release.wait()
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load)
+        waiting = asyncio.create_task(loader.load("a"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(loader._tasks) == 1
+
+        release.set()
+        assert await waiting == "a"
+        await asyncio.sleep(0)
+        assert loader._tasks == set()
+
+    async def test_batch_timing_recorded_for_every_waiting_request(self):
+        release = asyncio.Event()
+        started = asyncio.Event()
+
+        async def batch_load(keys):
+            started.set()
+            await release.wait()
+            record_timing("mongo", 5.0)
+            if "erro" in keys:
+                raise RuntimeError("falha")
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load)
+
+        async def request(key):
+            timings = start_timings()
+            try:
+                await loader.load(key)
+            except RuntimeError:
+                pass
+            return timings
+
+        first = asyncio.create_task(request("a"))
+        same_batch = asyncio.create_task(request("b"))
+        await started.wait()
+        joined = asyncio.create_task(request("a"))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(first, same_batch, joined) == [{"mongo": 5.0}] * 3
+        assert await request("erro") == {"mongo": 5.0}
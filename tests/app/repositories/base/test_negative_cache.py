@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from app.repositories.base import NegativeCache
+
+
+def test_added_key_expires_after_ttl():
+    cache = NegativeCache(ttl_seconds=10)
+
+    with patch("app.repositories.base.negative_cache.time.monotonic", return_value=100.0):
+        cache.add("a")
+        assert "a" in cache
+        assert "b" not in cache
+
+    with patch("app.repositories.base.negative_cache.time.monotonic", return_value=110.0):
+        assert "a" not in cache
+
+
+def test_max_size_evicts_oldest():
+    cache = NegativeCache(ttl_seconds=10, max_size=2)
+
+    cache.add("a")
+    cache.add("b")
+    cache.add("c")
+
+    assert "a" not in cache
+    assert "b" in cache and "c" in cache
+
+
+def test_zero_ttl_disables_cache():
+    cache = NegativeCache(ttl_seconds=0)
+
+    cache.add("a")
+
+    assert "a" not in cache
+
+
+def test_discard_and_clear():
+    cache = NegativeCache()
+    cache.add("a")
+    cache.add("b")
+
+    cache.discard("a")
+    assert "a" not in cache
+
+    cache.clear()
+    assert "b" not in cache
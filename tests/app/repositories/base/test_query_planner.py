@@ -0,0 +1,53 @@
+from app.repositories.base.query_planner import QueryPlanner
+from app.repositories.seller_repository import SellerRepository
+
+planner = QueryPlanner(SellerRepository.INDEXES)
+
+
+def test_equality_prefix_with_sort_is_indexed():
+    plan = planner.plan({"status": "Ativo", "product_categories": "moda"}, {"created_at": -1})
+
+    assert plan.index == (("status", 1), ("product_categories", 1), ("created_at", -1))
+    assert plan.sort_indexed
+    assert not plan.unindexed_filters
+
+
+def test_reverse_sort_uses_index_backwards():
+    plan = planner.plan({"status": "Ativo"}, {"created_at": 1})
+
+    assert plan.sort_indexed
+
+
+def test_sort_on_unindexed_field_is_not_indexed():
+    plan = planner.plan({"status": "Ativo"}, {"company_name": 1})
+
+    assert not plan.sort_indexed
+    assert not plan.is_collection_scan
+
+
+def test_sort_on_equality_field_is_ignored():
+    plan = planner.plan({"status": "Ativo"}, {"status": 1, "created_at": -1})
+
+    assert plan.sort_indexed
+
+
+def test_range_filters_are_bounded_by_index():
+    plan = planner.plan({"status": "Ativo", "created_at": {"$gte": "2025-01-01"}, "cnpj": {"$regex": "^123"}})
+
+    assert not plan.is_collection_scan
+    assert plan.unindexed_filters <= {"cnpj", "created_at"}
+    assert len(plan.unindexed_filters) == 1
+
+
+def test_unindexed_filter_without_any_index_is_collection_scan():
+    plan = planner.plan({"business_description": "moda"})
+
+    assert plan.is_collection_scan
+    assert plan.unindexed_filters == {"business_description"}
+
+
+def test_mixed_sort_directions_are_not_indexed():
+    mixed = QueryPlanner([(("a", 1), ("b", 1))])
+
+    assert mixed.plan({}, {"a": 1, "b": -1}).sort_indexed is False
+    assert mixed.plan({}, {"a": -1, "b": -1}).sort_indexed is True
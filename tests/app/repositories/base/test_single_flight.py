@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.common.server_timing import record_timing, start_timings
+from app.repositories.base.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        calls = []
+        release = asyncio.Event()
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            return {"seller_id": "seller01"}
+
+        flight = SingleFlight()
+        tasks = [asyncio.create_task(flight.do("seller01", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert all(result == {"seller_id": "seller01"} for result in results)
+        assert len(flight) == 0
+
+    async def test_distinct_keys_run_separately(self):
+        async def load(value):
+            await asyncio.sleep(0)
+            return value
+
+        flight = SingleFlight()
+
+        assert await asyncio.gather(flight.do("a", lambda: load("a")), flight.do("b", lambda: load("b"))) == ["a", "b"]
+
+    async def test_exception_reaches_every_caller_and_is_not_cached(self):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0)
+            raise RuntimeError("mongo fora do ar")
+
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do("a", load), flight.do("a", load), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1
+        with pytest.raises(RuntimeError):
+            await flight.do("a", load)
+        assert len(calls) == 2
+
+    async def test_timing_recorded_for_every_caller(self):
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            record_timing("mongo", 5.0)
+            return "ok"
+
+        flight = SingleFlight()
+
+        async def request():
+            timings = start_timings()
+            await flight.do("seller01", load)
+            return timings
+
+        tasks = [asyncio.create_task(request()) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == [{"mongo": 5.0}] * 3
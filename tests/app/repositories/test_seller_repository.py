@@ -1,10 +1,11 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
 from app.models.seller_model import Seller
 from app.repositories.seller_repository import SellerRepository
-from tests.helpers.test_fixtures import create_minimal_seller_dict
+from tests.helpers.test_fixtures import create_full_seller, create_minimal_seller_dict
 
 NOME_FANTASIA = "Loja Legal"
 LOJA = "Loja Trade Name"
@@ -77,3 +78,206 @@ class TestSellerRepository:
         result = await repo.find_by_trade_name("Loja Inexistente")
 
         assert result is None
+
+    async def test_find_by_id_concurrent_calls_use_single_in_query(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        docs = [
+            create_minimal_seller_dict(seller_id="seller01", trade_name="Loja Um"),
+            create_minimal_seller_dict(seller_id="seller02", trade_name="Loja Dois"),
+        ]
+
+        async def cursor():
+            for doc in docs:
+                yield doc
+
+        collection.find = mock.MagicMock(return_value=cursor())
+
+        repo = SellerRepository(client, "test_db")
+        first, second, missing = await asyncio.gather(
+            repo.find_by_id("seller01"), repo.find_by_id("seller02"), repo.find_by_id("seller03")
+        )
+
+        collection.find.assert_called_once_with({"seller_id": {"$in": ["seller01", "seller02", "seller03"]}})
+        collection.find_one.assert_not_called()
+        assert first.seller_id == "seller01"
+        assert second.seller_id == "seller02"
+        assert missing is None
+
+    async def test_find_many_by_ids(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+
+        async def cursor():
+            yield create_minimal_seller_dict(seller_id="seller01", trade_name="Loja Um")
+
+        collection.find = mock.MagicMock(return_value=cursor())
+
+        repo = SellerRepository(client, "test_db")
+        result = await repo.find_many_by_ids(["seller01", "seller02", "seller01"])
+
+        collection.find.assert_called_once_with({"seller_id": {"$in": ["seller01", "seller02"]}})
+        assert [seller.seller_id for seller in result] == ["seller01"]
+
+    async def test_find_many_by_cnpjs(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+
+        async def cursor():
+            yield create_minimal_seller_dict(seller_id="seller01", trade_name="Loja Um", cnpj="11111111111111")
+            yield create_minimal_seller_dict(seller_id="seller02", trade_name="Loja Dois", cnpj="22222222222222")
+
+        collection.find = mock.MagicMock(return_value=cursor())
+
+        repo = SellerRepository(client, "test_db")
+        result = await repo.find_many_by_cnpjs(["11111111111111", "22222222222222"])
+
+        collection.find.assert_called_once_with({"cnpj": {"$in": ["11111111111111", "22222222222222"]}})
+        assert {seller.cnpj for seller in result} == {"11111111111111", "22222222222222"}
+
+    async def test_create_stores_search_keys(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+
+        repo = SellerRepository(client, "test_db")
+        await repo.create(create_full_seller(trade_name="Loja São Jorge", company_name="Jorge Comércio"))
+
+        document = collection.insert_one.call_args.args[0]
+        assert document["trade_name_search"] == ["loja sao jorge", "sao jorge", "jorge"]
+        assert document["company_name_search"] == ["jorge comercio", "comercio"]
+
+    async def test_patch_updates_only_changed_search_keys(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one_and_update = mock.AsyncMock(return_value=create_minimal_seller_dict())
+
+        repo = SellerRepository(client, "test_db")
+        await repo.patch("seller01", {"trade_name": "Nova Loja"})
+
+        update = collection.find_one_and_update.call_args.args[1]["$set"]
+        assert update["trade_name_search"] == ["nova loja", "loja"]
+        assert "company_name_search" not in update
+
+    async def test_search_ranks_trade_name_prefix_first(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        by_trade_name = [
+            {"seller_id": "s2", "trade_name": "Mega Loja", "company_name": "Mega SA"},
+            {"seller_id": "s1", "trade_name": "Loja Mágica", "company_name": "Magica Ltda"},
+        ]
+        by_company_name = [
+            {"seller_id": "s1", "trade_name": "Loja Mágica", "company_name": "Magica Ltda"},
+            {"seller_id": "s3", "trade_name": "Outra", "company_name": "Loja Três Ltda"},
+        ]
+
+        def find(query, projection):
+            cursor = mock.MagicMock()
+            cursor.limit.return_value = cursor
+            docs = by_trade_name if "trade_name_search" in query else by_company_name
+            cursor.to_list = mock.AsyncMock(return_value=docs)
+            return cursor
+
+        collection.find = mock.MagicMock(side_effect=find)
+
+        repo = SellerRepository(client, "test_db")
+        result = await repo.search("LOJA", limit=10)
+
+        assert [doc["seller_id"] for doc in result] == ["s1", "s2", "s3"]
+        query, projection = collection.find.call_args_list[0].args
+        assert query == {"status": "Ativo", "trade_name_search": {"$regex": "^loja"}}
+        assert projection == SellerRepository.SEARCH_PROJECTION
+
+    async def test_search_blank_text_skips_query(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+
+        repo = SellerRepository(client, "test_db")
+
+        assert await repo.search("  ?? ") == []
+        collection.find.assert_not_called()
+
+    async def test_find_by_id_include_archived_skips_cold_on_hot_hit(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one = mock.AsyncMock(return_value=create_minimal_seller_dict(seller_id="ativo"))
+        cold_client, cold_collection = self._cold_client()
+
+        repo = SellerRepository(client, "test_db", cold_client=cold_client, cold_db_name="cold_db")
+        result = await repo.find_by_id("ativo", include_archived=True)
+
+        assert result.seller_id == "ativo"
+        cold_collection.find_one.assert_not_called()
+
+    async def test_find_by_id_include_archived_falls_back_to_cold(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one = mock.AsyncMock(return_value=None)
+        cold_client, cold_collection = self._cold_client(
+            create_minimal_seller_dict(seller_id="arquivado", status="Inativo")
+        )
+
+        repo = SellerRepository(client, "test_db", cold_client=cold_client, cold_db_name="cold_db")
+
+        assert await repo.find_by_id("arquivado") is None
+        cold_collection.find_one.assert_not_called()
+
+        result = await repo.find_by_id("arquivado", include_archived=True)
+        assert result.seller_id == "arquivado"
+        cold_client.get_database.assert_called_once_with("cold_db")
+        cold_collection.find_one.assert_awaited_once_with({"seller_id": "arquivado"})
+
+    async def test_find_by_cnpj_include_archived_caches_cold_misses(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one = mock.AsyncMock(return_value=None)
+        cold_client, cold_collection = self._cold_client()
+
+        repo = SellerRepository(client, "test_db", cold_client=cold_client, cold_db_name="cold_db")
+
+        assert await repo.find_by_cnpj("00000000000000", include_archived=True) is None
+        assert await repo.find_by_cnpj("00000000000000", include_archived=True) is None
+        cold_collection.find_one.assert_awaited_once_with({"cnpj": "00000000000000"})
+
+    async def test_include_archived_without_cold_client(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one = mock.AsyncMock(return_value=None)
+
+        repo = SellerRepository(client, "test_db")
+
+        assert await repo.find_by_id("inexistente", include_archived=True) is None
+
+    @staticmethod
+    def _cold_client(doc=None):
+        cold_collection = mock.MagicMock()
+        cold_collection.find_one = mock.AsyncMock(return_value=doc)
+        cold_database = mock.MagicMock()
+        cold_database.__getitem__ = lambda self, name: cold_collection
+        cold_client = mock.MagicMock()
+        cold_client.get_database.return_value = cold_database
+        return cold_client, cold_collection
+
+    async def test_find_by_id_include_archived_reads_segment_archive(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.find_one = mock.AsyncMock(return_value=None)
+        segment_archive = mock.MagicMock()
+        segment_archive.find.return_value = create_minimal_seller_dict(seller_id="segmento", status="Inativo")
+
+        repo = SellerRepository(client, "test_db", segment_archive=segment_archive)
+        result = await repo.find_by_id("segmento", include_archived=True)
+
+        assert result.seller_id == "segmento"
+        segment_archive.find.assert_called_once_with("seller_id", "segmento")
+
+    async def test_find_version_projects_only_version_fields(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        version = {"seller_id": "seller01", "cnpj": "11111111111111", "status": "Ativo", "updated_at": None}
+        collection.find_one = mock.AsyncMock(return_value=version)
+
+        repo = SellerRepository(client, "test_db")
+        result = await repo.find_version("cnpj", "11111111111111")
+
+        assert result == version
+        collection.find_one.assert_called_once_with({"cnpj": "11111111111111"}, SellerRepository.VERSION_PROJECTION)
+        assert "business_description" not in SellerRepository.VERSION_PROJECTION
+
+    async def test_find_version_concurrent_calls_share_query(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        version = {"seller_id": "seller01", "cnpj": "11111111111111", "status": "Ativo", "updated_at": None}
+        collection.find_one = mock.AsyncMock(return_value=version)
+
+        repo = SellerRepository(client, "test_db")
+        results = await asyncio.gather(*(repo.find_version("seller_id", "seller01") for _ in range(10)))
+
+        collection.find_one.assert_awaited_once()
+        assert all(result == version for result in results)
+        assert results[0] is not results[1]
@@ -0,0 +1,77 @@
+from unittest import mock
+
+import pytest
+
+from app.models.enums import ProductCategory, SellerStatus
+from app.repositories.seller_stats_repository import STATS_DOCUMENT_ID, SellerStatsRepository
+from tests.helpers.test_fixtures import create_full_seller
+
+
+@pytest.mark.asyncio
+class TestSellerStatsRepository:
+    async def test_apply_change_on_create(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+
+        repo = SellerStatsRepository(client, "test_db")
+        await repo.apply_change(None, create_full_seller(product_categories=[ProductCategory.GAMES]))
+
+        query, update = collection.update_one.call_args.args
+        assert query == {"_id": STATS_DOCUMENT_ID}
+        assert update["$inc"] == {
+            "total": 1,
+            "by_status.Ativo": 1,
+            "by_product_categories.games": 1,
+            "by_legal_rep_rg_state.SP": 1,
+            "by_account_type.Corrente": 1,
+        }
+        assert collection.update_one.call_args.kwargs == {"upsert": True}
+
+    async def test_apply_change_on_soft_delete_moves_status_only(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+        before = create_full_seller()
+        after = before.model_copy(update={"status": SellerStatus.INACTIVE})
+
+        repo = SellerStatsRepository(client, "test_db")
+        await repo.apply_change(before, after)
+
+        assert collection.update_one.call_args.args[1]["$inc"] == {"by_status.Ativo": -1, "by_status.Inativo": 1}
+
+    async def test_apply_change_without_facet_changes_is_noop(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.update_one = mock.AsyncMock()
+        seller = create_full_seller()
+
+        repo = SellerStatsRepository(client, "test_db")
+        await repo.apply_change(seller, seller.model_copy(update={"trade_name": "Outro Nome"}))
+
+        collection.update_one.assert_not_called()
+
+    async def test_reconcile_replaces_document_from_facet_aggregation(self, mock_mongo_client):
+        client, collection = mock_mongo_client
+        collection.replace_one = mock.AsyncMock()
+        aggregation = mock.MagicMock()
+        aggregation.to_list = mock.AsyncMock(
+            return_value=[
+                {
+                    "total": [{"count": 3}],
+                    "by_status": [{"_id": "Ativo", "count": 2}, {"_id": "Inativo", "count": 1}],
+                    "by_product_categories": [{"_id": "games", "count": 3}],
+                    "by_legal_rep_rg_state": [{"_id": "SP", "count": 3}, {"_id": None, "count": 1}],
+                    "by_account_type": [],
+                }
+            ]
+        )
+        collection.aggregate = mock.MagicMock(return_value=aggregation)
+
+        repo = SellerStatsRepository(client, "test_db")
+        stats = await repo.reconcile()
+
+        facet = collection.aggregate.call_args.args[0][0]["$facet"]
+        assert facet["by_product_categories"][0] == {"$unwind": "$product_categories"}
+        assert stats["total"] == 3
+        assert stats["by_status"] == {"Ativo": 2, "Inativo": 1}
+        assert stats["by_legal_rep_rg_state"] == {"SP": 3}
+        assert stats["by_account_type"] == {}
+        collection.replace_one.assert_awaited_once_with({"_id": STATS_DOCUMENT_ID}, stats, upsert=True)
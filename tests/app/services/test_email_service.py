@@ -1,11 +1,13 @@
 import pytest
-from unittest.mock import MagicMock, patch, call, AsyncMock
+from unittest.mock import patch, call, AsyncMock
 import smtplib
 from app.services.email_service import EmailService
+from tests.helpers.local_smtp_server import LocalSmtpServer
 
 
 EMPRESA_TESTE = 'Empresa Teste Ltda'
 EMAIl_LOJA_TESTE = 'contato@lojateste.com'
+SMTP_CLASS = 'app.integrations.email.smtp_session_pool.smtplib.SMTP'
 
 class TestEmailService:
     """Testes para o serviço de email"""
@@ -32,12 +34,10 @@ class TestEmailService:
         'SENDER_EMAIL': 'test@company.com',
         'SENDER_PASSWORD': 'test_password'
     })
-    @patch('app.services.email_service.smtplib.SMTP')
+    @patch(SMTP_CLASS)
     def test_send_welcome_email_success(self, mock_smtp):
         """Testa envio de email de boas-vindas com sucesso"""
-        mock_server = MagicMock()
-        mock_smtp.return_value.__enter__ = MagicMock(return_value=mock_server)
-        mock_smtp.return_value.__exit__ = MagicMock(return_value=None)
+        mock_server = mock_smtp.return_value
         
         service = EmailService()
         
@@ -55,7 +55,7 @@ class TestEmailService:
         assert result is True
         
         # Verifica se o SMTP foi configurado corretamente
-        mock_smtp.assert_called_once_with('smtp.test.com', '587')
+        mock_smtp.assert_called_once_with('smtp.test.com', '587', timeout=30.0)
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with('test@company.com', 'test_password')
         mock_server.sendmail.assert_called_once()
@@ -66,7 +66,7 @@ class TestEmailService:
         'SENDER_EMAIL': 'test@company.com',
         'SENDER_PASSWORD': 'test_password'
     })
-    @patch('app.services.email_service.smtplib.SMTP')
+    @patch(SMTP_CLASS)
     def test_send_welcome_email_smtp_error(self, mock_smtp):
         """Testa tratamento de erro SMTP"""
         mock_smtp.side_effect = smtplib.SMTPException("Falha na conexão")
@@ -161,7 +161,7 @@ class TestEmailService:
         'SENDER_EMAIL': 'test@company.com',
         'SENDER_PASSWORD': 'test_password'
     })
-    @patch('app.services.email_service.smtplib.SMTP')
+    @patch(SMTP_CLASS)
     def test_send_welcome_email_missing_fields(self, mock_smtp):
         """Testa envio de email com campos obrigatórios faltando"""
         service = EmailService()
@@ -202,13 +202,11 @@ class TestEmailService:
         'SENDER_EMAIL': 'test@company.com',
         'SENDER_PASSWORD': 'test_password'
     })
-    @patch('app.services.email_service.smtplib.SMTP')
+    @patch(SMTP_CLASS)
     def test_send_welcome_email_connection_error(self, mock_smtp):
         """Testa tratamento de erro de conexão"""
-        mock_server = MagicMock()
+        mock_server = mock_smtp.return_value
         mock_server.starttls.side_effect = Exception("Falha na conexão TLS")
-        mock_smtp.return_value.__enter__ = MagicMock(return_value=mock_server)
-        mock_smtp.return_value.__exit__ = MagicMock(return_value=None)
         
         service = EmailService()
         
@@ -227,3 +225,24 @@ class TestEmailService:
         
         mock_smtp.assert_called_once()
         mock_server.starttls.assert_called_once()
+
+    def test_send_welcome_emails_reuse_smtp_session(self):
+        """Testa que vários envios usam a mesma conexão autenticada"""
+        with LocalSmtpServer() as smtp_server:
+            with patch.dict('os.environ', {
+                'SMTP_SERVER': smtp_server.host,
+                'SMTP_PORT': str(smtp_server.port),
+                'SMTP_STARTTLS': 'false',
+                'SENDER_EMAIL': 'test@company.com',
+                'SENDER_PASSWORD': 'test_password'
+            }):
+                service = EmailService()
+
+            for index in range(3):
+                seller_data = {'company_name': EMPRESA_TESTE, 'contact_email': f'seller{index}@lojateste.com'}
+                assert service.send_welcome_email(seller_data) is True
+            service.close()
+
+            assert len(smtp_server.messages) == 3
+            assert smtp_server.stats['connections'] == 1
+            assert smtp_server.stats['logins'] == 1
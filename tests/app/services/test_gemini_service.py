@@ -1,10 +1,10 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
+from app.integrations.retrieval.pdf_text import PdfTextExtractor
 from app.services.gemini_service import GeminiService
 
 RESPOSTA_GEMINI = "Resposta do Gemini"
-PATH_LIB_GLOB = 'pathlib.Path.glob'
 PATH_LIB_EXISTS = 'pathlib.Path.exists'
 MENSAGE_TEST = "Mensagem de teste"
 
@@ -31,6 +31,7 @@ def mock_gemini_service(mock_api_key, mock_pdfs_folder):
         
         # Mock memory with proper structure
         service.memory = Mock()
+        service.memory.buffer_as_messages = []
         service.memory.chat_memory = Mock()
         service.memory.chat_memory.add_user_message = Mock()
         service.memory.chat_memory.add_ai_message = Mock()
@@ -63,34 +64,27 @@ def test_gemini_service_init_no_pdfs():
         GeminiService("test-key", "empty_folder")
 
 
-def test_load_pdfs_from_folder_success():
+def _write_pdf(path, text):
+    import fitz
+
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), text)
+        doc.save(str(path))
+
+
+def test_load_pdfs_from_folder_success(tmp_path):
     """Testa carregamento bem-sucedido de PDFs."""
-    with patch(PATH_LIB_EXISTS, return_value=True), \
-         patch(PATH_LIB_GLOB) as mock_glob, \
-         patch('fitz.open') as mock_fitz:
-        
-        # Mock PDF files
-        mock_pdf_file = Mock()
-        mock_pdf_file.name = "test.pdf"
-        mock_glob.return_value = [mock_pdf_file]
-        
-        # Mock PyMuPDF
-        mock_doc = Mock()
-        mock_page = Mock()
-        mock_page.get_text.return_value = "Conteúdo da página"
-        mock_doc.__iter__ = Mock(return_value=iter([mock_page]))
-        mock_doc.close = Mock()
-        mock_fitz.return_value.__enter__ = Mock(return_value=mock_doc)
-        mock_fitz.return_value.__exit__ = Mock(return_value=None)
-        
-        service = GeminiService.__new__(GeminiService)
-        service.pdfs_folder_path = "test_pdfs"
-        
-        result = service._load_pdfs_from_folder()
-        
-        # Verificar que contém o formato esperado
-        assert "test.pdf" in result
-        assert "--- Conteúdo do arquivo test.pdf ---" in result
+    _write_pdf(tmp_path / "test.pdf", "Conteudo da pagina")
+
+    service = GeminiService.__new__(GeminiService)
+    service.pdfs_folder_path = str(tmp_path)
+    service.pdf_extractor = PdfTextExtractor(max_workers=1)
+
+    result = service._load_pdfs_from_folder()
+
+    # Verificar que contém o formato esperado
+    assert "--- Conteúdo do arquivo test.pdf ---" in result
+    assert "Conteudo da pagina" in result
 
 
 def test_load_pdfs_folder_not_exists():
@@ -104,36 +98,85 @@ def test_load_pdfs_folder_not_exists():
         assert result == ""
 
 
-def test_load_pdfs_no_pdf_files():
+def test_load_pdfs_no_pdf_files(tmp_path):
     """Testa quando não há arquivos PDF na pasta."""
-    with patch(PATH_LIB_EXISTS, return_value=True), \
-         patch(PATH_LIB_GLOB, return_value=[]):
-        
-        service = GeminiService.__new__(GeminiService)
-        service.pdfs_folder_path = "empty_folder"
-        
-        result = service._load_pdfs_from_folder()
-        
-        assert result == ""
+    service = GeminiService.__new__(GeminiService)
+    service.pdfs_folder_path = str(tmp_path)
+    service.pdf_extractor = PdfTextExtractor(max_workers=1)
+
+    result = service._load_pdfs_from_folder()
 
+    assert result == ""
 
-def test_load_pdfs_file_error():
+
+def test_load_pdfs_file_error(tmp_path):
     """Testa erro ao carregar arquivo PDF específico."""
-    with patch(PATH_LIB_EXISTS, return_value=True), \
-         patch(PATH_LIB_GLOB) as mock_glob, \
-         patch('fitz.open', side_effect=Exception("Erro ao abrir PDF")):
-        
-        mock_pdf_file = Mock()
-        mock_pdf_file.name = "corrupted.pdf"
-        mock_glob.return_value = [mock_pdf_file]
-        
-        service = GeminiService.__new__(GeminiService)
-        service.pdfs_folder_path = "test_pdfs"
-        
-        result = service._load_pdfs_from_folder()
-        
-        # Deve retornar string vazia se não conseguir carregar nenhum PDF
-        assert result == ""
+    (tmp_path / "corrupted.pdf").write_bytes(b"isto nao e um pdf")
+
+    service = GeminiService.__new__(GeminiService)
+    service.pdfs_folder_path = str(tmp_path)
+    service.pdf_extractor = PdfTextExtractor(max_workers=1)
+
+    result = service._load_pdfs_from_folder()
+
+    # Deve retornar string vazia se não conseguir carregar nenhum PDF
+    assert result == ""
+
+
+@pytest.mark.asyncio
+async def test_fake_chat_backend_answers_offline():
+    """Testa o backend simulado: a chain completa responde sem chamar o Gemini."""
+    with patch.object(GeminiService, '_load_pdfs_from_folder', return_value=PDF_CONTENT), \
+         patch('app.services.gemini_service.ChatGoogleGenerativeAI') as mock_llm:
+        service = GeminiService("test-key", chat_backend="fake", fake_llm_config={"answer_tokens": 8})
+
+    answer = await service.achat("Como cadastrar um seller?")
+
+    assert len(answer.split()) == 8
+    mock_llm.assert_not_called()
+
+
+def test_unknown_chat_backend():
+    """Testa que um backend desconhecido impede a criação da chain."""
+    with patch.object(GeminiService, '_load_pdfs_from_folder', return_value=PDF_CONTENT), \
+         pytest.raises(RuntimeError, match="Backend de chat desconhecido"):
+        GeminiService("test-key", chat_backend="openai")
+
+
+def test_reload_documents_rebuilds_index_when_pdfs_change(tmp_path):
+    """Testa a recarga: o índice só é reconstruído quando o conteúdo dos PDFs muda."""
+    _write_pdf(tmp_path / "regras.pdf", "O cadastro do seller exige CNPJ valido.")
+    with patch.object(GeminiService, '_create_chain'):
+        service = GeminiService("test-key", str(tmp_path), pdf_workers=1)
+    documents_hash = service.documents_hash
+
+    assert service.reload_documents() is False
+
+    _write_pdf(tmp_path / "seguranca.pdf", "A autenticacao usa tokens JWT do Keycloak.")
+
+    assert service.reload_documents() is True
+    assert service.documents_hash != documents_hash
+    assert service.index.search("keycloak")[0][0].source == "seguranca.pdf"
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_documents_when_folder_changes(tmp_path):
+    """Testa que o watcher recarrega os documentos quando a pasta muda."""
+    import asyncio
+
+    _write_pdf(tmp_path / "regras.pdf", "O cadastro do seller exige CNPJ valido.")
+    with patch.object(GeminiService, '_create_chain'):
+        service = GeminiService("test-key", str(tmp_path), pdf_workers=1)
+
+    service.start_watching(0.01)
+    _write_pdf(tmp_path / "seguranca.pdf", "A autenticacao usa tokens JWT do Keycloak.")
+    for _ in range(200):
+        if "seguranca.pdf" in service.pdf_content:
+            break
+        await asyncio.sleep(0.01)
+    await service.stop_watching()
+
+    assert "seguranca.pdf" in service.pdf_content
 
 
 def test_create_chain():
@@ -152,6 +195,7 @@ def test_create_chain():
         
         service = GeminiService.__new__(GeminiService)
         service.api_key = "test-key"
+        service.chat_backend = "gemini"
         service.pdf_content = "Conteúdo teste"
         service.memory = Mock()
         
@@ -253,3 +297,258 @@ def test_chat_different_inputs(mock_gemini_service, message, expected_call_count
         assert result == "Resposta"
         assert mock_generate.call_count == expected_call_count
         mock_generate.assert_called_with(message)
+
+
+@pytest.mark.asyncio
+async def test_agenerate_response_uses_ainvoke(mock_gemini_service):
+    """Testa o caminho assíncrono: usa `ainvoke` e atualiza o histórico."""
+    from unittest.mock import AsyncMock
+
+    mock_gemini_service.chain.ainvoke = AsyncMock(return_value=Mock(content=RESPOSTA_GEMINI))
+
+    result = await mock_gemini_service.achat(MENSAGE_TEST)
+
+    assert result == RESPOSTA_GEMINI
+    mock_gemini_service.chain.invoke.assert_not_called()
+    mock_gemini_service.memory.chat_memory.add_ai_message.assert_called_once_with(RESPOSTA_GEMINI)
+
+
+@pytest.mark.asyncio
+async def test_agenerate_response_error(mock_gemini_service):
+    """Testa erro no caminho assíncrono."""
+    from unittest.mock import AsyncMock
+
+    mock_gemini_service.chain.ainvoke = AsyncMock(side_effect=Exception("Erro na chain"))
+
+    result = await mock_gemini_service.agenerate_response(MENSAGE_TEST)
+
+    assert result == "Desculpe, ocorreu um erro ao processar sua mensagem."
+
+
+@pytest.mark.asyncio
+async def test_astream_response_yields_chunks_and_updates_memory(mock_gemini_service):
+    """Testa o stream: repassa os trechos e grava a resposta completa no histórico."""
+    async def astream(_):
+        for content in ("Olá", "", [{"type": "text", "text": " mundo"}]):
+            yield Mock(content=content)
+
+    mock_gemini_service.chain.astream = astream
+
+    chunks = [chunk async for chunk in mock_gemini_service.astream_response(MENSAGE_TEST)]
+
+    assert chunks == ["Olá", " mundo"]
+    mock_gemini_service.memory.chat_memory.add_user_message.assert_called_once_with(MENSAGE_TEST)
+    mock_gemini_service.memory.chat_memory.add_ai_message.assert_called_once_with("Olá mundo")
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_capped_by_semaphore(mock_api_key):
+    """Testa que chamadas simultâneas ao modelo respeitam `max_concurrency`."""
+    import asyncio
+
+    with patch.object(GeminiService, '_initialize'):
+        service = GeminiService(mock_api_key, max_concurrency=2)
+    service.memory = Mock()
+    service.memory.buffer_as_messages = []
+    running = peak = 0
+
+    async def ainvoke(_):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Mock(content="ok")
+
+    service.chain = Mock()
+    service.chain.ainvoke = ainvoke
+
+    results = await asyncio.gather(*(service.achat(f"pergunta {i}") for i in range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_achat_uses_session_history_from_store(mock_gemini_service):
+    """Testa que, com `history_store`, o histórico vem da sessão e o turno é gravado nela."""
+    from unittest.mock import AsyncMock
+
+    mock_gemini_service.history_store = Mock()
+    mock_gemini_service.history_store.load = AsyncMock(return_value=[("Pergunta anterior", "Resposta anterior")])
+    mock_gemini_service.history_store.append = AsyncMock()
+    mock_gemini_service.chain.ainvoke = AsyncMock(return_value=Mock(content=RESPOSTA_GEMINI))
+
+    result = await mock_gemini_service.achat(MENSAGE_TEST, "user-123")
+
+    assert result == RESPOSTA_GEMINI
+    chat_history = mock_gemini_service.chain.ainvoke.call_args.args[0]["chat_history"]
+    assert [message.content for message in chat_history] == ["Pergunta anterior", "Resposta anterior"]
+    mock_gemini_service.history_store.load.assert_awaited_once_with("user-123")
+    mock_gemini_service.history_store.append.assert_awaited_once_with("user-123", MENSAGE_TEST, RESPOSTA_GEMINI)
+    mock_gemini_service.memory.chat_memory.add_user_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_achat_without_session_has_no_history(mock_gemini_service):
+    """Testa que, com `history_store` e sem sessão, a conversa não lê nem grava histórico."""
+    from unittest.mock import AsyncMock
+
+    mock_gemini_service.history_store = Mock()
+    mock_gemini_service.history_store.load = AsyncMock()
+    mock_gemini_service.history_store.append = AsyncMock()
+    mock_gemini_service.chain.ainvoke = AsyncMock(return_value=Mock(content=RESPOSTA_GEMINI))
+
+    await mock_gemini_service.achat(MENSAGE_TEST)
+
+    assert mock_gemini_service.chain.ainvoke.call_args.args[0]["chat_history"] == []
+    mock_gemini_service.history_store.load.assert_not_awaited()
+    mock_gemini_service.history_store.append.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_astream_response_saves_turn_in_session(mock_gemini_service):
+    """Testa que o stream grava a resposta completa na sessão ao final."""
+    from unittest.mock import AsyncMock
+
+    async def astream(_):
+        for content in ("Olá", " mundo"):
+            yield Mock(content=content)
+
+    mock_gemini_service.history_store = Mock()
+    mock_gemini_service.history_store.load = AsyncMock(return_value=[])
+    mock_gemini_service.history_store.append = AsyncMock()
+    mock_gemini_service.chain.astream = astream
+
+    chunks = [chunk async for chunk in mock_gemini_service.astream_response(MENSAGE_TEST, "user-123")]
+
+    assert chunks == ["Olá", " mundo"]
+    mock_gemini_service.history_store.append.assert_awaited_once_with("user-123", MENSAGE_TEST, "Olá mundo")
+
+
+@pytest.fixture
+def cached_gemini_service(mock_gemini_service):
+    """GeminiService com histórico por sessão (vazio) e cache de respostas mockados."""
+    from unittest.mock import AsyncMock
+
+    mock_gemini_service.documents_hash = "pdfs-v1"
+    mock_gemini_service.history_store = Mock()
+    mock_gemini_service.history_store.load = AsyncMock(return_value=[])
+    mock_gemini_service.history_store.append = AsyncMock()
+    mock_gemini_service.answer_cache = Mock()
+    mock_gemini_service.answer_cache.get = AsyncMock(return_value=(3, None))
+    mock_gemini_service.answer_cache.set = AsyncMock()
+    mock_gemini_service.chain.ainvoke = AsyncMock(return_value=Mock(content=RESPOSTA_GEMINI))
+    return mock_gemini_service
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_miss_stores_answer(cached_gemini_service):
+    """Testa que a resposta do modelo é gravada sob a geração lida do cache."""
+    result = await cached_gemini_service.achat(MENSAGE_TEST, "user-123")
+
+    assert result == RESPOSTA_GEMINI
+    cached_gemini_service.chain.ainvoke.assert_awaited_once()
+    cache_key = cached_gemini_service.answer_cache.get.call_args.args[0]
+    cached_gemini_service.answer_cache.set.assert_awaited_once_with(3, cache_key, RESPOSTA_GEMINI.encode())
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_hit_skips_model_and_keeps_history(cached_gemini_service):
+    """Testa que a resposta em cache dispensa o modelo e ainda entra no histórico da sessão."""
+    cached_gemini_service.answer_cache.get.return_value = (3, "Resposta em cache".encode())
+
+    result = await cached_gemini_service.achat(MENSAGE_TEST, "user-123")
+
+    assert result == "Resposta em cache"
+    cached_gemini_service.chain.ainvoke.assert_not_awaited()
+    cached_gemini_service.history_store.append.assert_awaited_once_with(
+        "user-123", MENSAGE_TEST, "Resposta em cache"
+    )
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_key_ignores_formatting_case_and_accents(cached_gemini_service):
+    """Testa que variações de formatação, caixa e acentos da pergunta usam a mesma chave."""
+    await cached_gemini_service.achat("Como **cadastrar** um seller?")
+    await cached_gemini_service.achat("  como cadastrar um SELLER ")
+    cached_gemini_service.documents_hash = "pdfs-v2"
+    await cached_gemini_service.achat("Como cadastrar um seller?")
+
+    keys = [c.args[0] for c in cached_gemini_service.answer_cache.get.call_args_list]
+    assert keys[0] == keys[1]
+    assert keys[2] != keys[0]
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_key_depends_on_chat_backend(cached_gemini_service):
+    """Testa que respostas do modelo simulado e do Gemini não compartilham chaves no cache."""
+    from app.services.gemini_service import CHAT_BACKEND_FAKE
+
+    await cached_gemini_service.achat(MENSAGE_TEST)
+    cached_gemini_service.chat_backend = CHAT_BACKEND_FAKE
+    await cached_gemini_service.achat(MENSAGE_TEST)
+    cached_gemini_service.fake_llm_config = {"answer_tokens": 10}
+    await cached_gemini_service.achat(MENSAGE_TEST)
+
+    keys = [c.args[0] for c in cached_gemini_service.answer_cache.get.call_args_list]
+    assert len(set(keys)) == 3
+
+
+@pytest.mark.asyncio
+async def test_answer_cache_skipped_for_follow_up_turns(cached_gemini_service):
+    """Testa que continuações de uma conversa não leem nem gravam o cache."""
+    cached_gemini_service.history_store.load.return_value = [("Pergunta anterior", "Resposta anterior")]
+
+    await cached_gemini_service.achat("E depois?", "user-123")
+
+    cached_gemini_service.answer_cache.get.assert_not_awaited()
+    cached_gemini_service.answer_cache.set.assert_not_awaited()
+    cached_gemini_service.chain.ainvoke.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_astream_response_serves_cached_answer(cached_gemini_service):
+    """Testa que o stream envia a resposta em cache como um único trecho."""
+    cached_gemini_service.answer_cache.get.return_value = (3, "Resposta em cache".encode())
+    cached_gemini_service.chain.astream = Mock()
+
+    chunks = [chunk async for chunk in cached_gemini_service.astream_response(MENSAGE_TEST, "user-123")]
+
+    assert chunks == ["Resposta em cache"]
+    cached_gemini_service.chain.astream.assert_not_called()
+
+
+PDF_CONTENT = (
+    "\n\n--- Conteúdo do arquivo regras.pdf ---\n\nO cadastro do seller exige CNPJ válido."
+    "\n\n--- Conteúdo do arquivo seguranca.pdf ---\n\nA autenticação usa tokens JWT do Keycloak."
+)
+
+
+def test_prompt_receives_only_relevant_chunks(tmp_path):
+    """Testa que o prompt recebe apenas os trechos relevantes e que o índice é reaproveitado do disco."""
+    index_path = tmp_path / "index.npz"
+    with patch.object(GeminiService, '_load_pdfs_from_folder', return_value=PDF_CONTENT), \
+         patch.object(GeminiService, '_create_chain'):
+        service = GeminiService("test-key", index_path=str(index_path))
+
+        context = service._chain_input("Como funciona a autenticação?")["context"]
+
+        assert "Trecho de seguranca.pdf" in context
+        assert "CNPJ" not in context
+        assert index_path.exists()
+
+        with patch('app.services.gemini_service.DocumentIndex.build') as mock_build:
+            reloaded = GeminiService("test-key", index_path=str(index_path))
+        mock_build.assert_not_called()
+        assert len(reloaded.index) == 2
+
+
+def test_retrieval_disabled_sends_full_content():
+    """Testa que, com `retrieval_top_k=0`, o conteúdo completo dos PDFs vai para o prompt."""
+    with patch.object(GeminiService, '_load_pdfs_from_folder', return_value=PDF_CONTENT), \
+         patch.object(GeminiService, '_create_chain'):
+        service = GeminiService("test-key", retrieval_top_k=0)
+
+    assert service.index is None
+    assert service._retrieve_context("qualquer pergunta") == PDF_CONTENT
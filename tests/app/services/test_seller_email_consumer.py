@@ -4,6 +4,9 @@ import pytest
 from unittest.mock import MagicMock, patch, call
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import ANY
 from app.services.seller_email_consumer import SellerEmailConsumer, main
 
@@ -65,10 +68,11 @@ class TestSellerEmailConsumer:
         
         mock_connection_instance.channel.assert_called_once()
         mock_channel.queue_declare.assert_called_once_with(queue='test_queue', durable=True)
+        mock_channel.basic_qos.assert_called_once_with(prefetch_count=16)
         mock_channel.basic_consume.assert_called_once_with(
             queue='test_queue',
             auto_ack=False,
-            on_message_callback=consumer._SellerEmailConsumer__process_seller_message
+            on_message_callback=consumer._SellerEmailConsumer__dispatch_message
         )
         
         assert connection == mock_connection_instance
@@ -316,6 +320,197 @@ class TestSellerEmailConsumer:
         mock_connection.assert_called()
 
 
+class FakeConnection:
+    """Conexão que guarda os callbacks agendados pelos workers e os executa em process_data_events"""
+
+    def __init__(self):
+        self.callbacks = []
+        self.lock = threading.Lock()
+        self.is_open = True
+        self.close = MagicMock()
+
+    def add_callback_threadsafe(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def process_data_events(self, time_limit=0):
+        with self.lock:
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+        if time_limit:
+            time.sleep(min(time_limit, 0.01))
+
+
+def _seller_message(index):
+    return json.dumps({
+        'seller_id': str(index),
+        'company_name': EMPRESA_TESTE,
+        'contact_email': f'contato{index}@teste.com'
+    }).encode('utf-8')
+
+
+class TestSellerEmailConsumerConcurrency:
+    """Testes para o processamento concorrente das mensagens"""
+
+    @patch.dict(os.environ, {'EMAIL_CONSUMER_WORKERS': '3', 'EMAIL_CONSUMER_PREFETCH': '5'})
+    def test_workers_and_prefetch_from_env(self):
+        """Testa configuração de workers e prefetch por variáveis de ambiente"""
+        consumer = SellerEmailConsumer()
+
+        assert consumer._SellerEmailConsumer__workers == 3
+        assert consumer._SellerEmailConsumer__prefetch_count == 5
+
+    def test_messages_processed_concurrently(self):
+        """Testa que várias mensagens são enviadas ao mesmo tempo, com ack pela thread da conexão"""
+        workers = 4
+        consumer = SellerEmailConsumer()
+        barrier = threading.Barrier(workers, timeout=5)
+        consumer.email_service = MagicMock()
+        consumer.email_service.send_welcome_email.side_effect = lambda data: barrier.wait() is not None
+        connection = FakeConnection()
+        consumer._SellerEmailConsumer__connection = connection
+        consumer._SellerEmailConsumer__executor = ThreadPoolExecutor(workers)
+        ch = MagicMock()
+
+        dispatch = consumer._SellerEmailConsumer__dispatch_message
+        for index in range(workers):
+            dispatch(ch, MagicMock(delivery_tag=index), None, _seller_message(index))
+        consumer._SellerEmailConsumer__executor.shutdown(wait=True)
+
+        # Os workers não usam o canal diretamente
+        ch.basic_ack.assert_not_called()
+        connection.process_data_events()
+        assert sorted(c.kwargs['delivery_tag'] for c in ch.basic_ack.call_args_list) == list(range(workers))
+        ch.basic_nack.assert_not_called()
+        assert consumer._SellerEmailConsumer__in_flight_count() == 0
+
+    @patch('app.services.seller_email_consumer.pika.BlockingConnection')
+    @patch('app.services.seller_email_consumer.pika.ConnectionParameters')
+    def test_shutdown_drains_in_flight_messages(self, mock_params, mock_connection):
+        """Testa que ao parar o consumer espera os envios em andamento e confirma as mensagens"""
+        connection = FakeConnection()
+        mock_channel = MagicMock()
+        connection.channel = MagicMock(return_value=mock_channel)
+        mock_connection.return_value = connection
+
+        consumer = SellerEmailConsumer()
+        consumer.email_service = MagicMock()
+        consumer.email_service.send_welcome_email.side_effect = lambda data: time.sleep(0.2) is None
+
+        def deliver_and_interrupt():
+            on_message = mock_channel.basic_consume.call_args.kwargs['on_message_callback']
+            on_message(mock_channel, MagicMock(delivery_tag=1), None, _seller_message(1))
+            raise KeyboardInterrupt()
+
+        mock_channel.start_consuming.side_effect = deliver_and_interrupt
+
+        consumer.start_consuming()
+
+        mock_channel.stop_consuming.assert_called_once()
+        mock_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+        connection.close.assert_called_once()
+
+    @patch.dict(os.environ, {'EMAIL_CONSUMER_DRAIN_TIMEOUT': '0.05'})
+    def test_drain_timeout_discards_queued_and_waits_started_sends(self):
+        """Testa que após o prazo as mensagens na fila do pool são descartadas e o envio iniciado é confirmado"""
+        consumer = SellerEmailConsumer()
+        started = threading.Event()
+        consumer.email_service = MagicMock()
+
+        def send(data):
+            started.set()
+            time.sleep(0.2)
+            return True
+
+        consumer.email_service.send_welcome_email.side_effect = send
+        connection = FakeConnection()
+        consumer._SellerEmailConsumer__connection = connection
+        consumer._SellerEmailConsumer__executor = ThreadPoolExecutor(1)
+        ch = MagicMock()
+
+        dispatch = consumer._SellerEmailConsumer__dispatch_message
+        dispatch(ch, MagicMock(delivery_tag=1), None, _seller_message(1))
+        dispatch(ch, MagicMock(delivery_tag=2), None, _seller_message(2))
+        assert started.wait(5)
+        consumer._SellerEmailConsumer__drain(connection)
+
+        assert consumer._SellerEmailConsumer__in_flight_count() == 0
+        consumer.email_service.send_welcome_email.assert_called_once()
+        ch.basic_ack.assert_called_once_with(delivery_tag=1)
+        ch.basic_nack.assert_not_called()
+
+    def test_ack_after_connection_closed_is_ignored(self):
+        """Testa que o envio que termina depois do fechamento não usa o canal, nem diretamente nem pela conexão"""
+        consumer = SellerEmailConsumer()
+        release = threading.Event()
+        consumer.email_service = MagicMock()
+        consumer.email_service.send_welcome_email.side_effect = lambda data: release.wait(5)
+        connection = FakeConnection()
+        consumer._SellerEmailConsumer__connection = connection
+        consumer._SellerEmailConsumer__executor = ThreadPoolExecutor(1)
+        ch = MagicMock()
+
+        consumer._SellerEmailConsumer__dispatch_message(ch, MagicMock(delivery_tag=1), None, _seller_message(1))
+        consumer._SellerEmailConsumer__close_connection(connection)
+        release.set()
+        consumer._SellerEmailConsumer__executor.shutdown(wait=True)
+
+        connection.close.assert_called_once()
+        assert connection.callbacks == []
+        ch.basic_ack.assert_not_called()
+        ch.basic_nack.assert_not_called()
+
+    @patch('app.services.seller_email_consumer.pika.BlockingConnection')
+    @patch('app.services.seller_email_consumer.pika.ConnectionParameters')
+    def test_email_service_closed_after_sends_finish(self, mock_params, mock_connection):
+        """Testa que o pool SMTP só é fechado depois que os workers terminam, mesmo se a conexão cair"""
+        connection = FakeConnection()
+        mock_channel = MagicMock()
+        connection.channel = MagicMock(return_value=mock_channel)
+        mock_connection.return_value = connection
+
+        consumer = SellerEmailConsumer()
+        events = []
+        started = threading.Event()
+        consumer.email_service = MagicMock()
+
+        def send(data):
+            started.set()
+            time.sleep(0.1)
+            events.append("enviado")
+            return True
+
+        consumer.email_service.send_welcome_email.side_effect = send
+        consumer.email_service.close.side_effect = lambda: events.append("fechado")
+
+        def deliver_and_fail():
+            on_message = mock_channel.basic_consume.call_args.kwargs['on_message_callback']
+            on_message(mock_channel, MagicMock(delivery_tag=1), None, _seller_message(1))
+            started.wait(5)
+            raise ConnectionError("Conexão perdida")
+
+        mock_channel.start_consuming.side_effect = deliver_and_fail
+
+        with pytest.raises(ConnectionError):
+            consumer.start_consuming()
+
+        assert events == ["enviado", "fechado"]
+
+    def test_stop_schedules_stop_consuming(self):
+        """Testa que stop agenda o cancelamento do consumo na thread da conexão"""
+        consumer = SellerEmailConsumer()
+        connection = FakeConnection()
+        channel = MagicMock()
+        consumer._SellerEmailConsumer__connection = connection
+        consumer._SellerEmailConsumer__channel = channel
+
+        consumer.stop()
+        channel.stop_consuming.assert_not_called()
+        connection.process_data_events()
+        channel.stop_consuming.assert_called_once()
+
+
 class TestMainFunction:
     """Testes para a função main"""
     
@@ -205,3 +205,186 @@ async def test_replace_not_found(mock_repository, mock_keycloak_client, existing
 
     with pytest.raises(NotFoundException):
         await service.replace("non-existent-id", existing_seller_model, auth_info=fake_auth_info)
+
+
+# --- Testes para o Método `find_many` (busca em lote) ---
+
+
+@pytest.mark.asyncio
+async def test_find_many_deduplicates_and_skips_inactive(mock_repository, mock_keycloak_client):
+    active = create_full_seller(seller_id="001", cnpj="11111111111111")
+    inactive = create_full_seller(seller_id="002", cnpj="22222222222222", status="Inativo")
+    mock_repository.find_many_by_ids.return_value = [active, inactive]
+    mock_repository.find_many_by_cnpjs.return_value = [active]
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    result = await service.find_many(seller_ids=["001", "002"], cnpjs=["11111111111111"])
+
+    assert [seller.seller_id for seller in result] == ["001"]
+    mock_repository.find_many_by_ids.assert_awaited_once_with(["001", "002"])
+    mock_repository.find_many_by_cnpjs.assert_awaited_once_with(["11111111111111"])
+
+
+# --- Testes para o Método `find` (planejamento por índice) ---
+
+
+def _paginator(sort=None):
+    from app.api.common.schemas import Paginator
+
+    return Paginator(request_path="/seller/v1/sellers", limit=10, offset=0, sort=sort)
+
+
+@pytest.mark.asyncio
+async def test_find_applies_default_status_and_indexed_sort(mock_keycloak_client):
+    repository = AsyncMock(spec=SellerRepository)
+    repository.plan.side_effect = SellerRepository.query_planner.plan
+    repository.find.return_value = []
+
+    service = SellerService(repository, mock_keycloak_client)
+    await service.find(_paginator("created_at:desc"), {"product_categories": "moda"})
+
+    repository.find.assert_awaited_once_with(
+        filters={"product_categories": "moda", "status": "Ativo"}, limit=10, offset=0, sort={"created_at": -1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_rejects_unindexed_sort_when_strict(mock_keycloak_client):
+    repository = AsyncMock(spec=SellerRepository)
+    repository.plan.side_effect = SellerRepository.query_planner.plan
+
+    service = SellerService(repository, mock_keycloak_client, reject_unindexed_sort=True)
+
+    with pytest.raises(BadRequestException):
+        await service.find(_paginator("business_description"), {})
+    repository.find.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_find_only_warns_unindexed_sort_by_default(mock_keycloak_client):
+    repository = AsyncMock(spec=SellerRepository)
+    repository.plan.side_effect = SellerRepository.query_planner.plan
+    repository.find.return_value = []
+
+    service = SellerService(repository, mock_keycloak_client)
+    await service.find(_paginator("company_name"), {})
+
+    repository.find.assert_awaited_once()
+
+
+# --- Testes para estatísticas materializadas ---
+
+
+@pytest.mark.asyncio
+async def test_update_applies_stats_change(
+    mock_repository, mock_keycloak_client, existing_seller_model, patch_data, fake_auth_info
+):
+    from app.repositories import SellerStatsRepository
+
+    stats_repository = AsyncMock(spec=SellerStatsRepository)
+    updated = existing_seller_model.model_copy(update={"trade_name": "Nova Loja"})
+    mock_repository.find_by_id.return_value = existing_seller_model
+    mock_repository.find_by_trade_name.return_value = None
+    mock_repository.patch.return_value = updated
+
+    service = SellerService(mock_repository, mock_keycloak_client, stats_repository=stats_repository)
+    await service.update(existing_seller_model.seller_id, patch_data, auth_info=fake_auth_info)
+
+    stats_repository.apply_change.assert_awaited_once_with(existing_seller_model, updated)
+
+
+@pytest.mark.asyncio
+async def test_stats_failure_does_not_break_write(
+    mock_repository, mock_keycloak_client, existing_seller_model, fake_auth_info
+):
+    from app.repositories import SellerStatsRepository
+
+    stats_repository = AsyncMock(spec=SellerStatsRepository)
+    stats_repository.apply_change.side_effect = RuntimeError("mongo indisponível")
+    mock_repository.find_by_id.return_value = existing_seller_model
+    mock_repository.patch.return_value = existing_seller_model
+
+    service = SellerService(mock_repository, mock_keycloak_client, stats_repository=stats_repository)
+    result = await service.delete_by_id(existing_seller_model.seller_id, auth_info=fake_auth_info)
+
+    assert result == existing_seller_model
+
+
+@pytest.mark.asyncio
+async def test_get_stats_reconciles_when_missing(mock_repository, mock_keycloak_client):
+    from app.repositories import SellerStatsRepository
+
+    stats_repository = AsyncMock(spec=SellerStatsRepository)
+    stats_repository.get.return_value = None
+    stats_repository.reconcile.return_value = {"total": 0}
+
+    service = SellerService(mock_repository, mock_keycloak_client, stats_repository=stats_repository)
+
+    assert await service.get_stats() == {"total": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_stats_schedules_background_reconcile_when_stale(mock_repository, mock_keycloak_client):
+    import asyncio
+    from datetime import timedelta
+
+    from app.common.datetime import utcnow
+    from app.repositories import SellerStatsRepository
+
+    stats_repository = AsyncMock(spec=SellerStatsRepository)
+    stale = {"total": 1, "reconciled_at": utcnow() - timedelta(hours=2)}
+    stats_repository.get.return_value = stale
+
+    service = SellerService(
+        mock_repository, mock_keycloak_client, stats_repository=stats_repository, stats_reconcile_interval_seconds=60
+    )
+
+    assert await service.get_stats() == stale
+    await asyncio.sleep(0)
+    stats_repository.reconcile.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_include_archived_returns_inactive(
+    mock_repository, mock_keycloak_client, existing_seller_model
+):
+    archived = existing_seller_model.model_copy(update={"status": "Inativo"})
+    mock_repository.find_by_id.return_value = archived
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    assert await service.find_by_id(archived.seller_id, include_archived=True) == archived
+    mock_repository.find_by_id.assert_awaited_once_with(archived.seller_id, include_archived=True)
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_hides_inactive_by_default(mock_repository, mock_keycloak_client, existing_seller_model):
+    inactive = existing_seller_model.model_copy(update={"status": "Inativo"})
+    mock_repository.find_by_id.return_value = inactive
+
+    service = SellerService(mock_repository, mock_keycloak_client)
+
+    assert await service.find_by_id(inactive.seller_id) is None
+    mock_repository.find_by_id.assert_awaited_once_with(inactive.seller_id, include_archived=False)
+
+
+# --- Testes para o cache da listagem ---
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_list_cache(
+    mock_repository, mock_keycloak_client, existing_seller_model, patch_data, fake_auth_info
+):
+    from app.integrations.kv_db.generation_cache import GenerationCache
+
+    list_cache = AsyncMock(spec=GenerationCache)
+    mock_repository.find_by_id.return_value = existing_seller_model
+    mock_repository.find_by_trade_name.return_value = None
+    mock_repository.patch.return_value = existing_seller_model
+
+    service = SellerService(mock_repository, mock_keycloak_client, list_cache=list_cache)
+    await service.update(existing_seller_model.seller_id, patch_data, auth_info=fake_auth_info)
+    await service.delete_by_id(existing_seller_model.seller_id, auth_info=fake_auth_info)
+
+    assert list_cache.invalidate.await_count == 2
@@ -1,5 +1,5 @@
 import pytest
-from app.services.text_cleaner_service import TextCleanerService
+from app.services.text_cleaner_service import TextCleanerService, clean
 
 
 PLAIN_TEXT = "Just plain text"
@@ -126,3 +126,86 @@ class TestTextCleanerService:
         ansi_text = "\x1b[31mRed\x1b[0m \x1b[32mGreen\x1b[0m \x1b[34mBlue\x1b[0m"
         result = self.service.remove_html(ansi_text)  # remove_html também remove ANSI
         assert result == "Red Green Blue"
+
+    def test_single_pass_matches_separate_passes(self):
+        """Testa que a passada única equivale a remover HTML e depois Markdown"""
+        text = "<p>**Atenção**: veja o [manual](http://x) e o *prazo*</p>\x1b[1m fim\x1b[0m"
+        assert clean(text) == self.service.clean_text(text) == "Atenção: veja o manual e o prazo fim"
+
+    def test_clean_text_keeps_separate_passes_on_asterisk_runs(self):
+        """Testa que clean_text mantém o resultado das passadas separadas em sequências de asteriscos"""
+        assert self.service.clean_text("***a*** e a ***b** c*") == "a e a b c"
+
+    def test_clean_text_formatting_inside_link(self):
+        """Testa formatação e HTML dentro do texto de negrito e de link"""
+        text = "[**<b>Guia</b>**](http://x) e **<i>nota</i>**"
+        assert self.service.clean_text(text) == "Guia e nota"
+
+
+STREAM_TEXT = (
+    "# Cadastro\n<p>Para **cadastrar um seller**, envie os *documentos* listados no "
+    "[guia do seller](https://example.com/guia).</p>\n\x1b[32m- CNPJ\x1b[0m\n"
+    "- Contrato social <br/> e **[comprovante](https://example.com/c)** de endereço"
+)
+
+
+def _feed_all(cleaner, chunks):
+    return "".join(cleaner.feed(chunk) for chunk in chunks) + cleaner.flush()
+
+
+class TestStreamingTextCleaner:
+    """Testes para a limpeza incremental de texto"""
+
+    def setup_method(self):
+        self.service = TextCleanerService()
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 1000])
+    def test_chunked_output_matches_full_text_cleaning(self, size):
+        """Testa que a saída em partes é igual à limpeza do texto completo"""
+        chunks = [STREAM_TEXT[i:i + size] for i in range(0, len(STREAM_TEXT), size)]
+        assert _feed_all(self.service.stream(), chunks) == clean(STREAM_TEXT)
+
+    def test_holds_incomplete_construct(self):
+        """Testa que construções incompletas ficam retidas até serem fechadas"""
+        cleaner = self.service.stream()
+        assert cleaner.feed("Veja o **prazo") == "Veja o "
+        assert cleaner.feed(" final** e <str") == "prazo final e "
+        assert cleaner.feed("ong>link [guia](http") == "link "
+        assert cleaner.feed("://x) ok") == "guia ok"
+        assert cleaner.flush() == ""
+
+    def test_holds_closed_italic_that_may_become_bold(self):
+        """Testa que `*texto*` no fim do trecho espera o próximo, pois pode ser o início de negrito"""
+        cleaner = self.service.stream()
+        assert cleaner.feed("a **b*") == "a "
+        assert cleaner.feed("* c") == "b c"
+
+    def test_plain_text_is_not_buffered(self):
+        """Testa que texto sem formatação é repassado imediatamente"""
+        cleaner = self.service.stream()
+        assert cleaner.feed("texto simples, ") == "texto simples, "
+        assert cleaner.feed("2 > 1") == "2 > 1"
+        assert cleaner.flush() == ""
+
+    def test_unclosed_construct_released_on_flush(self):
+        """Testa que o que nunca foi fechado é liberado ao final"""
+        cleaner = self.service.stream()
+        assert cleaner.feed("nota *sem fim") == "nota "
+        assert cleaner.flush() == "*sem fim"
+
+    def test_max_pending_releases_text(self):
+        """Testa que o trecho retido é liberado quando passa de max_pending"""
+        cleaner = self.service.stream(max_pending=10)
+        assert cleaner.feed("a *b") == "a "
+        assert cleaner.feed(" continua por muito tempo") == "*b continua por muito tempo"
+        assert cleaner.flush() == ""
+
+    async def test_aclean_stream(self):
+        """Testa a limpeza de um gerador assíncrono de trechos"""
+        async def chunks():
+            for i in range(0, len(STREAM_TEXT), 5):
+                yield STREAM_TEXT[i:i + 5]
+
+        result = [chunk async for chunk in self.service.aclean_stream(chunks())]
+        assert all(result)
+        assert "".join(result) == clean(STREAM_TEXT)
@@ -69,71 +69,6 @@ class TestApiMain:
         
         mock_load_dotenv.assert_called_once_with(override=False)
     
-    @pytest.mark.asyncio
-    async def test_log_requests_middleware_success(self):
-        """Testa middleware de log para requisições bem-sucedidas"""
-        from app.api_main import log_requests_middleware
-        
-        # Mock request
-        request = Mock(spec=Request)
-        request.method = "GET"
-        request.url.path = "/test"
-        
-        # Mock response
-        response = Mock(spec=Response)
-        response.status_code = 200
-        
-        # Mock call_next
-        call_next = AsyncMock(return_value=response)
-        
-        # Mock logger
-        with patch('app.api_main.logger') as mock_logger:
-            result = await log_requests_middleware(request, call_next)
-            
-            assert result is response
-            call_next.assert_called_once_with(request)
-            
-            # Verificar logs
-            assert mock_logger.info.call_count == 2
-            mock_logger.info.assert_any_call("Requisição recebida: GET /test")
-            
-            # Verificar log de finalização (deve conter duração)
-            final_log_call = mock_logger.info.call_args_list[1]
-            assert "Requisição finalizada: GET /test - Status: 200 - Duração:" in final_log_call[0][0]
-            assert "ms" in final_log_call[0][0]
-    
-    @pytest.mark.asyncio
-    async def test_log_requests_middleware_error(self):
-        """Testa middleware de log para requisições com erro"""
-        from app.api_main import log_requests_middleware
-        
-        # Mock request
-        request = Mock(spec=Request)
-        request.method = "POST"
-        request.url.path = "/error"
-        
-        # Mock response com erro
-        response = Mock(spec=Response)
-        response.status_code = 500
-        
-        # Mock call_next
-        call_next = AsyncMock(return_value=response)
-        
-        # Mock logger
-        with patch('app.api_main.logger') as mock_logger:
-            result = await log_requests_middleware(request, call_next)
-            
-            assert result is response
-            call_next.assert_called_once_with(request)
-            
-            # Verificar logs
-            assert mock_logger.info.call_count == 2
-            mock_logger.info.assert_any_call("Requisição recebida: POST /error")
-            
-            # Verificar log de finalização com status 500
-            final_log_call = mock_logger.info.call_args_list[1]
-            assert "Requisição finalizada: POST /error - Status: 500 - Duração:" in final_log_call[0][0]
-    
     @patch('app.api.api_application.create_app')
     @patch('app.api_main.Container')
     @patch('app.api_main.api_settings')
@@ -0,0 +1,246 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.worker.cold_archiver import CHECKPOINT_ID, COLD_ARCHIVER_WORKER, ColdArchiver, RateLimiter, run_cold_archiver
+from app.worker.worker_factory import worker_factory
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.sort_args = None
+        self.batch = None
+
+    def sort(self, *args):
+        self.sort_args = args
+        return self
+
+    def batch_size(self, n):
+        self.batch = n
+        return self
+
+    def __aiter__(self):
+        async def gen():
+            for doc in self.docs:
+                yield doc
+
+        return gen()
+
+
+def make_collection():
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    collection.delete_one = AsyncMock()
+    collection.delete_many = AsyncMock()
+    collection.bulk_write = AsyncMock()
+    return collection
+
+
+def make_client(collections: dict):
+    client = MagicMock()
+    database = MagicMock()
+    database.__getitem__ = lambda self, name: collections[name]
+    client.get_database.return_value = database
+    return client
+
+
+@pytest.fixture
+def collections():
+    return {"hot": make_collection(), "checkpoint": make_collection(), "cold": make_collection()}
+
+
+@pytest.fixture
+def archiver_factory(collections):
+    hot_client = make_client({"sellers": collections["hot"], "archiver_checkpoints": collections["checkpoint"]})
+    cold_client = make_client({"sellers": collections["cold"]})
+
+    def factory(**kwargs):
+        return ColdArchiver(hot_client, cold_client, "bd01", "bd01_cold", **kwargs)
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_run_streams_batches_and_deletes_confirmed_ids(collections, archiver_factory):
+    docs = [{"_id": i, "seller_id": f"s{i}", "status": "Inativo"} for i in range(5)]
+    cursor = FakeCursor(docs)
+    collections["hot"].find.return_value = cursor
+    stats_repository = AsyncMock()
+
+    result = await archiver_factory(batch_size=2, concurrency=2, stats_repository=stats_repository).run()
+
+    assert (result.archived, result.failed, result.batches) == (5, 0, 3)
+    assert collections["hot"].find.call_args.args[0] == {"status": "Inativo"}
+    assert cursor.sort_args == ("_id", 1)
+    assert cursor.batch == 2
+    assert collections["cold"].bulk_write.await_count == 3
+    assert collections["cold"].bulk_write.call_args_list[0].kwargs == {"ordered": False}
+    deleted = [call.args[0]["_id"]["$in"] for call in collections["hot"].delete_many.call_args_list]
+    assert sorted(sum(deleted, [])) == [0, 1, 2, 3, 4]
+    saved = [call.args[1]["$max"]["last_id"] for call in collections["checkpoint"].update_one.call_args_list]
+    assert max(saved) == 4
+    collections["checkpoint"].delete_one.assert_awaited_once_with({"_id": CHECKPOINT_ID})
+    stats_repository.reconcile.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_resumes_from_checkpoint(collections, archiver_factory):
+    collections["checkpoint"].find_one.return_value = {"_id": CHECKPOINT_ID, "last_id": 10}
+    collections["hot"].find.return_value = FakeCursor([])
+
+    result = await archiver_factory().run()
+
+    assert result.archived == 0
+    assert collections["hot"].find.call_args.args[0] == {"status": "Inativo", "_id": {"$gt": 10}}
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_kept_in_hot_and_checkpoint_is_not_cleared(collections, archiver_factory):
+    docs = [{"_id": i, "status": "Inativo"} for i in range(3)]
+    collections["hot"].find.return_value = FakeCursor(docs)
+    collections["cold"].bulk_write.side_effect = BulkWriteError({"writeErrors": [{"index": 1}]})
+
+    result = await archiver_factory(batch_size=3).run()
+
+    assert (result.archived, result.failed) == (2, 1)
+    assert collections["hot"].delete_many.call_args.args[0] == {"_id": {"$in": [0, 2]}, "status": "Inativo"}
+    collections["checkpoint"].update_one.assert_not_called()
+    collections["checkpoint"].delete_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_acquisitions(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("app.worker.cold_archiver.asyncio.sleep", fake_sleep)
+    limiter = RateLimiter(rate=10)
+
+    await limiter.acquire(5)
+    await limiter.acquire(5)
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(0.5, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_disabled():
+    await RateLimiter(rate=0).acquire(1000)
+
+
+@pytest.mark.asyncio
+async def test_run_cold_archiver_requires_cold_url(monkeypatch):
+    from app.settings import worker_settings
+
+    monkeypatch.setattr(worker_settings, "MONGO_COLD_URL", None)
+
+    with pytest.raises(ValueError):
+        await run_cold_archiver()
+
+
+def test_worker_is_registered():
+    definition = worker_factory.create(COLD_ARCHIVER_WORKER)
+
+    assert definition.info.name == COLD_ARCHIVER_WORKER
+    assert definition.config["run"] is run_cold_archiver
+
+
+@pytest.mark.asyncio
+async def test_run_writes_batches_to_segment_archive(collections, tmp_path):
+    from app.integrations.archive.segment_archive import SegmentArchive
+
+    docs = [{"_id": i, "seller_id": f"s{i}", "cnpj": f"{i:014d}", "status": "Inativo"} for i in range(3)]
+    collections["hot"].find.return_value = FakeCursor(docs)
+    hot_client = make_client({"sellers": collections["hot"], "archiver_checkpoints": collections["checkpoint"]})
+    segment_archive = SegmentArchive(tmp_path)
+
+    archiver = ColdArchiver(hot_client, None, "bd01", None, batch_size=2, segment_archive=segment_archive)
+    result = await archiver.run()
+
+    assert (result.archived, result.failed, result.batches) == (3, 0, 2)
+    assert segment_archive.find("seller_id", "s2")["_id"] == 2
+    assert len(list(tmp_path.glob("*.seg"))) == 2
+    segment_archive.close()
+
+
+@pytest.mark.asyncio
+async def test_run_compacts_segment_archive_above_max_segments(collections, tmp_path):
+    from app.integrations.archive.segment_archive import SegmentArchive
+
+    docs = [{"_id": i, "seller_id": f"s{i}", "cnpj": f"{i:014d}", "status": "Inativo"} for i in range(5)]
+    collections["hot"].find.return_value = FakeCursor(docs)
+    hot_client = make_client({"sellers": collections["hot"], "archiver_checkpoints": collections["checkpoint"]})
+    segment_archive = SegmentArchive(tmp_path)
+
+    archiver = ColdArchiver(
+        hot_client, None, "bd01", None, batch_size=1, segment_archive=segment_archive, max_segments=2
+    )
+    await archiver.run()
+
+    assert len(list(tmp_path.glob("*.seg"))) == 1
+    assert all(segment_archive.find("seller_id", f"s{i}")["_id"] == i for i in range(5))
+    segment_archive.close()
+
+
+def test_archiver_requires_a_cold_target(collections):
+    hot_client = make_client({"sellers": collections["hot"], "archiver_checkpoints": collections["checkpoint"]})
+
+    with pytest.raises(ValueError):
+        ColdArchiver(hot_client, None, "bd01", None)
+
+
+@pytest.mark.asyncio
+async def test_run_cancels_remaining_batches_when_one_fails(collections, archiver_factory):
+    collections["hot"].find.return_value = FakeCursor([{"_id": i, "status": "Inativo"} for i in range(2)])
+    archiver = archiver_factory(batch_size=1, concurrency=2)
+    blocked = asyncio.Event()
+    cancelled = []
+
+    async def archive_batch(docs):
+        if docs[0]["_id"] == 0:
+            await blocked.wait()
+            raise RuntimeError("falha no lote")
+        blocked.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(docs[0]["_id"])
+            raise
+
+    archiver.archive_batch = archive_batch
+
+    with pytest.raises(RuntimeError, match="falha no lote"):
+        await archiver.run()
+
+    assert cancelled == [1]
+
+
+@pytest.mark.asyncio
+async def test_run_stops_reading_cursor_after_a_batch_fails(collections, archiver_factory):
+    collections["hot"].find.return_value = FakeCursor([{"_id": i, "status": "Inativo"} for i in range(20)])
+    collections["cold"].bulk_write.side_effect = ConnectionError("banco frio fora do ar")
+    archiver = archiver_factory(batch_size=2, concurrency=1)
+
+    with pytest.raises(ConnectionError):
+        await archiver.run()
+
+    collections["cold"].bulk_write.assert_awaited_once()
+    collections["hot"].delete_many.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_archive_batch_invalidates_seller_list_cache(collections, archiver_factory):
+    list_cache = AsyncMock()
+    archiver = archiver_factory(list_cache=list_cache)
+
+    await archiver.archive_batch([{"_id": 1, "status": "Inativo"}])
+    collections["cold"].bulk_write.side_effect = BulkWriteError({"writeErrors": [{"index": 0}]})
+    await archiver.archive_batch([{"_id": 2, "status": "Inativo"}])
+
+    list_cache.invalidate.assert_awaited_once()
@@ -0,0 +1,201 @@
+"""
+Servidor SMTP local para testes e benchmarks: aceita qualquer login, guarda as mensagens em memória e
+pode simular a latência do handshake (conexão e TLS) e do login de um servidor real. Não faz STARTTLS.
+"""
+
+import base64
+import logging
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReceivedMessage:
+    mail_from: str
+    rcpt_tos: list[str]
+    data: bytes
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    server: "_ThreadingServer"
+
+    def _reply(self, text: str) -> None:
+        self.wfile.write(f"{text}\r\n".encode())
+
+    def _readline(self) -> Optional[str]:
+        line = self.rfile.readline()
+        return line.decode("utf-8", "replace").rstrip("\r\n") if line else None
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b".\r\n":
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    def handle(self) -> None:
+        owner = self.server.owner
+        owner._opened(self.connection)
+        try:
+            owner._sleep(owner.connect_latency_ms)
+            self._reply("220 localhost ESMTP")
+            self._session(owner)
+        except OSError:
+            pass
+        finally:
+            owner._closed(self.connection)
+
+    def _session(self, owner: "LocalSmtpServer") -> None:
+        mail_from, rcpt_tos = "", []
+        while True:
+            line = self._readline()
+            if line is None:
+                return
+            command, _, argument = line.partition(" ")
+            command = command.upper()
+            owner._sleep(owner.command_latency_ms)
+            if command == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 AUTH PLAIN LOGIN")
+            elif command == "HELO":
+                self._reply("250 localhost")
+            elif command == "AUTH":
+                self._authenticate(owner, argument)
+            elif command == "MAIL":
+                mail_from, rcpt_tos = argument, []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                rcpt_tos.append(argument)
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                owner._received(ReceivedMessage(mail_from, rcpt_tos, self._read_data()))
+                mail_from, rcpt_tos = "", []
+                self._reply("250 OK")
+            elif command == "RSET":
+                mail_from, rcpt_tos = "", []
+                self._reply("250 OK")
+            elif command == "NOOP":
+                owner._count("noops")
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _authenticate(self, owner: "LocalSmtpServer", argument: str) -> None:
+        mechanism, _, initial = argument.partition(" ")
+        if mechanism.upper() == "PLAIN" and not initial:
+            self._reply("334 ")
+            self._readline()
+        elif mechanism.upper() == "LOGIN":
+            self._reply("334 " + base64.b64encode(b"Username:").decode())
+            self._readline()
+            self._reply("334 " + base64.b64encode(b"Password:").decode())
+            self._readline()
+        owner._sleep(owner.auth_latency_ms)
+        owner._count("logins")
+        self._reply("235 Authentication successful")
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    owner: "LocalSmtpServer"
+
+
+class LocalSmtpServer:
+    """
+    Servidor SMTP em uma thread, na porta `port` (0 escolhe uma porta livre). Use como context manager
+    ou com `start()`/`stop()`; o endereço efetivo fica em `host` e `port` após iniciar.
+
+    :param connect_latency_ms: Espera antes da saudação, simulando conexão e TLS.
+    :param auth_latency_ms: Espera no login.
+    :param command_latency_ms: Espera em cada comando.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_latency_ms: float = 0,
+        auth_latency_ms: float = 0,
+        command_latency_ms: float = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.connect_latency_ms = connect_latency_ms
+        self.auth_latency_ms = auth_latency_ms
+        self.command_latency_ms = command_latency_ms
+        self.messages: list[ReceivedMessage] = []
+        self.stats = {"connections": 0, "logins": 0, "noops": 0}
+        self._lock = threading.Lock()
+        self._sockets: set[socket.socket] = set()
+        self._server: Optional[_ThreadingServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _sleep(milliseconds: float) -> None:
+        if milliseconds:
+            time.sleep(milliseconds / 1000)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _opened(self, connection: socket.socket) -> None:
+        with self._lock:
+            self.stats["connections"] += 1
+            self._sockets.add(connection)
+
+    def _closed(self, connection: socket.socket) -> None:
+        with self._lock:
+            self._sockets.discard(connection)
+
+    def _received(self, message: ReceivedMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def start(self) -> "LocalSmtpServer":
+        self._server = _ThreadingServer((self.host, self.port), _SmtpHandler)
+        self._server.owner = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="local-smtp", daemon=True
+        )
+        self._thread.start()
+        logger.info("Servidor SMTP local em %s:%d", self.host, self.port)
+        return self
+
+    def disconnect_all(self) -> None:
+        """Derruba as conexões abertas, como um servidor que encerra sessões ociosas."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for connection in sockets:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self.disconnect_all()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+
+    def __enter__(self) -> "LocalSmtpServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()